@@ -239,14 +239,13 @@ class AppointmentAdmin(BaseTenantAdmin):
         # Asignar local_id secuencial si está vacío
         if getattr(obj, 'local_id', None) in (None, 0):
             from django.db import transaction
-            from django.db.models import Max
+            from architect.utils.archive import max_with_archive
             with transaction.atomic():
-                max_local = (
-                    Appointment.objects.select_for_update()
-                    .filter(reflexo_id=obj.reflexo_id)
-                    .aggregate(m=Max('local_id'))['m']
+                # Incluye las archivadas: vuelven con su número al restaurarse
+                max_local = max_with_archive(
+                    Appointment, 'local_id', Appointment.objects.select_for_update(), reflexo_id=obj.reflexo_id
                 )
-                obj.local_id = (max_local or 0) + 1
+                obj.local_id = max_local + 1
 
         super().save_model(request, obj, form, change)
 
@@ -2,9 +2,11 @@
 Comando para asignar tenants a citas que no los tienen.
 """
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db.models import Q
 from appointments_status.models import Appointment
-from patients_diagnoses.models import Patient
+from architect.models import SearchEntry
+from architect.utils.global_search import GlobalSearchService
+from architect.utils.tenant_runner import TenantRunner, add_runner_arguments, format_summary
 
 
 class Command(BaseCommand):
@@ -16,6 +18,29 @@ class Command(BaseCommand):
             action='store_true',
             help='Mostrar qué citas serían actualizadas sin hacer cambios',
         )
+        add_runner_arguments(parser)
+
+    @staticmethod
+    def _assign_tenant(tenant_id):
+        """Citas sin tenant cuyo paciente pertenece a `tenant_id` (una transacción por tenant)."""
+        ids = list(
+            Appointment.objects.filter(reflexo_id__isnull=True, patient__reflexo_id=tenant_id)
+            .values_list('id', flat=True)
+        )
+        updated = Appointment.objects.filter(id__in=ids).update(reflexo_id=tenant_id)
+        # update() no dispara señales: el índice de búsqueda guarda el tenant de cada cita
+        GlobalSearchService().reindex_with_dependents(SearchEntry.TYPE_APPOINTMENT, ids)
+        return {'updated': updated}
+
+    def _on_result(self, result, done, total):
+        if result.ok:
+            self.stdout.write(
+                f'✅ [{done}/{total}] Tenant {result.tenant_id}: {result.value["updated"]} citas asignadas'
+            )
+        else:
+            self.stdout.write(
+                self.style.ERROR(f'❌ [{done}/{total}] Tenant {result.tenant_id}: error ({result.error})')
+            )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
@@ -34,7 +59,7 @@ class Command(BaseCommand):
 
         if dry_run:
             self.stdout.write('\n🔍 MODO DRY-RUN - No se realizarán cambios')
-            for appointment in appointments_without_tenant:
+            for appointment in appointments_without_tenant.select_related('patient'):
                 patient_tenant = appointment.patient.reflexo_id if appointment.patient else None
                 self.stdout.write(
                     f'  - Cita ID {appointment.id}: Paciente {appointment.patient.name if appointment.patient else "N/A"} '
@@ -42,27 +67,34 @@ class Command(BaseCommand):
                 )
             return
 
-        # Asignar tenant basándose en el paciente
-        updated_count = 0
-        with transaction.atomic():
-            for appointment in appointments_without_tenant:
-                if appointment.patient and appointment.patient.reflexo_id:
-                    appointment.reflexo_id = appointment.patient.reflexo_id
-                    appointment.save(update_fields=['reflexo_id'])
-                    updated_count += 1
-                    self.stdout.write(
-                        f'✅ Cita ID {appointment.id} asignada al tenant {appointment.patient.reflexo_id} '
-                        f'(basándose en paciente {appointment.patient.name})'
-                    )
-                else:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f'⚠️  Cita ID {appointment.id} no se puede asignar - paciente sin tenant'
-                        )
-                    )
+        # Un UPDATE por tenant del paciente (en paralelo con --workers)
+        tenants = list(
+            appointments_without_tenant.filter(patient__reflexo_id__isnull=False)
+            .order_by()
+            .values_list('patient__reflexo_id', flat=True)
+            .distinct()
+        )
+        unassignable = appointments_without_tenant.filter(
+            Q(patient__isnull=True) | Q(patient__reflexo_id__isnull=True)
+        ).count()
+        if unassignable:
+            self.stdout.write(
+                self.style.WARNING(f'⚠️  {unassignable} citas no se pueden asignar - paciente sin tenant')
+            )
+
+        runner = TenantRunner(
+            self._assign_tenant,
+            workers=options['workers'],
+            retries=options['retries'],
+            totals=('updated',),
+            on_result=self._on_result,
+        )
+        summary = runner.run(tenants)
 
         self.stdout.write(
-            self.style.SUCCESS(f'🎉 Actualizadas {updated_count} citas con tenant asignado')
+            self.style.SUCCESS(
+                f'🎉 Actualizadas {summary["totals"]["updated"]} citas con tenant asignado ({format_summary(summary)})'
+            )
         )
 
         # Verificar resultado
@@ -1,6 +1,9 @@
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.utils import timezone
 from appointments_status.models import Ticket
+from architect.models import SearchEntry
+from architect.utils.global_search import GlobalSearchService
+from architect.utils.tenant_runner import TenantRunner, add_runner_arguments, format_summary
 
 class Command(BaseCommand):
     help = "Backfill ticket.reflexo from related appointment when missing (NULL)."
@@ -17,6 +20,7 @@ class Command(BaseCommand):
             default=0,
             help="Limit the number of records to process (0 = no limit)",
         )
+        add_runner_arguments(parser)
 
     def handle(self, *args, **options):
         dry_run = options.get("dry_run", False)
@@ -24,22 +28,46 @@ class Command(BaseCommand):
 
         qs = Ticket.objects.filter(reflexo__isnull=True, appointment__isnull=False)
         total = qs.count()
+        limited_ids = None
         if limit and limit > 0:
-            qs = qs[:limit]
+            # The limit applies to the whole run: fix the ids here, workers only see their tenant's share
+            limited_ids = list(qs.order_by("id").values_list("id", flat=True)[:limit])
+            qs = qs.filter(id__in=limited_ids)
 
         self.stdout.write(self.style.NOTICE(f"Found {total} tickets with NULL reflexo_id (processing {qs.count()} records)..."))
 
-        updated = 0
-        with transaction.atomic():
-            for t in qs.select_related("appointment"):
-                tenant = getattr(t.appointment, "reflexo", None)
-                if tenant is None:
-                    continue
-                t.reflexo = tenant
-                if not dry_run:
-                    t.save(update_fields=["reflexo", "updated_at"])  # updated_at if model has it
-                updated += 1
-            if dry_run:
-                transaction.set_rollback(True)
-
-        self.stdout.write(self.style.SUCCESS(f"Done. Updated {updated} ticket(s). Dry run: {dry_run}"))
+        def backfill(tenant_id):
+            tickets = Ticket.objects.filter(reflexo__isnull=True, appointment__reflexo_id=tenant_id)
+            if limited_ids is not None:
+                tickets = tickets.filter(id__in=limited_ids)
+            ids = list(tickets.values_list("id", flat=True))
+            updated = Ticket.objects.filter(id__in=ids).update(reflexo_id=tenant_id, updated_at=timezone.now())
+            # update() skips the post_save signal that keeps search_entries in sync
+            GlobalSearchService().reindex(SearchEntry.TYPE_TICKET, ids)
+            return {"updated": updated}
+
+        def on_result(result, done, total_tenants):
+            if result.ok:
+                self.stdout.write(f"[{done}/{total_tenants}] Tenant {result.tenant_id}: {result.value['updated']} ticket(s)")
+            else:
+                self.stdout.write(self.style.ERROR(f"[{done}/{total_tenants}] Tenant {result.tenant_id}: ERROR {result.error}"))
+
+        tenants = list(
+            qs.filter(appointment__reflexo_id__isnull=False)
+            .order_by()
+            .values_list("appointment__reflexo_id", flat=True)
+            .distinct()
+        )
+        runner = TenantRunner(
+            backfill,
+            workers=options["workers"],
+            retries=options["retries"],
+            dry_run=dry_run,
+            totals=("updated",),
+            on_result=on_result,
+        )
+        summary = runner.run(tenants)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Updated {summary['totals']['updated']} ticket(s). {format_summary(summary)}. Dry run: {dry_run}"
+        ))
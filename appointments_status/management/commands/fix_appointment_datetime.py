@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db.models import Q
 from datetime import datetime, time
 from appointments_status.models.appointment import Appointment
+from architect.utils.tenant_runner import TenantRunner, add_runner_arguments, format_summary
 
 class Command(BaseCommand):
     help = (
@@ -13,6 +14,34 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--dry-run", action="store_true", help="Do not persist changes.")
         parser.add_argument("--tenant", type=int, default=None, help="Limit to a specific reflexo (tenant) ID.")
+        add_runner_arguments(parser)
+
+    @staticmethod
+    def _to_fix(qs):
+        return qs.filter(Q(appointment_date__isnull=True) | Q(hour__isnull=True))
+
+    def _fix_tenant(self, tenant_id):
+        """Fixes one tenant's appointments; TenantRunner wraps it in a transaction."""
+        checked = fixed = 0
+        for ap in self._to_fix(Appointment.objects.filter(reflexo_id=tenant_id)).select_for_update():
+            checked += 1
+            changed = False
+            if ap.appointment_date and ap.hour is None:
+                try:
+                    ap.hour = ap.appointment_date.time()
+                    changed = True
+                except Exception:
+                    pass
+            if ap.appointment_date is None and ap.initial_date and ap.hour:
+                try:
+                    ap.appointment_date = datetime.combine(ap.initial_date, ap.hour)
+                    changed = True
+                except Exception:
+                    pass
+            if changed:
+                ap.save(update_fields=["appointment_date", "hour", "updated_at"])
+                fixed += 1
+        return {"checked": checked, "fixed": fixed}
 
     def handle(self, *args, **opts):
         dry = opts.get("dry_run", False)
@@ -22,28 +51,25 @@ class Command(BaseCommand):
         if tenant is not None:
             qs = qs.filter(reflexo_id=tenant)
 
-        to_fix = qs.filter(models.Q(appointment_date__isnull=True) | models.Q(hour__isnull=True))
+        to_fix = self._to_fix(qs)
         total = to_fix.count()
-        fixed = 0
-
-        with transaction.atomic():
-            for ap in to_fix.select_for_update():
-                changed = False
-                if ap.appointment_date and ap.hour is None:
-                    try:
-                        ap.hour = ap.appointment_date.time()
-                        changed = True
-                    except Exception:
-                        pass
-                if ap.appointment_date is None and ap.initial_date and ap.hour:
-                    try:
-                        ap.appointment_date = datetime.combine(ap.initial_date, ap.hour)
-                        changed = True
-                    except Exception:
-                        pass
-                if changed:
-                    ap.save(update_fields=["appointment_date", "hour", "updated_at"])
-                    fixed += 1
-            if dry:
-                transaction.set_rollback(True)
-        self.stdout.write(self.style.SUCCESS(f"Checked {total} appointments, fixed {fixed}. Dry run: {dry}"))
+        # Appointments without tenant (reflexo_id NULL) are processed as one more unit
+        tenants = list(to_fix.order_by().values_list("reflexo_id", flat=True).distinct())
+
+        def on_result(result, done, total_tenants):
+            if not result.ok:
+                self.stdout.write(self.style.ERROR(f"[{done}/{total_tenants}] Tenant {result.tenant_id}: ERROR {result.error}"))
+
+        runner = TenantRunner(
+            self._fix_tenant,
+            workers=opts["workers"],
+            retries=opts["retries"],
+            dry_run=dry,
+            totals=("checked", "fixed"),
+            on_result=on_result,
+        )
+        summary = runner.run(tenants)
+        fixed = summary["totals"]["fixed"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {total} appointments, fixed {fixed}. {format_summary(summary)}. Dry run: {dry}"
+        ))
@@ -0,0 +1,148 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from architect.utils.archive import Archiver
+from architect.utils.partitions import (
+    FUTURE_PARTITION, PARTITIONED_TABLES,
+    add_future_partitions, drop_partitions, partition_by_month, partitions, remove_partitioning,
+)
+from architect.utils.search import create_fulltext_index
+
+# Tabla -> modelo (las columnas FULLTEXT a recrear al deshacer salen de SEARCH_FIELDS)
+MODELS = {
+    "appointments": "appointments_status.Appointment",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Monthly RANGE partitioning (MySQL) of appointments (appointment_day); tickets stays a plain table "
+        "because its per-company ticket number cannot be unique across partitions. "
+        "convert: partition the tables (drops their FULLTEXT index, so search falls back to LIKE, and their "
+        "foreign keys; tables with a unique key lacking the day column are refused). "
+        "extend: create the next months' partitions ahead of time. "
+        "prune: archive rows older than --before and drop the emptied partitions. "
+        "unpartition: back to plain tables with their foreign keys. status: list partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["status", "convert", "extend", "prune", "unpartition"])
+        parser.add_argument(
+            "--table",
+            action="append",
+            dest="tables",
+            choices=list(PARTITIONED_TABLES),
+            help="Table to process (repeatable). Default: all.",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.PARTITION_AHEAD_MONTHS,
+            help="Months of future partitions to keep ready (default: settings.PARTITION_AHEAD_MONTHS).",
+        )
+        parser.add_argument(
+            "--before",
+            help="prune: month (YYYY-MM); partitions entirely older than it are pruned.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="prune: drop the old partitions with their rows instead of archiving them first (data loss).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only show what would be done.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "mysql":
+            raise CommandError(f"Partitioning requires MySQL (current database: {connection.vendor}).")
+        tables = options["tables"] or list(PARTITIONED_TABLES)
+        action = options["action"]
+        if action == "status":
+            return self._status(tables)
+        if action == "prune":
+            return self._prune(tables, options)
+
+        refused = []
+        for table in tables:
+            column = PARTITIONED_TABLES[table]
+            if options["dry_run"]:
+                self.stdout.write(f"{table}: would {action} (partitioned={bool(partitions(connection, table))})")
+                continue
+            with connection.schema_editor(atomic=False) as editor:
+                if action == "convert":
+                    try:
+                        done = partition_by_month(editor, table, column, ahead=options["ahead"])
+                    except ValueError as e:
+                        self.stdout.write(self.style.ERROR(str(e)))
+                        refused.append(table)
+                        continue
+                    self._result(table, done, f"partitioned by month on {column}", "already partitioned")
+                elif action == "extend":
+                    created = add_future_partitions(editor, table, ahead=options["ahead"])
+                    self._result(table, created, f"created {', '.join(created)}", "nothing to create")
+                else:
+                    done = remove_partitioning(editor, table, column)
+                    if done:
+                        model = apps.get_model(MODELS[table])
+                        create_fulltext_index(editor, table, f"ft_{table}_search", model.SEARCH_FIELDS)
+                    self._result(
+                        table, done, "partitioning removed, foreign keys and FULLTEXT index restored", "not partitioned"
+                    )
+        if refused:
+            raise CommandError(f"Not partitioned: {', '.join(refused)}")
+
+    def _result(self, table, done, message, skipped):
+        if done:
+            self.stdout.write(self.style.SUCCESS(f"{table}: {message}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{table}: {skipped}"))
+
+    def _status(self, tables):
+        for table in tables:
+            rows = partitions(connection, table)
+            if not rows:
+                self.stdout.write(self.style.WARNING(f"{table}: not partitioned"))
+                continue
+            self.stdout.write(self.style.NOTICE(f"{table}: {len(rows)} partitions on {PARTITIONED_TABLES[table]}"))
+            for name, bound, estimate in rows:
+                self.stdout.write(f"  {name:<10} < {bound:<10} ~{estimate} rows")
+
+    def _prune(self, tables, options):
+        if not options["before"]:
+            raise CommandError("prune requires --before YYYY-MM")
+        try:
+            before = datetime.strptime(options["before"], "%Y-%m").date()
+        except ValueError:
+            raise CommandError(f"Invalid --before {options['before']!r}: use YYYY-MM")
+        if before > date.today():
+            raise CommandError("--before must not be in the future")
+
+        if not options["drop"]:
+            # Las citas (con sus tickets) anteriores al límite pasan a appointments_archive;
+            # appointment_day es UTC, igual que el límite
+            cutoff = datetime(before.year, before.month, 1, tzinfo=dt_timezone.utc)
+            archiver = Archiver(cutoff=cutoff, dry_run=options["dry_run"])
+            totals = archiver.run(["appointments_status.Appointment"])
+            verb = "would be archived" if options["dry_run"] else "archived"
+            for label, count in totals.items():
+                self.stdout.write(f"{label}: {count} {verb}")
+
+        for table in tables:
+            old = [
+                (name, estimate) for name, bound, estimate in partitions(connection, table)
+                if name != FUTURE_PARTITION and date.fromisoformat(bound) <= before
+            ]
+            if options["dry_run"]:
+                listing = ", ".join(f"{name} (~{estimate} rows)" for name, estimate in old) or "none"
+                self.stdout.write(f"{table}: partitions before {before:%Y-%m}: {listing}")
+                continue
+            with connection.schema_editor(atomic=False) as editor:
+                dropped, kept = drop_partitions(editor, table, before, only_empty=not options["drop"])
+            self.stdout.write(self.style.SUCCESS(f"{table}: dropped {', '.join(dropped) or 'none'}"))
+            if kept:
+                self.stdout.write(self.style.WARNING(
+                    f"{table}: kept {', '.join(kept)} (rows still referenced or without appointment_date)"
+                ))
@@ -1,9 +1,13 @@
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from appointments_status.models import Ticket
+from appointments_status.services.ticket_renumber_service import TicketRenumberService
+from architect.utils.renumber import DEFAULT_CHUNK_SIZE
+from architect.utils.tenant_runner import TenantRunner, add_runner_arguments, format_summary
 
 class Command(BaseCommand):
-    help = "Renumber tickets per tenant (reflexo) to TKT-001, TKT-002, ... in created_at order."
+    help = (
+        "Renumber tickets per tenant (reflexo) to TKT-001, TKT-002, ... in created_at order, "
+        "in bounded set-based batches, and mirror the numbers into Appointment.ticket_number."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,61 +21,64 @@ class Command(BaseCommand):
             action="store_true",
             help="Only show what would change; do not persist.",
         )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Tickets per UPDATE/transaction (default: {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip tenants already completed by a previous (interrupted) run.",
+        )
+        add_runner_arguments(parser)
+
+    def _progress(self, tenant_id, phase, done, total):
+        if total > self.chunk_size:
+            self.stdout.write(f"  Tenant {tenant_id}: phase {phase} {done}/{total}")
+
+    def _on_result(self, result, done, total):
+        if not result.ok:
+            self.stdout.write(self.style.ERROR(f"[{done}/{total}] Tenant {result.tenant_id}: failed ({result.error})."))
+            return
+        value = result.value
+        self.stdout.write(
+            self.style.NOTICE(
+                f"[{done}/{total}] Tenant {result.tenant_id}: renumbered {value['changed']} tickets "
+                f"(sequence length={value['sequence']}), appointments synced={value['mirrored']} "
+                f"({value['seconds']:.2f}s)."
+            )
+        )
 
     def handle(self, *args, **options):
         tenant_id = options.get("tenant")
         dry_run = options.get("dry_run", False)
+        self.chunk_size = options["chunk_size"]
 
-        tenants = (
-            Ticket.objects.filter(reflexo__isnull=False)
-            .values_list("reflexo_id", flat=True)
-            .distinct()
-        )
-        if tenant_id is not None:
-            tenants = [t for t in tenants if t == tenant_id]
-            if not tenants:
-                self.stdout.write(self.style.WARNING("No tickets found for the specified tenant."))
-                return
+        service = TicketRenumberService(chunk_size=self.chunk_size, progress=self._progress)
+        tenants = service.tenant_ids(tenant_id)
+        if tenant_id is not None and not tenants:
+            self.stdout.write(self.style.WARNING("No tickets found for the specified tenant."))
+            return
 
-        total_updated = 0
-        with transaction.atomic():
-            for t_id in tenants:
-                # Order by creation to preserve chronology per tenant
-                qs = (
-                    Ticket.objects.filter(reflexo_id=t_id)
-                    .order_by("created_at", "id")
-                    .only("id", "ticket_number")
-                )
-                counter = 0
-                updated_for_tenant = 0
-                for ticket in qs:
-                    counter += 1
-                    new_number = f"TKT-{counter:03d}"
-                    if ticket.ticket_number == new_number:
-                        continue
-                    # Ensure no clash: check if any other ticket within this tenant has this number already
-                    clash = (
-                        Ticket.objects.filter(reflexo_id=t_id, ticket_number=new_number)
-                        .exclude(pk=ticket.pk)
-                        .exists()
-                    )
-                    if clash:
-                        # This should not happen if we process sequentially, but guard anyway
-                        self.stdout.write(
-                            self.style.ERROR(
-                                f"Skipping ticket {ticket.id}: target number {new_number} already exists for tenant {t_id}."
-                            )
-                        )
-                        continue
-                    Ticket.objects.filter(pk=ticket.pk).update(ticket_number=new_number)
-                    updated_for_tenant += 1
-                total_updated += updated_for_tenant
-                self.stdout.write(
-                    self.style.NOTICE(
-                        f"Tenant {t_id}: renumbered {updated_for_tenant} tickets (sequence length={counter})."
-                    )
-                )
-            if dry_run:
-                transaction.set_rollback(True)
+        pending, skipped = service.pending_tenants(tenants, dry_run=dry_run, resume=options["resume"])
+        if skipped:
+            self.stdout.write(f"Skipping {len(skipped)} tenant(s) already done (checkpoint).")
 
-        self.stdout.write(self.style.SUCCESS(f"Done. Total tickets renumbered: {total_updated}. Dry run: {dry_run}"))
+        # El servicio maneja sus propias transacciones cortas por lote (atomic=False)
+        runner = TenantRunner(
+            lambda t: service.process_tenant(t, dry_run=dry_run),
+            workers=options["workers"],
+            retries=options["retries"],
+            atomic=False,
+            totals=("changed", "mirrored"),
+            on_result=self._on_result,
+        )
+        summary = runner.run(pending)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Total tickets renumbered: {summary['totals']['changed']}. "
+                f"{format_summary(summary)}. Dry run: {dry_run}"
+            )
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:45
+
+from django.db import migrations
+
+from architect.utils.search import create_fulltext_index, drop_fulltext_index
+
+# (tabla, índice, columnas): mismas columnas y orden que Appointment/Ticket.SEARCH_FIELDS
+FULLTEXT_INDEXES = [
+    ('appointments', 'ft_appointments_search', ['ailments', 'diagnosis', 'observation', 'ticket_number']),
+    ('tickets', 'ft_tickets_search', ['ticket_number', 'description']),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    for table, name, columns in FULLTEXT_INDEXES:
+        create_fulltext_index(schema_editor, table, name, columns)
+
+
+def remove_fulltext_indexes(apps, schema_editor):
+    for table, name, _ in FULLTEXT_INDEXES:
+        drop_fulltext_index(schema_editor, table, name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments_status', '0008_rename_appointment_appoint_80fbf2_idx_appointment_appoint_b25c11_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, remove_fulltext_indexes),
+    ]
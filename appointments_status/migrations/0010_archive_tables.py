@@ -0,0 +1,97 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments_status', '0009_fulltext_search'),
+        ('histories_configurations', '0009_alter_predeterminedprice_options_and_more'),
+        ('patients_diagnoses', '0010_patient_import_jobs'),
+        ('reflexo', '0003_tenant_export_jobs'),
+        ('therapists', '0004_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('local_id', models.IntegerField(blank=True, null=True, verbose_name='ID local (por empresa)')),
+                ('appointment_date', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de la cita')),
+                ('hour', models.TimeField(blank=True, null=True, verbose_name='Hora de la cita')),
+                ('ailments', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Padecimientos')),
+                ('diagnosis', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Diagnóstico')),
+                ('surgeries', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Cirugías')),
+                ('reflexology_diagnostics', models.CharField(blank=True, max_length=1000, null=True, verbose_name='Diagnósticos de reflexología')),
+                ('medications', models.CharField(blank=True, max_length=255, null=True, verbose_name='Medicamentos')),
+                ('observation', models.CharField(blank=True, max_length=255, null=True, verbose_name='Observaciones')),
+                ('initial_date', models.DateField(blank=True, null=True, verbose_name='Fecha inicial')),
+                ('final_date', models.DateField(blank=True, null=True, verbose_name='Fecha final')),
+                ('appointment_type', models.CharField(blank=True, max_length=255, null=True, verbose_name='Tipo de cita')),
+                ('room', models.IntegerField(blank=True, null=True, verbose_name='Habitación/Consultorio')),
+                ('social_benefit', models.BooleanField(default=True, verbose_name='Beneficio social')),
+                ('payment_detail', models.CharField(blank=True, max_length=255, null=True, verbose_name='Detalle de pago')),
+                ('payment', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True, verbose_name='Pago')),
+                ('ticket_number', models.CharField(blank=True, db_index=True, max_length=20, null=True)),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('appointment_status', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='appointments_status.appointmentstatus', verbose_name='Estado de la cita')),
+                ('history', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='histories_configurations.history', verbose_name='Historial')),
+                ('patient', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='patients_diagnoses.patient', verbose_name='Paciente')),
+                ('payment_status', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='histories_configurations.paymentstatus', verbose_name='Estado de pago')),
+                ('payment_type', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='histories_configurations.paymenttype', verbose_name='Tipo de pago')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+                ('therapist', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='therapists.therapist', verbose_name='Terapeuta')),
+            ],
+            options={
+                'verbose_name': 'Cita (archivo)',
+                'verbose_name_plural': 'Citas (archivo)',
+                'db_table': 'appointments_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_number', models.CharField(max_length=50, verbose_name='Número de ticket')),
+                ('payment_date', models.DateTimeField(verbose_name='Fecha de pago')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Monto')),
+                ('payment_method', models.CharField(max_length=50, verbose_name='Método de pago')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Descripción')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('paid', 'Pagado'), ('cancelled', 'Cancelado'), ('refunded', 'Reembolsado')], default='pending', max_length=20, verbose_name='Estado del ticket')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Activo')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('appointment', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='appointments_status.appointmentarchive', verbose_name='Cita')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+            ],
+            options={
+                'verbose_name': 'Ticket (archivo)',
+                'verbose_name_plural': 'Tickets (archivo)',
+                'db_table': 'tickets_archive',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='appointmentarchive',
+            index=models.Index(fields=['appointment_date', 'hour'], name='appointment_appoint_c2c4ec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointmentarchive',
+            index=models.Index(fields=['reflexo', 'appointment_date'], name='appointment_reflexo_442d55_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketarchive',
+            index=models.Index(fields=['payment_date'], name='tickets_arc_payment_a8709d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketarchive',
+            index=models.Index(fields=['reflexo', 'payment_date'], name='tickets_arc_reflexo_68b089_idx'),
+        ),
+    ]
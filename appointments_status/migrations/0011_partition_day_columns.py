@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:25
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments_status', '0010_archive_tables'),
+        ('histories_configurations', '0010_archive_tables'),
+        ('patients_diagnoses', '0011_archive_tables'),
+        ('reflexo', '0003_tenant_export_jobs'),
+        ('therapists', '0005_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='appointment_day',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.comparison.Coalesce('appointment_date', 'created_at'), models.DateField()), output_field=models.DateField(), verbose_name='Día de la cita'),
+        ),
+        migrations.AddField(
+            model_name='appointmentarchive',
+            name='appointment_day',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.comparison.Coalesce('appointment_date', 'created_at'), models.DateField()), output_field=models.DateField(), verbose_name='Día de la cita'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='payment_day',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast('payment_date', models.DateField()), output_field=models.DateField(), verbose_name='Día de pago'),
+        ),
+        migrations.AddField(
+            model_name='ticketarchive',
+            name='payment_day',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast('payment_date', models.DateField()), output_field=models.DateField(), verbose_name='Día de pago'),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['reflexo', 'appointment_day'], name='appointment_reflexo_ffbccf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['reflexo', 'payment_day'], name='tickets_reflexo_8c3af7_idx'),
+        ),
+    ]
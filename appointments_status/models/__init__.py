@@ -1,5 +1,6 @@
 from .appointment import Appointment
 from .appointment_status import AppointmentStatus
 from .ticket import Ticket
+from .archive import AppointmentArchive, TicketArchive
 
-__all__ = ['Appointment', 'AppointmentStatus', 'Ticket']
+__all__ = ['Appointment', 'AppointmentStatus', 'Ticket', 'AppointmentArchive', 'TicketArchive']
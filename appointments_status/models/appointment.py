@@ -1,5 +1,6 @@
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
  
 
@@ -69,6 +70,20 @@ class Appointment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
     deleted_at = models.DateTimeField(blank=True, null=True, verbose_name="Fecha de eliminación")
+
+    # Día (UTC) de la cita calculado por la base (o el de creación si no tiene
+    # fecha): clave de las particiones mensuales. Filtrar también por este campo
+    # permite a MySQL descartar particiones (ver architect/utils/partitions.py).
+    appointment_day = models.GeneratedField(
+        expression=Cast(Coalesce('appointment_date', 'created_at'), models.DateField()),
+        output_field=models.DateField(),
+        db_persist=True,
+        verbose_name="Día de la cita",
+    )
+
+    # Columnas de búsqueda: mismas y en el mismo orden que el índice FULLTEXT
+    # ft_appointments_search (solo MySQL, migración 0009_fulltext_search)
+    SEARCH_FIELDS = ('ailments', 'diagnosis', 'observation', 'ticket_number')
     
     class Meta:
         db_table = 'appointments'
@@ -78,6 +93,7 @@ class Appointment(models.Model):
         indexes = [
             models.Index(fields=['appointment_date', 'hour']),
             models.Index(fields=['appointment_status']),
+            models.Index(fields=['reflexo', 'appointment_day']),
         ]
         constraints = [
             # Evita duplicar citas activas con el mismo par (patient, history)
@@ -0,0 +1,17 @@
+from architect.utils.archive import archive_model
+from .appointment import Appointment
+from .ticket import Ticket
+
+# Tablas espejo (appointments_archive, tickets_archive): ver architect/utils/archive.py.
+# Los tickets se archivan junto con su cita, por eso apuntan a AppointmentArchive.
+AppointmentArchive = archive_model(
+    Appointment,
+    __name__,
+    indexes=[("appointment_date", "hour"), ("reflexo", "appointment_date")],
+)
+TicketArchive = archive_model(
+    Ticket,
+    __name__,
+    links={"appointment": "appointments_status.AppointmentArchive"},
+    indexes=[("payment_date",), ("reflexo", "payment_date")],
+)
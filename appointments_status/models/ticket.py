@@ -1,5 +1,6 @@
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Cast
 from decimal import Decimal
 
 
@@ -65,6 +66,19 @@ class Ticket(models.Model):
         verbose_name="Fecha de eliminación"
     )
     is_active = models.BooleanField(default=True, verbose_name="Activo")
+
+    # Día (UTC) del pago calculado por la base: ventana por día indexada de los reportes
+    # (la tabla no se particiona: uniq_ticket_number_per_reflexo no incluye el día)
+    payment_day = models.GeneratedField(
+        expression=Cast('payment_date', models.DateField()),
+        output_field=models.DateField(),
+        db_persist=True,
+        verbose_name="Día de pago",
+    )
+
+    # Columnas de búsqueda: mismas y en el mismo orden que el índice FULLTEXT
+    # ft_tickets_search (solo MySQL, migración 0009_fulltext_search)
+    SEARCH_FIELDS = ('ticket_number', 'description')
     
     class Meta:
         db_table = 'tickets'
@@ -76,6 +90,7 @@ class Ticket(models.Model):
             models.Index(fields=['payment_date']),
             models.Index(fields=['status']),
             models.Index(fields=['appointment']),  # Índice para la foreign key
+            models.Index(fields=['reflexo', 'payment_day']),
         ]
         constraints = [
             # Evita duplicados: un ticket activo por cita
@@ -1,5 +1,6 @@
 from .appointment_service import AppointmentService
 from .appointment_status_service import AppointmentStatusService
 from .ticket_service import TicketService
+from .ticket_renumber_service import TicketRenumberService
 
-__all__ = ['AppointmentService', 'AppointmentStatusService', 'TicketService']
+__all__ = ['AppointmentService', 'AppointmentStatusService', 'TicketService', 'TicketRenumberService']
@@ -9,6 +9,8 @@ from ..serializers import AppointmentSerializer
 from decimal import Decimal
 from datetime import datetime
 from histories_configurations.models import History
+from architect.utils.archive import max_with_archive
+from architect.utils.search import search_queryset
 
 
 class AppointmentService:
@@ -221,16 +223,14 @@ class AppointmentService:
                 return Response({'error': 'Formato inválido de appointment_date u hour. Use YYYY-MM-DD y HH:MM.'}, status=status.HTTP_400_BAD_REQUEST)
 
             # Crear la cita con local_id secuencial por tenant
-            from django.db.models import Max
             # Nota: estamos dentro de @transaction.atomic
             next_local = None
             if payload.get('reflexo_id'):
-                max_local = (
-                    Appointment.objects.select_for_update()
-                    .filter(reflexo_id=payload['reflexo_id'])
-                    .aggregate(m=Max('local_id'))['m']
+                # Incluye las archivadas: vuelven con su número al restaurarse
+                max_local = max_with_archive(
+                    Appointment, 'local_id', Appointment.objects.select_for_update(), reflexo_id=payload['reflexo_id']
                 )
-                next_local = (max_local or 0) + 1
+                next_local = max_local + 1
                 payload['local_id'] = next_local
 
             appointment = Appointment.objects.create(**payload)
@@ -373,6 +373,13 @@ class AppointmentService:
                     queryset = queryset.filter(patient=filters['patient'])
                 if 'therapist' in filters:
                     queryset = queryset.filter(therapist=filters['therapist'])
+                if 'search' in filters:
+                    queryset = search_queryset(
+                        queryset,
+                        filters['search'],
+                        fields=Appointment.SEARCH_FIELDS,
+                        fulltext_fields=Appointment.SEARCH_FIELDS,
+                    )
             
             # Aplicar paginación básica
             if pagination:
@@ -0,0 +1,158 @@
+import time
+from typing import Callable, Optional
+
+from django.db.models import F, IntegerField, Max, Window
+from django.db.models.functions import Cast, RowNumber, Substr
+
+from ..models import Appointment, Ticket
+from architect.models import SearchEntry
+from architect.utils.global_search import GlobalSearchService
+from architect.utils.renumber import DEFAULT_CHUNK_SIZE, MAPPING_TABLE, LocalIdRenumberer
+
+TICKET_PREFIX = "TKT-"
+
+
+def format_ticket_number(number: int) -> str:
+    """Mismo formato que TicketService.generate_ticket_number (TKT-001, TKT-1000)."""
+    return f"{TICKET_PREFIX}{number:03d}"
+
+
+class TicketRenumberService(LocalIdRenumberer):
+    """
+    Renumera los tickets de cada empresa a TKT-001, TKT-002, ... en orden
+    (created_at, id) con el motor de architect.utils.renumber:
+      - ROW_NUMBER() por empresa en una tabla temporal,
+      - fase 1: los tickets que cambian pasan a TKT-(offset + n), con offset =
+        mayor TKT-n releído justo antes de la fase 1 + cantidad de tickets,
+        para que uniq_ticket_number_per_reflexo no choque,
+      - fase 2: TKT-n definitivo y, en la misma transacción de cada lote,
+        Appointment.ticket_number se copia del ticket activo con un UPDATE ... JOIN,
+      - al final se reindexan en search_entries las citas y tickets del tenant.
+    Los tickets nuevos creados durante la corrida toman el último número + 1:
+    el margen del offset los deja fuera de la fase 1 salvo que, entre la
+    relectura y el primer lote, se creen más tickets de los que ya tiene la
+    empresa. En la fase 2 los números definitivos quedan por debajo del offset.
+    """
+
+    column = "ticket_number"
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, progress: Optional[Callable] = None):
+        super().__init__(Ticket, chunk_size=chunk_size)
+        # progress(tenant_id, phase, done, total): avance por lote
+        self.progress = progress
+        self._mirrored = 0
+
+    def job(self, only_missing: bool = False) -> str:
+        return "renumber_tickets"
+
+    def _mapping_queryset(self, tenant_id: int, only_missing: bool = False, start: int = 0):
+        return (
+            self.manager.filter(reflexo_id=tenant_id)
+            .order_by()
+            .annotate(
+                new_local=Window(
+                    RowNumber(),
+                    partition_by=[F("reflexo_id")],
+                    order_by=[F("created_at").asc(), F("id").asc()],
+                )
+            )
+            .values_list("id", "new_local")
+        )
+
+    def _current_max(self, tenant_id: int) -> int:
+        """Mayor TKT-n en uso en la empresa (una consulta, sin recorrer los tickets)."""
+        number = Cast(Substr("ticket_number", len(TICKET_PREFIX) + 1), IntegerField())
+        return (
+            self.manager.filter(reflexo_id=tenant_id, ticket_number__startswith=TICKET_PREFIX)
+            .aggregate(m=Max(number))["m"] or 0
+        )
+
+    def _target_sql(self, offset: int) -> str:
+        number = f"(m.new_local + {int(offset)})"
+        if self.connection.vendor == "mysql":
+            # LPAD recorta si el largo es menor que el número: nunca pedir menos de sus dígitos
+            return f"CONCAT('{TICKET_PREFIX}', LPAD({number}, GREATEST(3, CHAR_LENGTH({number})), '0'))"
+        return (
+            f"'{TICKET_PREFIX}' || CASE WHEN {number} < 10 THEN '00' "
+            f"WHEN {number} < 100 THEN '0' ELSE '' END || {number}"
+        )
+
+    def _after_chunk(self, cursor, low: int, high: int) -> None:
+        """Copia el número del ticket activo a su cita (solo las que difieren)."""
+        appointments = self._quote(Appointment._meta.db_table)
+        tickets = self._quote(Ticket._meta.db_table)
+        mapping = self._quote(MAPPING_TABLE)
+        differs = f"({appointments}.ticket_number IS NULL OR {appointments}.ticket_number <> t.ticket_number)"
+        if self.connection.vendor == "mysql":
+            sql = (
+                f"UPDATE {appointments} JOIN {tickets} t ON t.appointment_id = {appointments}.id "
+                f"JOIN {mapping} m ON m.id = t.id "
+                f"SET {appointments}.ticket_number = t.ticket_number "
+                f"WHERE t.is_active = %s AND m.new_local BETWEEN %s AND %s AND {differs}"
+            )
+        else:
+            sql = (
+                f"UPDATE {appointments} SET ticket_number = t.ticket_number "
+                f"FROM {tickets} t JOIN {mapping} m ON m.id = t.id "
+                f"WHERE t.appointment_id = {appointments}.id AND t.is_active = %s "
+                f"AND m.new_local BETWEEN %s AND %s AND {differs}"
+            )
+        cursor.execute(sql, [True, low, high])
+        self._mirrored += cursor.rowcount
+
+    def _refresh_search(self, ids) -> None:
+        """Reindexa las citas de esos tickets y, como dependientes, sus tickets (número nuevo en ambos)."""
+        service = GlobalSearchService()
+        for start in range(0, len(ids), self.chunk_size):
+            appointment_ids = (
+                self.manager.filter(id__in=ids[start:start + self.chunk_size])
+                .values_list("appointment_id", flat=True)
+                .distinct()
+            )
+            service.reindex_with_dependents(SearchEntry.TYPE_APPOINTMENT, appointment_ids)
+
+    def _report(self, tenant_id: int, phase: int, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(tenant_id, phase, done, total)
+
+    def renumber_tenant(self, tenant_id: int, only_missing: bool = False, dry_run: bool = False) -> dict:
+        started = time.perf_counter()
+        # Un solo recorrido de los números actuales: cuántos cambian
+        changed = position = 0
+        numbers = (
+            self.manager.filter(reflexo_id=tenant_id)
+            .order_by("created_at", "id")
+            .values_list("ticket_number", flat=True)
+        )
+        for number in numbers.iterator(chunk_size=self.chunk_size):
+            position += 1
+            if number != format_ticket_number(position):
+                changed += 1
+
+        self._mirrored = 0
+        if position and not dry_run:
+            with self.connection.cursor() as cursor:
+                try:
+                    _, low, high = self._create_mapping(cursor, self._mapping_queryset(tenant_id))
+                    if changed:
+                        # Releído justo antes de la fase 1: incluye los tickets creados desde el recorrido
+                        offset = self._current_max(tenant_id) + position
+                        for chunk in self._ranges(low, high, descending=True):
+                            self._apply(cursor, *chunk, offset=offset, skip_unchanged=True)
+                            self._report(tenant_id, 1, high - chunk[0] + 1, position)
+                    # La fase 2 corre siempre: también corrige citas con el número desfasado
+                    for chunk in self._ranges(low, high):
+                        self._apply(cursor, *chunk, offset=0, final=True, skip_unchanged=True)
+                        self._report(tenant_id, 2, chunk[1], position)
+                    renumbered = self._mapped_ids(cursor) if changed or self._mirrored else []
+                finally:
+                    self._drop_mapping(cursor)
+            self._refresh_search(renumbered)
+
+        return {
+            "tenant": tenant_id,
+            "changed": changed,
+            "mirrored": self._mirrored,
+            "sequence": position,
+            "seconds": time.perf_counter() - started,
+        }
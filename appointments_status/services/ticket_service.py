@@ -3,6 +3,7 @@ from rest_framework import status
 from rest_framework.response import Response
 from ..models import Ticket, Appointment
 from architect.utils.tenant import filter_by_tenant, is_global_admin, get_tenant
+from architect.utils.search import search_queryset
 from ..serializers import TicketSerializer
 from django.utils import timezone
 import re
@@ -237,6 +238,13 @@ class TicketService:
                     queryset = queryset.filter(appointment=filters['appointment'])
                 if 'payment_date' in filters:
                     queryset = queryset.filter(payment_date__date=filters['payment_date'])
+                if 'search' in filters:
+                    queryset = search_queryset(
+                        queryset,
+                        filters['search'],
+                        fields=Ticket.SEARCH_FIELDS,
+                        fulltext_fields=Ticket.SEARCH_FIELDS,
+                    )
             
             # Aplicar paginación básica
             if pagination:
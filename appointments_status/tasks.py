@@ -0,0 +1,24 @@
+from celery import shared_task
+
+
+@shared_task(bind=True)
+def maintain_partitions_job(self, ahead=None):
+    """
+    Mantenimiento mensual de las particiones de citas (solo MySQL y tablas ya
+    particionadas): crea los meses siguientes por adelantado y borra
+    las particiones anteriores al horizonte de archivado que ya quedaron vacías.
+    """
+    from django.conf import settings
+    from django.db import connection
+
+    from architect.utils.partitions import (
+        PARTITIONED_TABLES, add_future_partitions, archive_horizon_month, drop_partitions,
+    )
+
+    ahead = ahead if ahead is not None else settings.PARTITION_AHEAD_MONTHS
+    result = {}
+    with connection.schema_editor(atomic=False) as editor:
+        for table in PARTITIONED_TABLES:
+            dropped, _ = drop_partitions(editor, table, archive_horizon_month(), only_empty=True)
+            result[table] = {"created": add_future_partitions(editor, table, ahead=ahead), "dropped": dropped}
+    return result
@@ -3,11 +3,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from ..models import Appointment
 from ..serializers import AppointmentSerializer
 from ..services import AppointmentService
 from django.utils import timezone
+from architect.utils.search import IndexedSearchFilter
 from architect.utils.tenant import filter_by_tenant, assign_tenant_on_create, is_global_admin
 
 
@@ -22,7 +23,7 @@ class AppointmentViewSet(viewsets.ModelViewSet):
     
     queryset = Appointment.objects.filter(deleted_at__isnull=True)
     serializer_class = AppointmentSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, OrderingFilter]
     filterset_fields = [
         'appointment_date', 
         'appointment_status', 
@@ -31,12 +32,8 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         'patient',
         'therapist'
     ]
-    search_fields = [
-        'ailments', 
-        'diagnosis', 
-        'observation', 
-        'ticket_number'
-    ]
+    search_fields = Appointment.SEARCH_FIELDS
+    search_fulltext_fields = Appointment.SEARCH_FIELDS
     ordering_fields = [
         'appointment_date', 
         'hour', 
@@ -105,8 +102,8 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         filters = {}
         pagination = {}
         
-        # Extraer filtros de query params
-        for field in ['appointment_date', 'appointment_status', 'patient', 'therapist']:
+        # Extraer filtros de query params (list_all no pasa por filter_backends)
+        for field in ['appointment_date', 'appointment_status', 'patient', 'therapist', 'search']:
             value = request.query_params.get(field)
             if value:
                 filters[field] = value
@@ -2,10 +2,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from ..models import Ticket
 from ..serializers import TicketSerializer
 from ..services import TicketService
+from architect.utils.search import IndexedSearchFilter
 from architect.utils.tenant import (
     filter_by_tenant,
     assign_tenant_on_create,
@@ -21,17 +22,15 @@ class TicketViewSet(viewsets.ModelViewSet):
     
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, OrderingFilter]
     filterset_fields = [
         'ticket_number', 
         'payment_method', 
         'status', 
         'is_active'
     ]
-    search_fields = [
-        'ticket_number', 
-        'description'
-    ]
+    search_fields = Ticket.SEARCH_FIELDS
+    search_fulltext_fields = Ticket.SEARCH_FIELDS
     ordering_fields = [
         'payment_date', 
         'amount', 
@@ -100,8 +99,8 @@ class TicketViewSet(viewsets.ModelViewSet):
         filters = {}
         pagination = {}
         
-        # Extraer filtros de query params
-        for field in ['status', 'payment_method', 'appointment']:
+        # Extraer filtros de query params (list_all no pasa por filter_backends)
+        for field in ['status', 'payment_method', 'appointment', 'search']:
             value = request.query_params.get(field)
             if value:
                 filters[field] = value
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ArchitectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'architect'
\ No newline at end of file
+    name = 'architect'
+
+    def ready(self):
+        # Índice de búsqueda global (search_entries)
+        from . import signals  # noqa: F401
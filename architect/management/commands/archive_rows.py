@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from architect.utils.archive import DEFAULT_BATCH_SIZE, POLICIES, Archiver
+
+
+class Command(BaseCommand):
+    help = (
+        "Move soft-deleted rows, and appointments (with their tickets) older than the archive horizon, "
+        "to the *_archive tables in batched transactions. Rows still referenced by other data stay. "
+        "Restore endpoints and reports read the archive transparently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            choices=[policy.label for policy in POLICIES],
+            help="Model to archive (repeatable). Default: all.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Archive appointments older than this many days (default: settings.ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows moved per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be archived.")
+
+    def _progress(self, label, archived):
+        self.stdout.write(f"  {label}: {archived} archived")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        archiver = Archiver(
+            days=options["days"],
+            batch_size=max(options["batch_size"], 1),
+            dry_run=options["dry_run"],
+            progress=self._progress,
+        )
+        self.stdout.write(self.style.NOTICE(f"Archive horizon: {archiver.cutoff:%Y-%m-%d}"))
+        totals = archiver.run(options["models"])
+
+        verb = "would be archived" if options["dry_run"] else "archived"
+        for label, count in totals.items():
+            self.stdout.write(f"{label}: {count} {verb}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {sum(totals.values())} rows {verb} ({time.perf_counter() - started:.2f}s)"
+        ))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from architect.utils.global_search import PROVIDERS, GlobalSearchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the global search index (search_entries) for patients, therapists, appointments and tickets. "
+        "Needed once after the migration and after bulk imports or queryset.update() calls, which bypass signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            action="append",
+            dest="types",
+            choices=sorted(PROVIDERS),
+            help="Entity type to rebuild (repeatable). Default: all.",
+        )
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Entities reindexed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        types = options.get("types") or list(PROVIDERS)
+        tenant_id = options.get("tenant")
+        batch_size = max(options.get("batch_size") or 1000, 1)
+
+        service = GlobalSearchService()
+        for entity_type in types:
+            # Todas las filas (también inactivas): así se eliminan las entradas que ya no aplican
+            qs = PROVIDERS[entity_type].model._base_manager.order_by("id")
+            if tenant_id is not None:
+                qs = qs.filter(reflexo_id=tenant_id)
+
+            scanned = written = 0
+            batch = []
+            for pk in qs.values_list("id", flat=True).iterator(chunk_size=batch_size):
+                batch.append(pk)
+                if len(batch) >= batch_size:
+                    written += service.reindex(entity_type, batch)
+                    scanned += len(batch)
+                    batch = []
+                    self.stdout.write(self.style.NOTICE(f"{entity_type}: {scanned} reindexed..."))
+            if batch:
+                written += service.reindex(entity_type, batch)
+                scanned += len(batch)
+            self.stdout.write(self.style.SUCCESS(f"{entity_type}: scanned {scanned}, entries written {written}."))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from architect.utils.search import create_fulltext_index, drop_fulltext_index
+
+FULLTEXT_INDEX = 'ft_search_entries_document'
+
+
+def add_fulltext_index(apps, schema_editor):
+    create_fulltext_index(schema_editor, 'search_entries', FULLTEXT_INDEX, ['document'])
+
+
+def remove_fulltext_index(apps, schema_editor):
+    drop_fulltext_index(schema_editor, 'search_entries', FULLTEXT_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('architect', '0003_tokenblocklist'),
+        ('reflexo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('patient', 'Paciente'), ('therapist', 'Terapeuta'), ('appointment', 'Cita'), ('ticket', 'Ticket')], max_length=20, verbose_name='Tipo')),
+                ('entity_id', models.BigIntegerField(verbose_name='ID de la entidad')),
+                ('document', models.TextField(verbose_name='Texto de búsqueda')),
+                ('display', models.CharField(max_length=255, verbose_name='Texto a mostrar')),
+                ('subtitle', models.CharField(blank=True, default='', max_length=255, verbose_name='Detalle')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('reflexo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+            ],
+            options={
+                'verbose_name': 'Entrada de búsqueda',
+                'verbose_name_plural': 'Entradas de búsqueda',
+                'db_table': 'search_entries',
+                'indexes': [models.Index(fields=['reflexo', 'entity_type'], name='idx_search_entry_reflexo_type')],
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='uniq_search_entry_entity')],
+            },
+        ),
+        # Se llena con: python manage.py rebuild_search_index
+        migrations.RunPython(add_fulltext_index, remove_fulltext_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('architect', '0004_search_entries'),
+        ('reflexo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.CharField(max_length=100, verbose_name='Tarea')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('completed_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de finalización')),
+                ('reflexo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+            ],
+            options={
+                'verbose_name': 'Checkpoint de mantenimiento',
+                'verbose_name_plural': 'Checkpoints de mantenimiento',
+                'db_table': 'maintenance_checkpoints',
+                'constraints': [models.UniqueConstraint(fields=('job', 'reflexo'), name='uniq_maintenance_checkpoint_job_reflexo')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('architect', '0005_maintenance_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancecheckpoint',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', max_length=128, verbose_name='Huella del contenido'),
+        ),
+    ]
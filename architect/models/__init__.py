@@ -2,6 +2,8 @@ from .permission import Permission, Role
 from .base import BaseModel
 from .role_has_permission import RoleHasPermission
 from .token_blocklist import TokenBlocklist
+from .search_entry import SearchEntry
+from .maintenance_checkpoint import MaintenanceCheckpoint
 from users_profiles.models.user import User
 
-__all__ = ['Permission', 'Role', 'BaseModel', 'RoleHasPermission', 'TokenBlocklist', 'User']
\ No newline at end of file
+__all__ = ['Permission', 'Role', 'BaseModel', 'RoleHasPermission', 'TokenBlocklist', 'SearchEntry', 'MaintenanceCheckpoint', 'User']
\ No newline at end of file
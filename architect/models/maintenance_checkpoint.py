@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class MaintenanceCheckpoint(models.Model):
+    """
+    Avance de tareas de mantenimiento que recorren las empresas una por una
+    (p. ej. renumeración de local_id). Una fila por (tarea, empresa) ya
+    terminada: con --resume se omiten y la tarea continúa donde quedó.
+    Las importaciones de catálogos globales (reflexo nulo) guardan en
+    fingerprint el hash del último archivo aplicado.
+    """
+
+    job = models.CharField(max_length=100, verbose_name="Tarea")
+    #Multitenant
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    processed = models.PositiveIntegerField(default=0, verbose_name="Filas procesadas")
+    fingerprint = models.CharField(max_length=128, blank=True, default="", verbose_name="Huella del contenido")
+    completed_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de finalización")
+
+    class Meta:
+        db_table = 'maintenance_checkpoints'
+        verbose_name = 'Checkpoint de mantenimiento'
+        verbose_name_plural = 'Checkpoints de mantenimiento'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'reflexo'], name='uniq_maintenance_checkpoint_job_reflexo'),
+        ]
+
+    def __str__(self):
+        return f"{self.job} (empresa {self.reflexo_id})"
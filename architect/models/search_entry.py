@@ -0,0 +1,50 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Índice de búsqueda global: una fila por paciente, terapeuta, cita o ticket
+    con sus palabras normalizadas y el texto que se muestra en los resultados.
+    Se mantiene con señales (architect/signals.py) y con rebuild_search_index.
+    """
+
+    TYPE_PATIENT = 'patient'
+    TYPE_THERAPIST = 'therapist'
+    TYPE_APPOINTMENT = 'appointment'
+    TYPE_TICKET = 'ticket'
+    TYPE_CHOICES = [
+        (TYPE_PATIENT, 'Paciente'),
+        (TYPE_THERAPIST, 'Terapeuta'),
+        (TYPE_APPOINTMENT, 'Cita'),
+        (TYPE_TICKET, 'Ticket'),
+    ]
+
+    #Multitenant
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    entity_type = models.CharField(max_length=20, choices=TYPE_CHOICES, verbose_name="Tipo")
+    entity_id = models.BigIntegerField(verbose_name="ID de la entidad")
+    # Palabras normalizadas (architect.utils.text.search_document); FULLTEXT en MySQL
+    document = models.TextField(verbose_name="Texto de búsqueda")
+    display = models.CharField(max_length=255, verbose_name="Texto a mostrar")
+    subtitle = models.CharField(max_length=255, blank=True, default='', verbose_name="Detalle")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    class Meta:
+        db_table = 'search_entries'
+        verbose_name = 'Entrada de búsqueda'
+        verbose_name_plural = 'Entradas de búsqueda'
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='uniq_search_entry_entity'),
+        ]
+        indexes = [
+            models.Index(fields=['reflexo', 'entity_type'], name='idx_search_entry_reflexo_type'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.entity_id} {self.display}"
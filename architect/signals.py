@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .utils.global_search import GlobalSearchService
+
+
+@receiver(post_save, sender='patients_diagnoses.Patient')
+@receiver(post_save, sender='therapists.Therapist')
+@receiver(post_save, sender='appointments_status.Appointment')
+@receiver(post_save, sender='appointments_status.Ticket')
+def update_search_entry(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Mantiene search_entries al crear/editar/eliminar (soft) pacientes, terapeutas, citas y tickets.
+    Los bulk_create/update() no disparan señales: usar rebuild_search_index.
+    """
+    if raw:
+        return
+    provider = GlobalSearchService.provider_for_model(sender)
+    if update_fields is not None and not provider.fields.intersection(update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: GlobalSearchService().reindex_with_dependents(provider.entity_type, [pk]))
+
+
+@receiver(post_delete, sender='patients_diagnoses.Patient')
+@receiver(post_delete, sender='therapists.Therapist')
+@receiver(post_delete, sender='appointments_status.Appointment')
+@receiver(post_delete, sender='appointments_status.Ticket')
+def remove_search_entry(sender, instance, **kwargs):
+    provider = GlobalSearchService.provider_for_model(sender)
+    pk = instance.pk
+    transaction.on_commit(lambda: GlobalSearchService().remove(provider.entity_type, [pk]))
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task(bind=True)
+def archive_rows_job(self, days=None):
+    """Archivado periódico de filas eliminadas y citas antiguas (ver architect/utils/archive.py)."""
+    from architect.utils.archive import Archiver
+
+    return Archiver(days=days).run()
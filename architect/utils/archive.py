@@ -0,0 +1,344 @@
+# architect/utils/archive.py
+"""
+Cold storage for soft-deleted and aged rows.
+
+Every archivable model gets a mirror ``<Model>Archive`` table built with
+:func:`archive_model` (same columns, same primary keys, no unique keys and no
+FK constraints) plus an ``archived_at`` column. :class:`Archiver` moves rows
+there in small transactional batches; :func:`unarchive` moves them back
+(:func:`unarchive_one` for the restore endpoints) and :func:`with_archive`
+lets reports read both tables in a single ``UNION ALL``.
+
+Rules that keep joins valid on both sides:
+
+- Followers move with their parent: a ticket is archived/restored together
+  with its appointment, so ``TicketArchive.appointment`` points at
+  ``AppointmentArchive``.
+- Any other row is archived only when nothing (hot or archived) references
+  it anymore, apart from derived rows (search tokens, duplicate candidates)
+  which are deleted with it. Archived appointments keep joining their
+  patient/therapist in the hot tables.
+"""
+from dataclasses import dataclass, field as dc_field
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, Max, OuterRef, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 730
+DEFAULT_BATCH_SIZE = 500
+
+# source label -> archive model (filled by archive_model() as apps load)
+ARCHIVES: Dict[str, type] = {}
+
+# Rows rebuilt from their parent: deleted together with it instead of blocking it
+DERIVED_MODELS = {
+    "patients_diagnoses.PatientSearchToken",
+    "patients_diagnoses.PatientDuplicateCandidate",
+}
+
+_DROPPED_OPTIONS = ("unique", "auto_now", "auto_now_add", "primary_key", "auto_created")
+_PK_FIELDS = {
+    "django.db.models.AutoField": models.IntegerField,
+    "django.db.models.BigAutoField": models.BigIntegerField,
+    "django.db.models.SmallAutoField": models.SmallIntegerField,
+}
+
+
+def archive_model(source, module: str, links: Dict[str, str] = None, indexes: Iterable[Iterable[str]] = ()):
+    """
+    Builds the mirror archive model of ``source``, declared in ``module`` (the
+    caller's ``__name__``, inside the app's models package).
+
+    ``links`` maps FK names to the archive model they must point at instead
+    (followers); every other FK keeps its hot target. ``indexes`` adds
+    (non-unique) indexes for the columns reports filter on.
+    """
+    links = links or {}
+    meta = source._meta
+    attrs = {"__module__": module}
+    for f in meta.concrete_fields:
+        if f.is_relation:
+            # Built by hand: ForeignKey.deconstruct() needs the app registry ready
+            target = f.remote_field.model
+            if not isinstance(target, str):
+                target = target._meta.label
+            elif "." not in target:
+                target = f"{meta.app_label}.{target}"
+            attrs[f.name] = models.ForeignKey(
+                links.get(f.name, target),
+                on_delete=models.DO_NOTHING,
+                db_constraint=False,
+                related_name="+",
+                null=f.null,
+                blank=f.blank,
+                db_column=f.db_column,
+                verbose_name=f.verbose_name,
+            )
+            continue
+        name, path, args, kwargs = f.deconstruct()
+        for option in _DROPPED_OPTIONS:
+            kwargs.pop(option, None)
+        if f.primary_key:
+            attrs[name] = _PK_FIELDS.get(path, import_string(path))(primary_key=True, **kwargs)
+        else:
+            attrs[name] = import_string(path)(*args, **kwargs)
+    attrs["archived_at"] = models.DateTimeField(db_index=True, verbose_name="Fecha de archivo")
+    attrs["Meta"] = type("Meta", (), {
+        "db_table": f"{meta.db_table}_archive",
+        "verbose_name": f"{meta.verbose_name} (archivo)",
+        "verbose_name_plural": f"{meta.verbose_name_plural} (archivo)",
+        "indexes": [models.Index(fields=list(columns)) for columns in indexes],
+    })
+    model = type(f"{source.__name__}Archive", (models.Model,), attrs)
+    ARCHIVES[meta.label] = model
+    return model
+
+
+def archive_of(model) -> Optional[type]:
+    return ARCHIVES.get(model._meta.label)
+
+
+def source_of(archive) -> Optional[type]:
+    """Hot model of an archive model (None for any other model)."""
+    for label, model in ARCHIVES.items():
+        if model is archive:
+            return apps.get_model(label)
+    return None
+
+
+def max_with_archive(model, field: str, queryset=None, **filters) -> int:
+    """
+    Highest ``field`` (pk, local_id) among the rows matching ``filters`` in
+    the hot table and in its archive; ``model`` may be either of the pair.
+    Archived rows keep their pk and local_id and come back with them, so new
+    values must be allocated above both. ``queryset`` replaces the hot
+    table's manager (e.g. ``select_for_update()``; its database is used for
+    the archive too).
+    """
+    hot = source_of(model) or model
+    queryset = queryset if queryset is not None else hot._base_manager.all()
+    top = queryset.filter(**filters).aggregate(m=Max(field))["m"] or 0
+    archive = archive_of(hot)
+    if archive is not None:
+        archived = archive._base_manager.using(queryset.db).filter(**filters).aggregate(m=Max(field))["m"]
+        top = max(top, archived or 0)
+    return top
+
+
+def with_archive(build: Callable, model):
+    """
+    ``build(model)`` UNION ALL ``build(<model>Archive)``: both querysets must
+    select the same ``values()`` columns. Order the result on the union.
+    """
+    queryset = build(model).order_by()
+    archive = archive_of(model)
+    if archive is None:
+        return queryset
+    return queryset.union(build(archive).order_by(), all=True)
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    label: str
+    # DateTime/Date column: rows older than the horizon are archived even if active
+    aged_field: Optional[str] = None
+    # (label, fk name) of rows that move together with this model
+    followers: Tuple[Tuple[str, str], ...] = dc_field(default_factory=tuple)
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+
+# Children before parents: a parent is only archivable once its children left
+POLICIES = (
+    ArchivePolicy("appointments_status.Appointment", aged_field="appointment_date",
+                  followers=(("appointments_status.Ticket", "appointment"),)),
+    ArchivePolicy("patients_diagnoses.MedicalRecord"),
+    ArchivePolicy("histories_configurations.History"),
+    ArchivePolicy("patients_diagnoses.Patient"),
+    ArchivePolicy("therapists.Therapist"),
+    ArchivePolicy("histories_configurations.PredeterminedPrice"),
+    ArchivePolicy("patients_diagnoses.Diagnosis"),
+)
+FOLLOWS = {follower: (policy.label, fk) for policy in POLICIES for follower, fk in policy.followers}
+
+
+def _copy_rows(model, target, queryset, archived_at=None) -> int:
+    """
+    Copies the ``model`` columns of ``queryset`` rows (same pk) into ``target``:
+    the archive table when ``archived_at`` is given, else back to the hot table.
+    """
+    # Columnas generadas (appointment_day, payment_day): las calcula la base de datos
+    columns = [f.attname for f in model._meta.concrete_fields if not f.generated]
+    extra = {"archived_at": archived_at} if archived_at else {}
+    objs = [target(**row, **extra) for row in queryset.values(*columns)]
+    if not objs:
+        return 0
+    if archived_at:
+        target._base_manager.bulk_create(objs)
+    else:
+        # Raw INSERT: keeps created_at/updated_at as they were archived
+        fields = [f for f in target._meta.concrete_fields if not f.generated]
+        target._base_manager._insert(objs, fields=fields, raw=True)
+    return len(objs)
+
+
+class Archiver:
+    """
+    Moves soft-deleted rows, and rows whose ``aged_field`` is older than the
+    horizon (``ARCHIVE_AFTER_DAYS``), into the archive tables. Each batch is
+    its own transaction, so an interrupted run just resumes on the next one.
+    """
+
+    def __init__(self, days: int = None, batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False,
+                 progress: Callable = None, cutoff=None):
+        days = days if days is not None else getattr(settings, "ARCHIVE_AFTER_DAYS", DEFAULT_ARCHIVE_AFTER_DAYS)
+        # cutoff explícito (p. ej. el límite de una partición) en lugar de "hace N días"
+        self.cutoff = cutoff or timezone.now() - timedelta(days=days)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        # progress(label, archived_so_far)
+        self.progress = progress
+
+    def candidates(self, policy: ArchivePolicy):
+        """Archivable rows of ``policy.model``: eligible and not referenced by anything left behind."""
+        model = policy.model
+        condition = Q(deleted_at__isnull=False)
+        if policy.aged_field:
+            condition |= Q(**{f"{policy.aged_field}__lt": self.cutoff})
+        queryset = model._base_manager.filter(condition)
+
+        followers = {label for label, _ in policy.followers}
+        for rel in model._meta.get_fields(include_hidden=True):
+            if not (rel.auto_created and not rel.concrete and (rel.one_to_many or rel.one_to_one)):
+                continue
+            label = rel.related_model._meta.label
+            if label in followers or label in DERIVED_MODELS:
+                continue
+            referencing = rel.related_model._base_manager.filter(**{rel.field.attname: OuterRef("pk")})
+            queryset = queryset.filter(~Exists(referencing))
+        return queryset.order_by("pk")
+
+    def run(self, labels: Iterable[str] = None) -> Dict[str, int]:
+        """Archives every policy (or only ``labels``). Returns archived rows per model (followers included)."""
+        totals = {}
+        for policy in POLICIES:
+            if labels and policy.label not in labels:
+                continue
+            if self.dry_run:
+                totals[policy.label] = self.candidates(policy).count()
+                continue
+            totals.update(self._archive_policy(policy))
+        return totals
+
+    def _archive_policy(self, policy: ArchivePolicy) -> Dict[str, int]:
+        model, archive = policy.model, archive_of(policy.model)
+        counts = {policy.label: 0, **{label: 0 for label, _ in policy.followers}}
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    self.candidates(policy).filter(pk__gt=last_pk)
+                    .select_for_update().values_list("pk", flat=True)[:self.batch_size]
+                )
+                if not ids:
+                    break
+                now = timezone.now()
+                for label, fk in policy.followers:
+                    follower = apps.get_model(label)
+                    counts[label] += _copy_rows(
+                        follower, archive_of(follower), follower._base_manager.filter(**{f"{fk}__in": ids}), now,
+                    )
+                counts[policy.label] += _copy_rows(model, archive, model._base_manager.filter(pk__in=ids), now)
+                # delete() (not _raw_delete): cascades to followers and derived rows and fires
+                # post_delete, which drops the search entries
+                model._base_manager.filter(pk__in=ids).delete()
+            last_pk = ids[-1]
+            if self.progress is not None:
+                self.progress(policy.label, counts[policy.label])
+        return counts
+
+
+def unarchive(model, ids: Iterable[int]) -> int:
+    """
+    Moves archived rows of ``model`` (and their followers) back to the hot
+    table; ids that are not archived are ignored. A follower brings its
+    parent back. Raises ValueError if a unique value was reused meanwhile.
+    Returns the number of ``model`` rows restored.
+    """
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    archive = archive_of(model)
+    ids = list(ids)
+    if archive is None or not ids:
+        return 0
+
+    label = model._meta.label
+    if label in FOLLOWS:
+        parent_label, fk = FOLLOWS[label]
+        parent_ids = archive._base_manager.filter(pk__in=ids).values_list(f"{fk}_id", flat=True).distinct()
+        unarchive(parent_label, list(parent_ids))
+        return model._base_manager.filter(pk__in=ids).count()
+
+    policy = next(p for p in POLICIES if p.label == label)
+    restored = {}
+    try:
+        with transaction.atomic():
+            restored[label] = list(archive._base_manager.filter(pk__in=ids).values_list("pk", flat=True))
+            if not restored[label]:
+                return 0
+            _copy_rows(model, model, archive._base_manager.filter(pk__in=restored[label]))
+            for follower_label, fk in policy.followers:
+                follower = apps.get_model(follower_label)
+                rows = archive_of(follower)._base_manager.filter(**{f"{fk}__in": restored[label]})
+                restored[follower_label] = list(rows.values_list("pk", flat=True))
+                _copy_rows(follower, follower, rows)
+                rows.delete()
+            archive._base_manager.filter(pk__in=restored[label]).delete()
+    except IntegrityError as e:
+        raise ValueError(f"No se puede restaurar {label} {ids}: {e}")
+
+    _reindex(restored)
+    return len(restored[label])
+
+
+def unarchive_one(model, pk, scope: Optional[Callable] = None) -> bool:
+    """
+    Restore endpoints: moves one row back only after finding it in the
+    archive table through ``scope`` (e.g. the request's tenant filter), so a
+    row the caller cannot see is never touched. Returns False if it is not
+    archived or not visible; raises ValueError like :func:`unarchive`.
+    """
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    archive = archive_of(model)
+    if archive is None:
+        return False
+    rows = archive._base_manager.filter(pk=pk)
+    if scope is not None:
+        rows = scope(rows)
+    if not rows.exists():
+        return False
+    return unarchive(model, [pk]) > 0
+
+
+def _reindex(restored: Dict[str, List[int]]) -> None:
+    """Raw inserts skip signals: refresh the search indexes of the restored rows."""
+    from architect.utils.global_search import GlobalSearchService
+
+    service = GlobalSearchService()
+    for label, ids in restored.items():
+        provider = GlobalSearchService.provider_for_model(apps.get_model(label))
+        if provider is not None and ids:
+            service.reindex_with_dependents(provider.entity_type, ids)
+    if restored.get("patients_diagnoses.Patient"):
+        from patients_diagnoses.services.patient_search_service import PatientSearchService
+
+        PatientSearchService().reindex(restored["patients_diagnoses.Patient"])
@@ -0,0 +1,41 @@
+# architect/utils/cache_version.py
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = "catalog-version"
+
+
+def _key(name: str) -> str:
+    return f"{KEY_PREFIX}:{name}"
+
+
+def get_version(name: str) -> int:
+    """
+    Current version of a shared catalog (diagnoses, ubigeo...).
+
+    Process-local caches compare it with the version they were built from
+    and rebuild when it changed. It lives in the Django cache, so with Redis
+    it is shared by every worker. With LocMemCache (no REDIS_URL) each
+    process has its own version.
+    """
+    version = cache.get(_key(name))
+    if version is None:
+        # Initial value based on time: after a cache flush no stale copy can match it
+        cache.add(_key(name), time.time_ns(), timeout=None)
+        version = cache.get(_key(name))
+    return version
+
+
+def bump_version(name: str) -> None:
+    """Invalidates every process-local copy of the catalog."""
+    try:
+        cache.incr(_key(name))
+    except ValueError:
+        cache.set(_key(name), time.time_ns(), timeout=None)
+
+
+def bump_version_on_commit(name: str) -> None:
+    """Bumps after the current transaction commits, so other processes rebuild from committed data."""
+    transaction.on_commit(lambda: bump_version(name))
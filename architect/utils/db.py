@@ -0,0 +1,80 @@
+# architect/utils/db.py
+from typing import Iterator, List, Sequence
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, router
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def stream_values(qs, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yields the rows of a ``.values(...)`` queryset as dicts without buffering
+    the whole result set in memory.
+
+    - PostgreSQL/Oracle/SQLite: Django's ``iterator(chunk_size)`` already uses
+      server-side cursors (or chunked fetches), so we delegate to it.
+    - MySQL: the MySQLdb/PyMySQL default cursor buffers every row client-side
+      even with ``iterator()``; here we run the compiled SQL on an unbuffered
+      ``SSCursor`` and apply Django's converters ourselves, so values come out
+      exactly as ``.values()`` would return them (aware datetimes, Decimals...).
+
+    While the generator is alive the connection is busy with the unbuffered
+    result: consume it fully (or close it) before issuing other queries.
+    """
+    connection = connections[qs.db]
+    if connection.vendor != 'mysql':
+        yield from qs.iterator(chunk_size=chunk_size)
+        return
+
+    query = qs.query
+    names = [*query.extra_select, *query.values_select, *query.annotation_select]
+    compiler = query.get_compiler(using=qs.db)
+    try:
+        sql, params = compiler.as_sql()
+    except EmptyResultSet:
+        return
+    fields = [s[0] for s in compiler.select[0:compiler.col_count]]
+    converters = compiler.get_converters(fields)
+
+    import pymysql  # driver real detrás del shim MySQLdb (settings/__init__.py)
+
+    connection.ensure_connection()
+    cursor = connection.connection.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            if converters:
+                rows = compiler.apply_converters(rows, converters)
+            for row in rows:
+                yield dict(zip(names, row))
+    finally:
+        cursor.close()
+
+
+def bulk_upsert(
+    model,
+    objs: List,
+    unique_fields: Sequence[str],
+    update_fields: Sequence[str],
+    batch_size: int = DEFAULT_CHUNK_SIZE,
+    using: str = None,
+) -> List:
+    """
+    Batched INSERT ... ON CONFLICT DO UPDATE (PostgreSQL/SQLite) or
+    INSERT ... ON DUPLICATE KEY UPDATE (MySQL) through ``bulk_create``.
+
+    MySQL does not accept a conflict target: any unique key of the table
+    triggers the update, so ``unique_fields`` is only passed to backends that
+    support it. Primary keys of the returned objects are not set on every
+    backend; re-read them by the unique fields when needed.
+    """
+    if not objs:
+        return []
+    using = using or router.db_for_write(model)
+    options = {"update_conflicts": True, "update_fields": list(update_fields)}
+    if connections[using].features.supports_update_conflicts_with_target:
+        options["unique_fields"] = list(unique_fields)
+    return model._base_manager.using(using).bulk_create(objs, batch_size=batch_size, **options)
@@ -0,0 +1,54 @@
+# architect/utils/duplicates.py
+from typing import List, Optional
+
+from django.db.models import Q, QuerySet
+
+# Tipo de coincidencia -> puntaje (mayor es más probable que sea la misma persona)
+MATCH_SCORES = {
+    "document": 1.0,
+    "exact": 0.9,
+    "phonetic": 0.75,
+}
+
+
+def find_duplicate_candidates(
+    qs: QuerySet,
+    name_key: str,
+    phonetic_key: str,
+    document_number: Optional[str] = None,
+    exclude_id: Optional[int] = None,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    Candidate duplicates of a person (Patient/Therapist) by blocking on the
+    persisted keys: only rows sharing name_key, phonetic_key or document are
+    read, through the (reflexo, key) indexes, never the whole tenant.
+
+    ``qs`` must already be tenant-filtered. Returns dicts
+    ``{"object", "match", "score"}`` sorted by score.
+    """
+    condition = Q()
+    if name_key:
+        condition |= Q(name_key=name_key)
+    if phonetic_key:
+        condition |= Q(phonetic_key=phonetic_key)
+    if document_number:
+        condition |= Q(document_number=document_number)
+    if not condition:
+        return []
+
+    qs = qs.filter(condition)
+    if exclude_id is not None:
+        qs = qs.exclude(pk=exclude_id)
+
+    candidates = []
+    for obj in qs[:limit]:
+        if document_number and obj.document_number == document_number:
+            match = "document"
+        elif name_key and obj.name_key == name_key:
+            match = "exact"
+        else:
+            match = "phonetic"
+        candidates.append({"object": obj, "match": match, "score": MATCH_SCORES[match]})
+    candidates.sort(key=lambda c: (-c["score"], c["object"].pk))
+    return candidates
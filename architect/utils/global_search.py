@@ -0,0 +1,225 @@
+# architect/utils/global_search.py
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from architect.models.search_entry import SearchEntry
+from .search import search_queryset
+from .tenant import filter_by_tenant
+from .text import normalize_text, search_document
+
+# Resultados por tipo de entidad (por defecto y máximo)
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 20
+# Búsquedas más cortas (normalizadas) no consultan el índice
+MIN_QUERY_LENGTH = 2
+
+
+def _join(*parts) -> str:
+    return " ".join(str(p) for p in parts if p)
+
+
+class SearchProvider(ABC):
+    """How a model is indexed in search_entries (one subclass per entity type)."""
+
+    entity_type: str = ""
+    model_label: str = ""
+    # Campos cuyo cambio (update_fields) obliga a reindexar la entidad
+    fields: frozenset = frozenset()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @abstractmethod
+    def queryset(self):
+        """Active rows (rows missing from here are removed from the index)."""
+
+    @abstractmethod
+    def build(self, obj):
+        """(values to index, display text, subtitle)."""
+
+    def dependents(self, ids: Sequence[int]) -> Dict[str, Iterable[int]]:
+        """Entities of other types whose indexed text includes data from these."""
+        return {}
+
+
+class PatientSearchProvider(SearchProvider):
+    entity_type = SearchEntry.TYPE_PATIENT
+    model_label = "patients_diagnoses.Patient"
+    fields = frozenset({
+        "document_number", "name", "paternal_lastname", "maternal_lastname",
+        "phone1", "email", "reflexo", "deleted_at",
+    })
+
+    def queryset(self):
+        return self.model.objects.all()
+
+    def build(self, p):
+        values = (p.document_number, p.name, p.paternal_lastname, p.maternal_lastname, p.phone1, p.email)
+        return values, _join(p.paternal_lastname, p.maternal_lastname, p.name), p.document_number or ""
+
+    def dependents(self, ids):
+        Appointment = apps.get_model("appointments_status.Appointment")
+        Ticket = apps.get_model("appointments_status.Ticket")
+        return {
+            SearchEntry.TYPE_APPOINTMENT: Appointment.objects.filter(patient_id__in=ids).values_list("id", flat=True),
+            SearchEntry.TYPE_TICKET: Ticket.objects.filter(appointment__patient_id__in=ids).values_list("id", flat=True),
+        }
+
+
+class TherapistSearchProvider(SearchProvider):
+    entity_type = SearchEntry.TYPE_THERAPIST
+    model_label = "therapists.Therapist"
+    fields = frozenset({
+        "document_number", "first_name", "last_name_paternal", "last_name_maternal",
+        "phone", "email", "reflexo", "deleted_at",
+    })
+
+    def queryset(self):
+        return self.model.objects.filter(deleted_at__isnull=True)
+
+    def build(self, t):
+        values = (t.document_number, t.first_name, t.last_name_paternal, t.last_name_maternal, t.phone, t.email)
+        return values, _join(t.first_name, t.last_name_paternal, t.last_name_maternal), t.document_number or ""
+
+
+class AppointmentSearchProvider(SearchProvider):
+    entity_type = SearchEntry.TYPE_APPOINTMENT
+    model_label = "appointments_status.Appointment"
+    fields = frozenset({
+        "patient", "patient_id", "appointment_date", "hour", "ticket_number", "local_id", "reflexo", "deleted_at",
+    })
+
+    def queryset(self):
+        return self.model.objects.filter(deleted_at__isnull=True).select_related("patient")
+
+    def build(self, a):
+        p = a.patient
+        date = a.appointment_date.date().isoformat() if a.appointment_date else ""
+        values = (a.ticket_number, p.document_number, p.name, p.paternal_lastname, p.maternal_lastname, date)
+        display = _join(f"Cita {a.local_id or a.id}", "-", p.paternal_lastname, p.maternal_lastname, p.name)
+        hour = a.hour.strftime("%H:%M") if a.hour else ""
+        return values, display, _join(date, hour, a.ticket_number)
+
+    def dependents(self, ids):
+        Ticket = apps.get_model("appointments_status.Ticket")
+        return {SearchEntry.TYPE_TICKET: Ticket.objects.filter(appointment_id__in=ids).values_list("id", flat=True)}
+
+
+class TicketSearchProvider(SearchProvider):
+    entity_type = SearchEntry.TYPE_TICKET
+    model_label = "appointments_status.Ticket"
+    fields = frozenset({
+        "ticket_number", "appointment", "appointment_id", "amount", "status", "is_active", "reflexo",
+    })
+
+    def queryset(self):
+        return self.model.objects.filter(is_active=True).select_related("appointment__patient")
+
+    def build(self, t):
+        p = t.appointment.patient
+        values = (t.ticket_number, p.document_number, p.name, p.paternal_lastname, p.maternal_lastname)
+        subtitle = _join(p.paternal_lastname, p.maternal_lastname, p.name, "-", t.amount, t.get_status_display())
+        return values, f"Ticket {t.ticket_number}", subtitle
+
+
+PROVIDERS: Dict[str, SearchProvider] = {
+    provider.entity_type: provider
+    for provider in (
+        PatientSearchProvider(), TherapistSearchProvider(), AppointmentSearchProvider(), TicketSearchProvider(),
+    )
+}
+
+
+class GlobalSearchService:
+    """
+    Unified search over search_entries: patients, therapists, appointments
+    and tickets in one indexed query (FULLTEXT on MySQL), with a per-type
+    result limit.
+    """
+
+    @staticmethod
+    def provider_for_model(model) -> Optional[SearchProvider]:
+        label = model._meta.label
+        return next((p for p in PROVIDERS.values() if p.model_label == label), None)
+
+    # ---------- índice ----------
+    @staticmethod
+    def _entry(provider: SearchProvider, obj) -> SearchEntry:
+        values, display, subtitle = provider.build(obj)
+        return SearchEntry(
+            reflexo_id=obj.reflexo_id,
+            entity_type=provider.entity_type,
+            entity_id=obj.pk,
+            document=search_document(*values),
+            display=display[:255],
+            subtitle=subtitle[:255],
+        )
+
+    @transaction.atomic
+    def reindex(self, entity_type: str, ids: Iterable[int]) -> int:
+        """Rebuilds the entries of those entities (inactive or deleted ones leave the index)."""
+        ids = list(ids)
+        if not ids:
+            return 0
+        provider = PROVIDERS[entity_type]
+        rows = [self._entry(provider, obj) for obj in provider.queryset().filter(pk__in=ids)]
+        SearchEntry.objects.filter(entity_type=entity_type, entity_id__in=ids).delete()
+        SearchEntry.objects.bulk_create(rows)
+        return len(rows)
+
+    def reindex_with_dependents(self, entity_type: str, ids: Iterable[int]) -> int:
+        ids = list(ids)
+        written = self.reindex(entity_type, ids)
+        for dependent_type, dependent_ids in PROVIDERS[entity_type].dependents(ids).items():
+            written += self.reindex(dependent_type, dependent_ids)
+        return written
+
+    def remove(self, entity_type: str, ids: Iterable[int]) -> None:
+        SearchEntry.objects.filter(entity_type=entity_type, entity_id__in=list(ids)).delete()
+
+    # ---------- búsqueda ----------
+    def search(
+        self,
+        term: Optional[str],
+        user=None,
+        types: Optional[Sequence[str]] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Dict[str, List[dict]]:
+        """
+        Up to ``limit`` results per entity type in a single query
+        (ROW_NUMBER() per type). With FULLTEXT the most relevant come first.
+        """
+        types = [t for t in (types or PROVIDERS) if t in PROVIDERS]
+        results = {t: [] for t in types}
+        if len(normalize_text(term)) < MIN_QUERY_LENGTH or not types:
+            return results
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        queryset = SearchEntry.objects.filter(entity_type__in=types)
+        if user is not None:
+            queryset = filter_by_tenant(queryset, user, field='reflexo')
+        queryset = search_queryset(queryset, term, document_field="document", fulltext_fields=("document",))
+
+        order = [F("updated_at").desc(), F("entity_id").desc()]
+        if "search_rank" in queryset.query.annotations:
+            order.insert(0, F("search_rank").desc())
+        rows = (
+            queryset
+            .annotate(position=Window(RowNumber(), partition_by=[F("entity_type")], order_by=order))
+            .filter(position__lte=limit)
+            .order_by("entity_type", "position")
+            .values("entity_type", "entity_id", "display", "subtitle")
+        )
+        for row in rows:
+            results[row["entity_type"]].append({
+                "id": row["entity_id"],
+                "display": row["display"],
+                "subtitle": row["subtitle"],
+            })
+        return results
@@ -0,0 +1,334 @@
+# architect/utils/partitions.py
+"""
+Monthly MySQL ``RANGE COLUMNS`` partitioning for the big date-windowed tables
+(today ``appointments`` on ``appointment_day``).
+
+Layout: ``p_min`` holds everything before the first month, one ``pYYYYMM``
+partition per month (``VALUES LESS THAN`` the first day of the next month)
+and ``p_future`` (``MAXVALUE``) catches the rest. ``add_future_partitions``
+splits ``p_future`` ahead of time so it stays empty and the split is instant;
+``drop_partitions`` removes old months (by default only empty ones, after
+the archiver moved their rows to the ``*_archive`` tables).
+
+MySQL restrictions handled by :func:`partition_by_month`:
+
+- The primary key and every unique key must include the partition column.
+  The PK becomes ``(id, <day>)``: ``id`` stays unique through
+  AUTO_INCREMENT only. A unique key without the column would have to be
+  widened to ``(..., <day>)``, which only enforces uniqueness within a day,
+  so conversion refuses such tables instead. That is why ``tickets`` is not
+  in :data:`PARTITIONED_TABLES`: ``uniq_ticket_number_per_reflexo`` must stay
+  unique per company, not per day. Its ``payment_day`` column and
+  ``(reflexo, payment_day)`` index still give reports the same index-friendly
+  day window (:func:`day_window`).
+- No FULLTEXT indexes: they are dropped and search falls back to LIKE
+  (see ``search_queryset`` / :func:`is_partitioned`).
+- No foreign keys from or to the table. The models keep their constraints;
+  conversion drops them in the database and :func:`remove_partitioning`
+  recreates them from the models. Meanwhile only the ORM enforces the
+  relations (``on_delete``), and migrations that alter those foreign keys
+  must run with the table unpartitioned.
+
+These helpers take a ``schema_editor`` like the FULLTEXT ones in
+``architect/utils/search.py``, so they can run from a ``RunPython`` migration
+or from the ``manage_partitions`` command. Other databases are a no-op.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+
+# table -> partition column (a stored generated DATE column on the model).
+# Only tables whose unique keys can all include the column: not tickets (see above)
+PARTITIONED_TABLES = {
+    "appointments": "appointment_day",
+}
+MIN_PARTITION = "p_min"
+FUTURE_PARTITION = "p_future"
+DEFAULT_AHEAD_MONTHS = 3
+PARTITION_CACHE_SECONDS = 600
+
+
+def _month(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    for _ in range(months):
+        value = _next_month(value)
+    return value
+
+
+def _partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def _partition_sql(quote, month: date) -> str:
+    return f"PARTITION {quote(_partition_name(month))} VALUES LESS THAN ('{_next_month(month).isoformat()}')"
+
+
+def _future_sql(quote) -> str:
+    return f"PARTITION {quote(FUTURE_PARTITION)} VALUES LESS THAN (MAXVALUE)"
+
+
+def archive_horizon_month(days: int = None) -> date:
+    """
+    First day of the month of the archive horizon (``ARCHIVE_AFTER_DAYS``):
+    partitions entirely before it only hold rows the archiver could not move.
+    """
+    from architect.utils.archive import DEFAULT_ARCHIVE_AFTER_DAYS
+
+    days = days if days is not None else getattr(settings, "ARCHIVE_AFTER_DAYS", DEFAULT_ARCHIVE_AFTER_DAYS)
+    return _month(date.today() - timedelta(days=days))
+
+
+def _utc_date(value) -> date:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt_timezone.utc)
+        return value.date()
+    return value
+
+
+def day_window(column: str, start, end) -> Q:
+    """
+    Coarse filter on a partition day column (UTC dates) covering the
+    ``[start, end)`` datetimes: it lets MySQL prune partitions. Keep the exact
+    datetime filter next to it.
+    """
+    return Q(**{f"{column}__gte": _utc_date(start), f"{column}__lte": _utc_date(end)})
+
+
+def partitions(connection, table: str) -> List[Tuple[str, Optional[str], int]]:
+    """``(name, upper bound, approximate rows)`` of each partition, in order; empty if not partitioned."""
+    if connection.vendor != "mysql":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION",
+            [table],
+        )
+        return [(name, bound.strip("'") if bound else bound, rows or 0) for name, bound, rows in cursor.fetchall()]
+
+
+def _cache_key(using: str, table: str) -> str:
+    return f"partitioned:{using}:{table}"
+
+
+def is_partitioned(using: str, table: str) -> bool:
+    """Whether ``table`` is partitioned (cached: checked on every search request)."""
+    connection = connections[using]
+    if connection.vendor != "mysql" or table not in PARTITIONED_TABLES:
+        return False
+    key = _cache_key(using, table)
+    value = cache.get(key)
+    if value is None:
+        value = bool(partitions(connection, table))
+        cache.set(key, value, PARTITION_CACHE_SECONDS)
+    return value
+
+
+def _forget(connection, table: str) -> None:
+    cache.delete(_cache_key(connection.alias, table))
+
+
+def _fulltext_indexes(connection, table: str) -> List[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT'",
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _foreign_keys(connection, table: str) -> List[str]:
+    """Foreign keys declared on ``table`` or pointing at it."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CONSTRAINT_NAME, TABLE_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+            "WHERE CONSTRAINT_SCHEMA = DATABASE() AND (TABLE_NAME = %s OR REFERENCED_TABLE_NAME = %s)",
+            [table, table],
+        )
+        return [f"{owner}.{name}" for name, owner in cursor.fetchall()]
+
+
+def _primary_key(connection, table: str) -> List[str]:
+    with connection.cursor() as cursor:
+        return connection.introspection.get_primary_key_columns(cursor, table)
+
+
+def _model_foreign_keys(table: str) -> List[tuple]:
+    """``(model, field)`` of the foreign keys with a database constraint declared on ``table`` or pointing at it."""
+    from django.apps import apps
+
+    keys = []
+    for model in apps.get_models():
+        opts = model._meta
+        if not opts.managed or opts.proxy:
+            continue
+        for field in opts.local_concrete_fields:
+            if field.is_relation and field.db_constraint and table in (opts.db_table, field.related_model._meta.db_table):
+                keys.append((model, field))
+    return keys
+
+
+def _restore_foreign_keys(schema_editor, table: str) -> List[str]:
+    """
+    Recreates (with Django's constraint names) the model foreign keys of
+    ``table`` that are missing, except those to or from another table that
+    is still partitioned. Returns ``owner.column`` of each one created.
+    """
+    connection = schema_editor.connection
+    created = []
+    for model, field in _model_foreign_keys(table):
+        owner, target = model._meta.db_table, field.related_model._meta.db_table
+        other = target if owner == table else owner
+        if other != table and partitions(connection, other):
+            continue
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, owner)
+        if any(info["foreign_key"] and info["columns"] == [field.column] for info in constraints.values()):
+            continue
+        schema_editor.execute(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s"))
+        created.append(f"{owner}.{field.column}")
+    return created
+
+
+def _unique_keys(connection, table: str) -> Dict[str, List[str]]:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return {
+        name: info["columns"]
+        for name, info in constraints.items()
+        if info["unique"] and not info["primary_key"] and not info["foreign_key"]
+    }
+
+
+def partition_by_month(schema_editor, table: str, column: str, ahead: int = DEFAULT_AHEAD_MONTHS) -> bool:
+    """
+    Converts ``table`` to monthly RANGE COLUMNS partitions on ``column`` in a
+    single ALTER (one table rebuild), after dropping the foreign keys from and
+    to it. Returns False if it already was; raises ValueError if a unique key
+    lacks ``column`` (partitioning would weaken it).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "mysql" or partitions(connection, table):
+        return False
+    weakened = [name for name, columns in _unique_keys(connection, table).items() if column not in columns]
+    if weakened:
+        raise ValueError(
+            f"{table}: las claves únicas {', '.join(weakened)} no incluyen {column}; "
+            f"particionar solo las haría cumplir dentro de cada día"
+        )
+
+    quote = schema_editor.quote_name
+    pk = _primary_key(connection, table)
+    alters = [f"DROP INDEX {quote(name)}" for name in _fulltext_indexes(connection, table)]
+    if column not in pk:
+        alters.append(f"DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(quote(c) for c in [*pk, column])})")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({quote(column)}) FROM {quote(table)}")
+        first = cursor.fetchone()[0]
+    current = _month(date.today())
+    month = _month(first) if first and first < current else current
+    last = _add_months(current, ahead)
+    definitions = [f"PARTITION {quote(MIN_PARTITION)} VALUES LESS THAN ('{month.isoformat()}')"]
+    while month <= last:
+        definitions.append(_partition_sql(quote, month))
+        month = _next_month(month)
+    definitions.append(_future_sql(quote))
+
+    for key in _foreign_keys(connection, table):
+        owner, name = key.split(".", 1)
+        schema_editor.execute(f"ALTER TABLE {quote(owner)} DROP FOREIGN KEY {quote(name)}")
+    alters = f"{', '.join(alters)} " if alters else ""
+    try:
+        schema_editor.execute(
+            f"ALTER TABLE {quote(table)} {alters}"
+            f"PARTITION BY RANGE COLUMNS({quote(column)}) ({', '.join(definitions)})"
+        )
+    except Exception:
+        # La tabla sigue sin particionar: devolverle sus claves foráneas
+        _restore_foreign_keys(schema_editor, table)
+        raise
+    _forget(connection, table)
+    return True
+
+
+def remove_partitioning(schema_editor, table: str, column: str) -> bool:
+    """
+    Reverse of :func:`partition_by_month`: back to a plain table with the
+    original primary key and the model foreign keys from and to it (except
+    those involving another table that is still partitioned). FULLTEXT
+    indexes are recreated by the caller (``create_fulltext_index``).
+    Returns False if it was not partitioned.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "mysql" or not partitions(connection, table):
+        return False
+    quote = schema_editor.quote_name
+    pk = [c for c in _primary_key(connection, table) if c != column]
+    schema_editor.execute(f"ALTER TABLE {quote(table)} REMOVE PARTITIONING")
+    schema_editor.execute(f"ALTER TABLE {quote(table)} DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(quote(c) for c in pk)})")
+    _forget(connection, table)
+    _restore_foreign_keys(schema_editor, table)
+    return True
+
+
+def add_future_partitions(schema_editor, table: str, ahead: int = DEFAULT_AHEAD_MONTHS) -> List[str]:
+    """Splits ``p_future`` so that monthly partitions exist up to ``ahead`` months from now."""
+    connection = schema_editor.connection
+    existing = partitions(connection, table)
+    if not existing:
+        return []
+    months = [date.fromisoformat(bound) for name, bound, _ in existing if name not in (MIN_PARTITION, FUTURE_PARTITION)]
+    month = _next_month(max(months)) if months else _month(date.today())
+    last = _add_months(_month(date.today()), ahead)
+    new = []
+    while month <= last:
+        new.append(month)
+        month = _next_month(month)
+    if not new:
+        return []
+    quote = schema_editor.quote_name
+    definitions = [_partition_sql(quote, m) for m in new] + [_future_sql(quote)]
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} REORGANIZE PARTITION {quote(FUTURE_PARTITION)} INTO ({', '.join(definitions)})"
+    )
+    return [_partition_name(m) for m in new]
+
+
+def drop_partitions(schema_editor, table: str, before: date, only_empty: bool = True) -> Tuple[List[str], List[str]]:
+    """
+    Drops the partitions whose whole range is older than ``before`` (the
+    first day of a month). With ``only_empty`` (default) partitions that still
+    hold rows are kept. Returns ``(dropped, kept)``.
+    """
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    dropped, kept = [], []
+    for name, bound, _ in partitions(connection, table):
+        if name == FUTURE_PARTITION or date.fromisoformat(bound) > before:
+            continue
+        if only_empty:
+            # TABLE_ROWS es una estimación: contar exacto en la partición
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quote(table)} PARTITION ({quote(name)}))")
+                if cursor.fetchone()[0]:
+                    kept.append(name)
+                    continue
+        dropped.append(name)
+    if dropped:
+        schema_editor.execute(f"ALTER TABLE {quote(table)} DROP PARTITION {', '.join(quote(n) for n in dropped)}")
+    return dropped, kept
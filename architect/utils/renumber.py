@@ -0,0 +1,313 @@
+# architect/utils/renumber.py
+import time
+from typing import Iterator, List, Optional
+
+from django.core.management.base import BaseCommand
+from django.db import connections, router, transaction
+from django.db.models import Case, F, IntegerField, Max, Value, When, Window
+from django.db.models.functions import RowNumber
+
+from .tenant_runner import TenantRunner, add_runner_arguments, format_summary
+
+DEFAULT_CHUNK_SIZE = 5000
+MAPPING_TABLE = "tmp_local_id_renumber"
+
+
+class LocalIdRenumberer:
+    """
+    Set-based renumbering of a per-tenant ``local_id`` column.
+
+    For each tenant:
+      1. ``ROW_NUMBER() OVER (PARTITION BY reflexo_id ORDER BY created_at, id)``
+         is materialized into a temporary mapping table (new_local -> id),
+         keeping only the rows whose number actually changes. Active rows are
+         numbered first; soft-deleted rows that had a number follow them, so
+         they can never collide with the active sequence.
+      2. The mapping is applied with chunked ``UPDATE ... JOIN`` statements,
+         each in its own short transaction, in two phases to dodge the
+         (reflexo, local_id) unique constraint: first every changed row moves
+         to offset + new_local (highest chunk first), then to its final value.
+         The offset is the maximum re-read right before phase 1 plus the
+         number of mapped rows.
+
+    Rows inserted meanwhile take max(local_id) + 1. The headroom keeps them
+    clear of phase 1 unless more rows than were mapped are inserted between
+    that re-read and the first phase-1 chunk, so the command can run on a
+    live database. A tenant that was interrupted is simply renumbered again:
+    the mapping only depends on created_at/id. ``--only-missing`` fills NULL
+    values after the maximum (re-read before writing) in a single phase.
+    """
+
+    column = "local_id"
+
+    def __init__(self, model, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.model = model
+        self.chunk_size = max(1, chunk_size)
+        self.using = router.db_for_write(model)
+        self.manager = model._base_manager.using(self.using)
+
+    @property
+    def connection(self):
+        # Se resuelve en cada uso: en los workers de TenantRunner es la conexión propia del proceso
+        return connections[self.using]
+
+    def job(self, only_missing: bool) -> str:
+        """Checkpoint key (MaintenanceCheckpoint.job)."""
+        return f"renumber_local_ids:{self.model._meta.label_lower}" + (":missing" if only_missing else "")
+
+    def tenant_ids(self, tenant_id: Optional[int] = None) -> List[int]:
+        qs = self.manager.filter(reflexo__isnull=False)
+        if tenant_id is not None:
+            qs = qs.filter(reflexo_id=tenant_id)
+        return list(qs.order_by("reflexo_id").values_list("reflexo_id", flat=True).distinct())
+
+    # ---------- mapping ----------
+    def _create_mapping(self, cursor, queryset) -> tuple:
+        """
+        Temporary table new_local -> id filled from ``queryset``
+        (values_list("id", "new_local")). Returns (rows, min, max).
+        """
+        sql, params = queryset.query.sql_with_params()
+        mapping = self._quote(MAPPING_TABLE)
+        self._drop_mapping(cursor)
+        cursor.execute(f"CREATE TEMPORARY TABLE {mapping} (new_local INTEGER PRIMARY KEY, id BIGINT NOT NULL)")
+        cursor.execute(f"INSERT INTO {mapping} (id, new_local) {sql}", params)
+        cursor.execute(f"SELECT COUNT(*), MIN(new_local), MAX(new_local) FROM {mapping}")
+        return cursor.fetchone()
+
+    def _mapping_queryset(self, tenant_id: int, only_missing: bool, start: int):
+        qs = self.manager.filter(reflexo_id=tenant_id).order_by()
+        if only_missing:
+            qs = qs.filter(deleted_at__isnull=True, local_id__isnull=True)
+            order_by = [F("created_at").asc(), F("id").asc()]
+        else:
+            # Eliminados sin número se quedan sin número
+            qs = qs.exclude(deleted_at__isnull=False, local_id__isnull=True)
+            deleted_last = Case(When(deleted_at__isnull=True, then=Value(0)), default=Value(1), output_field=IntegerField())
+            order_by = [deleted_last.asc(), F("created_at").asc(), F("id").asc()]
+        qs = qs.annotate(
+            new_local=Window(RowNumber(), partition_by=[F("reflexo_id")], order_by=order_by) + Value(start)
+        )
+        if not only_missing:
+            qs = qs.exclude(local_id=F("new_local"))
+        return qs.values_list("id", "new_local")
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def _drop_mapping(self, cursor) -> None:
+        temporary = "TEMPORARY " if self.connection.vendor == "mysql" else ""
+        cursor.execute(f"DROP {temporary}TABLE IF EXISTS {self._quote(MAPPING_TABLE)}")
+
+    def _current_max(self, tenant_id: int) -> int:
+        """Highest value of the column in use for the tenant (new rows take it + 1)."""
+        return self.manager.filter(reflexo_id=tenant_id).aggregate(m=Max(self.column))["m"] or 0
+
+    def _target_sql(self, offset: int) -> str:
+        """Final value of a mapping row (alias ``m``), shifted by ``offset``."""
+        return f"m.new_local + {int(offset)}"
+
+    def _after_chunk(self, cursor, low: int, high: int) -> None:
+        """Hook run in the same transaction as each final (phase 2) chunk."""
+
+    def _apply(self, cursor, low: int, high: int, offset: int, final: bool = False, skip_unchanged: bool = False) -> int:
+        """
+        Sets the column to its target (+ offset) for the mapping rows with
+        new_local in [low, high], in one short transaction. Returns the row count.
+        """
+        table, mapping = self._quote(self.model._meta.db_table), self._quote(MAPPING_TABLE)
+        column = self._quote(self.column)
+        where = "m.new_local BETWEEN %s AND %s"
+        if skip_unchanged:
+            # Filas que ya tienen su valor final no se tocan en ninguna fase
+            where += f" AND {table}.{column} <> {self._target_sql(0)}"
+        if self.connection.vendor == "mysql":
+            sql = (
+                f"UPDATE {table} JOIN {mapping} m ON m.id = {table}.id "
+                f"SET {table}.{column} = {self._target_sql(offset)} WHERE {where}"
+            )
+        else:
+            sql = (
+                f"UPDATE {table} SET {column} = {self._target_sql(offset)} FROM {mapping} m "
+                f"WHERE m.id = {table}.id AND {where}"
+            )
+        with transaction.atomic(using=self.using):
+            cursor.execute(sql, [low, high])
+            count = cursor.rowcount
+            if final:
+                self._after_chunk(cursor, low, high)
+        return count
+
+    def _mapped_ids(self, cursor) -> List[int]:
+        cursor.execute(f"SELECT id FROM {self._quote(MAPPING_TABLE)} ORDER BY new_local")
+        return [row[0] for row in cursor.fetchall()]
+
+    def _refresh_search(self, ids: List[int]) -> None:
+        """
+        search_entries shows local_id (e.g. "Cita 12") and the bulk UPDATEs
+        fire no signals: reindex the renumbered rows, a chunk at a time.
+        """
+        from .global_search import GlobalSearchService
+
+        provider = GlobalSearchService.provider_for_model(self.model)
+        if provider is None or self.column not in provider.fields:
+            return
+        service = GlobalSearchService()
+        for start in range(0, len(ids), self.chunk_size):
+            service.reindex(provider.entity_type, ids[start:start + self.chunk_size])
+
+    def _ranges(self, low: int, high: int, descending: bool = False) -> Iterator[tuple]:
+        starts = range(low, high + 1, self.chunk_size)
+        for start in (reversed(starts) if descending else starts):
+            yield start, min(start + self.chunk_size - 1, high)
+
+    def renumber_tenant(self, tenant_id: int, only_missing: bool = False, dry_run: bool = False) -> dict:
+        started = time.perf_counter()
+        current_max = self._current_max(tenant_id)
+        start = current_max if only_missing else 0
+        queryset = self._mapping_queryset(tenant_id, only_missing, start)
+        offset = 0
+
+        with self.connection.cursor() as cursor:
+            try:
+                changed, low, high = self._create_mapping(cursor, queryset)
+                if changed and not dry_run:
+                    if only_missing:
+                        # Por encima del máximo releído: salta las filas creadas desde la primera lectura
+                        offset = max(self._current_max(tenant_id) - current_max, 0)
+                        for chunk in self._ranges(low, high):
+                            self._apply(cursor, *chunk, offset=offset, final=True)
+                    else:
+                        # Máximo releído justo antes de la fase 1, más un margen de tantos
+                        # números como filas mapeadas para las que se creen antes del primer lote
+                        offset = self._current_max(tenant_id) + high
+                        for chunk in self._ranges(low, high, descending=True):
+                            self._apply(cursor, *chunk, offset=offset)
+                        for chunk in self._ranges(low, high):
+                            self._apply(cursor, *chunk, offset=0, final=True)
+                    renumbered = self._mapped_ids(cursor)
+            finally:
+                self._drop_mapping(cursor)
+        if changed and not dry_run:
+            self._refresh_search(renumbered)
+
+        if only_missing:
+            sequence = current_max + offset + changed
+        else:
+            sequence = self.manager.filter(reflexo_id=tenant_id, deleted_at__isnull=True).count()
+        return {
+            "tenant": tenant_id,
+            "changed": changed,
+            "sequence": sequence,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def pending_tenants(self, tenant_ids, only_missing: bool = False, dry_run: bool = False, resume: bool = False):
+        """
+        (tenants to process, tenants skipped). With ``resume`` the tenants that
+        have a MaintenanceCheckpoint for this job are skipped; otherwise the
+        job's checkpoints are cleared (a new run).
+        """
+        from architect.models import MaintenanceCheckpoint
+
+        checkpoints = MaintenanceCheckpoint.objects.using(self.using).filter(job=self.job(only_missing))
+        done = set(checkpoints.values_list("reflexo_id", flat=True)) if resume else set()
+        if not resume and not dry_run:
+            checkpoints.delete()
+        pending = [t for t in tenant_ids if t not in done]
+        return pending, [t for t in tenant_ids if t in done]
+
+    def process_tenant(self, tenant_id: int, only_missing: bool = False, dry_run: bool = False) -> dict:
+        """Renumbers one tenant and records its checkpoint (TenantRunner work unit)."""
+        from architect.models import MaintenanceCheckpoint
+
+        result = self.renumber_tenant(tenant_id, only_missing=only_missing, dry_run=dry_run)
+        if not dry_run:
+            MaintenanceCheckpoint.objects.using(self.using).update_or_create(
+                job=self.job(only_missing), reflexo_id=tenant_id, defaults={"processed": result["changed"]}
+            )
+        return result
+
+
+class RenumberLocalIdsCommand(BaseCommand):
+    """
+    Base for the backfill_*_local_ids commands: subclasses only set
+    ``model``, ``label`` and ``help``.
+    """
+
+    model = None
+    label = "rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Only fill NULL local_id (after the tenant's current maximum); do not renumber existing values.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without persisting.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows per UPDATE/transaction (default: {DEFAULT_CHUNK_SIZE}).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip tenants already completed by a previous (interrupted) run.",
+        )
+        add_runner_arguments(parser)
+
+    def _on_result(self, result, done, total):
+        if not result.ok:
+            self.stdout.write(self.style.ERROR(f"[{done}/{total}] Tenant {result.tenant_id}: failed ({result.error})."))
+            return
+        value = result.value
+        self.stdout.write(
+            self.style.NOTICE(
+                f"[{done}/{total}] Tenant {result.tenant_id}: set/renumbered {value['changed']} {self.label} "
+                f"local_id(s), final sequence={value['sequence']} ({value['seconds']:.2f}s)."
+            )
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get("tenant")
+        only_missing = options.get("only_missing", False)
+        dry_run = options.get("dry_run", False)
+
+        renumberer = LocalIdRenumberer(self.model, chunk_size=options["chunk_size"])
+        tenants = renumberer.tenant_ids(tenant_id)
+        if tenant_id is not None and not tenants:
+            self.stdout.write(self.style.WARNING(f"No {self.label} found for the specified tenant."))
+            return
+
+        pending, skipped = renumberer.pending_tenants(tenants, only_missing, dry_run, resume=options["resume"])
+        if skipped:
+            self.stdout.write(f"Skipping {len(skipped)} tenant(s) already done (checkpoint).")
+
+        # La renumeración maneja sus propias transacciones cortas por lote (atomic=False)
+        runner = TenantRunner(
+            lambda t: renumberer.process_tenant(t, only_missing=only_missing, dry_run=dry_run),
+            workers=options["workers"],
+            retries=options["retries"],
+            atomic=False,
+            totals=("changed",),
+            on_result=self._on_result,
+        )
+        summary = runner.run(pending)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Total {self.label} updated: {summary['totals']['changed']}. "
+                f"{format_summary(summary)}. Dry run: {dry_run}"
+            )
+        )
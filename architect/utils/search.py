@@ -0,0 +1,153 @@
+# architect/utils/search.py
+import re
+from functools import reduce
+from operator import or_
+from typing import List, Optional, Sequence
+
+from django.db import connections
+from django.db.models import F, FloatField, Func, Q, QuerySet, Value
+from rest_framework.filters import SearchFilter
+
+from .partitions import is_partitioned
+from .text import normalize_text
+
+# Términos por búsqueda (el resto se ignora)
+MAX_SEARCH_TERMS = 8
+
+# innodb_ft_min_token_size (por defecto 3): palabras más cortas no están en el índice FULLTEXT
+FULLTEXT_MIN_TERM_LENGTH = 3
+_FULLTEXT_TERM = re.compile(r"^\w+$")
+_SPLIT = re.compile(r"[\s,]+")
+
+# Lista de stopwords por defecto de InnoDB: nunca coinciden por FULLTEXT, se buscan con LIKE
+INNODB_STOPWORDS = frozenset({
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from",
+    "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the", "this", "to",
+    "was", "what", "when", "where", "who", "will", "with", "und", "www",
+})
+
+
+class MatchAgainst(Func):
+    """MySQL ``MATCH (columns) AGAINST (query IN BOOLEAN MODE)`` (relevancia, 0 si no coincide)."""
+
+    output_field = FloatField()
+
+    def __init__(self, columns: Sequence[str], query: str):
+        super().__init__(*(F(column) for column in columns), Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        *columns, query = self.get_source_expressions()
+        sql, params = [], []
+        for column in columns:
+            column_sql, column_params = compiler.compile(column)
+            sql.append(column_sql)
+            params.extend(column_params)
+        query_sql, query_params = compiler.compile(query)
+        return f"MATCH ({', '.join(sql)}) AGAINST ({query_sql} IN BOOLEAN MODE)", [*params, *query_params]
+
+
+def search_terms(search: Optional[str], normalize: bool = False) -> List[str]:
+    """Distinct terms of a search string (whitespace/comma separated), optionally normalized."""
+    text = normalize_text(search) if normalize else (search or "").replace("\x00", "")
+    terms = dict.fromkeys(term for term in _SPLIT.split(text) if term)
+    return list(terms)[:MAX_SEARCH_TERMS]
+
+
+def is_fulltext_term(term: str) -> bool:
+    """Whether MySQL FULLTEXT can match ``term`` (long enough, a single word, not a stopword)."""
+    return (
+        len(term) >= FULLTEXT_MIN_TERM_LENGTH
+        and _FULLTEXT_TERM.match(term) is not None
+        and term.lower() not in INNODB_STOPWORDS
+    )
+
+
+def search_queryset(
+    queryset: QuerySet,
+    search: Optional[str],
+    fields: Sequence[str] = (),
+    document_field: Optional[str] = None,
+    fulltext_fields: Sequence[str] = (),
+) -> QuerySet:
+    """
+    Filters ``queryset`` so that every term of ``search`` matches.
+
+    - ``document_field``: a denormalized column holding ``search_document()``
+      text. Terms are normalized the same way (accent/case-insensitive) and
+      matched as word prefixes against that single column.
+    - ``fulltext_fields``: the columns of a MySQL FULLTEXT index, exactly in
+      index order. On MySQL, terms of 3+ word characters are matched with one
+      ``MATCH ... AGAINST`` in boolean mode (word prefix, served by the index).
+    - Any other term (short, stopword, punctuation, or any other database)
+      falls back to LIKE: on ``document_field`` when given, otherwise an OR of
+      ``icontains`` over ``fields``.
+    """
+    terms = search_terms(search, normalize=bool(document_field))
+    if not terms:
+        return queryset
+
+    # Las tablas particionadas no admiten índices FULLTEXT (ver architect/utils/partitions.py)
+    use_fulltext = (
+        bool(fulltext_fields)
+        and connections[queryset.db].vendor == "mysql"
+        and not is_partitioned(queryset.db, queryset.model._meta.db_table)
+    )
+    fulltext = []
+    for term in terms:
+        if use_fulltext and is_fulltext_term(term):
+            fulltext.append(term)
+        elif document_field:
+            # Prefijo de palabra, como FULLTEXT "term*": "001" no coincide dentro de "40000001".
+            # Lookups i*: en MySQL los exactos son LIKE BINARY y no usan el índice (la columna ya está normalizada)
+            queryset = queryset.filter(
+                Q(**{f"{document_field}__istartswith": term}) | Q(**{f"{document_field}__icontains": f" {term}"})
+            )
+        elif fields:
+            queryset = queryset.filter(reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields)))
+
+    if fulltext:
+        query = " ".join(f"+{term}*" for term in fulltext)
+        queryset = queryset.alias(search_rank=MatchAgainst(fulltext_fields, query)).filter(search_rank__gt=0)
+    return queryset
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for DRF's ``SearchFilter`` (same ``search`` param)
+    backed by an indexed column instead of ``icontains`` over every field.
+
+    Views opt in with:
+      - ``search_document_field``: denormalized, normalized search column.
+      - ``search_fulltext_fields``: columns of the MySQL FULLTEXT index.
+    ``search_fields`` is the LIKE fallback. Views declaring neither attribute
+    get the stock ``SearchFilter`` behaviour.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        document_field = getattr(view, "search_document_field", None)
+        fulltext_fields = getattr(view, "search_fulltext_fields", ())
+        if not document_field and not fulltext_fields:
+            return super().filter_queryset(request, queryset, view)
+        return search_queryset(
+            queryset,
+            request.query_params.get(self.search_param, ""),
+            fields=self.get_search_fields(view, request) or (),
+            document_field=document_field,
+            fulltext_fields=fulltext_fields,
+        )
+
+
+def create_fulltext_index(schema_editor, table: str, name: str, columns: Sequence[str]) -> None:
+    """Migration helper: FULLTEXT index on MySQL only (other databases use the LIKE fallback)."""
+    if schema_editor.connection.vendor != "mysql":
+        return
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE FULLTEXT INDEX {quote(name)} ON {quote(table)} ({', '.join(quote(c) for c in columns)})"
+    )
+
+
+def drop_fulltext_index(schema_editor, table: str, name: str) -> None:
+    if schema_editor.connection.vendor != "mysql":
+        return
+    schema_editor.execute(f"DROP INDEX {schema_editor.quote_name(name)} ON {schema_editor.quote_name(table)}")
@@ -0,0 +1,167 @@
+# architect/utils/tenant_runner.py
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from django.db import InterfaceError, OperationalError, connections, transaction
+
+DEFAULT_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.5
+
+# Errores transitorios (deadlock, lock wait timeout, conexión perdida): se reintentan
+RETRYABLE_ERRORS = (OperationalError, InterfaceError)
+
+# Trabajo por tenant de cada worker (se hereda por fork; nunca se serializa)
+_WORK: Optional[Callable] = None
+_OPTIONS: dict = {}
+
+
+@dataclass
+class TenantResult:
+    tenant_id: Optional[int]
+    ok: bool
+    value: dict = field(default_factory=dict)
+    error: str = ""
+    attempts: int = 1
+    seconds: float = 0.0
+
+
+def _init_worker(work: Callable, options: dict) -> None:
+    global _WORK, _OPTIONS
+    _WORK, _OPTIONS = work, options
+
+
+def _run_tenant(tenant_id: Optional[int]) -> TenantResult:
+    """Runs the work for one tenant (one transaction unless atomic=False), retrying transient DB errors."""
+    retries, atomic, dry_run = _OPTIONS["retries"], _OPTIONS["atomic"], _OPTIONS["dry_run"]
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            if atomic:
+                with transaction.atomic():
+                    value = _WORK(tenant_id) or {}
+                    if dry_run:
+                        transaction.set_rollback(True)
+            else:
+                value = _WORK(tenant_id) or {}
+            return TenantResult(tenant_id, True, value, attempts=attempt, seconds=time.perf_counter() - started)
+        except RETRYABLE_ERRORS as exc:
+            # La conexión puede haber quedado inutilizable: se abre otra en el reintento
+            connections.close_all()
+            if attempt > retries:
+                return TenantResult(tenant_id, False, error=str(exc), attempts=attempt, seconds=time.perf_counter() - started)
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        except Exception as exc:
+            return TenantResult(
+                tenant_id, False, error=f"{type(exc).__name__}: {exc}", attempts=attempt,
+                seconds=time.perf_counter() - started,
+            )
+
+
+class TenantRunner:
+    """
+    Runs ``work(tenant_id) -> dict`` for every tenant, fanned out across a
+    process pool.
+
+    - One worker process per slot, each with its own DB connection (the
+      parent closes its connections before forking, children open their own).
+    - One transaction per tenant (``atomic=False`` for work that manages its
+      own, e.g. chunked renumbering); ``dry_run`` rolls it back.
+    - Transient DB errors are retried with exponential backoff; any other
+      error marks the tenant as failed without stopping the others.
+    - ``on_result`` is called in the parent as each tenant finishes
+      (progress); ``run`` returns a summary adding up the ``totals`` keys of
+      the work results.
+
+    ``work`` may be any callable (closure, bound method): it reaches the
+    workers through fork, only tenant ids and results are pickled. Without
+    fork (or with workers <= 1) tenants run serially in this process.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[Optional[int]], dict],
+        workers: int = 1,
+        retries: int = DEFAULT_RETRIES,
+        atomic: bool = True,
+        dry_run: bool = False,
+        totals: Sequence[str] = (),
+        on_result: Optional[Callable[[TenantResult, int, int], None]] = None,
+    ):
+        self.work = work
+        self.workers = max(1, workers or 1)
+        self.options = {"retries": max(0, retries), "atomic": atomic, "dry_run": dry_run}
+        self.totals = tuple(totals)
+        self.on_result = on_result
+
+    def _results(self, tenant_ids: List[Optional[int]]) -> Iterable[TenantResult]:
+        if self.workers <= 1 or len(tenant_ids) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            _init_worker(self.work, self.options)
+            yield from map(_run_tenant, tenant_ids)
+            return
+
+        # Los hijos heredan el proceso: no deben compartir la conexión a la BD del padre
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(tenant_ids)),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.work, self.options),
+        ) as executor:
+            futures = [executor.submit(_run_tenant, tenant_id) for tenant_id in tenant_ids]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, tenant_ids: Iterable[Optional[int]]) -> dict:
+        tenant_ids = list(tenant_ids)
+        started = time.perf_counter()
+        summary = {
+            "tenants": len(tenant_ids), "succeeded": 0, "failed": [], "retried": 0,
+            "totals": dict.fromkeys(self.totals, 0),
+        }
+        for done, result in enumerate(self._results(tenant_ids), start=1):
+            if result.ok:
+                summary["succeeded"] += 1
+                for key in self.totals:
+                    summary["totals"][key] += result.value.get(key) or 0
+            else:
+                summary["failed"].append(result.tenant_id)
+            if result.attempts > 1:
+                summary["retried"] += 1
+            if self.on_result is not None:
+                self.on_result(result, done, len(tenant_ids))
+        summary["seconds"] = time.perf_counter() - started
+        return summary
+
+
+def add_runner_arguments(parser) -> None:
+    """--workers/--retries for commands that process tenants through TenantRunner."""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process tenants in parallel with N worker processes (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per tenant on transient database errors (default: {DEFAULT_RETRIES}).",
+    )
+
+
+def format_summary(summary: dict) -> str:
+    totals = ", ".join(f"{key}={value}" for key, value in summary["totals"].items())
+    text = (
+        f"{summary['succeeded']}/{summary['tenants']} tenant(s) ok in {summary['seconds']:.2f}s"
+        + (f" ({totals})" if totals else "")
+    )
+    if summary["retried"]:
+        text += f", {summary['retried']} retried"
+    if summary["failed"]:
+        text += f", failed: {summary['failed']}"
+    return text
@@ -0,0 +1,99 @@
+# architect/utils/text.py
+import re
+import unicodedata
+from typing import List, Optional
+
+# Longitud máxima de un token indexado (nombres/apellidos compuestos se parten en palabras)
+MAX_TOKEN_LENGTH = 64
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """
+    Lowercases and accent-folds ``value`` ("Peréz  Ñahui" -> "perez nahui").
+    Any run of non-alphanumeric characters becomes a single space.
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(value).lower())
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+def tokenize(*values: Optional[str]) -> List[str]:
+    """
+    Normalized tokens of ``values`` in order of appearance, without duplicates.
+    """
+    seen = {}
+    for value in values:
+        for token in normalize_text(value).split():
+            seen.setdefault(token[:MAX_TOKEN_LENGTH], None)
+    return list(seen)
+
+
+def normalize_document(value: Optional[str]) -> str:
+    """Document numbers are indexed as a single token (separators removed)."""
+    return normalize_text(value).replace(" ", "")[:MAX_TOKEN_LENGTH]
+
+
+
+# ---------- claves de nombre (detección de duplicados) ----------
+NAME_KEY_LENGTH = 255
+
+# Reglas fonéticas para español, aplicadas en orden sobre texto ya normalizado
+_PHONETIC_RULES = [
+    (re.compile(r"ch"), "x"),
+    (re.compile(r"ll"), "y"),
+    (re.compile(r"qu(?=[ei])"), "k"),
+    (re.compile(r"g(?=[ei])"), "j"),
+    (re.compile(r"gu(?=[ei])"), "g"),
+    (re.compile(r"c(?=[ei])"), "s"),
+    (re.compile(r"[cq]"), "k"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"v|w"), "b"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"y(?=[^aeiou]|$)"), "i"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def phonetic_token(token: str) -> str:
+    """
+    Spanish phonetic code of a normalized token: letters that sound alike
+    collapse ("Gonzales"/"González", "Vásquez"/"Basques", "Yupanqui"/"Llupanki").
+    """
+    code = token
+    for pattern, replacement in _PHONETIC_RULES:
+        code = pattern.sub(replacement, code)
+    return code or token
+
+
+def person_name_keys(*parts: Optional[str]):
+    """
+    (name_key, phonetic_key) of a person's name parts. Tokens are sorted, so
+    the keys do not depend on word order or on which field holds each word.
+    """
+    tokens = sorted(tokenize(*parts))
+    name_key = " ".join(tokens)[:NAME_KEY_LENGTH]
+    phonetic_key = " ".join(sorted(phonetic_token(t) for t in tokens))[:NAME_KEY_LENGTH]
+    return name_key, phonetic_key
+
+
+def exact_name_key(*parts: Optional[str]) -> str:
+    """
+    Order- and field-preserving key of a person's name parts: each part is
+    normalized on its own and kept in its position ("garcia perez|luis"), so
+    swapping surnames gives a different key. Used for the "same person"
+    check; the sorted ``name_key`` is only for duplicate candidates.
+    """
+    return "|".join(normalize_text(part) for part in parts)[:NAME_KEY_LENGTH]
+
+
+def search_document(*values: Optional[str]) -> str:
+    """
+    Denormalized search text of a row: the normalized tokens of ``values``
+    in one column, so a search reads a single column instead of OR-ing
+    ``icontains`` over many columns and joins.
+    """
+    return " ".join(tokenize(*values))
@@ -1,9 +1,11 @@
 from .auth import LoginView, RegisterView
 from .user import UserListView, UserCreateView, UserEditView, AdminUserDeleteView
 from .permission import PermissionView, RoleView
+from .search import GlobalSearchView
 
 __all__ = [
     'LoginView', 'RegisterView',
     'UserListView', 'UserCreateView', 'UserEditView', 'AdminUserDeleteView',
-    'PermissionView', 'RoleView'
+    'PermissionView', 'RoleView',
+    'GlobalSearchView'
 ]
\ No newline at end of file
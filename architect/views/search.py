@@ -0,0 +1,24 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..utils.global_search import DEFAULT_LIMIT, GlobalSearchService
+
+
+class GlobalSearchView(APIView):
+    """
+    Búsqueda global (pacientes, terapeutas, citas y tickets) en una sola consulta.
+    GET /api/search/?q=<texto>&types=patient,ticket&limit=5
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        term = request.query_params.get('q', '')
+        types = [t for t in request.query_params.get('types', '').split(',') if t] or None
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = DEFAULT_LIMIT
+        results = GlobalSearchService().search(term, user=request.user, types=types, limit=limit)
+        return Response({'query': term, 'results': results}, status=status.HTTP_200_OK)
@@ -1,32 +1,51 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from clinica.models import UserProfile
+from architect.utils.tenant_runner import TenantRunner, add_runner_arguments, format_summary
 
 class Command(BaseCommand):
     help = "Synchronize users_profiles.User.reflexo from clinica.UserProfile.reflexo for all users."
 
     def add_arguments(self, parser):
         parser.add_argument('--dry-run', action='store_true', help='Only show what would change')
+        add_runner_arguments(parser)
+
+    @staticmethod
+    def _sync_tenant(tenant_id):
+        """Users whose profile belongs to `tenant_id` (None = profile without tenant)."""
+        User = get_user_model()
+        profiles = UserProfile.objects.filter(reflexo_id=tenant_id).values('user_id')
+        users = User.objects.filter(id__in=profiles)
+        # Profiles without tenant: only users that still have one need the sync
+        users = users.filter(reflexo_id__isnull=False) if tenant_id is None else users.exclude(reflexo_id=tenant_id)
+        changes = list(users.order_by('id').values_list('id', 'email', 'reflexo_id'))
+        updated = User.objects.filter(id__in=[c[0] for c in changes]).update(reflexo_id=tenant_id)
+        return {'updated': updated, 'changes': changes}
 
     def handle(self, *args, **options):
         User = get_user_model()
         dry = options['dry_run']
-        updated = 0
-        total = 0
-        for u in User.objects.all().order_by('id'):
-            total += 1
-            try:
-                p = UserProfile.objects.get(user=u)
-            except UserProfile.DoesNotExist:
-                self.stdout.write(f"User {u.id} {u.email}: no profile")
-                continue
-            prof_ref = p.reflexo_id
-            if u.reflexo_id != prof_ref:
-                self.stdout.write(f"User {u.id} {u.email}: {u.reflexo_id} -> {prof_ref}")
-                if not dry:
-                    u.reflexo_id = prof_ref
-                    u.save(update_fields=['reflexo'])
-                    updated += 1
-            else:
-                self.stdout.write(f"User {u.id} {u.email}: already {u.reflexo_id}")
-        self.stdout.write(self.style.SUCCESS(f"Processed {total} users, updated {updated}"))
+        total = User.objects.count()
+
+        for user_id, email in User.objects.filter(clinica_profile__isnull=True).order_by('id').values_list('id', 'email'):
+            self.stdout.write(f"User {user_id} {email}: no profile")
+
+        def on_result(result, done, total_tenants):
+            if not result.ok:
+                self.stdout.write(self.style.ERROR(f"Tenant {result.tenant_id}: ERROR {result.error}"))
+                return
+            for user_id, email, old in result.value['changes']:
+                self.stdout.write(f"User {user_id} {email}: {old} -> {result.tenant_id}")
+
+        tenants = list(UserProfile.objects.order_by().values_list('reflexo_id', flat=True).distinct())
+        runner = TenantRunner(
+            self._sync_tenant,
+            workers=options['workers'],
+            retries=options['retries'],
+            dry_run=dry,
+            totals=('updated',),
+            on_result=on_result,
+        )
+        summary = runner.run(tenants)
+        updated = 0 if dry else summary['totals']['updated']
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} users, updated {updated}. {format_summary(summary)}"))
@@ -0,0 +1,209 @@
+import time
+import tracemalloc
+from datetime import date, datetime, time as dtime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction, connection
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from appointments_status.models.appointment import Appointment
+from company_reports.services.reports_services import ReportService
+from histories_configurations.models import DocumentType, History
+from patients_diagnoses.models.patient import Patient
+from reflexo.models import Reflexo
+from therapists.models.therapist import Therapist
+from ubi_geo.models import District
+
+
+# Fecha lejana para no mezclar los datos sintéticos con citas reales
+BENCH_DATE = date(2099, 1, 1)
+
+
+def legacy_patients_by_therapist(query_date):
+    """Implementación anterior (instancias de modelo + agrupación en Python), para comparar."""
+    appointments = (
+        Appointment.objects
+        .select_related("patient", "therapist")
+        .annotate(day=TruncDate("appointment_date"))
+        .filter(day=query_date)
+    )
+    report = {}
+    sin_terapeuta = {"therapist_id": "", "therapist": "Sin terapeuta asignado", "patients": {}}
+    for appointment in appointments:
+        patient = appointment.patient
+        therapist = appointment.therapist
+        if not patient:
+            continue
+        patient_data = {
+            "patient_id": patient.id,
+            "patient": f"{patient.paternal_lastname} {patient.maternal_lastname or ''} {patient.name}".strip(),
+            "appointments": 0,
+        }
+        if not therapist:
+            group = sin_terapeuta
+        else:
+            if therapist.id not in report:
+                report[therapist.id] = {
+                    "therapist_id": therapist.id,
+                    "therapist": f"{therapist.last_name_paternal} {therapist.last_name_maternal or ''} {therapist.first_name}".strip(),
+                    "patients": {},
+                }
+            group = report[therapist.id]
+        group["patients"].setdefault(patient.id, patient_data)["appointments"] += 1
+    if sin_terapeuta["patients"]:
+        report["sinTherapist"] = sin_terapeuta
+    for key in list(report.keys()):
+        report[key]["patients"] = list(report[key]["patients"].values())
+    return list(report.values())
+
+
+def legacy_appointments_between_dates(start_date, end_date):
+    """Implementación anterior (una instancia por cita), para comparar."""
+    appointments = (
+        Appointment.objects
+        .select_related("patient", "therapist")
+        .filter(appointment_date__gte=start_date, appointment_date__lte=end_date)
+        .order_by("appointment_date", "hour")
+    )
+    result = []
+    for app in appointments:
+        if not app.patient:
+            continue
+        result.append({
+            "appointment_id": app.id,
+            "patient_id": app.patient.id,
+            "document_number_patient": app.patient.document_number,
+            "patient": " ".join(filter(None, [app.patient.paternal_lastname, app.patient.maternal_lastname, app.patient.name])),
+            "phone1_patient": app.patient.phone1,
+            "appointment_date": app.appointment_date.strftime("%Y-%m-%d"),
+            "hour": app.hour.strftime("%H:%M") if app.hour else "",
+        })
+    return result
+
+
+def _normalize_grouped(report):
+    """Forma comparable del reporte agrupado (independiente del orden)."""
+    return sorted(
+        (str(g["therapist_id"]), g["therapist"], tuple(sorted((p["patient_id"], p["patient"], p["appointments"]) for p in g["patients"])))
+        for g in report
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark of the patients-by-therapist and appointments-between-dates reports: "
+        "legacy model-instance implementation vs. the values()-based one. "
+        "Seeds synthetic data inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--appointments", type=int, default=100_000, help="Synthetic appointments to seed.")
+        parser.add_argument("--patients", type=int, default=5_000, help="Synthetic patients to seed.")
+        parser.add_argument("--therapists", type=int, default=50, help="Synthetic therapists to seed.")
+        parser.add_argument("--batch-size", type=int, default=5_000, help="bulk_create batch size.")
+        parser.add_argument("--repeat", type=int, default=1, help="Runs per implementation (best time is reported).")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options)
+            self.stdout.write(self.style.NOTICE(
+                f"Seeded {options['appointments']} appointments on {BENCH_DATE} ({connection.vendor})."
+            ))
+
+            service = ReportService()
+            start, end = BENCH_DATE, BENCH_DATE + timedelta(days=1)
+            cases = [
+                (
+                    "patients_by_therapist",
+                    lambda: legacy_patients_by_therapist(BENCH_DATE),
+                    lambda: service.get_patients_by_therapist({"date": BENCH_DATE}),
+                    _normalize_grouped,
+                ),
+                (
+                    "appointments_between_dates",
+                    lambda: legacy_appointments_between_dates(start, end),
+                    lambda: service.get_appointments_between_dates({"start_date": start, "end_date": end}),
+                    lambda rows: sorted(tuple(sorted(r.items())) for r in rows),
+                ),
+            ]
+            for name, legacy, current, normalize in cases:
+                legacy_time, legacy_peak, legacy_result = self._measure(legacy, options["repeat"])
+                new_time, new_peak, new_result = self._measure(current, options["repeat"])
+                same = normalize(legacy_result) == normalize(new_result)
+                self.stdout.write(
+                    f"{name}: legacy {legacy_time:.2f}s / {legacy_peak / 2**20:.1f} MiB peak  ->  "
+                    f"values() {new_time:.2f}s / {new_peak / 2**20:.1f} MiB peak  "
+                    f"(x{legacy_time / new_time if new_time else 0:.1f}, same result: {'yes' if same else 'NO'})"
+                )
+
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS("Done. Synthetic data rolled back."))
+
+    @staticmethod
+    def _measure(func, repeat):
+        """Mejor tiempo de `repeat` corridas y, en una corrida aparte, el pico de memoria (tracemalloc)."""
+        best, result = None, None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        # tracemalloc distorsiona los tiempos: se mide por separado
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return best, peak, result
+
+    def _seed(self, options):
+        batch = options["batch_size"]
+        stamp = timezone.now().strftime("%Y%m%d%H%M%S%f")
+        tenant = Reflexo.objects.create(name=f"bench-{stamp}", domain=f"bench-{stamp}.local")
+        doc_type = DocumentType.objects.create(name="BENCH")
+        district = District.objects.select_related("province").first()
+        if district is None:
+            raise SystemExit("Ubigeo data is required (run import_ubigeo).")
+        geo = {"region_id": district.province.region_id, "province_id": district.province_id, "district_id": district.id}
+
+        Therapist.objects.bulk_create([
+            Therapist(
+                reflexo=tenant, document_type=doc_type, document_number=f"BT{stamp[-8:]}{i:05d}",
+                first_name=f"Terapeuta{i}", last_name_paternal=f"Paterno{i}", last_name_maternal=f"Materno{i}",
+                email=f"bench.t{i}@example.com", **geo,
+            )
+            for i in range(options["therapists"])
+        ], batch_size=batch)
+        therapist_ids = list(Therapist.objects.filter(reflexo=tenant).values_list("id", flat=True))
+
+        Patient.objects.bulk_create([
+            Patient(
+                reflexo=tenant, document_type=doc_type, document_number=f"BP{stamp[-8:]}{i:07d}",
+                name=f"Nombre{i}", paternal_lastname=f"Apellido{i % 997}", maternal_lastname=f"Materno{i % 389}",
+                email=f"bench.p{i}@example.com", phone1=f"9{i:08d}", ocupation="-", health_condition="-", **geo,
+            )
+            for i in range(options["patients"])
+        ], batch_size=batch)
+        patient_ids = list(Patient.objects.filter(reflexo=tenant).values_list("id", flat=True))
+
+        # Cada cita necesita su propio historial (uniq_active_patient_history); se
+        # crean eliminados para no chocar con "un historial activo por paciente".
+        n = options["appointments"]
+        now = timezone.now()
+        History.objects.bulk_create([
+            History(reflexo=tenant, patient_id=patient_ids[i % len(patient_ids)], deleted_at=now)
+            for i in range(n)
+        ], batch_size=batch)
+        history_ids = list(History.objects.filter(reflexo=tenant).order_by("id").values_list("id", "patient_id"))
+
+        day = timezone.make_aware(datetime.combine(BENCH_DATE, dtime.min))
+        Appointment.objects.bulk_create([
+            Appointment(
+                reflexo=tenant, history_id=h_id, patient_id=p_id,
+                # ~5% sin terapeuta asignado
+                therapist_id=None if i % 20 == 0 else therapist_ids[i % len(therapist_ids)],
+                appointment_date=day, hour=dtime(8 + i % 12, (i * 7) % 60),
+            )
+            for i, (h_id, p_id) in enumerate(history_ids)
+        ], batch_size=batch)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_reports', '0002_companydata_reflexo'),
+        ('reflexo', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(max_length=50, verbose_name='Reporte')),
+                ('format', models.CharField(max_length=10, verbose_name='Formato')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parámetros')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En proceso'), ('done', 'Completado'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('file', models.FileField(blank=True, null=True, upload_to='report_jobs/%Y/%m/', verbose_name='Archivo generado')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('task_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='ID de tarea')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('reflexo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Job de Reporte',
+                'verbose_name_plural': 'Jobs de Reportes',
+                'db_table': 'report_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['reflexo', 'created_at'], name='report_jobs_reflexo_b7a13a_idx'), models.Index(fields=['status'], name='report_jobs_status_f93e87_idx')],
+            },
+        ),
+    ]
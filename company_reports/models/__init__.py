@@ -0,0 +1,4 @@
+from .company import CompanyData
+from .report_job import ReportJob
+
+__all__ = ['CompanyData', 'ReportJob']
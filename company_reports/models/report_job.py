@@ -0,0 +1,64 @@
+from django.db import models
+from django.conf import settings
+
+
+class ReportJob(models.Model):
+    """
+    Solicitud de reporte/exportación procesada en segundo plano (Celery).
+    El artefacto generado queda en default_storage y se descarga por la API.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    # Multitenant
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True,
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name="Solicitado por",
+    )
+
+    report = models.CharField(max_length=50, verbose_name="Reporte")
+    format = models.CharField(max_length=10, verbose_name="Formato")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Parámetros")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado")
+    file = models.FileField(upload_to="report_jobs/%Y/%m/", blank=True, null=True, verbose_name="Archivo generado")
+    error = models.TextField(blank=True, null=True, verbose_name="Error")
+    task_id = models.CharField(max_length=255, blank=True, null=True, verbose_name="ID de tarea")
+
+    # Campos de auditoría
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="Inicio")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Fin")
+
+    def __str__(self):
+        return f"{self.report}.{self.format} ({self.get_status_display()})"
+
+    class Meta:
+        db_table = 'report_jobs'
+        verbose_name = "Job de Reporte"
+        verbose_name_plural = "Jobs de Reportes"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['reflexo', 'created_at']),
+            models.Index(fields=['status']),
+        ]
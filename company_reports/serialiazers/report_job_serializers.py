@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from django.urls import reverse
+from company_reports.models.report_job import ReportJob
+from company_reports.serialiazers.reports_serializers import DateParameterSerializer
+from company_reports.services.report_job_services import REPORT_JOB_TYPES, JOB_FORMATS
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    """Valida la solicitud de un reporte en segundo plano."""
+
+    report = serializers.ChoiceField(choices=list(REPORT_JOB_TYPES))
+    format = serializers.ChoiceField(choices=list(JOB_FORMATS), default='xlsx')
+    date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
+    start_date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
+    end_date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
+
+    def validate(self, data):
+        dates = DateParameterSerializer(data={
+            k: str(data[k]) for k in ('date', 'start_date', 'end_date') if data.get(k)
+        })
+        dates.is_valid(raise_exception=True)
+
+        if REPORT_JOB_TYPES[data['report']]['requires_range'] and not (data.get('start_date') and data.get('end_date')):
+            raise serializers.ValidationError("start_date y end_date son requeridos para este reporte")
+        if (data['format'] == 'xlsx' and not REPORT_JOB_TYPES[data['report']]['xlsx_range']
+                and data.get('start_date') and data.get('end_date')):
+            raise serializers.ValidationError(
+                "El libro xlsx de este reporte es de un solo día: use 'date' o el formato csv/ndjson para un rango"
+            )
+
+        # Parámetros tal como los recibirá la tarea (JSON)
+        data['params'] = {k: str(v) for k, v in dates.validated_data.items() if k != 'format' and v}
+        return data
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'reflexo', 'report', 'format', 'params', 'status', 'error',
+            'download_url', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.STATUS_DONE or not obj.file:
+            return None
+        url = reverse('report-jobs-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -9,6 +9,8 @@ class DateParameterSerializer(serializers.Serializer):
     date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
     start_date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
     end_date = serializers.DateField(required=False, input_formats=['%Y-%m-%d'])
+    # json (por defecto) | csv | ndjson -> los dos últimos se envían por streaming
+    format = serializers.ChoiceField(choices=['json', 'csv', 'ndjson'], required=False, default='json')
     
     def validate_date(self, value):
         """Valida formato de fecha."""
@@ -28,6 +30,21 @@ class DateParameterSerializer(serializers.Serializer):
             
         return data
 
+class DateRangeParameterSerializer(serializers.Serializer):
+    """Valida el rango de fechas de los reportes por día (variantes /range/)."""
+
+    MAX_DAYS = 366
+
+    start_date = serializers.DateField(input_formats=['%Y-%m-%d'])
+    end_date = serializers.DateField(input_formats=['%Y-%m-%d'])
+
+    def validate(self, data):
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("start_date no puede ser mayor que end_date")
+        if (data['end_date'] - data['start_date']).days + 1 > self.MAX_DAYS:
+            raise serializers.ValidationError(f"El rango no puede superar {self.MAX_DAYS} días")
+        return data
+
 class TherapistAppointmentSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()  # 👈 SIN source, leerá 'name' del dict
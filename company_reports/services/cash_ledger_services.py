@@ -0,0 +1,179 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.db import connection
+from django.db.models import CharField, F, IntegerField, Value
+from django.db.models.functions import Cast, Coalesce, Concat, NullIf
+from django.utils import timezone
+from appointments_status.models.appointment import Appointment
+from appointments_status.models.ticket import Ticket
+from architect.utils.archive import archive_of
+from architect.utils.partitions import day_window
+
+CENTS = Decimal("0.01")
+
+# Columnas normalizadas del libro de caja (mismo orden en ambas ramas del UNION)
+LEDGER_COLUMNS = (
+    "tipo", "orden", "ref_id", "numero", "monto", "metodo",
+    "pac_paterno", "pac_materno", "pac_nombre",
+    "ter_paterno", "ter_materno", "ter_nombre",
+    "fecha",
+)
+# Columnas descriptivas: en el agregado se toman con MAX() (una fila por pago)
+_DETAIL_COLUMNS = ("tipo", "numero", "pac_paterno", "pac_materno", "pac_nombre",
+                   "ter_paterno", "ter_materno", "ter_nombre", "fecha")
+
+
+class CashLedgerService:
+    """
+    Libro unificado de caja: pagos de citas y tickets pagados en un UNION ALL
+    con columnas normalizadas, más los totales por método y el total general
+    calculados en la misma consulta (GROUP BY ... WITH ROLLUP). Montos en Decimal.
+    """
+
+    def __init__(self, tenant_id=None):
+        # Empresa a la que se limita el libro (None: todas)
+        self.tenant_id = tenant_id
+
+    def _objects(self, model):
+        if self.tenant_id is None:
+            return model.objects.all()
+        return model.objects.filter(reflexo_id=self.tenant_id)
+
+    def ledger_queryset(self, start, end):
+        """
+        UNION ALL (values) de ambas fuentes entre dos datetimes [start, end),
+        cada una con su tabla activa y su tabla de archivo.
+        """
+        def appointments(model):
+            return (
+                self._objects(model)
+                .filter(day_window("appointment_day", start, end), appointment_date__gte=start, appointment_date__lt=end, payment__isnull=False, payment__gt=0)
+                .annotate(
+                    tipo=Value("Cita", output_field=CharField()),
+                    orden=Value(0, output_field=IntegerField()),
+                    ref_id=F("id"),
+                    numero=Coalesce(
+                        NullIf("ticket_number", Value("")),
+                        Concat(Value("CITA-"), Cast("id", CharField())),
+                        output_field=CharField(),
+                    ),
+                    monto=F("payment"),
+                    metodo=Coalesce(NullIf("payment_type__name", Value("")), Value("No especificado"), output_field=CharField()),
+                    pac_paterno=F("patient__paternal_lastname"),
+                    pac_materno=F("patient__maternal_lastname"),
+                    pac_nombre=F("patient__name"),
+                    ter_paterno=F("therapist__last_name_paternal"),
+                    ter_materno=F("therapist__last_name_maternal"),
+                    ter_nombre=F("therapist__first_name"),
+                    fecha=F("appointment_date"),
+                )
+                .values(*LEDGER_COLUMNS)
+                .order_by()
+            )
+
+        def tickets(model):
+            return (
+                self._objects(model)
+                .filter(day_window("payment_day", start, end), payment_date__gte=start, payment_date__lt=end, status="paid", amount__gt=0)
+                .annotate(
+                    tipo=Value("Ticket", output_field=CharField()),
+                    orden=Value(1, output_field=IntegerField()),
+                    ref_id=F("id"),
+                    numero=F("ticket_number"),
+                    monto=F("amount"),
+                    metodo=Coalesce("payment_method", Value("No especificado"), output_field=CharField()),
+                    pac_paterno=F("appointment__patient__paternal_lastname"),
+                    pac_materno=F("appointment__patient__maternal_lastname"),
+                    pac_nombre=F("appointment__patient__name"),
+                    ter_paterno=F("appointment__therapist__last_name_paternal"),
+                    ter_materno=F("appointment__therapist__last_name_maternal"),
+                    ter_nombre=F("appointment__therapist__first_name"),
+                    fecha=F("payment_date"),
+                )
+                .values(*LEDGER_COLUMNS)
+                .order_by()
+            )
+        return appointments(Appointment).union(
+            appointments(archive_of(Appointment)), tickets(Ticket), tickets(archive_of(Ticket)), all=True
+        )
+
+    def _rollup_sql(self, start, end):
+        inner_sql, params = self.ledger_queryset(start, end).query.sql_with_params()
+        qn = connection.ops.quote_name
+        keys = f"{qn('metodo')}, {qn('orden')}, {qn('ref_id')}"
+        details = ", ".join(f"MAX({qn(c)})" for c in _DETAIL_COLUMNS)
+        select = f"SELECT {keys}, SUM({qn('monto')}), COUNT(*), {details} FROM ledger"
+
+        if connection.vendor == "mysql":
+            sql = f"{select.replace('FROM ledger', f'FROM ({inner_sql}) ledger')} GROUP BY {keys} WITH ROLLUP"
+        elif connection.vendor == "postgresql":
+            sql = f"{select.replace('FROM ledger', f'FROM ({inner_sql}) ledger')} GROUP BY ROLLUP ({keys})"
+        else:
+            # Sin ROLLUP (p. ej. SQLite en desarrollo): mismos niveles con UNION ALL sobre un CTE
+            blanks = ", ".join("NULL" for _ in _DETAIL_COLUMNS)
+            sql = (
+                f"WITH ledger AS ({inner_sql}) "
+                f"{select} GROUP BY {keys} "
+                f"UNION ALL SELECT {qn('metodo')}, NULL, NULL, SUM({qn('monto')}), COUNT(*), {blanks} FROM ledger GROUP BY {qn('metodo')} "
+                f"UNION ALL SELECT NULL, NULL, NULL, SUM({qn('monto')}), COUNT(*), {blanks} FROM ledger"
+            )
+        return sql, params
+
+    @staticmethod
+    def _decimal(value):
+        if value is None:
+            return Decimal("0.00")
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return value.quantize(CENTS)
+
+    @staticmethod
+    def _datetime(value):
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value is not None and timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        return value
+
+    @staticmethod
+    def _full_name(*parts):
+        return " ".join(p or "" for p in parts).strip()
+
+    def get_ledger(self, start, end):
+        """
+        Devuelve (pagos, resumen_por_metodo, total_general, cantidad_total) para [start, end).
+        Pagos con las mismas claves que PAYMENT_DETAIL_FIELDS: primero citas y luego
+        tickets, cada grupo por monto descendente.
+        """
+        sql, params = self._rollup_sql(start, end)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        payments, summary = [], []
+        total, count = Decimal("0.00"), 0
+        for metodo, orden, ref_id, monto, cantidad, *detail in rows:
+            detail = dict(zip(_DETAIL_COLUMNS, detail))
+            if metodo is None:
+                # Fila del total general (ROLLUP)
+                total, count = self._decimal(monto), cantidad
+            elif orden is None:
+                # Subtotal por método
+                summary.append({"metodo": metodo, "cantidad_pagos": cantidad, "total": self._decimal(monto)})
+            elif ref_id is not None:
+                payments.append({
+                    "tipo": detail["tipo"],
+                    "id": ref_id,
+                    "ticket_number": detail["numero"],
+                    "monto": self._decimal(monto),
+                    "metodo_pago": metodo,
+                    "paciente": self._full_name(detail["pac_paterno"], detail["pac_materno"], detail["pac_nombre"]),
+                    "terapeuta": self._full_name(detail["ter_paterno"], detail["ter_materno"], detail["ter_nombre"]),
+                    "fecha_pago": timezone.localtime(self._datetime(detail["fecha"])).strftime("%Y-%m-%d"),
+                    "_orden": orden,
+                })
+            # (metodo, orden, NULL): nivel intermedio del ROLLUP, no se usa
+
+        payments.sort(key=lambda p: (p.pop("_orden"), -p["monto"]))
+        summary.sort(key=lambda s: s["total"], reverse=True)
+        return payments, summary, total, count
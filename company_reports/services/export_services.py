@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+import xlsxwriter
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Formatos de exportación por streaming (una fila por línea, sin armar el documento completo)
+STREAM_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _LineBuffer:
+    """Pseudo-buffer para csv.writer: devuelve la línea en lugar de acumularla."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, fieldnames):
+    """Codifica un iterable de dicts como CSV, línea por línea (encabezado incluido)."""
+    writer = csv.DictWriter(_LineBuffer(), fieldnames=fieldnames, extrasaction="ignore")
+    yield writer.writerow(dict(zip(fieldnames, fieldnames)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows):
+    """Codifica un iterable de dicts como JSON delimitado por saltos de línea."""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def iter_export(rows, fmt, fieldnames):
+    """Selecciona el codificador según el formato solicitado ('csv' | 'ndjson')."""
+    if fmt == "csv":
+        return iter_csv(rows, fieldnames)
+    if fmt == "ndjson":
+        return iter_ndjson(rows)
+    raise ValueError(f"Formato de exportación no soportado: {fmt}")
+
+
+# ===========================
+#   Excel
+# ===========================
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ExcelReportBuilder:
+    """Arma los libros Excel de los reportes (bytes), para la vista síncrona y los jobs en Celery."""
+
+    @staticmethod
+    def _workbook(sheet_name):
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+        worksheet = workbook.add_worksheet(sheet_name)
+
+        # Formato encabezado
+        header_format = workbook.add_format(
+            {"bold": True, "bg_color": "#2c3e50", "font_color": "white", "border": 1}
+        )
+        return output, workbook, worksheet, header_format
+
+    @staticmethod
+    def citas(data):
+        """Citas entre fechas (filas de get_appointments_between_dates)."""
+        output, workbook, worksheet, header_format = ExcelReportBuilder._workbook("Citas")
+
+        # Encabezados alineados con AppointmentRangeSerializer
+        headers = [
+            "ID Paciente",
+            "DNI/Documento",
+            "Paciente",
+            "Teléfono",
+            "Fecha",
+            "Hora",
+        ]
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+
+        # Escribir datos
+        for row, appointment in enumerate(data, start=1):
+            worksheet.write(row, 0, appointment.get("patient_id", ""))
+            worksheet.write(row, 1, appointment.get("document_number_patient", ""))
+            worksheet.write(row, 2, appointment.get("patient", ""))
+            worksheet.write(row, 3, appointment.get("phone1_patient", ""))
+            worksheet.write(row, 4, appointment.get("appointment_date", ""))
+            worksheet.write(row, 5, appointment.get("hour", ""))
+
+        # Anchos de columna
+        worksheet.set_column("A:A", 12)
+        worksheet.set_column("B:B", 15)
+        worksheet.set_column("C:C", 40)
+        worksheet.set_column("D:D", 15)
+        worksheet.set_column("E:E", 12)
+        worksheet.set_column("F:F", 10)
+
+        workbook.close()
+        return output.getvalue()
+
+    @staticmethod
+    def caja_chica_mejorada(data):
+        """Reporte mejorado de caja chica (resultado de get_improved_daily_cash)."""
+        output, workbook, worksheet, header_format = ExcelReportBuilder._workbook("Caja Chica")
+
+        # Encabezados para el reporte de caja chica
+        headers = [
+            "Tipo",
+            "ID",
+            "Número Ticket",
+            "Monto",
+            "Método Pago",
+            "Paciente",
+            "Terapeuta",
+            "Fecha Pago",
+        ]
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+
+        # Escribir datos
+        for row, payment in enumerate(data.get("pagos_detallados", []), start=1):
+            worksheet.write(row, 0, payment.get("tipo", ""))
+            worksheet.write(row, 1, payment.get("id", ""))
+            worksheet.write(row, 2, payment.get("ticket_number", ""))
+            worksheet.write(row, 3, payment.get("monto", 0))
+            worksheet.write(row, 4, payment.get("metodo_pago", ""))
+            worksheet.write(row, 5, payment.get("paciente", ""))
+            worksheet.write(row, 6, payment.get("terapeuta", ""))
+            worksheet.write(row, 7, payment.get("fecha_pago", ""))
+
+        # Anchos de columna
+        worksheet.set_column("A:A", 10)
+        worksheet.set_column("B:B", 8)
+        worksheet.set_column("C:C", 20)
+        worksheet.set_column("D:D", 12)
+        worksheet.set_column("E:E", 15)
+        worksheet.set_column("F:F", 30)
+        worksheet.set_column("G:G", 30)
+        worksheet.set_column("H:H", 12)
+
+        # Agregar resumen
+        worksheet.write(len(data.get("pagos_detallados", [])) + 3, 0, "RESUMEN:", header_format)
+        worksheet.write(len(data.get("pagos_detallados", [])) + 4, 0, "Total General:")
+        worksheet.write(len(data.get("pagos_detallados", [])) + 4, 3, data.get("total_general", 0))
+
+        workbook.close()
+        return output.getvalue()
+
+    @staticmethod
+    def tickets_pagados(data):
+        """Reporte diario de tickets pagados (resultado de get_daily_paid_tickets)."""
+        output, workbook, worksheet, header_format = ExcelReportBuilder._workbook("Tickets Pagados")
+
+        # Encabezados para el reporte de tickets pagados
+        headers = [
+            "Número Ticket",
+            "Monto",
+            "Método Pago",
+            "Fecha Pago",
+            "Paciente",
+            "Documento",
+            "Teléfono",
+            "Terapeuta",
+            "Licencia",
+            "Fecha Cita",
+            "Hora Cita",
+            "Consultorio",
+        ]
+        for col, header in enumerate(headers):
+            worksheet.write(0, col, header, header_format)
+
+        # Escribir datos
+        for row, ticket in enumerate(data.get("tickets_pagados", []), start=1):
+            worksheet.write(row, 0, ticket.get("numero_ticket", ""))
+            worksheet.write(row, 1, ticket.get("monto", 0))
+            worksheet.write(row, 2, ticket.get("metodo_pago", ""))
+            worksheet.write(row, 3, ticket.get("fecha_pago", ""))
+            worksheet.write(row, 4, ticket.get("paciente_nombre", ""))
+            worksheet.write(row, 5, ticket.get("paciente_documento", ""))
+            worksheet.write(row, 6, ticket.get("paciente_telefono", ""))
+            worksheet.write(row, 7, ticket.get("terapeuta_nombre", ""))
+            worksheet.write(row, 8, ticket.get("terapeuta_licencia", ""))
+            worksheet.write(row, 9, ticket.get("fecha_cita", ""))
+            worksheet.write(row, 10, ticket.get("hora_cita", ""))
+            worksheet.write(row, 11, ticket.get("consultorio", ""))
+
+        # Anchos de columna
+        worksheet.set_column("A:A", 20)  # Número Ticket
+        worksheet.set_column("B:B", 12)  # Monto
+        worksheet.set_column("C:C", 15)  # Método Pago
+        worksheet.set_column("D:D", 18)  # Fecha Pago
+        worksheet.set_column("E:E", 30)  # Paciente
+        worksheet.set_column("F:F", 15)  # Documento
+        worksheet.set_column("G:G", 15)  # Teléfono
+        worksheet.set_column("H:H", 30)  # Terapeuta
+        worksheet.set_column("I:I", 15)  # Licencia
+        worksheet.set_column("J:J", 12)  # Fecha Cita
+        worksheet.set_column("K:K", 10)  # Hora Cita
+        worksheet.set_column("L:L", 12)  # Consultorio
+
+        # Agregar resumen
+        worksheet.write(len(data.get("tickets_pagados", [])) + 3, 0, "RESUMEN:", header_format)
+        worksheet.write(len(data.get("tickets_pagados", [])) + 4, 0, "Total General:")
+        worksheet.write(len(data.get("tickets_pagados", [])) + 4, 1, data.get("total_general", 0))
+        worksheet.write(len(data.get("tickets_pagados", [])) + 5, 0, "Cantidad Tickets:")
+        worksheet.write(len(data.get("tickets_pagados", [])) + 5, 1, data.get("cantidad_tickets", 0))
+
+        workbook.close()
+        return output.getvalue()
@@ -0,0 +1,126 @@
+import logging
+import tempfile
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from company_reports.models.report_job import ReportJob
+from company_reports.serialiazers.reports_serializers import DateParameterSerializer
+from company_reports.services.reports_services import (
+    ReportService,
+    APPOINTMENT_RANGE_FIELDS,
+    PAYMENT_DETAIL_FIELDS,
+    PAID_TICKET_FIELDS,
+)
+from company_reports.services.export_services import ExcelReportBuilder, STREAM_FORMATS, iter_export
+from architect.utils.tenant import get_tenant
+
+logger = logging.getLogger(__name__)
+
+# Reportes que se pueden pedir en segundo plano:
+#  - xlsx: reporte completo (mismo libro que /exports/excel/...)
+#  - csv/ndjson: detalle fila a fila por streaming (mismo contenido que ?format=...)
+# xlsx_range: False si el libro xlsx es de un solo día ('date'); el rango solo
+# se acepta en csv/ndjson
+REPORT_JOB_TYPES = {
+    "citas": {
+        "report": "get_appointments_between_dates",
+        "rows": "iter_appointments_between_dates",
+        "excel": ExcelReportBuilder.citas,
+        "fields": APPOINTMENT_RANGE_FIELDS,
+        "requires_range": True,
+        "xlsx_range": True,
+    },
+    "caja_chica_mejorada": {
+        "report": "get_improved_daily_cash",
+        "rows": "iter_improved_daily_cash",
+        "excel": ExcelReportBuilder.caja_chica_mejorada,
+        "fields": PAYMENT_DETAIL_FIELDS,
+        "requires_range": False,
+        "xlsx_range": False,
+    },
+    "tickets_pagados": {
+        "report": "get_daily_paid_tickets",
+        "rows": "iter_daily_paid_tickets",
+        "excel": ExcelReportBuilder.tickets_pagados,
+        "fields": PAID_TICKET_FIELDS,
+        "requires_range": False,
+        "xlsx_range": False,
+    },
+}
+JOB_FORMATS = ("xlsx", *STREAM_FORMATS)
+
+# Por encima de este tamaño el archivo temporal pasa de memoria a disco
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class ReportJobService:
+    """Alta, ejecución y consulta de jobs de reportes."""
+
+
+    def submit(self, user, report, fmt, params):
+        """
+        Registra el job y lo encola al confirmar la transacción.
+        Sin REDIS_URL (CELERY_TASK_ALWAYS_EAGER) la tarea corre en el mismo proceso.
+        """
+        from company_reports.tasks import generate_report_job
+
+        job = ReportJob.objects.create(
+            reflexo_id=get_tenant(user),
+            requested_by=user if getattr(user, "is_authenticated", False) else None,
+            report=report,
+            format=fmt,
+            params=params,
+        )
+        transaction.on_commit(lambda: generate_report_job.delay(job.id))
+        return job
+
+    def run(self, job_id, task_id=None):
+        """Genera el artefacto del job y lo guarda en default_storage."""
+        job = ReportJob.objects.get(pk=job_id)
+        if job.status == ReportJob.STATUS_DONE:
+            return job
+
+        job.status = ReportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.task_id = task_id
+        job.error = None
+        job.save(update_fields=["status", "started_at", "task_id", "error"])
+
+        try:
+            # Datos solo de la empresa del job (sin empresa: administrador global, todas)
+            report_service = ReportService(tenant_id=job.reflexo_id)
+            spec = REPORT_JOB_TYPES[job.report]
+            serializer = DateParameterSerializer(data=job.params)
+            serializer.is_valid(raise_exception=True)
+            validated = serializer.validated_data
+
+            start_date, end_date = report_service.date_bounds(validated)
+            if job.format == "xlsx" and not spec["xlsx_range"]:
+                if validated.get("start_date") and validated.get("end_date"):
+                    raise ValueError(f"El libro xlsx de {job.report} es de un solo día: use 'date' o csv/ndjson")
+                start_date = end_date = validated["date"]
+            # Nombre con las fechas realmente reportadas
+            filename = f"{job.report}_{start_date}_a_{end_date}.{job.format}"
+
+            if job.format == "xlsx":
+                data = getattr(report_service, spec["report"])(validated)
+                job.file.save(filename, ContentFile(spec["excel"](data)), save=False)
+            else:
+                rows = getattr(report_service, spec["rows"])(validated)
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as tmp:
+                    for chunk in iter_export(rows, job.format, spec["fields"]):
+                        tmp.write(chunk.encode("utf-8"))
+                    tmp.seek(0)
+                    job.file.save(filename, File(tmp), save=False)
+
+            job.status = ReportJob.STATUS_DONE
+        except Exception as e:
+            logger.exception("Job de reporte %s falló", job.pk)
+            job.status = ReportJob.STATUS_FAILED
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "file", "error", "finished_at"])
+        return job
@@ -1,39 +1,148 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.utils import timezone
 from django.utils.timezone import localtime
 from django.db.models import Count, Q, CharField, Value, Sum
 from django.db.models.functions import Concat, TruncDate
 from appointments_status.models.appointment import Appointment
 from appointments_status.models.ticket import Ticket
 from therapists.models.therapist import Therapist
+from architect.utils.archive import with_archive
+from architect.utils.partitions import day_window
+from architect.utils.db import stream_values
+from company_reports.services.cash_ledger_services import CashLedgerService
 
 
 # from django.db import models  # 👈 no se usa
 
+# Columnas de las exportaciones por streaming (mismo orden que las filas JSON)
+APPOINTMENT_RANGE_FIELDS = [
+    "appointment_id", "patient_id", "document_number_patient", "patient",
+    "phone1_patient", "appointment_date", "hour",
+]
+PAYMENT_DETAIL_FIELDS = [
+    "tipo", "id", "ticket_number", "monto", "metodo_pago", "paciente", "terapeuta", "fecha_pago",
+]
+PAID_TICKET_FIELDS = [
+    "ticket_id", "numero_ticket", "monto", "metodo_pago", "fecha_pago", "descripcion",
+    "cita_id", "fecha_cita", "hora_cita", "consultorio", "tipo_pago_cita",
+    "paciente_nombre", "paciente_documento", "paciente_telefono",
+    "terapeuta_nombre", "terapeuta_licencia",
+]
+
+
 class ReportService:
-    def get_appointments_count_by_therapist(self, validated_data):
+    def __init__(self, tenant_id=None):
+        # Empresa a la que se limitan los reportes (None: todas, p. ej. administrador global)
+        self.tenant_id = tenant_id
+
+    # --------- Helpers ---------
+    def _objects(self, model):
+        """Manager de ``model`` (tabla activa o de archivo) limitado a la empresa del servicio."""
+        if self.tenant_id is None:
+            return model.objects.all()
+        return model.objects.filter(reflexo_id=self.tenant_id)
+
+    @staticmethod
+    def date_bounds(validated_data):
+        """Rango [inicio, fin] de días: start_date/end_date si vienen, si no el día 'date'."""
+        start_date = validated_data.get("start_date")
+        end_date = validated_data.get("end_date")
+        if start_date and end_date:
+            return start_date, end_date
+        query_date = validated_data.get("date")
+        return query_date, query_date
+
+    @staticmethod
+    def _datetime_bounds(start_date, end_date):
         """
-        Conteo de TODAS las citas por terapeuta para una fecha dada.
-        Agrupa desde Appointment para evitar problemas de related_name.
+        Convierte un rango de días a [desde, hasta) en datetimes aware.
+        Filtrar por rango (en lugar de __date=) permite usar los índices de la columna.
         """
-        query_date = validated_data.get("date")
+        start = timezone.make_aware(datetime.combine(start_date, time.min))
+        end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+        return start, end
 
-        # Si appointment_date es DateField, basta con igualdad.
-        # Si es DateTimeField, usamos TruncDate para comparar el día.
-        # Esta versión funciona en ambos casos (TruncDate ⇒ date-only).
-        qs = (
-            Appointment.objects
-            .filter(therapist__isnull=False)
-            .annotate(day=TruncDate("appointment_date"))
-            .filter(day=query_date)
-            .values(
-                "therapist_id",
-                "therapist__first_name",
-                "therapist__last_name_paternal",
-                "therapist__last_name_maternal",
-            )
-            .annotate(appointments_count=Count("id"))
-        )
+    @staticmethod
+    def _full_name(*parts):
+        return " ".join(p or "" for p in parts).strip()
+
+    def _appointment_payment_row(self, payment, fecha_pago):
+        return {
+            "tipo": "Cita",
+            "id": payment['id'],
+            "ticket_number": payment['ticket_number'] or f"CITA-{payment['id']}",
+            "monto": float(payment['payment']),
+            "metodo_pago": payment['payment_type__name'] or "No especificado",
+            "paciente": self._full_name(payment['patient__paternal_lastname'], payment['patient__maternal_lastname'], payment['patient__name']),
+            "terapeuta": self._full_name(payment['therapist__last_name_paternal'], payment['therapist__last_name_maternal'], payment['therapist__first_name']),
+            "fecha_pago": fecha_pago,
+        }
+
+    def _ticket_payment_row(self, payment, fecha_pago):
+        return {
+            "tipo": "Ticket",
+            "id": payment['id'],
+            "ticket_number": payment['ticket_number'],
+            "monto": float(payment['amount']),
+            "metodo_pago": payment['payment_method'],
+            "paciente": self._full_name(payment['appointment__patient__paternal_lastname'], payment['appointment__patient__maternal_lastname'], payment['appointment__patient__name']),
+            "terapeuta": self._full_name(payment['appointment__therapist__last_name_paternal'], payment['appointment__therapist__last_name_maternal'], payment['appointment__therapist__first_name']),
+            "fecha_pago": fecha_pago,
+        }
+
+    def _paid_ticket_row(self, ticket):
+        # Formatear fecha y hora de la cita
+        appointment_datetime = ticket['appointment__appointment_date']
+        appointment_date = appointment_datetime.strftime("%Y-%m-%d") if appointment_datetime else "No programada"
+        appointment_time = ticket['appointment__hour'].strftime("%H:%M") if ticket['appointment__hour'] else "No especificada"
+
+        # Formatear fecha de pago
+        payment_datetime = ticket['payment_date']
+        payment_date = payment_datetime.strftime("%Y-%m-%d %H:%M") if payment_datetime else "No especificada"
 
+        return {
+            "ticket_id": ticket['id'],
+            "numero_ticket": ticket['ticket_number'],
+            "monto": float(ticket['amount']),
+            "metodo_pago": ticket['payment_method'],
+            "fecha_pago": payment_date,
+            "descripcion": ticket['description'] or "Sin descripción",
+
+            # Información de la cita
+            "cita_id": ticket['appointment__id'],
+            "fecha_cita": appointment_date,
+            "hora_cita": appointment_time,
+            "consultorio": ticket['appointment__room'] or "No especificado",
+            "tipo_pago_cita": ticket['appointment__payment_type__name'] or "No especificado",
+
+            # Información del paciente
+            "paciente_nombre": self._full_name(ticket['appointment__patient__paternal_lastname'], ticket['appointment__patient__maternal_lastname'], ticket['appointment__patient__name']),
+            "paciente_documento": ticket['appointment__patient__document_number'] or "No especificado",
+            "paciente_telefono": ticket['appointment__patient__phone1'] or "No especificado",
+
+            # Información del terapeuta
+            "terapeuta_nombre": self._full_name(ticket['appointment__therapist__last_name_paternal'], ticket['appointment__therapist__last_name_maternal'], ticket['appointment__therapist__first_name']),
+            "terapeuta_licencia": "No especificado"
+        }
+
+    @staticmethod
+    def _merge_counts(rows, count_field):
+        """
+        Suma los conteos de filas agrupadas que llegan repetidas (una por tabla:
+        activa y archivo, ver with_archive), conservando el orden de llegada.
+        """
+        merged = {}
+        for row in rows:
+            key = tuple(value for name, value in row.items() if name != count_field)
+            if key in merged:
+                merged[key][count_field] += row[count_field]
+            else:
+                merged[key] = dict(row)
+        return list(merged.values())
+
+    def _therapist_counts(self, rows):
+        """Arma el payload de citas por terapeuta a partir de filas agrupadas (values + Count)."""
         therapists = [
             {
                 "id": row["therapist_id"],
@@ -42,7 +151,7 @@ class ReportService:
                 "last_name_maternal": row["therapist__last_name_maternal"],
                 "appointments_count": row["appointments_count"],
             }
-            for row in qs
+            for row in rows
         ]
 
         # Ordenar por mayor número de citas (como antes)
@@ -55,71 +164,147 @@ class ReportService:
             "total_appointments_count": total_appointments,
         }
 
-    def get_patients_by_therapist(self, validated_data):
-        """Pacientes agrupados por terapeuta para una fecha dada."""
-        query_date = validated_data.get("date")
-
-        appointments = (
-            Appointment.objects
-            .select_related("patient", "therapist")
-            .annotate(day=TruncDate("appointment_date"))
-            .filter(day=query_date)
-        )
-
+    def _group_patients_by_therapist(self, rows):
+        """
+        Agrupa filas (terapeuta, paciente, appointments) en la estructura del reporte
+        de pacientes por terapeuta; las citas sin terapeuta van al grupo "sinTherapist".
+        """
         report = {}
         sin_terapeuta = {
             "therapist_id": "",
             "therapist": "Sin terapeuta asignado",
-            "patients": {}
+            "patients": []
         }
 
-        for appointment in appointments:
-            patient = appointment.patient
-            therapist = appointment.therapist
-            if not patient:
-                continue
-
+        for row in rows:
             patient_data = {
-                "patient_id": patient.id,
-                "patient": f"{patient.paternal_lastname} {patient.maternal_lastname or ''} {patient.name}".strip(),
-                "appointments": 0,
+                "patient_id": row["patient_id"],
+                "patient": f"{row['patient__paternal_lastname'] or ''} {row['patient__maternal_lastname'] or ''} {row['patient__name']}".strip(),
+                "appointments": row["appointments"],
             }
 
-            if not therapist:
-                key = patient.id
-                if key not in sin_terapeuta["patients"]:
-                    sin_terapeuta["patients"][key] = patient_data
-                sin_terapeuta["patients"][key]["appointments"] += 1
-            else:
-                t_id = therapist.id
-                if t_id not in report:
-                    report[t_id] = {
-                        "therapist_id": t_id,
-                        # usa first_name (no existe 'name' en el modelo)
-                        "therapist": f"{therapist.last_name_paternal} {therapist.last_name_maternal or ''} {therapist.first_name}".strip(),
-                        "patients": {}
-                    }
-                key = patient.id
-                if key not in report[t_id]["patients"]:
-                    report[t_id]["patients"][key] = patient_data
-                report[t_id]["patients"][key]["appointments"] += 1
+            t_id = row["therapist_id"]
+            if t_id is None:
+                sin_terapeuta["patients"].append(patient_data)
+                continue
+
+            if t_id not in report:
+                report[t_id] = {
+                    "therapist_id": t_id,
+                    # usa first_name (no existe 'name' en el modelo)
+                    "therapist": f"{row['therapist__last_name_paternal']} {row['therapist__last_name_maternal'] or ''} {row['therapist__first_name']}".strip(),
+                    "patients": []
+                }
+            report[t_id]["patients"].append(patient_data)
 
         # Agregar grupo "sin terapeuta" si aplica
         if sin_terapeuta["patients"]:
             report["sinTherapist"] = sin_terapeuta
 
-        # Convertir dicts de pacientes a listas
-        for therapist_id in list(report.keys()):
-            report[therapist_id]["patients"] = list(report[therapist_id]["patients"].values())
-
         return list(report.values())
 
+    @staticmethod
+    def _daily_cash_row(p):
+        return {
+            "id_cita": p['id'],
+            "payment": p['payment'],
+            "payment_type": p['payment_type'],
+            "payment_type_name": p['payment_type__name']
+        }
+
+    def _paid_tickets_payload(self, query_date, tickets_data):
+        """Totales y resumen por método de pago de una lista de tickets pagados."""
+        total_amount = sum(t['monto'] for t in tickets_data)
+
+        # Calcular resumen por método de pago
+        payment_methods_summary = {}
+        for ticket in tickets_data:
+            metodo = ticket['metodo_pago']
+            monto = ticket['monto']
+            
+            if metodo not in payment_methods_summary:
+                payment_methods_summary[metodo] = {
+                    'metodo': metodo,
+                    'cantidad_tickets': 0,
+                    'total': 0.0
+                }
+            
+            payment_methods_summary[metodo]['cantidad_tickets'] += 1
+            payment_methods_summary[metodo]['total'] += monto
+
+        # Convertir a lista y ordenar por total
+        payment_methods_list = list(payment_methods_summary.values())
+        payment_methods_list.sort(key=lambda x: x['total'], reverse=True)
+
+        return {
+            "fecha": query_date.strftime("%Y-%m-%d"),
+            "tickets_pagados": tickets_data,
+            "resumen_por_metodo": payment_methods_list,
+            "total_general": round(total_amount, 2),
+            "cantidad_tickets": len(tickets_data),
+            "metodos_pago_utilizados": list(payment_methods_summary.keys())
+        }
+
+    def get_appointments_count_by_therapist(self, validated_data):
+        """
+        Conteo de TODAS las citas por terapeuta para una fecha dada.
+        Agrupa desde Appointment para evitar problemas de related_name.
+        """
+        query_date = validated_data.get("date")
+        start, end = self._datetime_bounds(query_date, query_date)
+
+        # Si appointment_date es DateField, basta con igualdad.
+        # Si es DateTimeField, usamos TruncDate para comparar el día.
+        # Esta versión funciona en ambos casos (TruncDate ⇒ date-only).
+        # day_window acota antes por la columna de partición (no se puede con TruncDate).
+        qs = with_archive(lambda model: (
+            self._objects(model)
+            .filter(day_window("appointment_day", start, end), therapist__isnull=False)
+            .annotate(day=TruncDate("appointment_date"))
+            .filter(day=query_date)
+            .values(
+                "therapist_id",
+                "therapist__first_name",
+                "therapist__last_name_paternal",
+                "therapist__last_name_maternal",
+            )
+            .annotate(appointments_count=Count("id"))
+        ), Appointment)
+
+        return self._therapist_counts(self._merge_counts(qs, "appointments_count"))
+
+    def get_patients_by_therapist(self, validated_data, chunk_size=2000):
+        """
+        Pacientes agrupados por terapeuta para una fecha dada.
+        El conteo por (terapeuta, paciente) se hace en SQL y solo se leen las
+        columnas necesarias; no se instancian modelos.
+        """
+        query_date = validated_data.get("date")
+        start, end = self._datetime_bounds(query_date, query_date)
+
+        rows = with_archive(lambda model: (
+            self._objects(model)
+            .filter(day_window("appointment_day", start, end), appointment_date__gte=start, appointment_date__lt=end)
+            .values(
+                "therapist_id",
+                "therapist__first_name",
+                "therapist__last_name_paternal",
+                "therapist__last_name_maternal",
+                "patient_id",
+                "patient__name",
+                "patient__paternal_lastname",
+                "patient__maternal_lastname",
+            )
+            .annotate(appointments=Count("id"))
+        ), Appointment).order_by("therapist__last_name_paternal", "therapist_id", "patient__paternal_lastname", "patient_id")
+        return self._group_patients_by_therapist(self._merge_counts(stream_values(rows, chunk_size), "appointments"))
+
     def get_daily_cash(self, validated_data):
         """Resumen diario de efectivo detallado por cita."""
         query_date = validated_data.get("date")
 
-        payments = (
-            Appointment.objects
+        payments = with_archive(lambda model: (
+            self._objects(model)
             .filter(
                 appointment_date=query_date,
                 payment__isnull=False,
@@ -131,36 +316,24 @@ class ReportService:
                 'payment_type',
                 'payment_type__name'
             )
-            .order_by('-id')
-        )
+        ), Appointment).order_by('-id')
 
-        result = [
-            {
-                "id_cita": p['id'],
-                "payment": p['payment'],
-                "payment_type": p['payment_type'],
-                "payment_type_name": p['payment_type__name']
-            }
-            for p in payments
-        ]
-        return result
+        return [self._daily_cash_row(p) for p in payments]
 
-    def get_improved_daily_cash(self, validated_data):
-        """
-        Reporte mejorado de caja chica con información detallada de pagos.
-        Incluye resumen por tipo de pago y totales.
-        """
-        query_date = validated_data.get("date")
+    def _improved_cash_querysets(self, start_date, end_date):
+        """Pagos de citas y de tickets (values) dentro del rango de días dado."""
+        start, end = self._datetime_bounds(start_date, end_date)
 
         # Obtener pagos de citas
-        appointment_payments = (
-            Appointment.objects
+        appointment_payments = with_archive(lambda model: (
+            self._objects(model)
             .filter(
-                appointment_date__date=query_date,
+                day_window("appointment_day", start, end),
+                appointment_date__gte=start,
+                appointment_date__lt=end,
                 payment__isnull=False,
                 payment__gt=0
             )
-            .select_related('payment_type', 'patient', 'therapist')
             .values(
                 'id',
                 'payment',
@@ -171,20 +344,21 @@ class ReportService:
                 'therapist__first_name',
                 'therapist__last_name_paternal',
                 'therapist__last_name_maternal',
-                'ticket_number'
+                'ticket_number',
+                'appointment_date',
             )
-            .order_by('-payment')
-        )
+        ), Appointment).order_by('-payment')
 
         # Obtener pagos de tickets
-        ticket_payments = (
-            Ticket.objects
+        ticket_payments = with_archive(lambda model: (
+            self._objects(model)
             .filter(
-                payment_date__date=query_date,
+                day_window("payment_day", start, end),
+                payment_date__gte=start,
+                payment_date__lt=end,
                 status='paid',
                 amount__gt=0
             )
-            .select_related('appointment__patient', 'appointment__therapist')
             .values(
                 'id',
                 'amount',
@@ -195,99 +369,41 @@ class ReportService:
                 'appointment__patient__maternal_lastname',
                 'appointment__therapist__first_name',
                 'appointment__therapist__last_name_paternal',
-                'appointment__therapist__last_name_maternal'
+                'appointment__therapist__last_name_maternal',
+                'payment_date',
             )
-            .order_by('-amount')
-        )
-
-        # Procesar pagos de citas
-        appointment_data = []
-        for payment in appointment_payments:
-            patient_name = f"{payment['patient__paternal_lastname'] or ''} {payment['patient__maternal_lastname'] or ''} {payment['patient__name'] or ''}".strip()
-            therapist_name = f"{payment['therapist__last_name_paternal'] or ''} {payment['therapist__last_name_maternal'] or ''} {payment['therapist__first_name'] or ''}".strip()
-            
-            appointment_data.append({
-                "tipo": "Cita",
-                "id": payment['id'],
-                "ticket_number": payment['ticket_number'] or f"CITA-{payment['id']}",
-                "monto": float(payment['payment']),
-                "metodo_pago": payment['payment_type__name'] or "No especificado",
-                "paciente": patient_name,
-                "terapeuta": therapist_name,
-                "fecha_pago": query_date.strftime("%Y-%m-%d")
-            })
-
-        # Procesar pagos de tickets
-        ticket_data = []
-        for payment in ticket_payments:
-            patient_name = f"{payment['appointment__patient__paternal_lastname'] or ''} {payment['appointment__patient__maternal_lastname'] or ''} {payment['appointment__patient__name'] or ''}".strip()
-            therapist_name = f"{payment['appointment__therapist__last_name_paternal'] or ''} {payment['appointment__therapist__last_name_maternal'] or ''} {payment['appointment__therapist__first_name'] or ''}".strip()
-            
-            ticket_data.append({
-                "tipo": "Ticket",
-                "id": payment['id'],
-                "ticket_number": payment['ticket_number'],
-                "monto": float(payment['amount']),
-                "metodo_pago": payment['payment_method'],
-                "paciente": patient_name,
-                "terapeuta": therapist_name,
-                "fecha_pago": query_date.strftime("%Y-%m-%d")
-            })
-
-        # Combinar todos los pagos
-        all_payments = appointment_data + ticket_data
-        
-        # Calcular totales por método de pago
-        payment_summary = {}
-        total_general = 0
-        
-        for payment in all_payments:
-            metodo = payment['metodo_pago']
-            monto = payment['monto']
-            
-            if metodo not in payment_summary:
-                payment_summary[metodo] = {
-                    'metodo': metodo,
-                    'cantidad_pagos': 0,
-                    'total': 0.0
-                }
-            
-            payment_summary[metodo]['cantidad_pagos'] += 1
-            payment_summary[metodo]['total'] += monto
-            total_general += monto
+        ), Ticket).order_by('-amount')
+        return appointment_payments, ticket_payments
 
-        # Convertir a lista y ordenar por total
-        payment_summary_list = list(payment_summary.values())
-        payment_summary_list.sort(key=lambda x: x['total'], reverse=True)
+    def get_improved_daily_cash(self, validated_data):
+        """
+        Reporte mejorado de caja chica con información detallada de pagos.
+        Incluye resumen por tipo de pago y totales (libro unificado, ver CashLedgerService).
+        """
+        query_date = validated_data.get("date")
+        start, end = self._datetime_bounds(query_date, query_date)
+        all_payments, payment_summary_list, total_general, cantidad = CashLedgerService(tenant_id=self.tenant_id).get_ledger(start, end)
 
         return {
             "fecha": query_date.strftime("%Y-%m-%d"),
             "pagos_detallados": all_payments,
             "resumen_por_metodo": payment_summary_list,
-            "total_general": round(total_general, 2),
-            "cantidad_total_pagos": len(all_payments)
+            "total_general": total_general,
+            "cantidad_total_pagos": cantidad
         }
 
-    def get_daily_paid_tickets(self, validated_data):
-        """
-        Reporte diario de todos los tickets PAGADOS.
-        Incluye información detallada de cada ticket pagado.
-        """
-        query_date = validated_data.get("date")
-
-        # Obtener tickets pagados del día
-        paid_tickets = (
-            Ticket.objects
+    def _paid_tickets_queryset(self, start_date, end_date):
+        """Tickets PAGADOS (values) dentro del rango de días dado."""
+        start, end = self._datetime_bounds(start_date, end_date)
+        return with_archive(lambda model: (
+            self._objects(model)
             .filter(
-                payment_date__date=query_date,
+                day_window("payment_day", start, end),
+                payment_date__gte=start,
+                payment_date__lt=end,
                 status='paid',
                 is_active=True
             )
-            .select_related(
-                'appointment__patient',
-                'appointment__therapist',
-                'appointment__payment_type'
-            )
             .values(
                 'id',
                 'ticket_number',
@@ -309,123 +425,193 @@ class ReportService:
                 'appointment__therapist__last_name_paternal',
                 'appointment__therapist__last_name_maternal'
             )
-            .order_by('-payment_date')
-        )
-
-        # Procesar tickets pagados
-        tickets_data = []
-        total_amount = 0.0
-        
-        for ticket in paid_tickets:
-            # Formatear nombre del paciente
-            patient_name = f"{ticket['appointment__patient__paternal_lastname'] or ''} {ticket['appointment__patient__maternal_lastname'] or ''} {ticket['appointment__patient__name'] or ''}".strip()
-            
-            # Formatear nombre del terapeuta
-            therapist_name = f"{ticket['appointment__therapist__last_name_paternal'] or ''} {ticket['appointment__therapist__last_name_maternal'] or ''} {ticket['appointment__therapist__first_name'] or ''}".strip()
-            
-            # Formatear fecha y hora de la cita
-            appointment_datetime = ticket['appointment__appointment_date']
-            appointment_date = appointment_datetime.strftime("%Y-%m-%d") if appointment_datetime else "No programada"
-            appointment_time = ticket['appointment__hour'].strftime("%H:%M") if ticket['appointment__hour'] else "No especificada"
-            
-            # Formatear fecha de pago
-            payment_datetime = ticket['payment_date']
-            payment_date = payment_datetime.strftime("%Y-%m-%d %H:%M") if payment_datetime else "No especificada"
-            
-            ticket_info = {
-                "ticket_id": ticket['id'],
-                "numero_ticket": ticket['ticket_number'],
-                "monto": float(ticket['amount']),
-                "metodo_pago": ticket['payment_method'],
-                "fecha_pago": payment_date,
-                "descripcion": ticket['description'] or "Sin descripción",
-                
-                # Información de la cita
-                "cita_id": ticket['appointment__id'],
-                "fecha_cita": appointment_date,
-                "hora_cita": appointment_time,
-                "consultorio": ticket['appointment__room'] or "No especificado",
-                "tipo_pago_cita": ticket['appointment__payment_type__name'] or "No especificado",
-                
-                # Información del paciente
-                "paciente_nombre": patient_name,
-                "paciente_documento": ticket['appointment__patient__document_number'] or "No especificado",
-                "paciente_telefono": ticket['appointment__patient__phone1'] or "No especificado",
-                
-                # Información del terapeuta
-                "terapeuta_nombre": therapist_name,
-                "terapeuta_licencia": "No especificado"
-            }
-            
-            tickets_data.append(ticket_info)
-            total_amount += float(ticket['amount'])
+        ), Ticket).order_by('-payment_date')
 
-        # Calcular resumen por método de pago
-        payment_methods_summary = {}
-        for ticket in tickets_data:
-            metodo = ticket['metodo_pago']
-            monto = ticket['monto']
-            
-            if metodo not in payment_methods_summary:
-                payment_methods_summary[metodo] = {
-                    'metodo': metodo,
-                    'cantidad_tickets': 0,
-                    'total': 0.0
-                }
-            
-            payment_methods_summary[metodo]['cantidad_tickets'] += 1
-            payment_methods_summary[metodo]['total'] += monto
-
-        # Convertir a lista y ordenar por total
-        payment_methods_list = list(payment_methods_summary.values())
-        payment_methods_list.sort(key=lambda x: x['total'], reverse=True)
+    def get_daily_paid_tickets(self, validated_data):
+        """
+        Reporte diario de todos los tickets PAGADOS.
+        Incluye información detallada de cada ticket pagado.
+        """
+        query_date = validated_data.get("date")
 
-        return {
-            "fecha": query_date.strftime("%Y-%m-%d"),
-            "tickets_pagados": tickets_data,
-            "resumen_por_metodo": payment_methods_list,
-            "total_general": round(total_amount, 2),
-            "cantidad_tickets": len(tickets_data),
-            "metodos_pago_utilizados": list(payment_methods_summary.keys())
-        }
+        # Procesar tickets pagados del día
+        tickets_data = [self._paid_ticket_row(t) for t in self._paid_tickets_queryset(query_date, query_date)]
+        return self._paid_tickets_payload(query_date, tickets_data)
 
     def get_appointments_between_dates(self, validated_data):
-        """Citas entre dos fechas dadas."""
-        start_date = validated_data.get("start_date")
-        end_date = validated_data.get("end_date")
+        """Citas entre dos fechas dadas (values() por bloques, ver iter_appointments_between_dates)."""
+        return list(self.iter_appointments_between_dates(validated_data))
+
+    # ===========================
+    #   Rangos (resultados por día)
+    # ===========================
+    # Una sola consulta agrupada por día + las claves del reporte diario; la
+    # respuesta trae una entrada por cada día del rango (vacía si no hubo datos)
+    # con la misma forma que el reporte de un solo día.
+
+    @staticmethod
+    def _days(start_date, end_date):
+        return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    def get_appointments_count_by_therapist_range(self, validated_data):
+        """Conteo de citas por terapeuta para cada día entre start_date y end_date."""
+        start_date, end_date = validated_data["start_date"], validated_data["end_date"]
+        start, end = self._datetime_bounds(start_date, end_date)
+
+        qs = with_archive(lambda model: (
+            self._objects(model)
+            .filter(day_window("appointment_day", start, end), therapist__isnull=False, appointment_date__gte=start, appointment_date__lt=end)
+            .annotate(day=TruncDate("appointment_date"))
+            .values(
+                "day",
+                "therapist_id",
+                "therapist__first_name",
+                "therapist__last_name_paternal",
+                "therapist__last_name_maternal",
+            )
+            .annotate(appointments_count=Count("id"))
+        ), Appointment)
+
+        by_day = defaultdict(list)
+        for row in self._merge_counts(qs, "appointments_count"):
+            by_day[row["day"]].append(row)
+
+        return [{"date": day, **self._therapist_counts(by_day.get(day, []))} for day in self._days(start_date, end_date)]
+
+    def get_patients_by_therapist_range(self, validated_data):
+        """Pacientes agrupados por terapeuta para cada día entre start_date y end_date."""
+        start_date, end_date = validated_data["start_date"], validated_data["end_date"]
+        start, end = self._datetime_bounds(start_date, end_date)
+
+        qs = with_archive(lambda model: (
+            self._objects(model)
+            .filter(day_window("appointment_day", start, end), appointment_date__gte=start, appointment_date__lt=end)
+            .annotate(day=TruncDate("appointment_date"))
+            .values(
+                "day",
+                "therapist_id",
+                "therapist__first_name",
+                "therapist__last_name_paternal",
+                "therapist__last_name_maternal",
+                "patient_id",
+                "patient__name",
+                "patient__paternal_lastname",
+                "patient__maternal_lastname",
+            )
+            .annotate(appointments=Count("id"))
+        ), Appointment).order_by("day", "therapist__last_name_paternal", "therapist_id", "patient__paternal_lastname", "patient_id")
+
+        by_day = defaultdict(list)
+        for row in self._merge_counts(qs, "appointments"):
+            by_day[row["day"]].append(row)
+
+        return [
+            {"date": day, "therapists": self._group_patients_by_therapist(by_day.get(day, []))}
+            for day in self._days(start_date, end_date)
+        ]
+
+    def get_daily_cash_range(self, validated_data):
+        """Caja diaria detallada por cita para cada día entre start_date y end_date."""
+        start_date, end_date = validated_data["start_date"], validated_data["end_date"]
+        start, end = self._datetime_bounds(start_date, end_date)
 
-        appointments = (
-            Appointment.objects
-            .select_related("patient", "therapist")
+        payments = with_archive(lambda model: (
+            self._objects(model)
             .filter(
-                appointment_date__gte=start_date,
-                appointment_date__lte=end_date
+                day_window("appointment_day", start, end),
+                appointment_date__gte=start,
+                appointment_date__lt=end,
+                payment__isnull=False,
+                payment_type__isnull=False
             )
-            .order_by("appointment_date", "hour")
-        )
+            .annotate(day=TruncDate("appointment_date"))
+            .values(
+                'day',
+                'id',
+                'payment',
+                'payment_type',
+                'payment_type__name'
+            )
+        ), Appointment).order_by('-id')
 
-        result = []
-        for app in appointments:
-            if not app.patient:
-                continue
+        by_day = defaultdict(list)
+        for p in payments:
+            by_day[p['day']].append(self._daily_cash_row(p))
+
+        return [{"date": day, "payments": by_day.get(day, [])} for day in self._days(start_date, end_date)]
+
+    def get_daily_paid_tickets_range(self, validated_data):
+        """Tickets pagados (con resumen por método) para cada día entre start_date y end_date."""
+        start_date, end_date = validated_data["start_date"], validated_data["end_date"]
+
+        by_day = defaultdict(list)
+        for ticket in self._paid_tickets_queryset(start_date, end_date):
+            by_day[localtime(ticket['payment_date']).date()].append(self._paid_ticket_row(ticket))
+
+        return [self._paid_tickets_payload(day, by_day.get(day, [])) for day in self._days(start_date, end_date)]
+
+    # ===========================
+    #   Streaming (CSV / NDJSON)
+    # ===========================
+    # Generadores fila a fila sobre .values() con cursor del servidor: no se
+    # instancian modelos ni se arma la lista completa en memoria. Cada fila
+    # tiene la misma forma que el detalle del reporte JSON equivalente.
+
+    def iter_appointments_between_dates(self, validated_data, chunk_size=2000):
+        """Citas entre start_date y end_date (mismo filtro que get_appointments_between_dates)."""
+        start, end = self._datetime_bounds(validated_data["start_date"], validated_data["end_date"])
+        qs = with_archive(lambda model: (
+            self._objects(model)
+            .filter(
+                day_window("appointment_day", start, end),
+                appointment_date__gte=start,
+                appointment_date__lt=end,
+                patient__isnull=False,
+            )
+            .values(
+                "id",
+                "patient_id",
+                "patient__document_number",
+                "patient__paternal_lastname",
+                "patient__maternal_lastname",
+                "patient__name",
+                "patient__phone1",
+                "appointment_date",
+                "hour",
+            )
+        ), Appointment).order_by("appointment_date", "hour")
+        for row in stream_values(qs, chunk_size):
+            hour_val = row["hour"]
+            yield {
+                "appointment_id": row["id"],
+                "patient_id": row["patient_id"],
+                "document_number_patient": row["patient__document_number"],
+                "patient": " ".join(filter(None, [
+                    row["patient__paternal_lastname"],
+                    row["patient__maternal_lastname"],
+                    row["patient__name"],
+                ])),
+                "phone1_patient": row["patient__phone1"],
+                "appointment_date": row["appointment_date"].strftime("%Y-%m-%d"),
+                "hour": hour_val.strftime("%H:%M") if hour_val else "",
+            }
 
-            patient_name = " ".join(filter(None, [
-                app.patient.paternal_lastname,
-                app.patient.maternal_lastname,
-                app.patient.name
-            ]))
-
-            hour_val = app.hour
-            hour_str = hour_val if isinstance(hour_val, str) else (hour_val.strftime("%H:%M") if hour_val else "")
-
-            result.append({
-                "appointment_id": app.id,
-                "patient_id": app.patient.id,
-                "document_number_patient": app.patient.document_number,
-                "patient": patient_name,
-                "phone1_patient": app.patient.phone1,
-                "appointment_date": app.appointment_date.strftime("%Y-%m-%d"),
-                "hour": hour_str,
-            })
-
-        return result
+    def iter_improved_daily_cash(self, validated_data, chunk_size=2000):
+        """Detalle de pagos (citas y luego tickets) para 'date' o el rango start_date/end_date."""
+        start_date, end_date = self.date_bounds(validated_data)
+        appointment_payments, ticket_payments = self._improved_cash_querysets(start_date, end_date)
+
+        # Las dos consultas se consumen en secuencia: el cursor sin buffer de la
+        # primera se cierra antes de abrir la segunda.
+        for payment in stream_values(appointment_payments, chunk_size):
+            fecha_pago = localtime(payment['appointment_date']).strftime("%Y-%m-%d")
+            yield self._appointment_payment_row(payment, fecha_pago)
+        for payment in stream_values(ticket_payments, chunk_size):
+            fecha_pago = localtime(payment['payment_date']).strftime("%Y-%m-%d")
+            yield self._ticket_payment_row(payment, fecha_pago)
+
+    def iter_daily_paid_tickets(self, validated_data, chunk_size=2000):
+        """Tickets pagados para 'date' o el rango start_date/end_date."""
+        start_date, end_date = self.date_bounds(validated_data)
+        for ticket in stream_values(self._paid_tickets_queryset(start_date, end_date), chunk_size):
+            yield self._paid_ticket_row(ticket)
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+
+@shared_task(bind=True)
+def generate_report_job(self, job_id):
+    """Genera el artefacto de un ReportJob (cola 'reports', ver settings/celery.py)."""
+    from company_reports.services.report_job_services import ReportJobService
+
+    job = ReportJobService().run(job_id, task_id=self.request.id)
+    return {"job_id": job.id, "status": job.status}
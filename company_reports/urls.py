@@ -2,6 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from company_reports.views.statistics_views import StatisticsViewSet, dashboard_view, GetMetricsView
 from company_reports.views.company_views import CompanyDataViewSet
+from company_reports.views.report_job_views import ReportJobViewSet
 #from company_reports.views.emails_views import dashboard_email, SendVerifyCodeAPIView, VerifyCodeAPIView
 from company_reports.views import reports_views as views
 from django.conf.urls.static import static
@@ -10,6 +11,7 @@ from django.conf import settings
 router = DefaultRouter()
 router.register(r'statistics', StatisticsViewSet, basename='statistics')
 router.register(r'company', CompanyDataViewSet, basename='company')
+router.register(r'report-jobs', ReportJobViewSet, basename='report-jobs')
 
 # Agrupar rutas por funcionalidad
 api_urlpatterns = [
@@ -26,6 +28,11 @@ reports_urlpatterns = [
     path('reports/improved-daily-cash/', views.get_improved_daily_cash, name='improved_daily_cash'),
     path('reports/daily-paid-tickets/', views.get_daily_paid_tickets, name='daily_paid_tickets'),
     path('reports/appointments-between-dates/', views.get_appointments_between_dates, name='appointments_between_dates'),
+    # Variantes por rango (start_date/end_date): una entrada por día en una sola consulta
+    path('reports/appointments-per-therapist/range/', views.get_number_appointments_per_therapist_range, name='appointments_per_therapist_range'),
+    path('reports/patients-by-therapist/range/', views.get_patients_by_therapist_range, name='patients_by_therapist_range'),
+    path('reports/daily-cash/range/', views.get_daily_cash_range, name='daily_cash_range'),
+    path('reports/daily-paid-tickets/range/', views.get_daily_paid_tickets_range, name='daily_paid_tickets_range'),
 ]
 
 export_urlpatterns = [
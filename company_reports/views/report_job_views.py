@@ -0,0 +1,48 @@
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.http import FileResponse, Http404
+
+from company_reports.models.report_job import ReportJob
+from company_reports.serialiazers.report_job_serializers import ReportJobSerializer, ReportJobCreateSerializer
+from company_reports.services.report_job_services import ReportJobService
+from architect.utils.tenant import filter_by_tenant
+
+report_job_service = ReportJobService()
+
+
+class ReportJobViewSet(mixins.CreateModelMixin,
+                       mixins.RetrieveModelMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Reportes/exportaciones en segundo plano.
+    POST crea el job (202) y GET /{id}/ permite consultar su estado y la URL de descarga.
+    """
+
+    serializer_class = ReportJobSerializer
+    filter_backends = []
+
+    def get_queryset(self):
+        """Restringe por tenant salvo admin global."""
+        return filter_by_tenant(ReportJob.objects.all(), self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = ReportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        job = report_job_service.submit(request.user, data['report'], data['format'], data['params'])
+        job.refresh_from_db()  # con broker en memoria (eager) ya puede estar terminado
+        return Response(
+            ReportJobSerializer(job, context=self.get_serializer_context()).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Descarga el artefacto generado."""
+        job = self.get_object()
+        if job.status != ReportJob.STATUS_DONE or not job.file:
+            raise Http404("El reporte aún no está disponible")
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
@@ -1,7 +1,19 @@
-from django.http import JsonResponse, HttpResponse
-from company_reports.services.reports_services import ReportService
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from company_reports.services.reports_services import (
+    ReportService,
+    APPOINTMENT_RANGE_FIELDS,
+    PAYMENT_DETAIL_FIELDS,
+    PAID_TICKET_FIELDS,
+)
+from company_reports.services.export_services import (
+    STREAM_FORMATS,
+    XLSX_CONTENT_TYPE,
+    ExcelReportBuilder,
+    iter_export,
+)
 from company_reports.serialiazers.reports_serializers import (
     DateParameterSerializer,
+    DateRangeParameterSerializer,
     TherapistAppointmentSerializer,
     PatientByTherapistSerializer,
     DailyCashSerializer,
@@ -14,11 +26,11 @@ from django.shortcuts import render
 from django.template import TemplateDoesNotExist
 # from django_xhtml2pdf.utils import pdf_decorator
 from django.views.decorators.csrf import csrf_exempt
-import xlsxwriter
-import io
 import json
+import logging
 
 report_service = ReportService()
+logger = logging.getLogger(__name__)
 
 
 # --------- Helpers ---------
@@ -49,6 +61,18 @@ def _merge_params(request):
     return merged
 
 
+def _stream_response(rows, fmt, fieldnames, basename):
+    """
+    Respuesta por streaming (transfer-encoding chunked): las filas se codifican
+    a medida que salen del cursor, sin armar el documento completo en memoria.
+    """
+    response = StreamingHttpResponse(iter_export(rows, fmt, fieldnames), content_type=STREAM_FORMATS[fmt])
+    response["Content-Disposition"] = f"attachment; filename={basename}.{fmt}"
+    # Evita que un proxy (nginx) acumule la respuesta antes de enviarla
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 # ===========================
 #   JSON API
 # ===========================
@@ -126,6 +150,12 @@ class ReportAPIView:
         if not serializer.is_valid():
             return JsonResponse(serializer.errors, status=400)
 
+        fmt = serializer.validated_data.get("format")
+        if fmt in STREAM_FORMATS:
+            start_date, end_date = report_service.date_bounds(serializer.validated_data)
+            rows = report_service.iter_improved_daily_cash(serializer.validated_data)
+            return _stream_response(rows, fmt, PAYMENT_DETAIL_FIELDS, f"caja_chica_mejorada_{start_date}_a_{end_date}")
+
         data = report_service.get_improved_daily_cash(serializer.validated_data)
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
@@ -141,6 +171,12 @@ class ReportAPIView:
         if not serializer.is_valid():
             return JsonResponse(serializer.errors, status=400)
 
+        fmt = serializer.validated_data.get("format")
+        if fmt in STREAM_FORMATS:
+            start_date, end_date = report_service.date_bounds(serializer.validated_data)
+            rows = report_service.iter_daily_paid_tickets(serializer.validated_data)
+            return _stream_response(rows, fmt, PAID_TICKET_FIELDS, f"tickets_pagados_{start_date}_a_{end_date}")
+
         data = report_service.get_daily_paid_tickets(serializer.validated_data)
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
@@ -156,6 +192,15 @@ class ReportAPIView:
         if not serializer.is_valid():
             return JsonResponse(serializer.errors, status=400)
 
+        fmt = serializer.validated_data.get("format")
+        if fmt in STREAM_FORMATS:
+            start_date = serializer.validated_data.get("start_date")
+            end_date = serializer.validated_data.get("end_date")
+            if not (start_date and end_date):
+                return JsonResponse({"error": "start_date y end_date son requeridos"}, status=400)
+            rows = report_service.iter_appointments_between_dates(serializer.validated_data)
+            return _stream_response(rows, fmt, APPOINTMENT_RANGE_FIELDS, f"citas_{start_date}_a_{end_date}")
+
         data = report_service.get_appointments_between_dates(serializer.validated_data)
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
@@ -164,6 +209,93 @@ class ReportAPIView:
         return JsonResponse(response_serializer.data, safe=False)
 
 
+    # --------- Variantes por rango: una entrada por día, misma forma que el reporte diario ---------
+
+    @staticmethod
+    def get_number_appointments_per_therapist_range(request):
+        """
+        Citas por terapeuta para cada día del rango.
+        GET /...?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+        """
+        serializer = DateRangeParameterSerializer(data=_merge_params(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        days = report_service.get_appointments_count_by_therapist_range(serializer.validated_data)
+        return JsonResponse(
+            {
+                "start_date": str(serializer.validated_data["start_date"]),
+                "end_date": str(serializer.validated_data["end_date"]),
+                "days": [
+                    {
+                        "date": str(day["date"]),
+                        "therapists_appointments": TherapistAppointmentSerializer(
+                            day["therapists_appointments"],
+                            many=True,
+                            context={"total_appointments": day["total_appointments_count"]},
+                        ).data,
+                        "total_appointments_count": day["total_appointments_count"],
+                    }
+                    for day in days
+                ],
+            }
+        )
+
+    @staticmethod
+    def get_patients_by_therapist_range(request):
+        """Pacientes agrupados por terapeuta para cada día del rango."""
+        serializer = DateRangeParameterSerializer(data=_merge_params(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        days = report_service.get_patients_by_therapist_range(serializer.validated_data)
+        return JsonResponse(
+            {
+                "start_date": str(serializer.validated_data["start_date"]),
+                "end_date": str(serializer.validated_data["end_date"]),
+                "days": [
+                    {"date": str(day["date"]), "therapists": PatientByTherapistSerializer(day["therapists"], many=True).data}
+                    for day in days
+                ],
+            }
+        )
+
+    @staticmethod
+    def get_daily_cash_range(request):
+        """Caja diaria por cita para cada día del rango."""
+        serializer = DateRangeParameterSerializer(data=_merge_params(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        days = report_service.get_daily_cash_range(serializer.validated_data)
+        return JsonResponse(
+            {
+                "start_date": str(serializer.validated_data["start_date"]),
+                "end_date": str(serializer.validated_data["end_date"]),
+                "days": [
+                    {"date": str(day["date"]), "payments": DailyCashSerializer(day["payments"], many=True).data}
+                    for day in days
+                ],
+            }
+        )
+
+    @staticmethod
+    def get_daily_paid_tickets_range(request):
+        """Tickets pagados (con resumen por método) para cada día del rango."""
+        serializer = DateRangeParameterSerializer(data=_merge_params(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        days = report_service.get_daily_paid_tickets_range(serializer.validated_data)
+        return JsonResponse(
+            {
+                "start_date": str(serializer.validated_data["start_date"]),
+                "end_date": str(serializer.validated_data["end_date"]),
+                "days": DailyPaidTicketsSerializer(days, many=True).data,
+            }
+        )
+
+
 # ===========================
 #   PDF
 # ===========================
@@ -301,6 +433,12 @@ class PDFExportView:
 class ExcelExportView:
     """Responsable exclusivamente de la exportación a Excel."""
 
+    @staticmethod
+    def _xlsx_response(content, filename):
+        response = HttpResponse(content, content_type=XLSX_CONTENT_TYPE)
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
+
     @staticmethod
     def exportar_excel_citas(request):
         data_in = _merge_params(request)
@@ -312,48 +450,6 @@ class ExcelExportView:
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
 
-        # Crear archivo Excel
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-        worksheet = workbook.add_worksheet("Citas")
-
-        # Formato encabezado
-        header_format = workbook.add_format(
-            {"bold": True, "bg_color": "#2c3e50", "font_color": "white", "border": 1}
-        )
-
-        # Encabezados alineados con AppointmentRangeSerializer
-        headers = [
-            "ID Paciente",
-            "DNI/Documento",
-            "Paciente",
-            "Teléfono",
-            "Fecha",
-            "Hora",
-        ]
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-
-        # Escribir datos
-        for row, appointment in enumerate(data, start=1):
-            worksheet.write(row, 0, appointment.get("patient_id", ""))
-            worksheet.write(row, 1, appointment.get("document_number_patient", ""))
-            worksheet.write(row, 2, appointment.get("patient", ""))
-            worksheet.write(row, 3, appointment.get("phone1_patient", ""))
-            worksheet.write(row, 4, appointment.get("appointment_date", ""))
-            worksheet.write(row, 5, appointment.get("hour", ""))
-
-        # Anchos de columna
-        worksheet.set_column("A:A", 12)
-        worksheet.set_column("B:B", 15)
-        worksheet.set_column("C:C", 40)
-        worksheet.set_column("D:D", 15)
-        worksheet.set_column("E:E", 12)
-        worksheet.set_column("F:F", 10)
-
-        workbook.close()
-        output.seek(0)
-
         # Nombre de archivo (si hay rango en query)
         start_date = serializer.validated_data.get("start_date")
         end_date = serializer.validated_data.get("end_date")
@@ -362,12 +458,7 @@ class ExcelExportView:
         else:
             filename = "citas.xlsx"
 
-        response = HttpResponse(
-            output.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = f"attachment; filename={filename}"
-        return response
+        return ExcelExportView._xlsx_response(ExcelReportBuilder.citas(data), filename)
 
     @staticmethod
     def exportar_excel_caja_chica_mejorada(request):
@@ -381,69 +472,11 @@ class ExcelExportView:
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
 
-        # Crear archivo Excel
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-        worksheet = workbook.add_worksheet("Caja Chica")
-
-        # Formato encabezado
-        header_format = workbook.add_format(
-            {"bold": True, "bg_color": "#2c3e50", "font_color": "white", "border": 1}
-        )
-
-        # Encabezados para el reporte de caja chica
-        headers = [
-            "Tipo",
-            "ID",
-            "Número Ticket",
-            "Monto",
-            "Método Pago",
-            "Paciente",
-            "Terapeuta",
-            "Fecha Pago",
-        ]
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-
-        # Escribir datos
-        for row, payment in enumerate(data.get("pagos_detallados", []), start=1):
-            worksheet.write(row, 0, payment.get("tipo", ""))
-            worksheet.write(row, 1, payment.get("id", ""))
-            worksheet.write(row, 2, payment.get("ticket_number", ""))
-            worksheet.write(row, 3, payment.get("monto", 0))
-            worksheet.write(row, 4, payment.get("metodo_pago", ""))
-            worksheet.write(row, 5, payment.get("paciente", ""))
-            worksheet.write(row, 6, payment.get("terapeuta", ""))
-            worksheet.write(row, 7, payment.get("fecha_pago", ""))
-
-        # Anchos de columna
-        worksheet.set_column("A:A", 10)
-        worksheet.set_column("B:B", 8)
-        worksheet.set_column("C:C", 20)
-        worksheet.set_column("D:D", 12)
-        worksheet.set_column("E:E", 15)
-        worksheet.set_column("F:F", 30)
-        worksheet.set_column("G:G", 30)
-        worksheet.set_column("H:H", 12)
-
-        # Agregar resumen
-        worksheet.write(len(data.get("pagos_detallados", [])) + 3, 0, "RESUMEN:", header_format)
-        worksheet.write(len(data.get("pagos_detallados", [])) + 4, 0, "Total General:")
-        worksheet.write(len(data.get("pagos_detallados", [])) + 4, 3, data.get("total_general", 0))
-
-        workbook.close()
-        output.seek(0)
-
         # Nombre de archivo
         date = serializer.validated_data.get("date")
         filename = f"caja_chica_mejorada_{date}.xlsx"
 
-        response = HttpResponse(
-            output.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = f"attachment; filename={filename}"
-        return response
+        return ExcelExportView._xlsx_response(ExcelReportBuilder.caja_chica_mejorada(data), filename)
 
     @staticmethod
     def exportar_excel_tickets_pagados(request):
@@ -457,83 +490,11 @@ class ExcelExportView:
         if isinstance(data, dict) and "error" in data:
             return JsonResponse(data, status=400)
 
-        # Crear archivo Excel
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
-        worksheet = workbook.add_worksheet("Tickets Pagados")
-
-        # Formato encabezado
-        header_format = workbook.add_format(
-            {"bold": True, "bg_color": "#2c3e50", "font_color": "white", "border": 1}
-        )
-
-        # Encabezados para el reporte de tickets pagados
-        headers = [
-            "Número Ticket",
-            "Monto",
-            "Método Pago",
-            "Fecha Pago",
-            "Paciente",
-            "Documento",
-            "Teléfono",
-            "Terapeuta",
-            "Licencia",
-            "Fecha Cita",
-            "Hora Cita",
-            "Consultorio",
-        ]
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-
-        # Escribir datos
-        for row, ticket in enumerate(data.get("tickets_pagados", []), start=1):
-            worksheet.write(row, 0, ticket.get("numero_ticket", ""))
-            worksheet.write(row, 1, ticket.get("monto", 0))
-            worksheet.write(row, 2, ticket.get("metodo_pago", ""))
-            worksheet.write(row, 3, ticket.get("fecha_pago", ""))
-            worksheet.write(row, 4, ticket.get("paciente_nombre", ""))
-            worksheet.write(row, 5, ticket.get("paciente_documento", ""))
-            worksheet.write(row, 6, ticket.get("paciente_telefono", ""))
-            worksheet.write(row, 7, ticket.get("terapeuta_nombre", ""))
-            worksheet.write(row, 8, ticket.get("terapeuta_licencia", ""))
-            worksheet.write(row, 9, ticket.get("fecha_cita", ""))
-            worksheet.write(row, 10, ticket.get("hora_cita", ""))
-            worksheet.write(row, 11, ticket.get("consultorio", ""))
-
-        # Anchos de columna
-        worksheet.set_column("A:A", 20)  # Número Ticket
-        worksheet.set_column("B:B", 12)  # Monto
-        worksheet.set_column("C:C", 15)  # Método Pago
-        worksheet.set_column("D:D", 18)  # Fecha Pago
-        worksheet.set_column("E:E", 30)  # Paciente
-        worksheet.set_column("F:F", 15)  # Documento
-        worksheet.set_column("G:G", 15)  # Teléfono
-        worksheet.set_column("H:H", 30)  # Terapeuta
-        worksheet.set_column("I:I", 15)  # Licencia
-        worksheet.set_column("J:J", 12)  # Fecha Cita
-        worksheet.set_column("K:K", 10)  # Hora Cita
-        worksheet.set_column("L:L", 12)  # Consultorio
-
-        # Agregar resumen
-        worksheet.write(len(data.get("tickets_pagados", [])) + 3, 0, "RESUMEN:", header_format)
-        worksheet.write(len(data.get("tickets_pagados", [])) + 4, 0, "Total General:")
-        worksheet.write(len(data.get("tickets_pagados", [])) + 4, 1, data.get("total_general", 0))
-        worksheet.write(len(data.get("tickets_pagados", [])) + 5, 0, "Cantidad Tickets:")
-        worksheet.write(len(data.get("tickets_pagados", [])) + 5, 1, data.get("cantidad_tickets", 0))
-
-        workbook.close()
-        output.seek(0)
-
         # Nombre de archivo
         date = serializer.validated_data.get("date")
         filename = f"tickets_pagados_{date}.xlsx"
 
-        response = HttpResponse(
-            output.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = f"attachment; filename={filename}"
-        return response
+        return ExcelExportView._xlsx_response(ExcelReportBuilder.tickets_pagados(data), filename)
 
 
 # ===========================
@@ -634,6 +595,44 @@ def get_appointments_between_dates(request):
         )
 
 
+def _internal_error(view_name):
+    """Registra la excepción en curso y responde un 500 genérico (sin detalles internos)."""
+    logger.exception("Error en %s", view_name)
+    return JsonResponse({"error": "Error interno del servidor"}, status=500)
+
+
+@csrf_exempt
+def get_number_appointments_per_therapist_range(request):
+    try:
+        return report_api.get_number_appointments_per_therapist_range(request)
+    except Exception:
+        return _internal_error("get_number_appointments_per_therapist_range")
+
+
+@csrf_exempt
+def get_patients_by_therapist_range(request):
+    try:
+        return report_api.get_patients_by_therapist_range(request)
+    except Exception:
+        return _internal_error("get_patients_by_therapist_range")
+
+
+@csrf_exempt
+def get_daily_cash_range(request):
+    try:
+        return report_api.get_daily_cash_range(request)
+    except Exception:
+        return _internal_error("get_daily_cash_range")
+
+
+@csrf_exempt
+def get_daily_paid_tickets_range(request):
+    try:
+        return report_api.get_daily_paid_tickets_range(request)
+    except Exception:
+        return _internal_error("get_daily_paid_tickets_range")
+
+
 def reports_dashboard(request):
     return render(request, "reports.html")
 
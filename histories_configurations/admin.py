@@ -191,14 +191,13 @@ class HistoryAdmin(BaseTenantAdmin):
         # Asignar local_id secuencial si está vacío
         if getattr(obj, 'local_id', None) in (None, 0):
             from django.db import transaction
-            from django.db.models import Max
+            from architect.utils.archive import max_with_archive
             with transaction.atomic():
-                max_local = (
-                    History.objects.select_for_update()
-                    .filter(reflexo_id=obj.reflexo_id)
-                    .aggregate(m=Max('local_id'))['m']
+                # Incluye los archivados: vuelven con su número al restaurarse
+                max_local = max_with_archive(
+                    History, 'local_id', History.objects.select_for_update(), reflexo_id=obj.reflexo_id
                 )
-                obj.local_id = (max_local or 0) + 1
+                obj.local_id = max_local + 1
 
         super().save_model(request, obj, form, change)
 
@@ -226,15 +225,12 @@ class PredeterminedPriceAdmin(BaseTenantAdmin):
         # Asignar local_id secuencial por tenant si está vacío
         if getattr(obj, 'local_id', None) in (None, 0):
             from django.db import transaction
-            from django.db.models import Max
+            from architect.utils.archive import max_with_archive
             from .models.predetermined_price import PredeterminedPrice as PP
             with transaction.atomic():
-                max_local = (
-                    PP.objects.select_for_update()
-                    .filter(reflexo_id=obj.reflexo_id)
-                    .aggregate(m=Max('local_id'))['m']
-                )
-                obj.local_id = (max_local or 0) + 1
+                # Incluye los archivados: vuelven con su número al restaurarse
+                max_local = max_with_archive(PP, 'local_id', PP.objects.select_for_update(), reflexo_id=obj.reflexo_id)
+                obj.local_id = max_local + 1
 
         super().save_model(request, obj, form, change)
 
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0009_alter_predeterminedprice_options_and_more'),
+        ('patients_diagnoses', '0010_patient_import_jobs'),
+        ('reflexo', '0003_tenant_export_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('local_id', models.IntegerField(blank=True, null=True, verbose_name='ID local (por empresa)')),
+                ('testimony', models.BooleanField(default=True, verbose_name='Testimonio')),
+                ('private_observation', models.TextField(blank=True, null=True, verbose_name='Observación privada')),
+                ('observation', models.TextField(blank=True, null=True, verbose_name='Observación')),
+                ('height', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True, verbose_name='Altura')),
+                ('weight', models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='Peso')),
+                ('last_weight', models.DecimalField(blank=True, decimal_places=3, max_digits=6, null=True, verbose_name='Último peso')),
+                ('menstruation', models.BooleanField(default=True, verbose_name='Menstruación')),
+                ('diu_type', models.CharField(blank=True, max_length=255, null=True, verbose_name='Tipo de DIU')),
+                ('gestation', models.BooleanField(default=True, verbose_name='Gestación')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('patient', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='patients_diagnoses.patient', verbose_name='Paciente')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+            ],
+            options={
+                'verbose_name': 'Historial (archivo)',
+                'verbose_name_plural': 'Historiales (archivo)',
+                'db_table': 'histories_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='PredeterminedPriceArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8, verbose_name='Precio')),
+                ('local_id', models.IntegerField(blank=True, null=True, verbose_name='ID local (por empresa)')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='Empresa/Tenant')),
+            ],
+            options={
+                'verbose_name': 'Precio Predeterminado (archivo)',
+                'verbose_name_plural': 'Precios Predeterminados (archivo)',
+                'db_table': 'predetermined_prices_archive',
+            },
+        ),
+    ]
@@ -3,3 +3,4 @@ from .history import History
 from .payment_type import PaymentType
 from .payment_status import PaymentStatus
 from .predetermined_price import PredeterminedPrice
+from .archive import HistoryArchive, PredeterminedPriceArchive
@@ -0,0 +1,7 @@
+from architect.utils.archive import archive_model
+from .history import History
+from .predetermined_price import PredeterminedPrice
+
+# Tablas espejo de registros eliminados (soft delete): ver architect/utils/archive.py
+HistoryArchive = archive_model(History, __name__)
+PredeterminedPriceArchive = archive_model(PredeterminedPrice, __name__)
@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.views.decorators.csrf import csrf_exempt
 from ..models.history import History
 from ..models.document_type import DocumentType
+from architect.utils.archive import max_with_archive
 from architect.utils.tenant import filter_by_tenant, get_tenant, is_global_admin
 from patients_diagnoses.models.patient import Patient
 
@@ -91,15 +92,11 @@ def history_create(request):
 
     try:
         # Asignar local_id secuencial por tenant
-        from django.db.models import Max
         from django.db import transaction, IntegrityError
         with transaction.atomic():
-            max_local = (
-                History.objects.select_for_update()
-                .filter(reflexo_id=tenant_id)
-                .aggregate(m=Max('local_id'))['m']
-            )
-            next_local = (max_local or 0) + 1
+            # Incluye los archivados: vuelven con su número al restaurarse
+            max_local = max_with_archive(History, 'local_id', History.objects.select_for_update(), reflexo_id=tenant_id)
+            next_local = max_local + 1
             h = History.objects.create(patient_id=patient_id, reflexo_id=tenant_id, local_id=next_local)
         return JsonResponse({"id": h.id, "reflexo_id": h.reflexo_id}, status=201)
     except IntegrityError:
@@ -2,6 +2,7 @@ from django.contrib import admin
 from .models.patient import Patient
 from .models.diagnosis import Diagnosis
 from .models.medical_record import MedicalRecord
+from .models.patient_duplicate import PatientDuplicateCandidate
 from architect.utils.tenant import is_global_admin, get_tenant, filter_by_tenant
 
 
@@ -220,3 +221,45 @@ class MedicalRecordAdmin(BaseTenantAdmin):
             # Importante: delegar a super() para que Django aplique raw_id_fields
             return super().formfield_for_foreignkey(db_field, request, **kwargs)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(PatientDuplicateCandidate)
+class PatientDuplicateCandidateAdmin(BaseTenantAdmin):
+    """Revisión de posibles duplicados generados por `find_duplicate_patients`."""
+    list_display = ('id', 'patient_a', 'patient_b', 'score', 'reasons', 'status', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('patient_a__document_number', 'patient_b__document_number', 'patient_a__name_key', 'patient_b__name_key')
+    ordering = ('-score', 'id')
+    raw_id_fields = ('patient_a', 'patient_b')
+    readonly_fields = ('patient_a', 'patient_b', 'score', 'reasons')
+    actions = ('merge_keep_oldest', 'dismiss')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('patient_a', 'patient_b')
+
+    @admin.action(description="Fusionar (conservar el paciente más antiguo)")
+    def merge_keep_oldest(self, request, queryset):
+        from django.contrib import messages
+        from rest_framework.exceptions import ValidationError
+        from .services.patient_merge_service import PatientMergeService
+
+        service = PatientMergeService()
+        merged = 0
+        for candidate in queryset.filter(status=PatientDuplicateCandidate.STATUS_PENDING).order_by('-score', 'id'):
+            # Un merge anterior de la misma selección pudo haber eliminado este par
+            if not PatientDuplicateCandidate.objects.filter(pk=candidate.pk, status=PatientDuplicateCandidate.STATUS_PENDING).exists():
+                continue
+            try:
+                service.merge_candidate(candidate)
+                merged += 1
+            except ValidationError as e:
+                messages.error(request, f"Par {candidate.pk}: {e.detail}")
+        messages.success(request, f"Pares fusionados: {merged}.")
+
+    @admin.action(description="Descartar (no son duplicados)")
+    def dismiss(self, request, queryset):
+        from django.contrib import messages
+        updated = queryset.filter(status=PatientDuplicateCandidate.STATUS_PENDING).update(
+            status=PatientDuplicateCandidate.STATUS_DISMISSED
+        )
+        messages.success(request, f"Pares descartados: {updated}.")
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class PatientsDiagnosesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'patients_diagnoses'
+
+    def ready(self):
+        # Índice de búsqueda de pacientes y del catálogo de diagnósticos
+        from . import signals  # noqa: F401
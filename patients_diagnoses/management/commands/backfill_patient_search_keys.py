@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from patients_diagnoses.models.patient import Patient
+from architect.utils.text import exact_name_key, person_name_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute Patient.name_key / phonetic_key / full_name_key (accent-insensitive, Spanish phonetic "
+        "and field-preserving name keys used for duplicate detection). The migrations already fill them; "
+        "use it after raw data loads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Rows read and updated per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without persisting.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get("tenant")
+        batch_size = max(options.get("batch_size") or 2000, 1)
+        dry_run = options.get("dry_run", False)
+
+        qs = Patient.all_objects.order_by("id").only(
+            "id", "name", "paternal_lastname", "maternal_lastname", "name_key", "phonetic_key", "full_name_key"
+        )
+        if tenant_id is not None:
+            qs = qs.filter(reflexo_id=tenant_id)
+
+        scanned = updated = 0
+        last_id = 0
+        while True:
+            batch = list(qs.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            changed = []
+            for p in batch:
+                names = (p.paternal_lastname, p.maternal_lastname, p.name)
+                keys = (*person_name_keys(*names), exact_name_key(*names))
+                if (p.name_key, p.phonetic_key, p.full_name_key) != keys:
+                    p.name_key, p.phonetic_key, p.full_name_key = keys
+                    changed.append(p)
+            if changed and not dry_run:
+                with transaction.atomic():
+                    Patient.all_objects.bulk_update(changed, ["name_key", "phonetic_key", "full_name_key"])
+            scanned += len(batch)
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Patients scanned: {scanned}. Keys updated: {updated}. Dry run: {dry_run}"
+        ))
@@ -0,0 +1,91 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from patients_diagnoses.models.patient import Patient
+from patients_diagnoses.services.patient_dedup_service import (
+    PatientDedupService,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_BLOCK,
+    DEFAULT_MIN_SCORE,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Find likely duplicate patients per tenant (reflexo). Candidate pairs come from blocking keys "
+        "(document, phonetic name, phone, email, birth date + surname), are scored in a process pool "
+        "and stored in patient_duplicate_candidates for review (see merge_duplicate_patients)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Scoring processes (1 = in-process).",
+        )
+        parser.add_argument(
+            "--min-score",
+            type=float,
+            default=DEFAULT_MIN_SCORE,
+            help=f"Minimum score (0..1) to store a pair. Default {DEFAULT_MIN_SCORE}.",
+        )
+        parser.add_argument(
+            "--max-block",
+            type=int,
+            default=DEFAULT_MAX_BLOCK,
+            help="Blocks larger than this (shared placeholder phone/email...) are skipped.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Pairs per scoring task.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Score and report without writing candidates.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get("tenant")
+        dry_run = options.get("dry_run", False)
+
+        if tenant_id is not None:
+            tenants = [tenant_id]
+        else:
+            tenants = list(
+                Patient.objects.filter(reflexo__isnull=False)
+                .values_list("reflexo_id", flat=True)
+                .distinct()
+                .order_by("reflexo_id")
+            )
+
+        service = PatientDedupService()
+        total = 0
+        for t_id in tenants:
+            started = time.perf_counter()
+            stats = service.run(
+                t_id,
+                workers=max(options["workers"], 1),
+                min_score=options["min_score"],
+                max_block=max(options["max_block"], 2),
+                chunk_size=max(options["chunk_size"], 1),
+                dry_run=dry_run,
+            )
+            total += stats["candidates"]
+            self.stdout.write(self.style.NOTICE(
+                f"Tenant {t_id}: {stats['patients']} patients, {stats['pairs']} pairs scored, "
+                f"{stats['candidates']} candidates, {stats['skipped_blocks']} oversized blocks skipped "
+                f"({time.perf_counter() - started:.1f}s)."
+            ))
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Total candidates: {total}. Dry run: {dry_run}"))
@@ -1,17 +1,46 @@
 import csv
+import hashlib
+import time
+from itertools import islice
 from pathlib import Path
-from typing import Tuple
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Count, Max
 
+from architect.models import MaintenanceCheckpoint
 from patients_diagnoses.models.diagnosis import Diagnosis
+from patients_diagnoses.services.diagnosis_index import CATALOG as DIAGNOSIS_CATALOG
+from architect.utils.cache_version import bump_version
+from architect.utils.db import bulk_upsert
+
+JOB = "import_diagnoses"
+CHUNK_SIZE = 2000
+
+
+def _file_hash(path: Path, delimiter: str) -> str:
+    """sha256 del archivo (leído por bloques) y del delimitador con que se interpreta."""
+    digest = hashlib.sha256(delimiter.encode("utf-8"))
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(file_hash: str) -> str:
+    """
+    Hash del archivo + estado de la tabla (filas y último updated_at): si
+    alguien editó el catálogo desde la última importación, no coincide.
+    """
+    state = Diagnosis.all_objects.order_by().aggregate(total=Count("id"), last=Max("updated_at"))
+    return hashlib.sha256(f"{file_hash}:{state['total']}:{state['last']}".encode("utf-8")).hexdigest()
 
 
 class Command(BaseCommand):
     help = (
         "Importa diagnósticos globales desde un CSV con encabezado 'code;name' "
-        "ubicado por defecto en db/diagnoses.csv. Upsert por code (crea o actualiza)."
+        "ubicado por defecto en db/diagnoses.csv. Upsert por code (crea o actualiza). "
+        "Si el archivo y la tabla no cambiaron desde la última importación, no hace nada."
     )
 
     def add_arguments(self, parser):
@@ -32,8 +61,14 @@ class Command(BaseCommand):
             action="store_true",
             help="Vacía la tabla antes de importar (hard reset).",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Importa aunque el archivo no haya cambiado desde la última vez.",
+        )
 
     def handle(self, *args, **options):
+        started = time.perf_counter()
         path = Path(options["path"]).resolve()
         delimiter = options["delimiter"]
         truncate = options["truncate"]
@@ -41,86 +76,107 @@ class Command(BaseCommand):
         if not path.exists():
             raise CommandError(f"No se encontró el archivo: {path}")
 
+        file_hash = _file_hash(path, delimiter)
+        checkpoint = MaintenanceCheckpoint.objects.filter(job=JOB, reflexo__isnull=True).first()
+        if (
+            not (truncate or options["force"])
+            and checkpoint is not None
+            and checkpoint.fingerprint == _fingerprint(file_hash)
+        ):
+            self.stdout.write(self.style.SUCCESS(
+                f"Sin cambios desde la última importación ({time.perf_counter() - started:.3f}s)"
+            ))
+            return
+
         self.stdout.write(self.style.NOTICE(f"Leyendo {path} ..."))
 
-        rows: list[Tuple[str, str]] = []
+        if truncate:
+            Diagnosis.all_objects.all().delete()
+            self.stdout.write(self.style.WARNING("Tabla 'diagnoses' vaciada (truncate)."))
+
+        # code -> (name, reflexo_id, deleted_at): un solo SELECT, sin instancias ni IN gigantes
+        existing = {
+            code: tuple(rest)
+            for code, *rest in Diagnosis.all_objects.order_by().values_list("code", "name", "reflexo_id", "deleted_at")
+        }
+
+        created = updated = read = 0
         with path.open("r", encoding="utf-8", newline="") as f:
-            # Primera pasada para limpiar BOM y normalizar encabezados
-            _peek = f.readline()
-            if not _peek:
-                raise CommandError("El archivo está vacío")
-            f.seek(0)
-            reader = csv.reader(f, delimiter=delimiter)
-            raw_header = next(reader)
-            norm_header = [h.strip().lstrip('\ufeff').lower() for h in raw_header]
-            # Validar columnas requeridas
-            if not {"code", "name"}.issubset(set(norm_header)):
-                raise CommandError(
-                    f"Encabezados inválidos. Se esperaba al menos: code{delimiter}name; encontrados: {raw_header}"
-                )
-            # Construir un DictReader con los encabezados normalizados
-            f.seek(0)
-            reader = csv.DictReader(f, fieldnames=norm_header, delimiter=delimiter)
-            next(reader)  # saltar la fila de encabezados original
-            for i, row in enumerate(reader, start=2):  # start=2 por el header
-                code = (row.get("code") or "").strip()
-                name = (row.get("name") or "").strip()
-                if not code or not name:
-                    self.stdout.write(self.style.WARNING(f"Fila {i} omitida (code/name vacío)"))
-                    continue
-                rows.append((code, name))
-
-        if not rows:
+            rows = self._rows(f, delimiter)
+            while True:
+                chunk = list(islice(rows, CHUNK_SIZE))
+                if not chunk:
+                    break
+                read += len(chunk)
+                n, u = self._apply_chunk(chunk, existing)
+                created += n
+                updated += u
+
+        if not read:
             self.stdout.write(self.style.WARNING("No hay filas válidas para importar."))
             return
 
-        created = 0
-        updated = 0
-
-        with transaction.atomic():
-            if truncate:
-                Diagnosis.all_objects.all().delete()
-                self.stdout.write(self.style.WARNING("Tabla 'diagnoses' vaciada (truncate)."))
-
-            # Mapear existentes por code
-            codes = [c for c, _ in rows]
-            existing = {d.code: d for d in Diagnosis.all_objects.filter(code__in=codes)}
-
-            to_create: list[Diagnosis] = []
-            to_update: list[Diagnosis] = []
-
-            for code, name in rows:
-                if code in existing:
-                    diag = existing[code]
-                    # Asegurar globalidad y valores actuales
-                    changed = False
-                    if diag.name != name:
-                        diag.name = name
-                        changed = True
-                    if diag.reflexo_id is not None:
-                        diag.reflexo_id = None
-                        changed = True
-                    if diag.deleted_at is not None:
-                        diag.deleted_at = None
-                        changed = True
-                    if changed:
-                        to_update.append(diag)
-                else:
-                    to_create.append(
-                        Diagnosis(code=code, name=name, reflexo=None, deleted_at=None)
-                    )
-
-            if to_create:
-                Diagnosis.objects.bulk_create(to_create, batch_size=2000)
-                created = len(to_create)
-            if to_update:
-                Diagnosis.all_objects.bulk_update(
-                    to_update, ["name", "reflexo_id", "deleted_at"], batch_size=2000
-                )
-                updated = len(to_update)
+        if created or updated or truncate:
+            # bulk_create no dispara señales: invalidar el índice en memoria (DiagnosisIndex)
+            bump_version(DIAGNOSIS_CATALOG)
+        MaintenanceCheckpoint.objects.update_or_create(
+            job=JOB, reflexo=None, defaults={"processed": read, "fingerprint": _fingerprint(file_hash)}
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Importación completada: creados={created}, actualizados={updated}, total_leído={len(rows)}"
+                f"Importación completada: creados={created}, actualizados={updated}, total_leído={read} "
+                f"({time.perf_counter() - started:.2f}s)"
             )
         )
+
+    def _rows(self, f, delimiter):
+        """Genera (code, name) fila por fila, sin cargar el archivo en memoria."""
+        # Primera pasada para limpiar BOM y normalizar encabezados
+        _peek = f.readline()
+        if not _peek:
+            raise CommandError("El archivo está vacío")
+        f.seek(0)
+        reader = csv.reader(f, delimiter=delimiter)
+        raw_header = next(reader)
+        norm_header = [h.strip().lstrip('\ufeff').lower() for h in raw_header]
+        # Validar columnas requeridas
+        if not {"code", "name"}.issubset(set(norm_header)):
+            raise CommandError(
+                f"Encabezados inválidos. Se esperaba al menos: code{delimiter}name; encontrados: {raw_header}"
+            )
+        # Construir un DictReader con los encabezados normalizados
+        f.seek(0)
+        reader = csv.DictReader(f, fieldnames=norm_header, delimiter=delimiter)
+        next(reader)  # saltar la fila de encabezados original
+        for i, row in enumerate(reader, start=2):  # start=2 por el header
+            code = (row.get("code") or "").strip()
+            name = (row.get("name") or "").strip()
+            if not code or not name:
+                self.stdout.write(self.style.WARNING(f"Fila {i} omitida (code/name vacío)"))
+                continue
+            yield code, name
+
+    @staticmethod
+    def _apply_chunk(chunk, existing):
+        """
+        Compara el lote con `existing` y aplica solo altas y cambios en una
+        transacción (un upsert por lote). Deja `existing` al día para que un
+        código repetido en lotes siguientes se compare contra lo ya escrito.
+        """
+        # Dentro del lote gana la última aparición de cada código.
+        # Asegurar globalidad y valores actuales: global (sin reflexo) y no eliminado
+        pending = {code: name for code, name in dict(chunk).items() if existing.get(code) != (name, None, None)}
+        if not pending:
+            return 0, 0
+
+        created = sum(1 for code in pending if code not in existing)
+        objs = [Diagnosis(code=code, name=name, reflexo=None, deleted_at=None) for code, name in pending.items()]
+        with transaction.atomic():
+            bulk_upsert(
+                Diagnosis, objs, unique_fields=["code"],
+                update_fields=["name", "reflexo", "deleted_at", "updated_at"], batch_size=CHUNK_SIZE,
+            )
+        for code, name in pending.items():
+            existing[code] = (name, None, None)
+        return created, len(pending) - created
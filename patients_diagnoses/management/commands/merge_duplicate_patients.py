@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from patients_diagnoses.models.patient_duplicate import PatientDuplicateCandidate
+from patients_diagnoses.services.patient_merge_service import PatientMergeService
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge duplicate patients from patient_duplicate_candidates: re-points histories, appointments "
+        "and medical records to the kept patient in bulk and soft-deletes the duplicate. "
+        "Either a single pair (--candidate) or every pending pair above --min-score."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--candidate",
+            type=int,
+            default=None,
+            help="ID of the candidate pair to merge.",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=None,
+            help="Patient ID to keep (with --candidate). Defaults to the oldest of the pair.",
+        )
+        parser.add_argument(
+            "--min-score",
+            type=float,
+            default=None,
+            help="Merge every pending pair with score >= this value (keeps the oldest patient).",
+        )
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit --min-score merges to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without persisting.",
+        )
+
+    def handle(self, *args, **options):
+        candidate_id = options.get("candidate")
+        min_score = options.get("min_score")
+        dry_run = options.get("dry_run", False)
+        if (candidate_id is None) == (min_score is None):
+            raise CommandError("Use exactly one of --candidate or --min-score.")
+
+        pending = PatientDuplicateCandidate.objects.filter(status=PatientDuplicateCandidate.STATUS_PENDING)
+        if candidate_id is not None:
+            candidates = list(pending.filter(pk=candidate_id))
+            if not candidates:
+                raise CommandError(f"No pending candidate with id {candidate_id}.")
+        else:
+            qs = pending.filter(score__gte=min_score).order_by("-score", "id")
+            if options.get("tenant") is not None:
+                qs = qs.filter(reflexo_id=options["tenant"])
+            candidates = list(qs)
+
+        service = PatientMergeService()
+        merged = 0
+        with transaction.atomic():
+            for candidate in candidates:
+                # Un merge anterior pudo haber eliminado este par (paciente ya fusionado)
+                if not PatientDuplicateCandidate.objects.filter(pk=candidate.pk, status=PatientDuplicateCandidate.STATUS_PENDING).exists():
+                    continue
+                result = service.merge_candidate(candidate, keep_id=options.get("keep"))
+                merged += 1
+                self.stdout.write(self.style.NOTICE(
+                    f"Pair {candidate.pk}: kept {result['kept']}, removed {result['removed']} "
+                    f"(histories={result['histories']}, appointments={result['appointments']}, "
+                    f"medical_records={result['medical_records']}, left_on_duplicate={result['medical_records_left']})."
+                ))
+            if dry_run:
+                transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Pairs merged: {merged}. Dry run: {dry_run}"))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from patients_diagnoses.models.patient import Patient
+from patients_diagnoses.services.patient_search_service import PatientSearchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the patient search index (patient_search_tokens). "
+        "Needed after bulk imports or queryset.update() calls, which bypass the Patient signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Patients reindexed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get("tenant")
+        batch_size = max(options.get("batch_size") or 1000, 1)
+
+        qs = Patient.all_objects.order_by("id")
+        if tenant_id is not None:
+            qs = qs.filter(reflexo_id=tenant_id)
+        patient_ids = qs.values_list("id", flat=True)
+
+        service = PatientSearchService()
+        patients = tokens = 0
+        batch = []
+        for pk in patient_ids.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                tokens += service.reindex(batch)
+                patients += len(batch)
+                batch = []
+                self.stdout.write(self.style.NOTICE(f"{patients} patients reindexed..."))
+        if batch:
+            tokens += service.reindex(batch)
+            patients += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Patients processed: {patients}. Tokens written: {tokens}."))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from architect.utils.text import normalize_document, tokenize
+
+BATCH_SIZE = 2000
+
+
+def build_search_tokens(apps, schema_editor):
+    """Indexa los pacientes activos existentes (mismo criterio que PatientSearchService)."""
+    Patient = apps.get_model('patients_diagnoses', 'Patient')
+    PatientSearchToken = apps.get_model('patients_diagnoses', 'PatientSearchToken')
+
+    rows = []
+    patients = (
+        Patient._base_manager.filter(deleted_at__isnull=True)
+        .values_list('id', 'reflexo_id', 'document_number', 'name', 'paternal_lastname', 'maternal_lastname')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for pk, reflexo_id, document_number, name, paternal, maternal in patients:
+        pairs = []
+        document = normalize_document(document_number)
+        if document:
+            pairs.append(('document', document))
+        for field, value in (('name', name), ('paternal', paternal), ('maternal', maternal)):
+            pairs.extend((field, token) for token in tokenize(value))
+        rows.extend(
+            PatientSearchToken(reflexo_id=reflexo_id, patient_id=pk, field=field, token=token)
+            for field, token in pairs
+        )
+        if len(rows) >= BATCH_SIZE:
+            PatientSearchToken.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    if rows:
+        PatientSearchToken.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients_diagnoses', '0005_remove_diagnosis_uniq_diagnosis_per_reflexo_code_and_more'),
+        ('reflexo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatientSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('document', 'Documento'), ('name', 'Nombre'), ('paternal', 'Apellido paterno'), ('maternal', 'Apellido materno')], max_length=10, verbose_name='Campo')),
+                ('token', models.CharField(db_index=True, max_length=64, verbose_name='Token')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='patients_diagnoses.patient', verbose_name='Paciente')),
+                ('reflexo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+            ],
+            options={
+                'verbose_name': 'Token de búsqueda de paciente',
+                'verbose_name_plural': 'Tokens de búsqueda de pacientes',
+                'db_table': 'patient_search_tokens',
+                'indexes': [models.Index(fields=['reflexo', 'token'], name='idx_pst_reflexo_token')],
+                'constraints': [models.UniqueConstraint(fields=('patient', 'field', 'token'), name='uniq_patient_search_token')],
+            },
+        ),
+        migrations.RunPython(build_search_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:39
+
+from django.db import migrations, models
+
+from architect.utils.text import person_name_keys
+
+BATCH_SIZE = 2000
+
+
+def build_name_keys(apps, schema_editor):
+    """Calcula name_key/phonetic_key de los pacientes existentes (mismo criterio que Patient.save())."""
+    Patient = apps.get_model('patients_diagnoses', 'Patient')
+    rows = (
+        Patient._base_manager.order_by('id')
+        .values_list('id', 'paternal_lastname', 'maternal_lastname', 'name')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for pk, paternal, maternal, name in rows:
+        name_key, phonetic_key = person_name_keys(paternal, maternal, name)
+        batch.append(Patient(id=pk, name_key=name_key, phonetic_key=phonetic_key))
+        if len(batch) >= BATCH_SIZE:
+            Patient._base_manager.bulk_update(batch, ['name_key', 'phonetic_key'])
+            batch = []
+    if batch:
+        Patient._base_manager.bulk_update(batch, ['name_key', 'phonetic_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0009_alter_predeterminedprice_options_and_more'),
+        ('patients_diagnoses', '0006_patient_search_tokens'),
+        ('reflexo', '0001_initial'),
+        ('ubi_geo', '0009_alter_district_options_district_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre'),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='phonetic_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave fonética'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['reflexo', 'name_key'], name='idx_patient_reflexo_name_key'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['reflexo', 'phonetic_key'], name='idx_patient_reflexo_phonetic'),
+        ),
+        migrations.RunPython(build_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients_diagnoses', '0007_name_keys'),
+        ('reflexo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatientDuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=3, max_digits=4, verbose_name='Puntaje')),
+                ('reasons', models.CharField(blank=True, default='', max_length=255, verbose_name='Coincidencias')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('merged', 'Fusionado'), ('dismissed', 'Descartado')], default='pending', max_length=10, verbose_name='Estado')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('patient_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='patients_diagnoses.patient', verbose_name='Paciente A')),
+                ('patient_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='patients_diagnoses.patient', verbose_name='Paciente B')),
+                ('reflexo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+            ],
+            options={
+                'verbose_name': 'Posible paciente duplicado',
+                'verbose_name_plural': 'Posibles pacientes duplicados',
+                'db_table': 'patient_duplicate_candidates',
+                'ordering': ['-score', 'id'],
+                'indexes': [models.Index(fields=['reflexo', 'status', 'score'], name='idx_pdc_reflexo_status_score')],
+                'constraints': [models.UniqueConstraint(fields=('patient_a', 'patient_b'), name='uniq_patient_duplicate_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+from architect.utils.search import create_fulltext_index, drop_fulltext_index
+
+FULLTEXT_INDEX = 'ft_medical_records_clinical'
+# Mismas columnas y orden que MedicalRecord.CLINICAL_FIELDS
+FULLTEXT_COLUMNS = ['symptoms', 'treatment', 'notes']
+
+
+def add_fulltext_index(apps, schema_editor):
+    create_fulltext_index(schema_editor, 'medical_records', FULLTEXT_INDEX, FULLTEXT_COLUMNS)
+
+
+def remove_fulltext_index(apps, schema_editor):
+    drop_fulltext_index(schema_editor, 'medical_records', FULLTEXT_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients_diagnoses', '0008_patient_duplicate_candidates'),
+        ('reflexo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(fields=['reflexo', 'deleted_at', '-diagnosis_date', '-created_at'], name='idx_mr_reflexo_listing'),
+        ),
+        migrations.RunPython(add_fulltext_index, remove_fulltext_index),
+    ]
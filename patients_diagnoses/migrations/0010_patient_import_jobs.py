@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients_diagnoses', '0009_medical_record_search'),
+        ('reflexo', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatientImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.FileField(upload_to='patient_imports/%Y/%m/', verbose_name='Archivo importado')),
+                ('format', models.CharField(max_length=10, verbose_name='Formato')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En proceso'), ('done', 'Completado'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Filas totales')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='Pacientes creados')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='Filas con error')),
+                ('errors_file', models.FileField(blank=True, null=True, upload_to='patient_imports/%Y/%m/', verbose_name='Reporte de errores')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('task_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='ID de tarea')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('reflexo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reflexo.reflexo')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Importación de pacientes',
+                'verbose_name_plural': 'Importaciones de pacientes',
+                'db_table': 'patient_import_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['reflexo', 'created_at'], name='patient_imp_reflexo_9aa07b_idx'), models.Index(fields=['status'], name='patient_imp_status_36b432_idx')],
+            },
+        ),
+    ]
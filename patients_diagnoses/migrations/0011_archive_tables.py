@@ -0,0 +1,96 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0010_archive_tables'),
+        ('patients_diagnoses', '0010_patient_import_jobs'),
+        ('reflexo', '0003_tenant_export_jobs'),
+        ('ubi_geo', '0009_alter_district_options_district_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicalRecordArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('diagnosis_date', models.DateField(verbose_name='Fecha de diagnóstico')),
+                ('symptoms', models.TextField(blank=True, null=True, verbose_name='Síntomas')),
+                ('treatment', models.TextField(blank=True, null=True, verbose_name='Tratamiento')),
+                ('notes', models.TextField(blank=True, null=True, verbose_name='Notas')),
+                ('status', models.CharField(default='active', max_length=20, verbose_name='Estado')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('diagnose', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='patients_diagnoses.diagnosis', verbose_name='Diagnóstico')),
+                ('patient', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='patients_diagnoses.patient', verbose_name='Paciente')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+            ],
+            options={
+                'verbose_name': 'Historial Médico (archivo)',
+                'verbose_name_plural': 'Historiales Médicos (archivo)',
+                'db_table': 'medical_records_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='DiagnosisArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=255, verbose_name='Código')),
+                ('name', models.CharField(max_length=255, verbose_name='Nombre')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='Empresa/Tenant')),
+            ],
+            options={
+                'verbose_name': 'Diagnóstico (archivo)',
+                'verbose_name_plural': 'Diagnósticos (archivo)',
+                'db_table': 'diagnoses_archive',
+                'indexes': [models.Index(fields=['code'], name='diagnoses_a_code_9294dd_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PatientArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('local_id', models.IntegerField(blank=True, null=True, verbose_name='ID local (por empresa)')),
+                ('document_number', models.CharField(max_length=20, verbose_name='Número de documento')),
+                ('paternal_lastname', models.CharField(blank=True, db_column='last_name_paternal', max_length=150, null=True, verbose_name='Apellido paterno')),
+                ('maternal_lastname', models.CharField(blank=True, db_column='last_name_maternal', max_length=150, null=True, verbose_name='Apellido materno')),
+                ('name', models.CharField(max_length=150, verbose_name='Nombre')),
+                ('personal_reference', models.CharField(blank=True, max_length=255, null=True, verbose_name='Referencia personal')),
+                ('birth_date', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de nacimiento')),
+                ('sex', models.CharField(blank=True, db_column='gender', max_length=50, null=True, verbose_name='Sexo')),
+                ('phone1', models.CharField(blank=True, max_length=20, null=True, verbose_name='Teléfono 1')),
+                ('phone2', models.CharField(blank=True, max_length=20, null=True, verbose_name='Teléfono 2')),
+                ('email', models.CharField(max_length=254, verbose_name='Email')),
+                ('ocupation', models.CharField(max_length=100, verbose_name='Ocupación')),
+                ('health_condition', models.TextField(verbose_name='Condición de salud')),
+                ('address', models.TextField(blank=True, null=True, verbose_name='Dirección')),
+                ('name_key', models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre')),
+                ('phonetic_key', models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave fonética')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('district', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.district', verbose_name='Distrito')),
+                ('document_type', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='histories_configurations.documenttype', verbose_name='Tipo de documento')),
+                ('province', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.province', verbose_name='Provincia')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+                ('region', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.region', verbose_name='Región')),
+            ],
+            options={
+                'verbose_name': 'Paciente (archivo)',
+                'verbose_name_plural': 'Pacientes (archivo)',
+                'db_table': 'patients_archive',
+                'indexes': [models.Index(fields=['document_number'], name='patients_ar_documen_e64df1_idx')],
+            },
+        ),
+    ]
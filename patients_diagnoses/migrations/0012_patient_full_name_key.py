@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+from architect.utils.text import exact_name_key
+
+BATCH_SIZE = 2000
+
+
+def build_full_name_keys(apps, schema_editor):
+    """Calcula full_name_key de los pacientes existentes, activos y archivados (mismo criterio que Patient.save())."""
+    for model_name in ('Patient', 'PatientArchive'):
+        model = apps.get_model('patients_diagnoses', model_name)
+        rows = (
+            model._base_manager.order_by('id')
+            .values_list('id', 'paternal_lastname', 'maternal_lastname', 'name')
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+        batch = []
+        for pk, *names in rows:
+            batch.append(model(id=pk, full_name_key=exact_name_key(*names)))
+            if len(batch) >= BATCH_SIZE:
+                model._base_manager.bulk_update(batch, ['full_name_key'])
+                batch = []
+        if batch:
+            model._base_manager.bulk_update(batch, ['full_name_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0010_archive_tables'),
+        ('patients_diagnoses', '0011_archive_tables'),
+        ('reflexo', '0003_tenant_export_jobs'),
+        ('ubi_geo', '0009_alter_district_options_district_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patient',
+            name='full_name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre completo'),
+        ),
+        migrations.AddField(
+            model_name='patientarchive',
+            name='full_name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre completo'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['reflexo', 'full_name_key'], name='idx_patient_reflexo_full_name'),
+        ),
+        migrations.RunPython(build_full_name_keys, migrations.RunPython.noop),
+    ]
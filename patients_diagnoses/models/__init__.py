@@ -1,5 +1,10 @@
 from .patient import Patient
+from .patient_search_token import PatientSearchToken
+from .patient_duplicate import PatientDuplicateCandidate
 from .diagnosis import Diagnosis
 from .medical_record import MedicalRecord
+from .patient_import_job import PatientImportJob
+from .archive import PatientArchive, MedicalRecordArchive, DiagnosisArchive
 
-__all__ = ['Patient', 'Diagnosis', 'MedicalRecord']
+__all__ = ['Patient', 'PatientSearchToken', 'PatientDuplicateCandidate', 'Diagnosis', 'MedicalRecord', 'PatientImportJob',
+           'PatientArchive', 'MedicalRecordArchive', 'DiagnosisArchive']
@@ -0,0 +1,9 @@
+from architect.utils.archive import archive_model
+from .diagnosis import Diagnosis
+from .medical_record import MedicalRecord
+from .patient import Patient
+
+# Tablas espejo de registros eliminados (soft delete): ver architect/utils/archive.py
+PatientArchive = archive_model(Patient, __name__, indexes=[("document_number",)])
+MedicalRecordArchive = archive_model(MedicalRecord, __name__)
+DiagnosisArchive = archive_model(Diagnosis, __name__, indexes=[("code",)])
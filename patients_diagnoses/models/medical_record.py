@@ -41,6 +41,10 @@ class MedicalRecord(models.Model):
     # Managers
     objects = ActiveMedicalRecordManager()
     all_objects = models.Manager()
+
+    # Texto clínico: mismas columnas y orden que el índice FULLTEXT
+    # ft_medical_records_clinical (solo MySQL, migración 0009_medical_record_search)
+    CLINICAL_FIELDS = ('symptoms', 'treatment', 'notes')
     
     class Meta:
         db_table = 'medical_records'
@@ -49,6 +53,13 @@ class MedicalRecord(models.Model):
         ordering = ['-diagnosis_date', '-created_at']
         # Permite múltiples registros para el mismo paciente/diagnóstico en fechas distintas
         unique_together = ['patient', 'diagnose', 'diagnosis_date']
+        indexes = [
+            # Listado por empresa en el orden de la vista (activos, más recientes primero)
+            models.Index(
+                fields=['reflexo', 'deleted_at', '-diagnosis_date', '-created_at'],
+                name='idx_mr_reflexo_listing',
+            ),
+        ]
     
     def soft_delete(self):
         """Soft delete del historial médico."""
@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+from architect.utils.text import exact_name_key, person_name_keys
 
 class ActivePatientManager(models.Manager):
     """Manager por defecto que excluye registros soft-deleted."""
@@ -61,6 +62,12 @@ class Patient(models.Model):
         verbose_name="Tipo de documento"
     )
 
+    # Claves de nombre normalizada y fonética (detección de duplicados); se calculan en save()
+    name_key = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="Clave de nombre")
+    phonetic_key = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="Clave fonética")
+    # Apellidos y nombre normalizados, cada uno en su posición: comprobación de "mismo paciente" al crear
+    full_name_key = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="Clave de nombre completo")
+
     # Campos de auditoría
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
@@ -82,6 +89,22 @@ class Patient(models.Model):
                 condition=models.Q(local_id__isnull=False)
             )
         ]
+        indexes = [
+            models.Index(fields=['reflexo', 'name_key'], name='idx_patient_reflexo_name_key'),
+            models.Index(fields=['reflexo', 'phonetic_key'], name='idx_patient_reflexo_phonetic'),
+            models.Index(fields=['reflexo', 'full_name_key'], name='idx_patient_reflexo_full_name'),
+        ]
+
+    NAME_FIELDS = frozenset({'name', 'paternal_lastname', 'maternal_lastname'})
+
+    def save(self, *args, **kwargs):
+        """Recalcula las claves de nombre (y las agrega a update_fields si cambió el nombre)."""
+        self.name_key, self.phonetic_key = person_name_keys(self.paternal_lastname, self.maternal_lastname, self.name)
+        self.full_name_key = exact_name_key(self.paternal_lastname, self.maternal_lastname, self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.NAME_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'name_key', 'phonetic_key', 'full_name_key'}
+        super().save(*args, **kwargs)
 
     def soft_delete(self):
         """Soft delete del paciente."""
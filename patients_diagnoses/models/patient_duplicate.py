@@ -0,0 +1,56 @@
+from django.db import models
+
+
+class PatientDuplicateCandidate(models.Model):
+    """
+    Par de pacientes posiblemente duplicados, generado por `find_duplicate_patients`
+    y pendiente de revisión (fusionar o descartar).
+    patient_a siempre tiene el ID menor.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_MERGED = "merged"
+    STATUS_DISMISSED = "dismissed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pendiente"),
+        (STATUS_MERGED, "Fusionado"),
+        (STATUS_DISMISSED, "Descartado"),
+    ]
+
+    #Multitenant
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    patient_a = models.ForeignKey(
+        'patients_diagnoses.Patient', on_delete=models.CASCADE, related_name='+', verbose_name="Paciente A"
+    )
+    patient_b = models.ForeignKey(
+        'patients_diagnoses.Patient', on_delete=models.CASCADE, related_name='+', verbose_name="Paciente B"
+    )
+    score = models.DecimalField(max_digits=4, decimal_places=3, verbose_name="Puntaje")
+    # Coincidencias que sumaron al puntaje, separadas por coma (document,name,phone,...)
+    reasons = models.CharField(max_length=255, blank=True, default='', verbose_name="Coincidencias")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado")
+
+    # Campos de auditoría
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
+
+    class Meta:
+        db_table = 'patient_duplicate_candidates'
+        verbose_name = 'Posible paciente duplicado'
+        verbose_name_plural = 'Posibles pacientes duplicados'
+        ordering = ['-score', 'id']
+        indexes = [
+            models.Index(fields=['reflexo', 'status', 'score'], name='idx_pdc_reflexo_status_score'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['patient_a', 'patient_b'], name='uniq_patient_duplicate_pair'),
+        ]
+
+    def __str__(self):
+        return f"{self.patient_a_id} ~ {self.patient_b_id} ({self.score})"
@@ -0,0 +1,70 @@
+from django.db import models
+from django.conf import settings
+
+
+class PatientImportJob(models.Model):
+    """
+    Importación masiva de pacientes (CSV/XLSX) procesada en segundo plano (Celery).
+    El archivo subido y el reporte de errores por fila quedan en default_storage;
+    processed_rows/total_rows permiten consultar el avance.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    FORMAT_CSV = 'csv'
+    FORMAT_XLSX = 'xlsx'
+    FORMATS = (FORMAT_CSV, FORMAT_XLSX)
+
+    # Multitenant
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name="Solicitado por",
+    )
+
+    source = models.FileField(upload_to="patient_imports/%Y/%m/", verbose_name="Archivo importado")
+    format = models.CharField(max_length=10, verbose_name="Formato")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado")
+    total_rows = models.PositiveIntegerField(default=0, verbose_name="Filas totales")
+    processed_rows = models.PositiveIntegerField(default=0, verbose_name="Filas procesadas")
+    created_count = models.PositiveIntegerField(default=0, verbose_name="Pacientes creados")
+    error_count = models.PositiveIntegerField(default=0, verbose_name="Filas con error")
+    errors_file = models.FileField(upload_to="patient_imports/%Y/%m/", blank=True, null=True, verbose_name="Reporte de errores")
+    error = models.TextField(blank=True, null=True, verbose_name="Error")
+    task_id = models.CharField(max_length=255, blank=True, null=True, verbose_name="ID de tarea")
+
+    # Campos de auditoría
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="Inicio")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Fin")
+
+    def __str__(self):
+        return f"Importación {self.pk} ({self.get_status_display()})"
+
+    class Meta:
+        db_table = 'patient_import_jobs'
+        verbose_name = "Importación de pacientes"
+        verbose_name_plural = "Importaciones de pacientes"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['reflexo', 'created_at']),
+            models.Index(fields=['status']),
+        ]
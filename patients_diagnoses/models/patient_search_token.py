@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class PatientSearchToken(models.Model):
+    """
+    Índice de búsqueda de pacientes: un registro por palabra normalizada
+    (minúsculas, sin tildes) de nombres, apellidos y número de documento.
+    Se mantiene desde las señales de Patient (ver patients_diagnoses/signals.py)
+    y se reconstruye con `manage.py rebuild_patient_search_index`.
+    """
+
+    FIELD_DOCUMENT = "document"
+    FIELD_NAME = "name"
+    FIELD_PATERNAL = "paternal"
+    FIELD_MATERNAL = "maternal"
+    FIELD_CHOICES = [
+        (FIELD_DOCUMENT, "Documento"),
+        (FIELD_NAME, "Nombre"),
+        (FIELD_PATERNAL, "Apellido paterno"),
+        (FIELD_MATERNAL, "Apellido materno"),
+    ]
+
+    # Multitenant (copiado del paciente para que el índice filtre por empresa)
+    reflexo = models.ForeignKey(
+        'reflexo.Reflexo',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    patient = models.ForeignKey(
+        'patients_diagnoses.Patient',
+        on_delete=models.CASCADE,
+        related_name='search_tokens',
+        verbose_name="Paciente"
+    )
+    field = models.CharField(max_length=10, choices=FIELD_CHOICES, verbose_name="Campo")
+    # db_index: en PostgreSQL agrega además el índice *_like (varchar_pattern_ops) para LIKE 'abc%'
+    token = models.CharField(max_length=64, db_index=True, verbose_name="Token")
+
+    class Meta:
+        db_table = 'patient_search_tokens'
+        verbose_name = 'Token de búsqueda de paciente'
+        verbose_name_plural = 'Tokens de búsqueda de pacientes'
+        indexes = [
+            # Búsqueda por prefijo dentro de la empresa: WHERE reflexo_id = ? AND token LIKE 'abc%'
+            models.Index(fields=['reflexo', 'token'], name='idx_pst_reflexo_token'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['patient', 'field', 'token'], name='uniq_patient_search_token'),
+        ]
+
+    def __str__(self):
+        return f"{self.patient_id}:{self.field}:{self.token}"
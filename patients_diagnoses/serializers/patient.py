@@ -4,9 +4,7 @@ from ubi_geo.serializers.region import RegionSerializer
 from ubi_geo.serializers.province import ProvinceSerializer
 from ubi_geo.serializers.district import DistrictSerializer
 from histories_configurations.serializers.document_type import DocumentTypeSerializer
-from ubi_geo.models.region import Region
-from ubi_geo.models.province import Province
-from ubi_geo.models.district import District
+from ubi_geo.services.geo_cache import GeoCache
 from django.core.validators import RegexValidator
 from datetime import date
 
@@ -129,26 +127,18 @@ class PatientSerializer(serializers.ModelSerializer):
 
         # Resolver región/provincia/distrito por ubigeo_code si NO se enviaron *_id
         # y sí se enviaron *_code
-        if not data.get('region') and self.initial_data.get('region_code'):
-            try:
-                reg = Region.objects.get(ubigeo_code=int(self.initial_data.get('region_code')))
-            except (Region.DoesNotExist, ValueError, TypeError):
-                raise serializers.ValidationError({'region_id': 'Región no encontrada para ese ubigeo_code'})
-            data['region'] = reg
-
-        if not data.get('province') and self.initial_data.get('province_code'):
-            try:
-                prov = Province.objects.select_related('region').get(ubigeo_code=int(self.initial_data.get('province_code')))
-            except (Province.DoesNotExist, ValueError, TypeError):
-                raise serializers.ValidationError({'province_id': 'Provincia no encontrada para ese ubigeo_code'})
-            data['province'] = prov
-
-        if not data.get('district') and self.initial_data.get('district_code'):
-            try:
-                dist = District.objects.select_related('province').get(ubigeo_code=int(self.initial_data.get('district_code')))
-            except (District.DoesNotExist, ValueError, TypeError):
-                raise serializers.ValidationError({'district_id': 'Distrito no encontrado para ese ubigeo_code'})
-            data['district'] = dist
+        # Resolución en memoria (GeoCache): sin consultas por código
+        for level, error in (
+            ('region', 'Región no encontrada para ese ubigeo_code'),
+            ('province', 'Provincia no encontrada para ese ubigeo_code'),
+            ('district', 'Distrito no encontrado para ese ubigeo_code'),
+        ):
+            code = self.initial_data.get(f'{level}_code')
+            if not data.get(level) and code:
+                obj = GeoCache.get_by_code(level, code)
+                if obj is None:
+                    raise serializers.ValidationError({f'{level}_id': error})
+                data[level] = obj
 
         # Geo: solo exigir si estás actualizando la ubicación
         geo_keys = ('region_id','province_id','district_id','region_code','province_code','district_code')
@@ -0,0 +1,110 @@
+from datetime import date
+
+from django.core.validators import RegexValidator
+from django.urls import reverse
+from rest_framework import ISO_8601, serializers
+
+from ..models.patient_import_job import PatientImportJob
+
+
+class PatientImportRowSerializer(serializers.Serializer):
+    """
+    Valida una fila del archivo con las mismas reglas de campo que
+    PatientSerializer, pero sin consultas: la unicidad, la geografía y el tipo
+    de documento los resuelve PatientImportService por lotes.
+    """
+
+    document_number = serializers.CharField(
+        max_length=20,
+        validators=[RegexValidator(r'^\d+$', 'Solo se permiten números.')]
+    )
+    document_type_id = serializers.IntegerField(required=False, allow_null=True)
+    document_type = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    paternal_lastname = serializers.CharField(max_length=150)
+    maternal_lastname = serializers.CharField(max_length=150)
+    name = serializers.CharField(max_length=150)
+    personal_reference = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    # Las planillas suelen traer solo la fecha (ISO o dd/mm/aaaa)
+    birth_date = serializers.DateTimeField(
+        required=False, allow_null=True, input_formats=[ISO_8601, '%Y-%m-%d', '%d/%m/%Y'],
+    )
+    sex = serializers.CharField(max_length=50, required=False, allow_blank=True, allow_null=True)
+    phone1 = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    phone2 = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    email = serializers.CharField(max_length=254)
+    ocupation = serializers.CharField(max_length=100)
+    health_condition = serializers.CharField()
+    address = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    # Ubicación por id o por ubigeo_code (igual que la API de pacientes)
+    region_id = serializers.IntegerField(required=False, allow_null=True)
+    province_id = serializers.IntegerField(required=False, allow_null=True)
+    district_id = serializers.IntegerField(required=False, allow_null=True)
+    region_code = serializers.IntegerField(required=False, allow_null=True)
+    province_code = serializers.IntegerField(required=False, allow_null=True)
+    district_code = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_document_number(self, value):
+        if len(value) < 8:
+            raise serializers.ValidationError("El número de documento debe tener al menos 8 dígitos.")
+        return value
+
+    def validate_birth_date(self, value):
+        if value and value.date() > date.today():
+            raise serializers.ValidationError("La fecha de nacimiento no puede ser futura.")
+        return value
+
+    def validate_phone1(self, value):
+        if value and len(value) < 6:
+            raise serializers.ValidationError("El teléfono principal debe tener al menos 6 caracteres.")
+        return value
+
+    def validate(self, data):
+        if not data.get('document_type_id') and not data.get('document_type'):
+            raise serializers.ValidationError({'document_type_id': 'Este campo es obligatorio (envía document_type_id o document_type).'})
+        for level in ('region', 'province', 'district'):
+            if not data.get(f'{level}_id') and not data.get(f'{level}_code'):
+                raise serializers.ValidationError({f'{level}_id': f'Este campo es obligatorio (envía {level}_id o {level}_code).'})
+        return data
+
+
+class PatientImportCreateSerializer(serializers.Serializer):
+    """Archivo a importar (y empresa destino, solo para administradores globales)."""
+
+    file = serializers.FileField()
+    reflexo_id = serializers.IntegerField(required=False)
+
+    def validate_file(self, value):
+        extension = value.name.rsplit('.', 1)[-1].lower() if '.' in value.name else ''
+        if extension not in PatientImportJob.FORMATS:
+            raise serializers.ValidationError(f"Formato no soportado. Use: {', '.join(PatientImportJob.FORMATS)}")
+        return value
+
+
+class PatientImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    errors_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PatientImportJob
+        fields = [
+            'id', 'reflexo', 'format', 'status', 'total_rows', 'processed_rows', 'progress',
+            'created_count', 'error_count', 'errors_url', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        """Porcentaje procesado (0-100)."""
+        if obj.status == PatientImportJob.STATUS_DONE:
+            return 100
+        if not obj.total_rows:
+            return 0
+        return min(100, int(obj.processed_rows * 100 / obj.total_rows))
+
+    def get_errors_url(self, obj):
+        if not obj.errors_file:
+            return None
+        url = reverse('patient-import-errors', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -1,8 +1,9 @@
 from .patient_service import PatientService
 from .diagnosis_service import DiagnosisService
 from .medical_record_service import MedicalRecordService
+from .patient_import_service import PatientImportService
 
-__all__ = ['PatientService', 'DiagnosisService', 'MedicalRecordService']
+__all__ = ['PatientService', 'DiagnosisService', 'MedicalRecordService', 'PatientImportService']
 
 
 
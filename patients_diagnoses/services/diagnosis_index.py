@@ -0,0 +1,123 @@
+# patients_diagnoses/services/diagnosis_index.py
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from ..models.diagnosis import Diagnosis
+from architect.utils.cache_version import get_version
+from architect.utils.text import normalize_text
+
+# Nombre del catálogo en architect.utils.cache_version
+CATALOG = "diagnoses"
+
+
+class _Reflexo:
+    __slots__ = ("id", "name")
+
+    def __init__(self, pk, name):
+        self.id = pk
+        self.name = name
+
+
+class DiagnosisEntry:
+    """Copia en memoria de un diagnóstico activo, con los atributos que leen los serializers."""
+
+    __slots__ = ("id", "code", "name", "reflexo_id", "reflexo", "created_at", "updated_at", "deleted_at")
+
+    def __init__(self, row):
+        self.id = row["id"]
+        self.code = row["code"]
+        self.name = row["name"]
+        self.reflexo_id = row["reflexo_id"]
+        self.reflexo = _Reflexo(row["reflexo_id"], row["reflexo__name"]) if row["reflexo_id"] else None
+        self.created_at = row["created_at"]
+        self.updated_at = row["updated_at"]
+        self.deleted_at = None
+
+
+class _Snapshot:
+    """Arreglos ordenados para búsqueda por prefijo con bisect."""
+
+    def __init__(self, rows):
+        # Mismo orden que Diagnosis.objects.order_by('code'): la posición es el orden de salida
+        self.entries: List[DiagnosisEntry] = [DiagnosisEntry(row) for row in rows]
+        self.by_code: Dict[str, DiagnosisEntry] = {}
+        codes, words = [], []
+        for pos, entry in enumerate(self.entries):
+            code_key = entry.code.lower()
+            self.by_code.setdefault(code_key, entry)
+            codes.append((code_key, pos))
+            words.extend((word, pos) for word in set(normalize_text(entry.name).split()))
+        codes.sort()
+        words.sort()
+        self.code_keys = [c for c, _ in codes]
+        self.code_pos = [p for _, p in codes]
+        self.word_keys = [w for w, _ in words]
+        self.word_pos = [p for _, p in words]
+
+    @staticmethod
+    def _prefix(keys, positions, prefix):
+        """Posiciones cuyas claves empiezan con `prefix` (rango contiguo en el arreglo ordenado)."""
+        found = set()
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            found.add(positions[i])
+            i += 1
+        return found
+
+    def search(self, term: str) -> List[DiagnosisEntry]:
+        words = normalize_text(term).split()
+        if not words:
+            return list(self.entries)
+
+        # Código por prefijo ("a09" -> A09, A090, A099...)
+        matches = self._prefix(self.code_keys, self.code_pos, "".join(words))
+        # Nombre: cada palabra buscada debe ser prefijo de alguna palabra del nombre
+        by_name = None
+        for word in words:
+            hits = self._prefix(self.word_keys, self.word_pos, word)
+            by_name = hits if by_name is None else by_name & hits
+            if not by_name:
+                break
+        matches |= by_name or set()
+        return [self.entries[pos] for pos in sorted(matches)]
+
+
+class DiagnosisIndex:
+    """
+    Índice del catálogo global de diagnósticos, local al proceso.
+
+    Se construye en el primer uso y se reconstruye cuando cambia la versión
+    del catálogo (bump_version(CATALOG) en las escrituras y en import_diagnoses).
+    Búsqueda y consulta por código se resuelven sin SQL.
+    """
+
+    _lock = threading.Lock()
+    _snapshot: Optional[_Snapshot] = None
+    _version = None
+
+    @classmethod
+    def snapshot(cls) -> _Snapshot:
+        version = get_version(CATALOG)
+        snapshot = cls._snapshot
+        if snapshot is not None and cls._version == version:
+            return snapshot
+        with cls._lock:
+            if cls._snapshot is None or cls._version != version:
+                rows = (
+                    Diagnosis.objects.filter(deleted_at__isnull=True)
+                    .order_by("code")
+                    .values("id", "code", "name", "reflexo_id", "reflexo__name", "created_at", "updated_at")
+                )
+                cls._snapshot = _Snapshot(rows)
+                cls._version = version
+            return cls._snapshot
+
+    @classmethod
+    def search(cls, term: Optional[str]) -> List[DiagnosisEntry]:
+        """Diagnósticos activos cuyo código o palabras del nombre empiezan con lo buscado, ordenados por código."""
+        return cls.snapshot().search(term or "")
+
+    @classmethod
+    def get_by_code(cls, code: str) -> Optional[DiagnosisEntry]:
+        return cls.snapshot().by_code.get((code or "").strip().lower())
@@ -1,6 +1,9 @@
-from django.db.models import Q
 from django.core.paginator import Paginator
 from ..models.diagnosis import Diagnosis
+from .diagnosis_index import DiagnosisIndex, CATALOG as DIAGNOSIS_CATALOG
+from architect.utils.archive import unarchive_one
+from architect.utils.tenant import filter_by_tenant_including_global
+from architect.utils.cache_version import bump_version_on_commit
 from ..serializers.diagnosis import DiagnosisSerializer, DiagnosisListSerializer
 from django.utils import timezone
 
@@ -9,21 +12,11 @@ class DiagnosisService:
     
     @staticmethod
     def get_all_diagnoses(page=1, page_size=10, search=None):
-        """Obtiene todos los diagnósticos con paginación y búsqueda."""
-        queryset = Diagnosis.objects.filter(deleted_at__isnull=True)
-        
-        # Aplicar búsqueda
-        if search:
-            queryset = queryset.filter(
-                Q(code__icontains=search) |
-                Q(name__icontains=search)
-            )
-        
-        # Ordenar por código
-        queryset = queryset.order_by('code')
-        
+        """Obtiene todos los diagnósticos con paginación y búsqueda (índice en memoria, ordenado por código)."""
+        entries = DiagnosisIndex.search(search)
+
         # Paginación
-        paginator = Paginator(queryset, page_size)
+        paginator = Paginator(entries, page_size)
         diagnoses_page = paginator.get_page(page)
         
         # Serializar
@@ -83,16 +76,26 @@ class DiagnosisService:
             # Borrado definitivo global por código
             Diagnosis.all_objects.filter(code=diagnosis.code).delete()
             return True
-        # Soft delete global por código
+        # Soft delete global por código (update() no dispara señales: invalidar el índice aquí)
         now = timezone.now()
         Diagnosis.objects.filter(code=diagnosis.code, deleted_at__isnull=True).update(deleted_at=now)
+        bump_version_on_commit(DIAGNOSIS_CATALOG)
         return True
     
     @staticmethod
-    def restore_diagnosis(diagnosis_id):
-        """Restaura un diagnóstico eliminado."""
+    def restore_diagnosis(diagnosis_id, user=None):
+        """Restaura un diagnóstico eliminado (también si ya fue archivado).
+        Lanza ValueError si no puede volver del archivo (código reutilizado).
+        """
+        # Catálogo compartido: el usuario ve los de su empresa y los globales
+        scope = (lambda qs: filter_by_tenant_including_global(qs, user, field='reflexo')) if user is not None else None
+        base = Diagnosis.all_objects.filter(id=diagnosis_id)
+        if scope is not None:
+            base = scope(base)
+        if not base.exists() and not unarchive_one(Diagnosis, diagnosis_id, scope):
+            return False
         try:
-            diagnosis = Diagnosis.objects.get(id=diagnosis_id, deleted_at__isnull=False)
+            diagnosis = base.get(deleted_at__isnull=False)
             diagnosis.restore()
             return True
         except Diagnosis.DoesNotExist:
@@ -100,9 +103,8 @@ class DiagnosisService:
     
     @staticmethod
     def get_diagnosis_by_code(code):
-        """Obtiene un diagnóstico por su código."""
-        try:
-            diagnosis = Diagnosis.objects.get(code=code, deleted_at__isnull=True)
-            return DiagnosisSerializer(diagnosis).data
-        except Diagnosis.DoesNotExist:
+        """Obtiene un diagnóstico por su código (índice en memoria)."""
+        diagnosis = DiagnosisIndex.get_by_code(code)
+        if diagnosis is None:
             return None
+        return DiagnosisSerializer(diagnosis).data
@@ -1,13 +1,87 @@
-from django.db.models import Q
+from django.db import connections
+from django.db.models import Case, FloatField, IntegerField, Q, Value, When
 from django.core.paginator import Paginator
 from ..models.medical_record import MedicalRecord
 from ..serializers.medical_record import MedicalRecordSerializer, MedicalRecordListSerializer
+from architect.utils.archive import unarchive_one
+from architect.utils.search import MatchAgainst, is_fulltext_term
 from architect.utils.tenant import filter_by_tenant, get_tenant, is_global_admin
+from architect.utils.text import tokenize
 from ..models.patient import Patient
 from ..models.diagnosis import Diagnosis
+from .diagnosis_index import DiagnosisIndex
+from .patient_search_service import PatientSearchService
+
+# Máximo de palabras de la búsqueda que se consideran
+MAX_SEARCH_TERMS = 5
+# Más diagnósticos que esto para una palabra (p. ej. "a") se filtran por join en vez de IN (...)
+MAX_DIAGNOSIS_IDS = 500
+
+# Puntaje por palabra según dónde coincide: paciente > diagnóstico > texto clínico
+SCORE_PATIENT = 3
+SCORE_DIAGNOSIS = 2
+SCORE_CLINICAL = 1
+
 
 class MedicalRecordService:
     """Servicio para gestionar historiales médicos."""
+
+    @staticmethod
+    def _clinical_match(queryset, term, use_fulltext):
+        """Registros cuyo texto clínico (síntomas, tratamiento, notas) contiene `term`."""
+        if use_fulltext and is_fulltext_term(term):
+            # Subconsulta servida por el índice FULLTEXT, acotada al mismo tenant
+            matches = (
+                queryset.alias(clinical_rank=MatchAgainst(MedicalRecord.CLINICAL_FIELDS, f"+{term}*"))
+                .filter(clinical_rank__gt=0)
+                .values('id')
+            )
+            return Q(id__in=matches)
+        condition = Q()
+        for field in MedicalRecord.CLINICAL_FIELDS:
+            condition |= Q(**{f"{field}__icontains": term})
+        return condition
+
+    @staticmethod
+    def _diagnosis_match(term):
+        ids = [entry.id for entry in DiagnosisIndex.search(term)]
+        if len(ids) > MAX_DIAGNOSIS_IDS:
+            return Q(diagnose__code__istartswith=term) | Q(diagnose__name__icontains=term)
+        return Q(diagnose_id__in=ids)
+
+    @classmethod
+    def search_records(cls, queryset, search, user=None):
+        """
+        Filtra `queryset` (ya acotado al tenant) por palabras, y anota `search_score`.
+
+        Cada palabra debe coincidir con el paciente (índice de tokens), el
+        diagnóstico (índice en memoria del catálogo) o el texto clínico
+        (FULLTEXT en MySQL, LIKE en otras bases); todas son consultas por
+        índice en vez de siete `icontains` con joins. El puntaje suma, por
+        palabra, dónde coincidió y, en MySQL, la relevancia FULLTEXT.
+        """
+        terms = tokenize(search)[:MAX_SEARCH_TERMS]
+        score = Value(0.0, output_field=FloatField())
+        if not terms:
+            return queryset.none().annotate(search_score=score)
+
+        use_fulltext = connections[queryset.db].vendor == 'mysql'
+        search_service = PatientSearchService()
+        scope = MedicalRecord.objects.all()
+        if user is not None:
+            scope = filter_by_tenant(scope, user, field='reflexo')
+        for term in terms:
+            patient = Q(patient_id__in=search_service.patient_ids(term, user))
+            diagnosis = cls._diagnosis_match(term)
+            clinical = cls._clinical_match(scope, term, use_fulltext)
+            queryset = queryset.filter(patient | diagnosis | clinical)
+            for condition, weight in ((patient, SCORE_PATIENT), (diagnosis, SCORE_DIAGNOSIS), (clinical, SCORE_CLINICAL)):
+                score += Case(When(condition, then=Value(weight)), default=Value(0), output_field=IntegerField())
+
+        fulltext_terms = [t for t in terms if is_fulltext_term(t)]
+        if use_fulltext and fulltext_terms:
+            score += MatchAgainst(MedicalRecord.CLINICAL_FIELDS, " ".join(f"{t}*" for t in fulltext_terms))
+        return queryset.annotate(search_score=score)
     
     @staticmethod
     def get_all_medical_records(page=1, page_size=10, search=None, filters=None, user=None):
@@ -22,15 +96,7 @@ class MedicalRecordService:
         
         # Aplicar búsqueda
         if search:
-            queryset = queryset.filter(
-                Q(patient__name__icontains=search) |
-                Q(patient__paternal_lastname__icontains=search) |
-                Q(patient__document_number__icontains=search) |
-                Q(diagnose__name__icontains=search) |
-                Q(diagnose__code__icontains=search) |
-                Q(symptoms__icontains=search) |
-                Q(treatment__icontains=search)
-            )
+            queryset = MedicalRecordService.search_records(queryset, search, user=user)
         
         # Aplicar filtros
         if filters:
@@ -45,8 +111,11 @@ class MedicalRecordService:
             if filters.get('date_to'):
                 queryset = queryset.filter(diagnosis_date__lte=filters['date_to'])
         
-        # Ordenar por fecha de diagnóstico
-        queryset = queryset.order_by('-diagnosis_date', '-created_at')
+        # Ordenar por relevancia (si hay búsqueda) y fecha de diagnóstico
+        if search:
+            queryset = queryset.order_by('-search_score', '-diagnosis_date', '-created_at')
+        else:
+            queryset = queryset.order_by('-diagnosis_date', '-created_at')
         
         # Paginación
         paginator = Paginator(queryset, page_size)
@@ -208,10 +277,19 @@ class MedicalRecordService:
             return False
     
     @staticmethod
-    def restore_medical_record(record_id):
-        """Restaura un historial médico eliminado."""
+    def restore_medical_record(record_id, user=None):
+        """Restaura un historial médico eliminado (también si ya fue archivado).
+        Lanza ValueError si no puede volver del archivo (valor único reutilizado).
+        """
+        scope = (lambda qs: filter_by_tenant(qs, user, field='reflexo')) if user is not None else None
+        base = MedicalRecord.all_objects.filter(id=record_id)
+        if scope is not None:
+            base = scope(base)
+        # Del archivo solo vuelve si el usuario puede verlo allí
+        if not base.exists() and not unarchive_one(MedicalRecord, record_id, scope):
+            return False
         try:
-            record = MedicalRecord.objects.get(id=record_id, deleted_at__isnull=False)
+            record = base.get(deleted_at__isnull=False)
             record.restore()
             return True
         except MedicalRecord.DoesNotExist:
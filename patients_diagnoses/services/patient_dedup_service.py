@@ -0,0 +1,233 @@
+# patients_diagnoses/services/patient_dedup_service.py
+import multiprocessing
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from difflib import SequenceMatcher
+from itertools import combinations, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connections, transaction
+
+from ..models.patient import Patient
+from ..models.patient_duplicate import PatientDuplicateCandidate
+from architect.utils.text import normalize_document, person_name_keys, phonetic_token, tokenize
+
+# Pesos del puntaje (máximo 1.0)
+WEIGHT_DOCUMENT = 0.5
+WEIGHT_NAME_EXACT = 0.35
+WEIGHT_NAME_PHONETIC = 0.3
+WEIGHT_NAME_SIMILAR = 0.3  # multiplicado por la similitud (0..1) de name_key
+WEIGHT_PHONE = 0.1
+WEIGHT_EMAIL = 0.1
+WEIGHT_BIRTH_DATE = 0.1
+
+DEFAULT_MIN_SCORE = 0.4
+# Bloques más grandes que esto (p. ej. un teléfono o email "comodín" compartido) no generan pares
+DEFAULT_MAX_BLOCK = 200
+DEFAULT_CHUNK_SIZE = 20000
+INSERT_BATCH_SIZE = 2000
+
+_DIGITS = re.compile(r"\D+")
+
+# Registro compacto de un paciente para el puntaje (tupla: se copia barato a los workers)
+# (id, documento, name_key, phonetic_key, teléfonos, email, fecha_nacimiento, apellido_paterno_fonético)
+Record = Tuple[int, str, str, str, Tuple[str, ...], str, str, str]
+
+# Registros del tenant en cada worker (se heredan por fork o llegan por el initializer)
+_RECORDS: Dict[int, Record] = {}
+
+
+def _phone(value) -> str:
+    digits = _DIGITS.sub("", value or "")
+    # Los últimos 9 dígitos: ignora prefijos de país/ciudad
+    return digits[-9:] if len(digits) >= 6 else ""
+
+
+def _email(value) -> str:
+    value = (value or "").strip().lower()
+    return value if "@" in value else ""
+
+
+def _init_worker(records: Dict[int, Record]) -> None:
+    global _RECORDS
+    _RECORDS = records
+
+
+def score_pair(a: Record, b: Record) -> Tuple[float, List[str]]:
+    """Puntaje 0..1 de que dos registros sean la misma persona y las coincidencias que lo explican."""
+    score, reasons = 0.0, []
+    if a[1] and a[1] == b[1]:
+        score += WEIGHT_DOCUMENT
+        reasons.append("document")
+    if a[2] and a[2] == b[2]:
+        score += WEIGHT_NAME_EXACT
+        reasons.append("name")
+    elif a[3] and a[3] == b[3]:
+        score += WEIGHT_NAME_PHONETIC
+        reasons.append("phonetic")
+    elif a[2] and b[2]:
+        ratio = SequenceMatcher(None, a[2], b[2]).ratio()
+        if ratio >= 0.8:
+            score += WEIGHT_NAME_SIMILAR * ratio
+            reasons.append("similar_name")
+    if a[4] and set(a[4]) & set(b[4]):
+        score += WEIGHT_PHONE
+        reasons.append("phone")
+    if a[5] and a[5] == b[5]:
+        score += WEIGHT_EMAIL
+        reasons.append("email")
+    if a[6] and b[6]:
+        if a[6] == b[6]:
+            score += WEIGHT_BIRTH_DATE
+            reasons.append("birth_date")
+        else:
+            # Fechas de nacimiento distintas: evidencia en contra
+            score -= WEIGHT_BIRTH_DATE
+    return max(0.0, min(score, 1.0)), reasons
+
+
+def _score_chunk(args) -> List[Tuple[int, int, float, str]]:
+    """Worker: puntúa un bloque de pares (a_id, b_id) y devuelve los que superan el umbral."""
+    pairs, min_score = args
+    out = []
+    for a_id, b_id in pairs:
+        score, reasons = score_pair(_RECORDS[a_id], _RECORDS[b_id])
+        if score >= min_score:
+            out.append((a_id, b_id, round(score, 3), ",".join(reasons)))
+    return out
+
+
+class PatientDedupService:
+    """
+    Detección de pacientes duplicados por empresa:
+      1. carga registros compactos (una sola consulta en streaming),
+      2. genera pares candidatos solo dentro de bloques (documento, nombre fonético,
+         teléfono, email, fecha de nacimiento + apellido) en vez de comparar todos contra todos,
+      3. puntúa los pares en un pool de procesos,
+      4. guarda los pares por encima del umbral en patient_duplicate_candidates a medida que llegan.
+    """
+
+    def load_records(self, tenant_id: Optional[int]) -> Dict[int, Record]:
+        qs = Patient.objects.filter(reflexo_id=tenant_id).values_list(
+            "id", "document_number", "name", "paternal_lastname", "maternal_lastname",
+            "name_key", "phonetic_key", "phone1", "phone2", "email", "birth_date",
+        )
+        records = {}
+        for pk, doc, name, paternal, maternal, name_key, phonetic_key, phone1, phone2, email, birth in qs.iterator(chunk_size=5000):
+            if not name_key:
+                # Filas sin backfill de claves: se calculan al vuelo
+                name_key, phonetic_key = person_name_keys(paternal, maternal, name)
+            paternal_tokens = tokenize(paternal)
+            records[pk] = (
+                pk,
+                normalize_document(doc),
+                name_key,
+                phonetic_key,
+                tuple(p for p in {_phone(phone1), _phone(phone2)} if p),
+                _email(email),
+                birth.date().isoformat() if birth else "",
+                phonetic_token(paternal_tokens[0]) if paternal_tokens else "",
+            )
+        return records
+
+    @staticmethod
+    def blocking_keys(record: Record) -> Iterator[tuple]:
+        pk, doc, name_key, phonetic_key, phones, email, birth, paternal = record
+        if doc:
+            yield ("d", doc)
+        if phonetic_key:
+            yield ("n", phonetic_key)
+        for phone in phones:
+            yield ("t", phone)
+        if email:
+            yield ("e", email)
+        if birth and paternal:
+            yield ("b", birth, paternal)
+
+    def candidate_pairs(self, records: Dict[int, Record], max_block: int = DEFAULT_MAX_BLOCK) -> Tuple[List[Tuple[int, int]], int]:
+        """Pares únicos (a_id < b_id) que comparten al menos un bloque, y cantidad de bloques omitidos por tamaño."""
+        blocks = defaultdict(list)
+        for record in records.values():
+            for key in self.blocking_keys(record):
+                blocks[key].append(record[0])
+
+        pairs, skipped = set(), 0
+        for ids in blocks.values():
+            if len(ids) < 2:
+                continue
+            if len(ids) > max_block:
+                skipped += 1
+                continue
+            ids.sort()
+            pairs.update(combinations(ids, 2))
+        return sorted(pairs), skipped
+
+    @staticmethod
+    def _chunks(pairs: List[Tuple[int, int]], size: int) -> Iterator[List[Tuple[int, int]]]:
+        it = iter(pairs)
+        while True:
+            chunk = list(islice(it, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def score(self, records, pairs, workers: int, min_score: float, chunk_size: int) -> Iterable[List[tuple]]:
+        """Resultados por bloque de pares. Con workers > 1 usa un pool de procesos (fork)."""
+        jobs = ((chunk, min_score) for chunk in self._chunks(pairs, chunk_size))
+        if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            _init_worker(records)
+            yield from map(_score_chunk, jobs)
+            return
+
+        # Los hijos heredan el proceso: no deben compartir la conexión a la BD del padre
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(records,),
+        ) as executor:
+            yield from executor.map(_score_chunk, jobs)
+
+    def run(
+        self,
+        tenant_id: Optional[int],
+        workers: int = 1,
+        min_score: float = DEFAULT_MIN_SCORE,
+        max_block: int = DEFAULT_MAX_BLOCK,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        dry_run: bool = False,
+    ) -> dict:
+        records = self.load_records(tenant_id)
+        pairs, skipped_blocks = self.candidate_pairs(records, max_block=max_block)
+        stats = {
+            "patients": len(records),
+            "pairs": len(pairs),
+            "skipped_blocks": skipped_blocks,
+            "candidates": 0,
+        }
+        if not dry_run:
+            # Se regeneran los pendientes; fusionados/descartados se conservan (ignore_conflicts)
+            PatientDuplicateCandidate.objects.filter(
+                reflexo_id=tenant_id, status=PatientDuplicateCandidate.STATUS_PENDING
+            ).delete()
+
+        for results in self.score(records, pairs, workers, min_score, chunk_size):
+            stats["candidates"] += len(results)
+            if dry_run or not results:
+                continue
+            with transaction.atomic():
+                PatientDuplicateCandidate.objects.bulk_create(
+                    [
+                        PatientDuplicateCandidate(
+                            reflexo_id=tenant_id, patient_a_id=a, patient_b_id=b,
+                            score=Decimal(str(score)), reasons=reasons,
+                        )
+                        for a, b, score, reasons in results
+                    ],
+                    batch_size=INSERT_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+        return stats
@@ -0,0 +1,320 @@
+# patients_diagnoses/services/patient_import_service.py
+import csv
+import io
+import logging
+from datetime import date, datetime
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models.patient import Patient
+from ..models.patient_import_job import PatientImportJob
+from ..serializers.patient_import import PatientImportRowSerializer
+from .patient_search_service import PatientSearchService
+from architect.models import SearchEntry
+from architect.utils.archive import max_with_archive
+from architect.utils.global_search import GlobalSearchService
+from architect.utils.tenant import get_tenant, is_global_admin
+from architect.utils.text import exact_name_key, person_name_keys
+from histories_configurations.models import DocumentType
+from ubi_geo.services.geo_cache import GeoCache
+
+logger = logging.getLogger(__name__)
+
+# Filas por lote: una consulta IN por clave única, un bloque de local_id y un bulk_create
+BATCH_SIZE = 500
+
+# Columnas de la fila validada que pasan tal cual al modelo
+PATIENT_FIELDS = (
+    "document_number", "paternal_lastname", "maternal_lastname", "name", "personal_reference",
+    "birth_date", "sex", "phone1", "phone2", "email", "ocupation", "health_condition", "address",
+)
+ERROR_REPORT_HEADER = ("fila", "document_number", "campo", "error")
+
+GEO_ERRORS = {
+    "region": "Región no encontrada para ese ubigeo_code",
+    "province": "Provincia no encontrada para ese ubigeo_code",
+    "district": "Distrito no encontrado para ese ubigeo_code",
+}
+
+
+def _cell(value) -> Optional[str]:
+    """Valor de celda (CSV o XLSX) como texto; vacío -> None."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Excel guarda documentos y teléfonos como números: 12345678.0 -> "12345678"
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+class _ImportState:
+    """Datos compartidos por todos los lotes de un job (sin consultas por fila)."""
+
+    def __init__(self, tenant_id: int):
+        self.tenant_id = tenant_id
+        document_types = list(DocumentType.objects.all())
+        self.document_types = {d.id: d for d in document_types}
+        self.document_types_by_name = {d.name.strip().lower(): d for d in document_types}
+        # Claves ya importadas en lotes anteriores (duplicados dentro del mismo archivo)
+        self.documents = set()
+        self.emails = set()
+        self.full_name_keys = set()
+
+
+class PatientImportService:
+    """Alta, ejecución y consulta de importaciones masivas de pacientes."""
+
+    def submit(self, user, upload, reflexo_id=None) -> PatientImportJob:
+        """
+        Guarda el archivo, registra el job y lo encola al confirmar la transacción.
+        Sin REDIS_URL (CELERY_TASK_ALWAYS_EAGER) la tarea corre en el mismo proceso.
+        """
+        from patients_diagnoses.tasks import import_patients_job
+
+        # Mismas reglas de tenant que PatientService.store_or_restore
+        if is_global_admin(user):
+            if not reflexo_id:
+                raise ValidationError({"reflexo_id": "Debe indicar la empresa (tenant) para los pacientes."})
+            tenant_id = reflexo_id
+        else:
+            tenant_id = get_tenant(user)
+            if tenant_id is None:
+                raise ValidationError({"tenant": "El usuario no tiene una empresa asignada (reflexo). Contacte al administrador."})
+
+        job = PatientImportJob(
+            reflexo_id=tenant_id,
+            requested_by=user if getattr(user, "is_authenticated", False) else None,
+            format=upload.name.rsplit(".", 1)[-1].lower(),
+        )
+        job.source.save(upload.name, upload, save=False)
+        job.save()
+        transaction.on_commit(lambda: import_patients_job.delay(job.id))
+        return job
+
+    def run(self, job_id, task_id=None) -> PatientImportJob:
+        """Procesa el archivo por lotes y guarda el reporte de errores por fila."""
+        job = PatientImportJob.objects.get(pk=job_id)
+        if job.status == PatientImportJob.STATUS_DONE:
+            return job
+
+        job.status = PatientImportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.task_id = task_id
+        job.error = None
+        job.processed_rows = job.created_count = job.error_count = 0
+        job.save(update_fields=["status", "started_at", "task_id", "error", "processed_rows", "created_count", "error_count"])
+
+        errors: List[Tuple[int, str, str, str]] = []
+        try:
+            # Primera pasada solo para el total (progreso); no guarda filas en memoria
+            job.total_rows = sum(1 for _ in self._iter_rows(job))
+            PatientImportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows)
+
+            state = _ImportState(job.reflexo_id)
+            batch = []
+            for row in self._iter_rows(job):
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    self._process_batch(job, batch, state, errors)
+                    batch = []
+            if batch:
+                self._process_batch(job, batch, state, errors)
+            job.status = PatientImportJob.STATUS_DONE
+        except Exception as e:
+            logger.exception("Importación de pacientes %s falló", job.pk)
+            job.status = PatientImportJob.STATUS_FAILED
+            job.error = str(e)
+
+        if errors:
+            job.errors_file.save(f"errores_importacion_{job.pk}.csv", ContentFile(self._error_report(errors)), save=False)
+        job.finished_at = timezone.now()
+        job.save(update_fields=[
+            "status", "total_rows", "processed_rows", "created_count", "error_count",
+            "errors_file", "error", "finished_at",
+        ])
+        return job
+
+    # ---------- lectura ----------
+    def _iter_rows(self, job: PatientImportJob) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(número de fila, {columna: valor}) leyendo el archivo por streaming; omite filas vacías."""
+        rows = self._xlsx_rows(job) if job.format == PatientImportJob.FORMAT_XLSX else self._csv_rows(job)
+        header = None
+        for number, values in enumerate(rows, start=1):
+            values = [_cell(v) for v in values]
+            if header is None:
+                header = [(v or "").lower() for v in values]
+                continue
+            if not any(values):
+                continue
+            yield number, {key: value for key, value in zip(header, values) if key and value is not None}
+
+    @staticmethod
+    def _csv_rows(job: PatientImportJob) -> Iterator[list]:
+        with job.source.open("rb") as f:
+            text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+            first = text.readline()
+            # Planillas exportadas en español suelen usar ';'
+            delimiter = ";" if first.count(";") >= first.count(",") else ","
+            yield from csv.reader(chain([first], text), delimiter=delimiter)
+
+    @staticmethod
+    def _xlsx_rows(job: PatientImportJob) -> Iterator[tuple]:
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("La importación de archivos .xlsx requiere openpyxl (pip install openpyxl)")
+        with job.source.open("rb") as f:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+            try:
+                yield from workbook.active.iter_rows(values_only=True)
+            finally:
+                workbook.close()
+
+    # ---------- validación e inserción por lotes ----------
+    def _resolve(self, data: Dict[str, Any], state: _ImportState) -> Optional[Tuple[str, str]]:
+        """Tipo de documento y ubicación desde memoria; (campo, error) si algo no coincide."""
+        document_type = (
+            state.document_types.get(data["document_type_id"]) if data.get("document_type_id")
+            else state.document_types_by_name.get(data["document_type"].strip().lower())
+        )
+        if document_type is None:
+            return "document_type_id", "Tipo de documento no encontrado."
+        data["document_type"] = document_type
+
+        for level in ("region", "province", "district"):
+            pk, code = data.pop(f"{level}_id", None), data.pop(f"{level}_code", None)
+            obj = GeoCache.get(level, pk) if pk else GeoCache.get_by_code(level, code)
+            if obj is None:
+                return f"{level}_id", GEO_ERRORS[level]
+            data[level] = obj
+        if data["province"].region_id != data["region"].id:
+            return "province_id", "La provincia no pertenece a la región indicada"
+        if data["district"].province_id != data["province"].id:
+            return "district_id", "El distrito no pertenece a la provincia indicada"
+        return None
+
+    @staticmethod
+    def _check_unique(rows, state: _ImportState):
+        """
+        Documento, email y nombre (por empresa) contra la BD con una consulta IN
+        por clave, y contra las filas ya importadas del mismo archivo.
+        Devuelve (filas válidas, errores).
+        """
+        documents = {data["document_number"] for _, data in rows}
+        emails = {data["email"] for _, data in rows}
+        full_name_keys = {data["full_name_key"] for _, data in rows}
+        taken_documents = set(
+            Patient.all_objects.filter(document_number__in=documents).values_list("document_number", flat=True)
+        ) | state.documents
+        taken_emails = set(Patient.objects.filter(email__in=emails).values_list("email", flat=True)) | state.emails
+        taken_names = set(
+            Patient.objects.filter(reflexo_id=state.tenant_id, full_name_key__in=full_name_keys)
+            .values_list("full_name_key", flat=True)
+        ) | state.full_name_keys
+
+        valid, errors = [], []
+        for number, data in rows:
+            if data["document_number"] in taken_documents:
+                errors.append((number, data["document_number"], "document_number", "El número de documento ya está registrado."))
+            elif data["email"] in taken_emails:
+                errors.append((number, data["document_number"], "email", "El correo electrónico ya está registrado."))
+            elif data["full_name_key"] in taken_names:
+                errors.append((number, data["document_number"], "name", "El paciente ya existe"))
+            else:
+                valid.append((number, data))
+                taken_documents.add(data["document_number"])
+                taken_emails.add(data["email"])
+                taken_names.add(data["full_name_key"])
+        return valid, errors
+
+    @staticmethod
+    def _insert(rows, tenant_id: int) -> List[int]:
+        """Un bloque de local_id y un bulk_create por lote; devuelve los ids creados."""
+        with transaction.atomic():
+            # Mismo bloqueo que PatientService.store_or_restore, una vez por lote en lugar de por paciente
+            # (incluye los archivados: vuelven con su número al restaurarse)
+            max_local = max_with_archive(Patient, "local_id", Patient.all_objects.select_for_update(), reflexo_id=tenant_id)
+            patients = [
+                Patient(
+                    reflexo_id=tenant_id,
+                    local_id=max_local + position,
+                    region=data["region"],
+                    province=data["province"],
+                    district=data["district"],
+                    document_type=data["document_type"],
+                    name_key=data["name_key"],
+                    phonetic_key=data["phonetic_key"],
+                    full_name_key=data["full_name_key"],
+                    **{field: data.get(field) for field in PATIENT_FIELDS},
+                )
+                for position, (_, data) in enumerate(rows, start=1)
+            ]
+            Patient.objects.bulk_create(patients, batch_size=BATCH_SIZE)
+        # MySQL no devuelve los ids del bulk_create: releerlos por documento (único)
+        return list(
+            Patient.all_objects.filter(document_number__in=[data["document_number"] for _, data in rows])
+            .values_list("id", flat=True)
+        )
+
+    def _process_batch(self, job: PatientImportJob, batch, state: _ImportState, errors: list) -> None:
+        rows = []
+        for number, raw in batch:
+            serializer = PatientImportRowSerializer(data=raw)
+            if not serializer.is_valid():
+                for field, messages in serializer.errors.items():
+                    errors.append((number, raw.get("document_number") or "", field, " ".join(map(str, messages))))
+                continue
+            data = dict(serializer.validated_data)
+            problem = self._resolve(data, state)
+            if problem is not None:
+                errors.append((number, data["document_number"], *problem))
+                continue
+            # save() no se llama en bulk_create: las claves de nombre se calculan aquí
+            names = (data["paternal_lastname"], data["maternal_lastname"], data["name"])
+            data["name_key"], data["phonetic_key"] = person_name_keys(*names)
+            data["full_name_key"] = exact_name_key(*names)
+            rows.append((number, data))
+
+        valid, rejected = self._check_unique(rows, state)
+        ids = []
+        if valid:
+            try:
+                ids = self._insert(valid, state.tenant_id)
+            except IntegrityError:
+                # Alta concurrente (API) entre la validación y el INSERT: revalidar una vez
+                valid, rejected = self._check_unique(rows, state)
+                ids = self._insert(valid, state.tenant_id) if valid else []
+        errors.extend(rejected)
+        for _, data in valid:
+            state.documents.add(data["document_number"])
+            state.emails.add(data["email"])
+            state.full_name_keys.add(data["full_name_key"])
+
+        if ids:
+            # bulk_create no dispara señales: índices de búsqueda de pacientes y global
+            PatientSearchService().reindex(ids)
+            GlobalSearchService().reindex(SearchEntry.TYPE_PATIENT, ids)
+
+        job.processed_rows += len(batch)
+        job.created_count += len(ids)
+        job.error_count = len({number for number, *_ in errors})
+        PatientImportJob.objects.filter(pk=job.pk).update(
+            processed_rows=job.processed_rows, created_count=job.created_count, error_count=job.error_count,
+        )
+
+    @staticmethod
+    def _error_report(errors) -> bytes:
+        """CSV (una línea por error) para descargar y corregir el archivo."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(ERROR_REPORT_HEADER)
+        writer.writerows(sorted(errors, key=lambda error: error[0]))
+        return buffer.getvalue().encode("utf-8")
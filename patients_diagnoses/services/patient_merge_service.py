@@ -0,0 +1,105 @@
+# patients_diagnoses/services/patient_merge_service.py
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from ..models.patient import Patient
+from ..models.medical_record import MedicalRecord
+from ..models.patient_duplicate import PatientDuplicateCandidate
+from appointments_status.models.appointment import Appointment
+from architect.models import SearchEntry
+from architect.utils.global_search import GlobalSearchService
+from histories_configurations.models.history import History
+
+# Datos de contacto que el paciente que se conserva hereda si no los tiene
+FILLABLE_FIELDS = ("phone1", "phone2", "address", "birth_date", "personal_reference", "sex")
+
+
+class PatientMergeService:
+    """Fusiona un paciente duplicado en otro, moviendo sus relaciones con UPDATE masivos."""
+
+    @transaction.atomic
+    def merge(self, keep_id: int, remove_id: int) -> dict:
+        """
+        Mueve historiales, citas e historiales médicos de `remove_id` a `keep_id`
+        y elimina (soft delete) el duplicado.
+        - Un solo historial activo por paciente: si ambos tienen, el del duplicado se cierra.
+        - MedicalRecord es único por (paciente, diagnóstico, fecha): los registros del
+          duplicado que chocarían quedan en él (eliminado) y no se pierden.
+        """
+        if keep_id == remove_id:
+            raise ValidationError({"patient": "No se puede fusionar un paciente consigo mismo."})
+        patients = {
+            p.id: p for p in Patient.all_objects.select_for_update().filter(id__in=[keep_id, remove_id])
+        }
+        keep, remove = patients.get(keep_id), patients.get(remove_id)
+        if keep is None or remove is None:
+            raise ValidationError({"patient": "Paciente no encontrado."})
+        if keep.reflexo_id != remove.reflexo_id:
+            raise ValidationError({"patient": "Los pacientes pertenecen a empresas distintas."})
+        if keep.deleted_at is not None:
+            raise ValidationError({"patient": "El paciente que se conserva está eliminado."})
+
+        now = timezone.now()
+        closed_histories = 0
+        if History.active.filter(patient_id=keep_id).exists():
+            closed_histories = History.active.filter(patient_id=remove_id).update(deleted_at=now)
+        histories = History.objects.filter(patient_id=remove_id).update(patient_id=keep_id)
+        moved_appointments = list(Appointment.objects.filter(patient_id=remove_id).values_list("id", flat=True))
+        appointments = Appointment.objects.filter(id__in=moved_appointments).update(patient_id=keep_id)
+        # update() no dispara señales: las citas (y sus tickets) indexan el nombre y documento del paciente
+        transaction.on_commit(
+            lambda: GlobalSearchService().reindex_with_dependents(SearchEntry.TYPE_APPOINTMENT, moved_appointments)
+        )
+
+        taken = set(
+            MedicalRecord.all_objects.filter(patient_id=keep_id).values_list("diagnose_id", "diagnosis_date")
+        )
+        conflicting = [
+            pk for pk, diagnose_id, diagnosis_date in MedicalRecord.all_objects
+            .filter(patient_id=remove_id)
+            .values_list("id", "diagnose_id", "diagnosis_date")
+            if (diagnose_id, diagnosis_date) in taken
+        ]
+        medical_records = (
+            MedicalRecord.all_objects.filter(patient_id=remove_id)
+            .exclude(id__in=conflicting)
+            .update(patient_id=keep_id)
+        )
+
+        filled = [f for f in FILLABLE_FIELDS if not getattr(keep, f) and getattr(remove, f)]
+        for field in filled:
+            setattr(keep, field, getattr(remove, field))
+        if filled:
+            keep.save(update_fields=filled)
+
+        if remove.deleted_at is None:
+            remove.soft_delete()
+
+        pair = Q(patient_a_id=min(keep_id, remove_id), patient_b_id=max(keep_id, remove_id))
+        PatientDuplicateCandidate.objects.filter(pair).update(status=PatientDuplicateCandidate.STATUS_MERGED)
+        # Otros pares pendientes del duplicado ya no aplican (se regeneran en la próxima corrida)
+        PatientDuplicateCandidate.objects.filter(
+            Q(patient_a_id=remove_id) | Q(patient_b_id=remove_id),
+            status=PatientDuplicateCandidate.STATUS_PENDING,
+        ).delete()
+
+        return {
+            "kept": keep_id,
+            "removed": remove_id,
+            "histories": histories,
+            "closed_histories": closed_histories,
+            "appointments": appointments,
+            "medical_records": medical_records,
+            "medical_records_left": len(conflicting),
+            "filled_fields": filled,
+        }
+
+    def merge_candidate(self, candidate: PatientDuplicateCandidate, keep_id: int = None) -> dict:
+        """Fusiona un par de la tabla de revisión (por defecto se conserva el paciente más antiguo)."""
+        keep_id = keep_id or candidate.patient_a_id
+        if keep_id not in (candidate.patient_a_id, candidate.patient_b_id):
+            raise ValidationError({"keep": "El paciente a conservar debe ser parte del par."})
+        remove_id = candidate.patient_b_id if keep_id == candidate.patient_a_id else candidate.patient_a_id
+        return self.merge(keep_id, remove_id)
@@ -0,0 +1,178 @@
+# patients_diagnoses/services/patient_search_service.py
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+
+from ..models.patient import Patient
+from ..models.patient_search_token import PatientSearchToken
+from architect.utils.tenant import filter_by_tenant
+from architect.utils.text import normalize_document, tokenize
+
+# Campos del paciente que alimentan el índice (si un save() no toca ninguno, no se reindexa)
+INDEXED_FIELDS = frozenset({
+    "document_number", "name", "paternal_lastname", "maternal_lastname", "reflexo", "deleted_at",
+})
+
+# Máximo de palabras de la búsqueda que se consideran (cada una es un CASE en la consulta)
+MAX_SEARCH_TERMS = 5
+
+# Puntaje por palabra: el documento pesa más que los nombres, exacto más que prefijo
+SCORE_DOCUMENT_EXACT = 100
+SCORE_DOCUMENT_PREFIX = 50
+SCORE_TOKEN_EXACT = 3
+SCORE_TOKEN_PREFIX = 1
+
+
+class PatientSearchService:
+    """
+    Búsqueda de pacientes sobre la tabla de tokens (patient_search_tokens).
+
+    Cada palabra buscada se resuelve con un rango por prefijo sobre el índice
+    (reflexo_id, token); el paciente debe coincidir con todas las palabras, en
+    cualquier orden ("jose perez" == "perez jose"), y se ordena por puntaje.
+    """
+
+    # ---------- índice ----------
+    @staticmethod
+    def tokens_for(document_number, name, paternal_lastname, maternal_lastname) -> List[Tuple[str, str]]:
+        """Pares (campo, token) que se indexan para un paciente."""
+        pairs = []
+        document = normalize_document(document_number)
+        if document:
+            pairs.append((PatientSearchToken.FIELD_DOCUMENT, document))
+        for field, value in (
+            (PatientSearchToken.FIELD_NAME, name),
+            (PatientSearchToken.FIELD_PATERNAL, paternal_lastname),
+            (PatientSearchToken.FIELD_MATERNAL, maternal_lastname),
+        ):
+            pairs.extend((field, token) for token in tokenize(value))
+        return pairs
+
+    def _build_rows(self, patients: Iterable[Dict]) -> List[PatientSearchToken]:
+        rows = []
+        for p in patients:
+            if p["deleted_at"] is not None:
+                continue
+            rows.extend(
+                PatientSearchToken(reflexo_id=p["reflexo_id"], patient_id=p["id"], field=field, token=token)
+                for field, token in self.tokens_for(
+                    p["document_number"], p["name"], p["paternal_lastname"], p["maternal_lastname"]
+                )
+            )
+        return rows
+
+    @transaction.atomic
+    def reindex(self, patient_ids: Iterable[int]) -> int:
+        """
+        Reconstruye los tokens de los pacientes indicados (los eliminados quedan
+        fuera del índice). Devuelve la cantidad de tokens creados.
+        """
+        patient_ids = list(patient_ids)
+        if not patient_ids:
+            return 0
+        patients = Patient.all_objects.filter(id__in=patient_ids).values(
+            "id", "reflexo_id", "document_number", "name", "paternal_lastname", "maternal_lastname", "deleted_at",
+        )
+        rows = self._build_rows(patients)
+        PatientSearchToken.objects.filter(patient_id__in=patient_ids).delete()
+        PatientSearchToken.objects.bulk_create(rows, ignore_conflicts=True)
+        return len(rows)
+
+    # ---------- búsqueda ----------
+    @staticmethod
+    def _terms(search_term: str) -> List[str]:
+        terms = tokenize(search_term)
+        # El documento se indexa sin separadores: "12.345.678" se busca como "12345678"
+        document = normalize_document(search_term)
+        if len(terms) > 1 and document.isdigit():
+            return [document]
+        return terms[:MAX_SEARCH_TERMS]
+
+    def ranked(self, search_term: str, user=None):
+        """
+        QuerySet de dicts {patient_id, score} ordenado por relevancia.
+        Devuelve un queryset vacío si la búsqueda no tiene palabras útiles.
+        """
+        terms = self._terms(search_term)
+        queryset = PatientSearchToken.objects.all()
+        if user is not None:
+            queryset = filter_by_tenant(queryset, user, field='reflexo')
+        if not terms:
+            return queryset.none().values("patient_id")
+
+        # istartswith (LIKE sobre la collation _ci) y no startswith: en MySQL este es
+        # LIKE BINARY y no puede usar el rango del índice (reflexo, token). Los tokens ya
+        # están en minúsculas, así que el resultado es el mismo.
+        terms_filter = Q()
+        for term in terms:
+            terms_filter |= Q(token__istartswith=term)
+        if len(terms) > 1:
+            # Candidatos acotados por la palabra más selectiva (la más larga): el GROUP BY
+            # solo recorre los tokens de esos pacientes y no los de cada palabra común.
+            anchor = max(terms, key=len)
+            terms_filter &= Q(patient_id__in=queryset.filter(token__istartswith=anchor).values("patient_id"))
+
+        scores = {}
+        for i, term in enumerate(terms):
+            scores[f"s{i}"] = Max(Case(
+                When(field=PatientSearchToken.FIELD_DOCUMENT, token=term, then=Value(SCORE_DOCUMENT_EXACT)),
+                When(field=PatientSearchToken.FIELD_DOCUMENT, token__istartswith=term, then=Value(SCORE_DOCUMENT_PREFIX)),
+                When(token=term, then=Value(SCORE_TOKEN_EXACT)),
+                When(token__istartswith=term, then=Value(SCORE_TOKEN_PREFIX)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ))
+
+        score = sum((F(name) for name in scores), Value(0))
+        having = {f"{name}__gt": 0 for name in scores}
+
+        return (
+            queryset
+            .filter(terms_filter)
+            .values("patient_id")
+            .annotate(**scores)
+            .filter(**having)
+            .annotate(score=score)
+            .order_by("-score", "-patient_id")
+        )
+
+    def patient_ids(self, term: str, user=None):
+        """Subconsulta con los ids de pacientes que tienen algún token que empieza con `term` (ya normalizado)."""
+        queryset = PatientSearchToken.objects.all()
+        if user is not None:
+            queryset = filter_by_tenant(queryset, user, field='reflexo')
+        return queryset.filter(token__istartswith=term).values("patient_id")
+
+    @staticmethod
+    def fetch_in_order(ranked_rows) -> List[Patient]:
+        """Instancias de Patient (activas) en el orden del ranking."""
+        order = [row["patient_id"] for row in ranked_rows]
+        by_id = Patient.objects.in_bulk(order)
+        return [by_id[pk] for pk in order if pk in by_id]
+
+    def autocomplete(self, search_term: str, user=None, limit: int = 10) -> List[Dict]:
+        """Sugerencias livianas (sin serializer) para el selector de pacientes."""
+        ranked = list(self.ranked(search_term, user)[:limit])
+        if not ranked:
+            return []
+        rows = Patient.objects.filter(id__in=[r["patient_id"] for r in ranked]).values(
+            "id", "local_id", "document_number", "name", "paternal_lastname", "maternal_lastname",
+        )
+        by_id = {row["id"]: row for row in rows}
+        results = []
+        for r in ranked:
+            row = by_id.get(r["patient_id"])
+            if row is None:
+                continue
+            full_name = " ".join(
+                p for p in (row["paternal_lastname"], row["maternal_lastname"], row["name"]) if p
+            )
+            results.append({
+                "id": row["id"],
+                "local_id": row["local_id"],
+                "document_number": row["document_number"],
+                "full_name": full_name,
+                "score": r["score"],
+            })
+        return results
@@ -4,16 +4,22 @@ from typing import Any, Dict, Tuple
 from rest_framework.exceptions import ValidationError
 from django.core.paginator import Paginator, EmptyPage
 from django.db import transaction
-from django.db.models import Q, Value
-from django.db.models.functions import Concat
 
 from ..models.patient import Patient
+from .patient_search_service import PatientSearchService
 from ..serializers.patient import PatientSerializer, PatientListSerializer
+from architect.utils.archive import max_with_archive, unarchive_one
 from architect.utils.tenant import filter_by_tenant, is_global_admin, get_tenant
+from architect.utils.duplicates import find_duplicate_candidates
+from architect.utils.text import exact_name_key, person_name_keys
 from ubi_geo.models import Region, Province, District
+from ubi_geo.services.geo_cache import GeoCache
 
 
 class PatientService:
+    def __init__(self):
+        self.search_service = PatientSearchService()
+
     def get_all(self):
         return Patient.objects.filter(deleted_at__isnull=True)
 
@@ -46,35 +52,53 @@ class PatientService:
         except (TypeError, ValueError):
             per_page = 30
 
-        queryset = Patient.objects.filter(deleted_at__isnull=True).order_by("-id")
-        if user is not None:
-            queryset = filter_by_tenant(queryset, user, field='reflexo')
         if search_term:
-            queryset = queryset.annotate(
-                paternal_name=Concat("paternal_lastname", Value(" "), "name"),
-                full_name=Concat("name", Value(" "), "paternal_lastname", Value(" "), "maternal_lastname"),
-                paternal_maternal_name=Concat("paternal_lastname", Value(" "), "maternal_lastname", Value(" "), "name"),
-            ).filter(
-                Q(document_number__iexact=search_term)
-                | Q(document_number__istartswith=search_term)
-                | Q(name__istartswith=search_term)
-                | Q(name__icontains=search_term)
-                | Q(paternal_lastname__istartswith=search_term)
-                | Q(paternal_lastname__icontains=search_term)
-                | Q(maternal_lastname__istartswith=search_term)
-                | Q(maternal_lastname__icontains=search_term)
-                | Q(paternal_name__istartswith=search_term)
-                | Q(full_name__istartswith=search_term)
-                | Q(paternal_maternal_name__istartswith=search_term)
-            )
+            # Búsqueda por índice de tokens (documento por prefijo, nombres en cualquier orden)
+            queryset = self.search_service.ranked(search_term, user)
+        else:
+            queryset = Patient.objects.filter(deleted_at__isnull=True).order_by("-id")
+            if user is not None:
+                queryset = filter_by_tenant(queryset, user, field='reflexo')
 
         paginator = Paginator(queryset, per_page)
         try:
             page_obj = paginator.page(1)
         except EmptyPage:
             page_obj = paginator.page(paginator.num_pages)
+        if search_term:
+            page_obj.object_list = self.search_service.fetch_in_order(page_obj.object_list)
         return page_obj
 
+    def autocomplete(self, params: Dict[str, Any], user=None):
+        search_term = (params.get("search") or params.get("q") or "").strip()
+        try:
+            limit = min(max(int(params.get("limit", 10)), 1), 50)
+        except (TypeError, ValueError):
+            limit = 10
+        if not search_term:
+            return []
+        return self.search_service.autocomplete(search_term, user=user, limit=limit)
+
+    def find_duplicate_candidates(self, params: Dict[str, Any], user=None):
+        """Posibles duplicados de un paciente (mismo documento, mismo nombre sin tildes o nombre fonéticamente igual)."""
+        name_key, phonetic_key = person_name_keys(
+            params.get("paternal_lastname"), params.get("maternal_lastname"), params.get("name")
+        )
+        try:
+            exclude_id = int(params["exclude"]) if params.get("exclude") else None
+        except (TypeError, ValueError):
+            exclude_id = None
+        queryset = Patient.objects.filter(deleted_at__isnull=True).select_related("region", "document_type")
+        if user is not None:
+            queryset = filter_by_tenant(queryset, user, field='reflexo')
+        return find_duplicate_candidates(
+            queryset,
+            name_key,
+            phonetic_key,
+            document_number=(params.get("document_number") or "").strip() or None,
+            exclude_id=exclude_id,
+        )
+
     # ---------- helpers ----------
     @staticmethod
     def _id_or_none(obj_or_id):
@@ -101,12 +125,13 @@ class PatientService:
         # si no hay alguno, no validamos jerarquía (permite parciales)
         if not (rid and pid):
             return
-        province = Province.objects.filter(id=pid).first()
+        # Jerarquía desde GeoCache (id -> padre en memoria)
+        province = GeoCache.get("province", pid)
         if not province or province.region_id != rid:
             raise ValidationError({"province": "La provincia seleccionada no pertenece a la región indicada."})
 
         if did:
-            district = District.objects.filter(id=did).first()
+            district = GeoCache.get("district", did)
             if not district or district.province_id != pid:
                 raise ValidationError({"district": "El distrito seleccionado no pertenece a la provincia indicada."})
 
@@ -117,11 +142,10 @@ class PatientService:
         base_qs = Patient.objects.all()
         if user is not None:
             base_qs = filter_by_tenant(base_qs, user, field='reflexo')
-        existing = base_qs.filter(
-            name=data.get("name"),
-            paternal_lastname=data.get("paternal_lastname"),
-            maternal_lastname=data.get("maternal_lastname"),
-        ).first()
+        # Mismos apellidos y nombre (sin tildes/mayúsculas, cada uno en su campo) sobre el índice
+        # (reflexo, full_name_key); name_key ordena las palabras y solo sirve para candidatos
+        full_name_key = exact_name_key(data.get("paternal_lastname"), data.get("maternal_lastname"), data.get("name"))
+        existing = base_qs.filter(full_name_key=full_name_key).first() if full_name_key.strip("|") else None
         if existing:
             return existing, False, False
 
@@ -150,13 +174,9 @@ class PatientService:
         if tenant_id and not data.get('local_id'):
             # Bloqueo a nivel de filas del tenant para reducir condiciones de carrera
             # (esta función ya está dentro de @transaction.atomic)
-            from django.db.models import Max
-            max_local = (
-                Patient.all_objects.select_for_update()
-                .filter(reflexo_id=tenant_id)
-                .aggregate(m=Max('local_id'))['m']
-            )
-            data['local_id'] = (max_local or 0) + 1
+            # (incluye los archivados: vuelven con su número al restaurarse)
+            max_local = max_with_archive(Patient, 'local_id', Patient.all_objects.select_for_update(), reflexo_id=tenant_id)
+            data['local_id'] = max_local + 1
 
         patient = Patient.objects.create(**data)
         return patient, True, False
@@ -205,9 +225,21 @@ class PatientService:
         else:
             patient.soft_delete()
 
-    def restore(self, patient_id: int) -> bool:
+    def restore(self, patient_id: int, user=None) -> bool:
+        scope = (lambda qs: filter_by_tenant(qs, user, field='reflexo')) if user is not None else None
+        base = Patient.all_objects.filter(id=patient_id)
+        if scope is not None:
+            base = scope(base)
+        # Si ya fue archivado (architect/utils/archive.py), vuelve primero a la tabla
+        # activa; solo si el usuario puede verlo en el archivo
+        if not base.exists():
+            try:
+                if not unarchive_one(Patient, patient_id, scope):
+                    return False
+            except ValueError as e:
+                raise ValidationError({"detail": str(e)})
         try:
-            patient = Patient.objects.get(id=patient_id, deleted_at__isnull=False)
+            patient = base.get(deleted_at__isnull=False)
             patient.restore()
             return True
         except Patient.DoesNotExist:
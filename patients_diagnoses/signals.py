@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.diagnosis import Diagnosis
+from .models.patient import Patient
+from .services.diagnosis_index import CATALOG as DIAGNOSIS_CATALOG
+from .services.patient_search_service import INDEXED_FIELDS, PatientSearchService
+from architect.utils.cache_version import bump_version_on_commit
+
+
+@receiver(post_save, sender=Patient)
+def reindex_patient_search_tokens(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Mantiene patient_search_tokens al crear/editar/eliminar (soft) un paciente.
+    Los bulk_create/update() no disparan señales: usar rebuild_patient_search_index.
+    """
+    if raw:
+        return
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    patient_id = instance.pk
+    transaction.on_commit(lambda: PatientSearchService().reindex([patient_id]))
+
+
+@receiver(post_save, sender=Diagnosis)
+@receiver(post_delete, sender=Diagnosis)
+def invalidate_diagnosis_index(sender, raw=False, **kwargs):
+    """Cualquier escritura del catálogo invalida los índices en memoria (DiagnosisIndex)."""
+    if raw:
+        return
+    bump_version_on_commit(DIAGNOSIS_CATALOG)
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+
+@shared_task(bind=True)
+def import_patients_job(self, job_id):
+    """Importa el archivo de un PatientImportJob (cola 'imports', ver settings/celery.py)."""
+    from patients_diagnoses.services.patient_import_service import PatientImportService
+
+    job = PatientImportService().run(job_id, task_id=self.request.id)
+    return {"job_id": job.id, "status": job.status, "created": job.created_count, "errors": job.error_count}
@@ -1,7 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views.diagnosis import ( DiagnosisListCreateAPIView, DiagnosisRetrieveUpdateDestroyAPIView, DiagnosisSearchAPIView )
-from .views.patient import ( PatientListCreateView, PatientRetrieveUpdateDeleteView, PatientSearchView, HardDeletePatientView )
+from .views.patient import ( PatientListCreateView, PatientRetrieveUpdateDeleteView, PatientSearchView, PatientAutocompleteView, PatientDuplicatesView, HardDeletePatientView )
+from .views.patient_import import ( PatientImportListCreateView, PatientImportDetailView, PatientImportErrorsView )
 from .views.medical_record import ( MedicalRecordListCreateAPIView, MedicalRecordRetrieveUpdateDestroyAPIView, PatientMedicalHistoryAPIView, DiagnosisStatisticsAPIView, HardDeleteMedicalRecordView )
 
 # Eliminamos el router ya que usamos vistas basadas en clases
@@ -22,8 +23,15 @@ urlpatterns = [
      # URLs de pacientes
      path('patients/', PatientListCreateView.as_view(), name='patient-list'),
      path('patients/search/', PatientSearchView.as_view(), name='patient-search'),
+     path('patients/autocomplete/', PatientAutocompleteView.as_view(), name='patient-autocomplete'),
+     path('patients/duplicates/', PatientDuplicatesView.as_view(), name='patient-duplicates'),
      path('patients/<int:pk>/', PatientRetrieveUpdateDeleteView.as_view(), name='patient-detail'),
      path('patients/<int:pk>/hard-delete/', HardDeletePatientView.as_view(), name='patient-hard-delete'),
+
+     # Importación masiva de pacientes (CSV/XLSX en segundo plano)
+     path('patients/imports/', PatientImportListCreateView.as_view(), name='patient-import-list'),
+     path('patients/imports/<int:pk>/', PatientImportDetailView.as_view(), name='patient-import-detail'),
+     path('patients/imports/<int:pk>/errors/', PatientImportErrorsView.as_view(), name='patient-import-errors'),
      
      # URLs de historiales médicos
      path('medical-records/', MedicalRecordListCreateAPIView.as_view(), name='medical-record-list-create'),
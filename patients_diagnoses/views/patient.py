@@ -141,6 +141,27 @@ class PatientSearchView(APIView):
             "results": serializer.data,
         })
 
+class PatientAutocompleteView(APIView):
+    """Sugerencias rápidas para el selector de pacientes.
+    URL: /api/patients/patients/autocomplete/?q=<texto>&limit=10
+    """
+    def get(self, request):
+        results = patient_service.autocomplete(request.GET, user=request.user)
+        return Response({"results": results})
+
+class PatientDuplicatesView(APIView):
+    """Posibles pacientes duplicados antes de registrar/editar.
+    URL: /api/patients/patients/duplicates/?name=&paternal_lastname=&maternal_lastname=&document_number=&exclude=<id>
+    """
+    def get(self, request):
+        candidates = patient_service.find_duplicate_candidates(request.GET, user=request.user)
+        return Response({
+            "results": [
+                {"match": c["match"], "score": c["score"], "patient": PatientListSerializer(c["object"]).data}
+                for c in candidates
+            ]
+        })
+
 class HardDeletePatientView(APIView):
     """Endpoint dedicado para eliminación permanente de un paciente.
     URL: /api/patients/patients/<id>/hard-delete/
@@ -0,0 +1,66 @@
+from django.http import FileResponse, Http404
+from rest_framework import status
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models.patient_import_job import PatientImportJob
+from ..serializers.patient_import import PatientImportCreateSerializer, PatientImportJobSerializer
+from ..services.patient_import_service import PatientImportService
+from architect.utils.tenant import filter_by_tenant
+
+patient_import_service = PatientImportService()
+
+
+def _tenant_jobs(user):
+    """Jobs de importación visibles para el usuario (restringe por tenant salvo admin global)."""
+    return filter_by_tenant(PatientImportJob.objects.all(), user, field='reflexo')
+
+
+class PatientImportListCreateView(APIView):
+    """
+    Importación masiva de pacientes desde CSV/XLSX.
+    POST (multipart, campo 'file') crea el job (202); GET lista los jobs de la empresa.
+    """
+    parser_classes = [MultiPartParser, FormParser]
+
+    def get(self, request):
+        serializer = PatientImportJobSerializer(_tenant_jobs(request.user), many=True, context={'request': request})
+        return Response(serializer.data)
+
+    def post(self, request):
+        serializer = PatientImportCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        job = patient_import_service.submit(request.user, data['file'], reflexo_id=data.get('reflexo_id'))
+        job.refresh_from_db()  # con broker en memoria (eager) ya puede estar terminado
+        return Response(
+            PatientImportJobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class PatientImportDetailView(APIView):
+    """Estado y avance del job (para consultar periódicamente)."""
+
+    def get(self, request, pk):
+        try:
+            job = _tenant_jobs(request.user).get(pk=pk)
+        except PatientImportJob.DoesNotExist:
+            return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(PatientImportJobSerializer(job, context={'request': request}).data)
+
+
+class PatientImportErrorsView(APIView):
+    """Descarga el reporte de errores por fila (CSV)."""
+
+    def get(self, request, pk):
+        try:
+            job = _tenant_jobs(request.user).get(pk=pk)
+        except PatientImportJob.DoesNotExist:
+            raise Http404("Importación no encontrada")
+        if not job.errors_file:
+            raise Http404("La importación no tiene errores registrados")
+        return FileResponse(job.errors_file.open('rb'), as_attachment=True, filename=job.errors_file.name.rsplit('/', 1)[-1])
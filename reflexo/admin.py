@@ -1,12 +1,15 @@
-from django.contrib import admin
-from .models import Reflexo
+from django.contrib import admin, messages
+from .models import Reflexo, TenantExportJob, TenantPurgeJob
+from .services.tenant_offboarding_service import TenantOffboardingService
+from .services.tenant_transfer_service import TenantTransferService
 from architect.utils.tenant import is_global_admin, get_tenant
 
 @admin.register(Reflexo)
 class ReflexoAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'created_at')
+    list_display = ('id', 'name', 'is_active', 'created_at')
     search_fields = ('name',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'is_active', 'disabled_at')
+    actions = ['export_data']
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -23,4 +26,59 @@ class ReflexoAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         # Solo admin global puede borrar tenants
-        return is_global_admin(request.user)
\ No newline at end of file
+        return is_global_admin(request.user)
+
+    # Borrar una empresa = darla de baja: se desactiva y sus datos se eliminan por lotes en segundo plano
+    def get_deleted_objects(self, objs, request):
+        # Sin recolectar en memoria todas las filas dependientes para la confirmación
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        TenantOffboardingService().offboard(obj.pk, user=request.user)
+        self.message_user(request, f"La empresa {obj} fue desactivada; sus datos se eliminarán en segundo plano.", messages.WARNING)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.delete_model(request, obj)
+
+    @admin.action(description="Exportar datos (respaldo comprimido)")
+    def export_data(self, request, queryset):
+        if not is_global_admin(request.user):
+            self.message_user(request, "Solo un administrador global puede exportar empresas.", messages.ERROR)
+            return
+        service = TenantTransferService()
+        for obj in queryset:
+            service.submit_export(obj.pk, user=request.user)
+        self.message_user(request, f"{queryset.count()} exportación(es) en cola; revise 'Exportaciones de empresas'.", messages.SUCCESS)
+
+
+@admin.register(TenantPurgeJob)
+class TenantPurgeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'reflexo_id', 'reflexo_name', 'status', 'current_step', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = [f.name for f in TenantPurgeJob._meta.fields]
+
+    def has_module_permission(self, request):
+        return is_global_admin(request.user)
+
+    def has_view_permission(self, request, obj=None):
+        return is_global_admin(request.user)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TenantExportJob)
+class TenantExportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'reflexo_id', 'reflexo_name', 'format', 'status', 'file', 'created_at', 'finished_at')
+    list_filter = ('status', 'format')
+    readonly_fields = [f.name for f in TenantExportJob._meta.fields]
+
+    def has_module_permission(self, request):
+        return is_global_admin(request.user)
+
+    def has_view_permission(self, request, obj=None):
+        return is_global_admin(request.user)
+
+    def has_add_permission(self, request):
+        return False
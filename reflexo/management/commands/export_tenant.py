@@ -0,0 +1,56 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reflexo.models import Reflexo
+from reflexo.services.tenant_transfer_service import (
+    BATCH_SIZE, EXTENSIONS, FORMAT_NDJSON, FORMATS, TenantTransferService,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream every tenant-scoped row of a tenant (reflexo) to a compressed archive "
+        "(gzipped NDJSON or a tar.gz of CSV files) in FK-safe order, with constant memory. "
+        "Global catalogs are referenced by natural key. Load it back with import_tenant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tenant", type=int, help="Reflexo (tenant) ID to export.")
+        parser.add_argument("--format", choices=FORMATS, default=FORMAT_NDJSON, help="Archive format.")
+        parser.add_argument(
+            "--output",
+            help="Output file (default: tenant_<id>_<timestamp> with the format's extension).",
+        )
+        parser.add_argument(
+            "--async",
+            dest="enqueue",
+            action="store_true",
+            help="Queue a TenantExportJob (Celery) and store the archive in default storage instead.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows fetched per cursor chunk.")
+
+    def _progress(self, label, count):
+        self.stdout.write(f"  {label}: {count} rows")
+
+    def handle(self, *args, **options):
+        tenant_id = options["tenant"]
+        fmt = options["format"]
+        if not Reflexo.objects.filter(pk=tenant_id).exists():
+            raise CommandError(f"Tenant {tenant_id} does not exist")
+
+        service = TenantTransferService(batch_size=options["batch_size"], progress=self._progress)
+        if options["enqueue"]:
+            job = service.submit_export(tenant_id, fmt=fmt)
+            self.stdout.write(self.style.SUCCESS(f"Export job {job.id} queued."))
+            return
+
+        output = Path(options["output"] or f"tenant_{tenant_id}_{time.strftime('%Y%m%d_%H%M%S')}{EXTENSIONS[fmt]}")
+        started = time.perf_counter()
+        with output.open("wb") as out:
+            counts = service.export(tenant_id, out, fmt)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {sum(counts.values())} rows from {len(counts)} models to {output} "
+            f"({output.stat().st_size} bytes, {time.perf_counter() - started:.2f}s)"
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reflexo.models import Reflexo, TenantPurgeJob
+from reflexo.services.tenant_offboarding_service import BATCH_SIZE, TenantOffboardingService
+
+
+class Command(BaseCommand):
+    help = (
+        "Disable a tenant (reflexo) and delete its data in dependency order and bounded "
+        "PK-range batches. Re-running resumes an unfinished purge."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tenant", type=int, help="Reflexo (tenant) ID to offboard.")
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Run the purge in this process instead of queueing the Celery task.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per delete batch.")
+
+    def _progress(self, job, label, deleted):
+        self.stdout.write(f"  {label}: {deleted} deleted")
+
+    def handle(self, *args, **options):
+        tenant_id = options["tenant"]
+        if not Reflexo.objects.filter(pk=tenant_id).exists():
+            job = TenantPurgeJob.objects.filter(reflexo_id=tenant_id).first()
+            if job is None:
+                raise CommandError(f"Tenant {tenant_id} does not exist")
+            self.stdout.write(self.style.WARNING(f"Tenant {tenant_id} is already purged (job {job.id}: {job.status})"))
+            return
+
+        service = TenantOffboardingService(batch_size=options["batch_size"], progress=self._progress)
+        job = service.offboard(tenant_id, enqueue=not options["sync"])
+        self.stdout.write(f"Tenant {tenant_id} ({job.reflexo_name}) disabled; purge job {job.id}")
+        if not options["sync"]:
+            self.stdout.write(self.style.SUCCESS("Purge queued."))
+            return
+
+        job = service.run(job.id)
+        totals = ", ".join(f"{label}={count}" for label, count in job.deleted.items())
+        if job.status != TenantPurgeJob.STATUS_DONE:
+            raise CommandError(f"Purge failed at {job.current_step}: {job.error} (re-run to resume)")
+        self.stdout.write(self.style.SUCCESS(f"Done. Deleted: {totals or 'nothing'}"))
@@ -0,0 +1,77 @@
+import csv
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reflexo.services.tenant_onboarding_service import BATCH_SIZE, TenantOnboardingService
+
+
+class Command(BaseCommand):
+    help = (
+        "Provision tenants (reflexo) in bulk: create the new ones and clone the template tenant's "
+        "appointment statuses and predetermined prices with one bulk_create per catalog, allocating "
+        "local ids in blocks. Existing tenants only get the catalog rows they are missing. "
+        "Caches used by a fresh tenant's first requests are warmed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--template", type=int, required=True, help="Reflexo (tenant) ID whose catalogs are cloned.")
+        parser.add_argument(
+            "--tenant",
+            nargs=2,
+            action="append",
+            default=[],
+            metavar=("NAME", "DOMAIN"),
+            help="New tenant to create (repeatable).",
+        )
+        parser.add_argument("--csv", help="CSV file with 'name' and 'domain' columns, one tenant per row.")
+        parser.add_argument(
+            "--existing",
+            type=int,
+            action="append",
+            default=[],
+            help="Existing tenant ID to complete with the template catalogs (repeatable).",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per INSERT.")
+
+    def _tenants(self, options):
+        tenants = [tuple(pair) for pair in options["tenant"]]
+        if options["csv"]:
+            path = Path(options["csv"])
+            if not path.exists():
+                raise CommandError(f"File not found: {path}")
+            with path.open(newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                if not {"name", "domain"} <= set(reader.fieldnames or ()):
+                    raise CommandError("The CSV needs 'name' and 'domain' columns")
+                tenants += [(row["name"].strip(), row["domain"].strip()) for row in reader if row["name"].strip()]
+        return tenants
+
+    def _progress(self, label, copied):
+        self.stdout.write(f"  {label}: {copied} rows")
+
+    def handle(self, *args, **options):
+        tenants = self._tenants(options)
+        if not tenants and not options["existing"]:
+            raise CommandError("Nothing to do: pass --tenant, --csv or --existing")
+
+        started = time.perf_counter()
+        try:
+            service = TenantOnboardingService(
+                options["template"], batch_size=max(options["batch_size"], 1), progress=self._progress,
+            )
+            for label in service.missing_global_catalogs():
+                self.stdout.write(self.style.WARNING(f"Global catalog {label} is empty"))
+            results = service.provision(tenants, options["existing"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            copied = ", ".join(f"{label.split('.')[-1]}={count}" for label, count in result.copied.items())
+            state = "created" if result.created else "existing"
+            self.stdout.write(f"Tenant {result.tenant_id} ({result.name}, {state}): {copied}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Provisioned {len(results)} tenants ({sum(r.created for r in results)} new) "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflexo', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reflexo',
+            name='disabled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reflexo',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='TenantPurgeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reflexo_id', models.BigIntegerField(db_index=True, verbose_name='Empresa')),
+                ('reflexo_name', models.CharField(max_length=100, verbose_name='Nombre de la empresa')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En proceso'), ('done', 'Completado'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('current_step', models.CharField(blank=True, default='', max_length=100, verbose_name='Paso actual')),
+                ('deleted', models.JSONField(blank=True, default=dict, verbose_name='Filas eliminadas por modelo')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('task_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='ID de tarea')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Baja de empresa',
+                'verbose_name_plural': 'Bajas de empresas',
+                'db_table': 'tenant_purge_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,9 +1,117 @@
+from django.conf import settings
 from django.db import models
 
 class Reflexo(models.Model):
     name = models.CharField(max_length=100, unique=True)
     domain = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Baja de la empresa: se desactiva al instante y sus datos se eliminan en segundo plano
+    is_active = models.BooleanField(default=True)
+    disabled_at = models.DateTimeField(null=True, blank=True)
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class TenantPurgeJob(models.Model):
+    """
+    Eliminación por lotes de los datos de una empresa dada de baja
+    (TenantOffboardingService). Guarda el paso actual y las filas eliminadas
+    por modelo: si la tarea se interrumpe, continúa donde quedó. No tiene FK a
+    Reflexo para conservar el registro cuando la empresa ya no existe.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    reflexo_id = models.BigIntegerField(db_index=True, verbose_name="Empresa")
+    reflexo_name = models.CharField(max_length=100, verbose_name="Nombre de la empresa")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name="Solicitado por",
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado")
+    current_step = models.CharField(max_length=100, blank=True, default='', verbose_name="Paso actual")
+    deleted = models.JSONField(default=dict, blank=True, verbose_name="Filas eliminadas por modelo")
+    error = models.TextField(blank=True, null=True, verbose_name="Error")
+    task_id = models.CharField(max_length=255, blank=True, null=True, verbose_name="ID de tarea")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="Inicio")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Fin")
+
+    def __str__(self):
+        return f"Baja de {self.reflexo_name} ({self.get_status_display()})"
+
+    class Meta:
+        db_table = 'tenant_purge_jobs'
+        verbose_name = "Baja de empresa"
+        verbose_name_plural = "Bajas de empresas"
+        ordering = ['-created_at']
+
+
+class TenantExportJob(models.Model):
+    """
+    Exportación de los datos de una empresa (TenantTransferService) para
+    respaldo o migración. El archivo comprimido queda en default_storage.
+    Sin FK a Reflexo: el respaldo sobrevive a la baja de la empresa.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CSV = 'csv'
+    FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+    reflexo_id = models.BigIntegerField(db_index=True, verbose_name="Empresa")
+    reflexo_name = models.CharField(max_length=100, verbose_name="Nombre de la empresa")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True,
+        verbose_name="Solicitado por",
+    )
+
+    format = models.CharField(max_length=10, default=FORMAT_NDJSON, verbose_name="Formato")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Estado")
+    file = models.FileField(upload_to="tenant_exports/%Y/%m/", blank=True, null=True, verbose_name="Archivo")
+    counts = models.JSONField(default=dict, blank=True, verbose_name="Filas exportadas por modelo")
+    error = models.TextField(blank=True, null=True, verbose_name="Error")
+    task_id = models.CharField(max_length=255, blank=True, null=True, verbose_name="ID de tarea")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="Inicio")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Fin")
+
+    def __str__(self):
+        return f"Exportación de {self.reflexo_name} ({self.get_status_display()})"
+
+    class Meta:
+        db_table = 'tenant_export_jobs'
+        verbose_name = "Exportación de empresa"
+        verbose_name_plural = "Exportaciones de empresas"
+        ordering = ['-created_at']
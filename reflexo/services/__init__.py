@@ -0,0 +1,5 @@
+from .tenant_offboarding_service import TenantOffboardingService
+from .tenant_onboarding_service import TenantOnboardingService
+from .tenant_transfer_service import TenantTransferService
+
+__all__ = ['TenantOffboardingService', 'TenantOnboardingService', 'TenantTransferService']
@@ -0,0 +1,160 @@
+# reflexo/services/tenant_offboarding_service.py
+import logging
+from graphlib import TopologicalSorter
+from typing import Callable, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Reflexo, TenantPurgeJob
+from architect.utils.cache_version import bump_version_on_commit
+
+logger = logging.getLogger(__name__)
+
+# Filas por lote: cada lote es un rango de PK eliminado en su propia transacción
+BATCH_SIZE = 1000
+
+# Catálogo global con campo reflexo heredado: otras empresas lo usan, se desvincula en lugar de eliminarse
+DETACH_MODELS = {"patients_diagnoses.Diagnosis"}
+DIAGNOSIS_CATALOG = "diagnoses"
+
+
+def tenant_models() -> List:
+    """
+    Modelos con FK a Reflexo (incluidos los related_name='+') en orden de
+    eliminación: primero los que referencian a otros modelos de la empresa
+    (tickets antes que citas, citas antes que pacientes, perfiles antes que usuarios).
+    """
+    models = sorted(
+        {
+            rel.related_model
+            for rel in Reflexo._meta.get_fields(include_hidden=True)
+            if rel.auto_created and not rel.concrete and rel.field.name == "reflexo"
+        },
+        key=lambda model: model._meta.label,
+    )
+    graph = {model: set() for model in models}
+    for model in models:
+        for field in model._meta.concrete_fields:
+            target = field.related_model if field.is_relation else None
+            if target in graph and target is not model:
+                # `target` se elimina después de `model`
+                graph[target].add(model)
+    return list(TopologicalSorter(graph).static_order())
+
+
+class TenantOffboardingService:
+    """
+    Baja de una empresa sin el DELETE en cascada de Reflexo (millones de filas
+    en memoria y en una sola transacción):
+      - disable(): la empresa y sus usuarios quedan inactivos al instante,
+      - run(): elimina los datos modelo por modelo en orden de dependencias y
+        por rangos de PK acotados, registrando el avance en TenantPurgeJob;
+        al reanudar, los pasos ya vacíos terminan con una consulta.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, progress: Optional[Callable] = None):
+        self.batch_size = batch_size
+        # progress(job, label, deleted): avance por lote
+        self.progress = progress
+
+    @transaction.atomic
+    def disable(self, tenant_id: int) -> Reflexo:
+        """Desactiva la empresa y a sus usuarios (JWT y sesiones rechazan usuarios inactivos)."""
+        reflexo = Reflexo.objects.select_for_update().get(pk=tenant_id)
+        if reflexo.is_active:
+            reflexo.is_active = False
+            reflexo.disabled_at = timezone.now()
+            reflexo.save(update_fields=["is_active", "disabled_at"])
+        get_user_model().objects.filter(reflexo_id=tenant_id, is_superuser=False).update(is_active=False)
+        return reflexo
+
+    def offboard(self, tenant_id: int, user=None, enqueue: bool = True) -> TenantPurgeJob:
+        """
+        Desactiva la empresa y registra (o retoma) su job de eliminación.
+        Con enqueue la tarea se encola al confirmar la transacción.
+        """
+        from reflexo.tasks import purge_tenant_job
+
+        with transaction.atomic():
+            reflexo = self.disable(tenant_id)
+            job = (
+                TenantPurgeJob.objects.filter(reflexo_id=tenant_id)
+                .exclude(status=TenantPurgeJob.STATUS_DONE)
+                .first()
+            )
+            if job is None:
+                job = TenantPurgeJob.objects.create(
+                    reflexo_id=tenant_id,
+                    reflexo_name=reflexo.name,
+                    requested_by=user if getattr(user, "is_authenticated", False) else None,
+                )
+            if enqueue:
+                transaction.on_commit(lambda: purge_tenant_job.delay(job.id))
+        return job
+
+    def run(self, job_id: int, task_id=None) -> TenantPurgeJob:
+        """Elimina (o continúa eliminando) los datos de la empresa del job."""
+        job = TenantPurgeJob.objects.get(pk=job_id)
+        if job.status == TenantPurgeJob.STATUS_DONE:
+            return job
+
+        job.status = TenantPurgeJob.STATUS_RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.task_id = task_id
+        job.error = None
+        job.save(update_fields=["status", "started_at", "task_id", "error"])
+
+        try:
+            # Nunca eliminar una empresa activa (p. ej. reactivada después de pedir la baja)
+            if Reflexo.objects.filter(pk=job.reflexo_id, is_active=True).exists():
+                raise ValueError("La empresa está activa: desactívela antes de eliminar sus datos")
+            for model in tenant_models():
+                self._purge_model(job, model)
+            self._set_step(job, Reflexo._meta.label)
+            Reflexo.objects.filter(pk=job.reflexo_id).delete()
+            job.status = TenantPurgeJob.STATUS_DONE
+            job.current_step = ""
+        except Exception as e:
+            logger.exception("Baja de la empresa %s falló", job.reflexo_id)
+            job.status = TenantPurgeJob.STATUS_FAILED
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "current_step", "deleted", "error", "finished_at"])
+        return job
+
+    # ---------- pasos ----------
+    def _set_step(self, job: TenantPurgeJob, label: str) -> None:
+        job.current_step = label
+        TenantPurgeJob.objects.filter(pk=job.pk).update(current_step=label)
+
+    def _purge_model(self, job: TenantPurgeJob, model) -> None:
+        label = model._meta.label
+        self._set_step(job, label)
+        queryset = model._base_manager.filter(reflexo_id=job.reflexo_id)
+
+        if label in DETACH_MODELS:
+            queryset.update(reflexo=None)
+            if label == "patients_diagnoses.Diagnosis":
+                bump_version_on_commit(DIAGNOSIS_CATALOG)
+            return
+        if model is get_user_model():
+            # Los administradores globales no pertenecen a la empresa: solo se desvinculan
+            queryset.filter(is_superuser=True).update(reflexo=None)
+
+        while True:
+            # Límite superior del próximo lote: el PK número batch_size de lo que queda
+            boundary = list(queryset.order_by("pk").values_list("pk", flat=True)[self.batch_size - 1:self.batch_size])
+            batch = queryset.filter(pk__lte=boundary[0]) if boundary else queryset
+            with transaction.atomic():
+                _, per_model = batch.delete()
+            deleted = per_model.get(label, 0)
+            if deleted:
+                job.deleted[label] = job.deleted.get(label, 0) + deleted
+                TenantPurgeJob.objects.filter(pk=job.pk).update(deleted=job.deleted)
+                if self.progress is not None:
+                    self.progress(job, label, job.deleted[label])
+            if not boundary:
+                return
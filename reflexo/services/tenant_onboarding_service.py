@@ -0,0 +1,205 @@
+# reflexo/services/tenant_onboarding_service.py
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max
+
+from architect.utils.archive import archive_of
+from ..models import Reflexo
+
+# Filas por INSERT del bulk_create
+BATCH_SIZE = 1000
+
+# Catálogos por empresa que se copian de la plantilla: (modelo, columnas copiadas)
+TENANT_CATALOGS = (
+    ("appointments_status.AppointmentStatus", ("name", "description")),
+    ("histories_configurations.PredeterminedPrice", ("name", "price")),
+)
+
+# Catálogos globales (sin reflexo): no se copian, solo se verifica que existan
+GLOBAL_CATALOGS = (
+    "histories_configurations.DocumentType",
+    "histories_configurations.PaymentType",
+    "histories_configurations.PaymentStatus",
+)
+
+
+@dataclass
+class OnboardingResult:
+    tenant_id: int
+    name: str
+    # False si la empresa ya existía (solo se completaron sus catálogos)
+    created: bool
+    copied: Dict[str, int] = field(default_factory=dict)
+
+
+class TenantOnboardingService:
+    """
+    Alta de empresas copiando los catálogos de una empresa plantilla:
+      - crea las empresas nuevas con un solo bulk_create,
+      - copia estados de cita y precios predeterminados con un bulk_create
+        por catálogo para todo el grupo, reservando un bloque de local_id por
+        empresa (una consulta MAX por catálogo, no por fila),
+      - es idempotente: una empresa existente con el mismo nombre y dominio
+        solo recibe las filas de catálogo que le falten (por nombre),
+      - al confirmar, precalienta las cachés que usan sus primeras requests.
+    """
+
+    def __init__(self, template_id: int, batch_size: int = BATCH_SIZE, progress: Optional[Callable] = None):
+        if not Reflexo.objects.filter(pk=template_id).exists():
+            raise ValueError(f"La empresa plantilla {template_id} no existe")
+        self.template_id = template_id
+        self.batch_size = batch_size
+        # progress(label, copied): filas copiadas por catálogo
+        self.progress = progress
+
+    def missing_global_catalogs(self) -> List[str]:
+        """Catálogos globales vacíos (las empresas nuevas no podrían registrar pacientes o pagos)."""
+        return [
+            label for label in GLOBAL_CATALOGS
+            if not apps.get_model(label).objects.exists()
+        ]
+
+    def template_rows(self) -> Dict[str, List[dict]]:
+        """Filas activas de cada catálogo de la plantilla (leídas una sola vez para todo el grupo)."""
+        rows = {}
+        for label, columns in TENANT_CATALOGS:
+            model = apps.get_model(label)
+            order = "local_id" if any(f.name == "local_id" for f in model._meta.fields) else "name"
+            rows[label] = list(
+                model.objects.filter(reflexo_id=self.template_id, deleted_at__isnull=True)
+                .order_by(order, "pk").values(*columns)
+            )
+        return rows
+
+    def provision(self, tenants: Iterable[Tuple[str, str]] = (), existing_ids: Iterable[int] = ()) -> List[OnboardingResult]:
+        """
+        Crea las empresas ``(nombre, dominio)`` que no existan y copia los
+        catálogos de la plantilla en ellas y en ``existing_ids``, todo en una
+        transacción. Devuelve un resultado por empresa.
+        """
+        template = self.template_rows()
+        with transaction.atomic():
+            results = self._create_tenants(list(tenants))
+            known = {result.tenant_id for result in results}
+            extra = [pk for pk in dict.fromkeys(existing_ids) if pk not in known and pk != self.template_id]
+            for reflexo in Reflexo.objects.filter(pk__in=extra).order_by("pk"):
+                results.append(OnboardingResult(reflexo.pk, reflexo.name, created=False))
+            missing = set(extra) - {result.tenant_id for result in results}
+            if missing:
+                raise ValueError(f"Empresas inexistentes: {', '.join(map(str, sorted(missing)))}")
+
+            by_id = {result.tenant_id: result for result in results}
+            for label, columns in TENANT_CATALOGS:
+                copied = self._clone(apps.get_model(label), template[label], columns, list(by_id))
+                for tenant_id, count in copied.items():
+                    by_id[tenant_id].copied[label] = count
+                if self.progress is not None:
+                    self.progress(label, sum(copied.values()))
+            transaction.on_commit(self.warm)
+        return results
+
+    def _create_tenants(self, tenants: List[Tuple[str, str]]) -> List[OnboardingResult]:
+        """Un bulk_create para las empresas nuevas; las existentes (mismo nombre y dominio) se reutilizan."""
+        names = [name for name, _ in tenants]
+        domains = [domain for _, domain in tenants]
+        for values, kind in ((names, "nombre"), (domains, "dominio")):
+            repeated = {value for value in values if values.count(value) > 1}
+            if repeated:
+                raise ValueError(f"{kind.capitalize()} repetido en la lista: {', '.join(sorted(repeated))}")
+
+        existing = {
+            (reflexo.name, reflexo.domain): reflexo
+            for reflexo in Reflexo.objects.filter(name__in=names) | Reflexo.objects.filter(domain__in=domains)
+        }
+        conflicts = [
+            f"{name} ({domain})" for name, domain in tenants
+            if (name, domain) not in existing
+            and any(name == taken_name or domain == taken_domain for taken_name, taken_domain in existing)
+        ]
+        if conflicts:
+            raise ValueError(f"Nombre o dominio ya usado por otra empresa: {', '.join(conflicts)}")
+
+        new = [Reflexo(name=name, domain=domain) for name, domain in tenants if (name, domain) not in existing]
+        for reflexo in new:
+            try:
+                # Sin validate_unique: la unicidad ya se resolvió arriba para todo el grupo
+                reflexo.clean_fields()
+            except ValidationError as e:
+                raise ValueError(f"{reflexo.name!r}: {'; '.join(f'{k}: {v[0]}' for k, v in e.message_dict.items())}")
+        Reflexo.objects.bulk_create(new, batch_size=self.batch_size)
+        # MySQL no devuelve los ids del bulk_create: releerlos por nombre (único)
+        created = {reflexo.name: reflexo for reflexo in Reflexo.objects.filter(name__in=[r.name for r in new])}
+        results = []
+        for name, domain in tenants:
+            reflexo = existing.get((name, domain))
+            if reflexo is not None:
+                results.append(OnboardingResult(reflexo.pk, name, created=False))
+            else:
+                results.append(OnboardingResult(created[name].pk, name, created=True))
+        return results
+
+    def _clone(self, model, rows: List[dict], columns, tenant_ids: List[int]) -> Dict[int, int]:
+        """Copia ``rows`` a cada empresa (salvo los nombres que ya tenga) en un solo bulk_create."""
+        if not rows or not tenant_ids:
+            return {tenant_id: 0 for tenant_id in tenant_ids}
+        # Incluye eliminados: (reflexo, name) es único también para ellos
+        taken = set(
+            model._base_manager.filter(reflexo_id__in=tenant_ids, name__in=[row["name"] for row in rows])
+            .values_list("reflexo_id", "name")
+        )
+        has_local_id = any(f.name == "local_id" for f in model._meta.fields)
+        next_local = {}
+        if has_local_id:
+            # Bloque de local_id por empresa: mismo bloqueo que el alta individual, una vez por catálogo
+            next_local = {
+                row["reflexo_id"]: row["m"]
+                for row in model._base_manager.select_for_update()
+                .filter(reflexo_id__in=tenant_ids)
+                .values("reflexo_id").annotate(m=Max("local_id")).order_by()
+            }
+            # Los archivados vuelven con su número al restaurarse: el bloque empieza por encima
+            archive = archive_of(model)
+            if archive is not None:
+                for row in (
+                    archive._base_manager.filter(reflexo_id__in=tenant_ids)
+                    .values("reflexo_id").annotate(m=Max("local_id")).order_by()
+                ):
+                    next_local[row["reflexo_id"]] = max(next_local.get(row["reflexo_id"]) or 0, row["m"] or 0)
+
+        objs, copied = [], {}
+        for tenant_id in tenant_ids:
+            local_id = next_local.get(tenant_id) or 0
+            copied[tenant_id] = 0
+            for row in rows:
+                if (tenant_id, row["name"]) in taken:
+                    continue
+                values = {column: row[column] for column in columns}
+                if has_local_id:
+                    local_id += 1
+                    values["local_id"] = local_id
+                objs.append(model(reflexo_id=tenant_id, **values))
+                copied[tenant_id] += 1
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        return copied
+
+    @staticmethod
+    def warm() -> None:
+        """
+        Precalienta lo que piden las primeras requests de una empresa nueva:
+        las copias en memoria de ubigeo y diagnósticos (formulario de
+        pacientes) y las claves compartidas de versión de catálogo y de
+        particiones. Las cachés por proceso solo quedan calientes en el proceso
+        que ejecuta el alta (web o worker); las claves compartidas, en todos.
+        """
+        from architect.utils.partitions import PARTITIONED_TABLES, is_partitioned
+        from patients_diagnoses.services.diagnosis_index import DiagnosisIndex
+        from ubi_geo.services.geo_cache import GeoCache
+
+        GeoCache.snapshot()
+        DiagnosisIndex.snapshot()
+        for table in PARTITIONED_TABLES:
+            is_partitioned(DEFAULT_DB_ALIAS, table)
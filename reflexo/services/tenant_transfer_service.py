@@ -0,0 +1,474 @@
+# reflexo/services/tenant_transfer_service.py
+import codecs
+import csv
+import gzip
+import io
+import json
+import logging
+import tarfile
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import JSONField
+from django.utils import timezone
+
+from ..models import Reflexo, TenantExportJob
+from .tenant_offboarding_service import tenant_models
+from architect.utils.archive import max_with_archive, source_of
+from architect.utils.db import stream_values
+from architect.utils.global_search import PROVIDERS, GlobalSearchService
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NDJSON = TenantExportJob.FORMAT_NDJSON
+FORMAT_CSV = TenantExportJob.FORMAT_CSV
+FORMATS = TenantExportJob.FORMATS
+EXTENSIONS = {FORMAT_NDJSON: ".ndjson.gz", FORMAT_CSV: ".tar.gz"}
+ARCHIVE_VERSION = 1
+
+BATCH_SIZE = 1000
+# Por encima de este tamaño los archivos temporales pasan de memoria a disco
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# NULL en CSV (distinto de cadena vacía)
+CSV_NULL = "\\N"
+INSERT_RETRIES = 3
+
+# Catálogos globales: entre entornos sus ids cambian, se vinculan por esta clave
+NATURAL_KEYS = {
+    "ubi_geo.Region": "ubigeo_code",
+    "ubi_geo.Province": "ubigeo_code",
+    "ubi_geo.District": "ubigeo_code",
+    "ubi_geo.Country": "ISO2",
+    "histories_configurations.DocumentType": "name",
+    "histories_configurations.PaymentType": "name",
+    "histories_configurations.PaymentStatus": "name",
+    "patients_diagnoses.Diagnosis": "code",
+}
+
+# Modelos con reflexo que no se exportan: índices y duplicados se reconstruyen,
+# checkpoints, códigos de verificación y jobs son propios de cada entorno
+EXCLUDED_MODELS = {
+    "architect.MaintenanceCheckpoint",
+    "architect.SearchEntry",
+    "patients_diagnoses.PatientSearchToken",
+    "patients_diagnoses.PatientDuplicateCandidate",
+    "patients_diagnoses.PatientImportJob",
+    "users_profiles.UserVerificationCode",
+    "company_reports.ReportJob",
+}
+
+
+def export_models() -> List:
+    """Modelos exportados, padres antes que hijos (orden inverso al de eliminación)."""
+    return [
+        model for model in reversed(tenant_models())
+        if model._meta.label not in EXCLUDED_MODELS and model._meta.label not in NATURAL_KEYS
+    ]
+
+
+def _tenant_queryset(model, tenant_id: int):
+    queryset = model._base_manager.filter(reflexo_id=tenant_id)
+    if model._meta.label == "users_profiles.User":
+        # Los administradores globales no pertenecen a la empresa
+        queryset = queryset.filter(is_superuser=False)
+    return queryset.order_by("pk")
+
+
+def _references(models, tenant_id: int) -> Iterator[Tuple[str, int, object]]:
+    """(modelo, id, clave natural) de cada fila de catálogo global referenciada por la empresa."""
+    targets: Dict = {}
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model._meta.label in NATURAL_KEYS:
+                targets.setdefault(field.related_model, []).append((model, field))
+    for target, fields in targets.items():
+        label = target._meta.label
+        ids = set()
+        for model, field in fields:
+            ids.update(
+                _tenant_queryset(model, tenant_id).filter(**{f"{field.attname}__isnull": False})
+                .order_by().values_list(field.attname, flat=True).distinct()
+            )
+        for pk, key in target._base_manager.filter(pk__in=ids).values_list("pk", NATURAL_KEYS[label]):
+            yield label, pk, key
+
+
+class _NdjsonWriter:
+    def __init__(self, out):
+        self.stream = io.TextIOWrapper(gzip.GzipFile(fileobj=out, mode="wb"), encoding="utf-8")
+
+    def _line(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")))
+        self.stream.write("\n")
+
+    def header(self, header: dict) -> None:
+        self._line({"type": "header", **header})
+
+    def references(self, refs) -> None:
+        for label, pk, key in refs:
+            self._line({"type": "ref", "model": label, "id": pk, "key": key})
+
+    def rows(self, label: str, columns: List[str], rows) -> int:
+        count = 0
+        for row in rows:
+            self._line({"type": "row", "model": label, "data": row})
+            count += 1
+        return count
+
+    def close(self, counts: dict) -> None:
+        self._line({"type": "end", "counts": counts})
+        self.stream.close()
+
+
+class _CsvWriter:
+    """tar.gz con manifest.json, refs.csv y un CSV por modelo (en orden de carga)."""
+
+    def __init__(self, out):
+        self.tar = tarfile.open(fileobj=out, mode="w:gz")
+
+    def _add(self, name: str, spool) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = spool.tell()
+        info.mtime = int(time.time())
+        spool.seek(0)
+        self.tar.addfile(info, spool)
+
+    def _csv_member(self, name: str, header: List[str], rows) -> int:
+        count = 0
+        # Cada miembro necesita su tamaño antes de escribirse: se arma en un temporal (disco si crece)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow([self._cell(value) for value in row])
+                count += 1
+            text.flush()
+            self._add(name, spool)
+            text.detach()
+        return count
+
+    @staticmethod
+    def _cell(value):
+        if value is None:
+            return CSV_NULL
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value
+
+    def header(self, header: dict) -> None:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            spool.write(json.dumps({"type": "header", **header}, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8"))
+            self._add("manifest.json", spool)
+
+    def references(self, refs) -> None:
+        self._csv_member("refs.csv", ["model", "id", "key"], refs)
+
+    def rows(self, label: str, columns: List[str], rows) -> int:
+        return self._csv_member(f"{label}.csv", columns, ([row[c] for c in columns] for row in rows))
+
+    def close(self, counts: dict) -> None:
+        self.tar.close()
+
+
+def _read_ndjson(fileobj) -> Iterator[dict]:
+    with io.TextIOWrapper(gzip.GzipFile(fileobj=fileobj, mode="rb"), encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _text_lines(handle, block_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Líneas (con su salto) de un miembro del tar en modo streaming: no admite
+    seek, así que no sirve TextIOWrapper. Solo se corta en "\n", como espera csv.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    for block in iter(lambda: handle.read(block_size), b""):
+        pending += decoder.decode(block)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _read_csv(fileobj) -> Iterator[dict]:
+    """Mismos registros que _read_ndjson, leyendo el tar.gz miembro por miembro (modo streaming)."""
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            handle = tar.extractfile(member)
+            if member.name == "manifest.json":
+                yield json.load(handle)
+                continue
+            reader = csv.reader(_text_lines(handle))
+            columns = next(reader)
+            label = member.name[:-len(".csv")]
+            for values in reader:
+                values = [None if value == CSV_NULL else value for value in values]
+                if member.name == "refs.csv":
+                    yield {"type": "ref", "model": values[0], "id": int(values[1]), "key": values[2]}
+                else:
+                    yield {"type": "row", "model": label, "data": dict(zip(columns, values)), "csv": True}
+
+
+class TenantTransferService:
+    """
+    Exporta los datos de una empresa a un archivo comprimido (NDJSON o CSV)
+    y los vuelve a cargar en otro entorno como una empresa nueva.
+
+    - Exportación: un modelo a la vez, padres antes que hijos, con
+      stream_values (cursor del lado del servidor en MySQL): memoria constante.
+    - Los catálogos globales (ubigeo, tipos de documento, diagnósticos...) no
+      se copian: se exportan sus claves naturales y se vinculan en destino.
+    - Importación: lotes con ids nuevos reservados sobre el MAX(id) actual e
+      INSERT directo (conserva created_at/updated_at); cada FK se traduce con
+      el mapa id viejo -> id nuevo del modelo padre.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, progress: Optional[Callable] = None):
+        self.batch_size = batch_size
+        # progress(label, count): avance por modelo (exportación) o por lote (importación)
+        self.progress = progress
+
+    def _report(self, label: str, count: int) -> None:
+        if self.progress is not None:
+            self.progress(label, count)
+
+    # ---------- exportación ----------
+    def export(self, tenant_id: int, out, fmt: str = FORMAT_NDJSON) -> Dict[str, int]:
+        """Escribe el archivo en `out` (binario). Devuelve filas exportadas por modelo."""
+        reflexo = Reflexo.objects.get(pk=tenant_id)
+        models = export_models()
+        writer = _NdjsonWriter(out) if fmt == FORMAT_NDJSON else _CsvWriter(out)
+        writer.header({
+            "version": ARCHIVE_VERSION,
+            "format": fmt,
+            "exported_at": timezone.now(),
+            "reflexo": {"id": reflexo.pk, "name": reflexo.name, "domain": reflexo.domain},
+            "models": [model._meta.label for model in models],
+        })
+        writer.references(_references(models, tenant_id))
+
+        counts = {}
+        for model in models:
+            label = model._meta.label
+            # Las columnas generadas (appointment_day, payment_day) se recalculan en destino
+            columns = [field.attname for field in model._meta.concrete_fields if not field.generated]
+            rows = stream_values(_tenant_queryset(model, tenant_id).values(*columns), chunk_size=self.batch_size)
+            counts[label] = writer.rows(label, columns, rows)
+            self._report(label, counts[label])
+        writer.close(counts)
+        return counts
+
+    def submit_export(self, tenant_id: int, user=None, fmt: str = FORMAT_NDJSON) -> TenantExportJob:
+        """Registra el job de exportación y lo encola al confirmar la transacción."""
+        from reflexo.tasks import export_tenant_job
+
+        reflexo = Reflexo.objects.get(pk=tenant_id)
+        job = TenantExportJob.objects.create(
+            reflexo_id=reflexo.pk,
+            reflexo_name=reflexo.name,
+            format=fmt,
+            requested_by=user if getattr(user, "is_authenticated", False) else None,
+        )
+        transaction.on_commit(lambda: export_tenant_job.delay(job.id))
+        return job
+
+    def run_export(self, job_id: int, task_id=None) -> TenantExportJob:
+        """Genera el archivo del job y lo guarda en default_storage."""
+        job = TenantExportJob.objects.get(pk=job_id)
+        if job.status == TenantExportJob.STATUS_DONE:
+            return job
+
+        job.status = TenantExportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.task_id = task_id
+        job.error = None
+        job.save(update_fields=["status", "started_at", "task_id", "error"])
+
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as tmp:
+                job.counts = self.export(job.reflexo_id, tmp, job.format)
+                tmp.seek(0)
+                filename = f"tenant_{job.reflexo_id}_{timezone.now():%Y%m%d_%H%M%S}{EXTENSIONS[job.format]}"
+                job.file.save(filename, File(tmp), save=False)
+            job.status = TenantExportJob.STATUS_DONE
+        except Exception as e:
+            logger.exception("Exportación de la empresa %s falló", job.reflexo_id)
+            job.status = TenantExportJob.STATUS_FAILED
+            job.error = str(e)
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "file", "counts", "error", "finished_at"])
+        return job
+
+    # ---------- importación ----------
+    def import_archive(self, fileobj, fmt: str = FORMAT_NDJSON, name: str = None, domain: str = None):
+        """
+        Crea una empresa nueva con los datos del archivo.
+        Devuelve (empresa, filas importadas por modelo, filas omitidas por modelo).
+        """
+        records = _read_ndjson(fileobj) if fmt == FORMAT_NDJSON else _read_csv(fileobj)
+        header = next(records, None)
+        if not header or header.get("type") != "header":
+            raise ValueError("Archivo de exportación inválido: falta el encabezado")
+        if header.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Versión de archivo no soportada: {header.get('version')}")
+
+        source = header["reflexo"]
+        name, domain = name or source["name"], domain or source["domain"]
+        if Reflexo.objects.filter(name=name).exists() or Reflexo.objects.filter(domain=domain).exists():
+            raise ValueError(f"Ya existe una empresa con el nombre '{name}' o el dominio '{domain}'")
+
+        refs: Dict[str, Dict[int, object]] = {}
+        imported: Dict[str, int] = {}
+        skipped: Dict[str, int] = {}
+        # Todo o nada: un archivo a medio cargar no debe dejar una empresa incompleta
+        with transaction.atomic():
+            reflexo = Reflexo.objects.create(name=name, domain=domain)
+            # id viejo -> id nuevo, por modelo (Reflexo y catálogos incluidos)
+            maps: Dict[str, Dict[int, int]] = {Reflexo._meta.label: {source["id"]: reflexo.pk}}
+
+            label, batch = None, []
+            for record in records:
+                kind = record.get("type")
+                if kind == "ref":
+                    refs.setdefault(record["model"], {})[int(record["id"])] = record["key"]
+                    continue
+                if kind != "row":
+                    continue
+                if refs:
+                    self._resolve_references(refs, maps)
+                    refs = {}
+                if record["model"] != label or len(batch) >= self.batch_size:
+                    self._flush(label, batch, maps, imported, skipped)
+                    label, batch = record["model"], []
+                batch.append(record)
+            self._flush(label, batch, maps, imported, skipped)
+
+        self._rebuild_indexes(maps)
+        return reflexo, imported, skipped
+
+    @staticmethod
+    def _resolve_references(refs: Dict[str, Dict[int, object]], maps: Dict[str, Dict[int, int]]) -> None:
+        """Traduce los ids de catálogos globales del origen a los del destino por clave natural."""
+        for label, keys in refs.items():
+            model = apps.get_model(label)
+            field = model._meta.get_field(NATURAL_KEYS[label])
+            wanted = {field.to_python(key) for key in keys.values()}
+            by_key = {}
+            for pk, key in model._base_manager.filter(**{f"{field.name}__in": wanted}).order_by("pk").values_list("pk", field.name):
+                by_key.setdefault(key, pk)
+            maps[label] = {
+                old: by_key[field.to_python(key)] for old, key in keys.items() if field.to_python(key) in by_key
+            }
+
+    def _build(self, model, record: dict, maps) -> Optional[Tuple[int, object]]:
+        """(id viejo, instancia con FKs traducidas) o None si falta un padre obligatorio."""
+        data = record["data"]
+        from_csv = record.get("csv", False)
+        values = {}
+        old_pk = None
+        for field in model._meta.concrete_fields:
+            if field.generated:
+                continue
+            value = data.get(field.attname)
+            if field.primary_key:
+                old_pk = int(value)
+                continue
+            if field.is_relation:
+                if value is not None:
+                    value = maps.get(field.related_model._meta.label, {}).get(int(value))
+                if value is None and not field.null:
+                    return None
+            elif value is not None:
+                if from_csv and isinstance(field, JSONField):
+                    value = json.loads(value)
+                value = field.to_python(value)
+            values[field.attname] = value
+        return old_pk, model(**values)
+
+    def _flush(self, label: Optional[str], batch: List[dict], maps, imported, skipped) -> None:
+        if not batch:
+            return
+        model = apps.get_model(label)
+        built = [self._build(model, record, maps) for record in batch]
+        rows = [row for row in built if row is not None]
+        skipped[label] = skipped.get(label, 0) + len(built) - len(rows)
+        if rows:
+            self._check_unique(model, [obj for _, obj in rows])
+            self._insert(model, rows, maps.setdefault(label, {}))
+        imported[label] = imported.get(label, 0) + len(rows)
+        self._report(label, imported[label])
+
+    @staticmethod
+    def _check_unique(model, objs: List) -> None:
+        """
+        Columnas únicas a nivel global (documentos, correos): si ya existen en
+        destino (p. ej. la empresa de origen sigue activa) se aborta con un
+        mensaje claro en vez de un IntegrityError a mitad de la carga.
+        """
+        for field in model._meta.concrete_fields:
+            if not field.unique or field.primary_key or field.is_relation:
+                continue
+            values = {getattr(obj, field.attname) for obj in objs} - {None}
+            taken = list(model._base_manager.filter(**{f"{field.attname}__in": values}).values_list(field.attname, flat=True)[:5])
+            if taken:
+                raise ValueError(
+                    f"{model._meta.label}.{field.name} ya existe en destino: {', '.join(map(str, taken))}"
+                )
+
+    @staticmethod
+    def _insert(model, rows: List[Tuple[int, object]], mapping: Dict[int, int]) -> None:
+        """
+        Reserva ids por encima del MAX(id) actual e inserta el lote sin pre_save
+        (raw: conserva auto_now/auto_now_add). Si un alta concurrente ocupa uno
+        de esos ids, se recalcula y se reintenta. Una tabla y su archivo
+        comparten ids (unarchive restaura la fila con el mismo id): el máximo
+        se toma sobre ambas.
+        """
+        using = router.db_for_write(model)
+        fields = [field for field in model._meta.concrete_fields if not field.generated]
+        batch_size = connections[using].ops.bulk_batch_size(fields, [obj for _, obj in rows]) or len(rows)
+        for attempt in range(1, INSERT_RETRIES + 1):
+            try:
+                with transaction.atomic(using=using):
+                    hot = source_of(model) or model
+                    top = max_with_archive(model, "pk", hot._base_manager.using(using))
+                    for position, (_, obj) in enumerate(rows, start=1):
+                        obj.pk = top + position
+                    objs = [obj for _, obj in rows]
+                    for start in range(0, len(objs), batch_size):
+                        model._base_manager.using(using)._insert(objs[start:start + batch_size], fields=fields, raw=True)
+                break
+            except IntegrityError:
+                if attempt == INSERT_RETRIES:
+                    raise
+        for old_pk, obj in rows:
+            mapping[old_pk] = obj.pk
+
+    @staticmethod
+    def _rebuild_indexes(maps) -> None:
+        """Los INSERT directos no disparan señales: reconstruir los índices de búsqueda."""
+        from patients_diagnoses.services.patient_search_service import PatientSearchService
+
+        service = GlobalSearchService()
+        for entity_type, provider in PROVIDERS.items():
+            ids = list(maps.get(provider.model_label, {}).values())
+            for start in range(0, len(ids), BATCH_SIZE):
+                service.reindex(entity_type, ids[start:start + BATCH_SIZE])
+        patient_ids = list(maps.get("patients_diagnoses.Patient", {}).values())
+        for start in range(0, len(patient_ids), BATCH_SIZE):
+            PatientSearchService().reindex(patient_ids[start:start + BATCH_SIZE])
@@ -0,0 +1,19 @@
+from celery import shared_task
+
+
+@shared_task(bind=True)
+def purge_tenant_job(self, job_id):
+    """Elimina por lotes los datos de una empresa dada de baja (TenantPurgeJob)."""
+    from reflexo.services.tenant_offboarding_service import TenantOffboardingService
+
+    job = TenantOffboardingService().run(job_id, task_id=self.request.id)
+    return {"job_id": job.id, "status": job.status}
+
+
+@shared_task(bind=True)
+def export_tenant_job(self, job_id):
+    """Genera el archivo de exportación de una empresa (TenantExportJob)."""
+    from reflexo.services.tenant_transfer_service import TenantTransferService
+
+    job = TenantTransferService().run_export(job_id, task_id=self.request.id)
+    return {"job_id": job.id, "status": job.status}
@@ -14,13 +14,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 # Configuración de Celery
+# Broker y backend de resultados: CELERY_BROKER_URL / CELERY_RESULT_BACKEND en
+# settings (Redis si hay REDIS_URL, si no broker en memoria con ejecución eager).
 app.conf.update(
-    # Broker de mensajes (Redis)
-    broker_url=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
-    
-    # Backend de resultados
-    result_backend=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'),
-    
     # Configuración de tareas
     task_serializer='json',
     accept_content=['json'],
@@ -44,6 +40,7 @@ app.conf.update(
     task_routes={
         'appointments_status.tasks.*': {'queue': 'appointments'},
         'company_reports.tasks.*': {'queue': 'reports'},
+        'patients_diagnoses.tasks.*': {'queue': 'imports'},
         'therapists.tasks.*': {'queue': 'therapists'},
     },
     
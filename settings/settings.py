@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from decouple import config
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -232,9 +233,29 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_ENABLE_UTC = True
+# Sin Redis no hay worker que consuma el broker en memoria: las tareas se
+# ejecutan en el mismo proceso (útil en local y para pruebas).
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=not USE_REDIS, cast=bool)
 
 # Celery Beat Configuration
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+# DatabaseScheduler registra estas entradas al iniciar; se pueden ajustar desde el admin
+CELERY_BEAT_SCHEDULE = {
+    'archive-rows-nightly': {
+        'task': 'architect.tasks.archive_rows_job',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'maintain-partitions-monthly': {
+        'task': 'appointments_status.tasks.maintain_partitions_job',
+        'schedule': crontab(day_of_month=1, hour=4, minute=0),
+    },
+}
+
+# Archivado: citas (y sus tickets) más antiguas que esto pasan a las tablas *_archive
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=730, cast=int)
+
+# Particiones mensuales (MySQL) de citas: meses futuros creados por adelantado
+PARTITION_AHEAD_MONTHS = config('PARTITION_AHEAD_MONTHS', default=3, cast=int)
 
 # Celery Results Configuration
 CELERY_RESULT_EXPIRES = 3600  # 1 hora
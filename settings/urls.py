@@ -22,6 +22,7 @@ from django.urls import path, include
 from django.conf import settings  # Importa settings
 from django.conf.urls.static import static  # Importa static
 from django.http import HttpResponse
+from architect.views.search import GlobalSearchView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -54,6 +55,9 @@ urlpatterns = [
         # 📊 Módulo 8: Reportes de Empresas
         path('company/', include('company_reports.urls')),
 
+        # Búsqueda global (pacientes, terapeutas, citas y tickets)
+        path('search/', GlobalSearchView.as_view(), name='global-search'),
+
     ])),
 ]
 
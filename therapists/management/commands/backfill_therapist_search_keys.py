@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from therapists.models.therapist import Therapist
+from architect.utils.text import person_name_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute Therapist.name_key / phonetic_key (accent-insensitive and Spanish phonetic name keys "
+        "used for duplicate detection) and search_document (denormalized search text). Needed after "
+        "bulk imports and after renaming a document type or a region/province/district "
+        "(import_ubigeo runs it when it renames places)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant",
+            type=int,
+            default=None,
+            help="Limit to a specific reflexo (tenant) ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Rows read and updated per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without persisting.",
+        )
+
+    def handle(self, *args, **options):
+        tenant_id = options.get("tenant")
+        batch_size = max(options.get("batch_size") or 2000, 1)
+        dry_run = options.get("dry_run", False)
+
+        qs = Therapist.objects.order_by("id").select_related("document_type")
+        if tenant_id is not None:
+            qs = qs.filter(reflexo_id=tenant_id)
+
+        scanned = updated = 0
+        last_id = 0
+        while True:
+            batch = list(qs.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            changed = []
+            for t in batch:
+                keys = person_name_keys(t.last_name_paternal, t.last_name_maternal, t.first_name)
+                document = t.build_search_document()
+                if (t.name_key, t.phonetic_key, t.search_document) != (*keys, document):
+                    t.name_key, t.phonetic_key = keys
+                    t.search_document = document
+                    changed.append(t)
+            if changed and not dry_run:
+                with transaction.atomic():
+                    Therapist.objects.bulk_update(changed, ["name_key", "phonetic_key", "search_document"])
+            scanned += len(batch)
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Therapists scanned: {scanned}. Keys updated: {updated}. Dry run: {dry_run}"
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:39
+
+from django.db import migrations, models
+
+from architect.utils.text import person_name_keys
+
+BATCH_SIZE = 2000
+
+
+def build_name_keys(apps, schema_editor):
+    """Calcula name_key/phonetic_key de los terapeutas existentes (mismo criterio que Therapist.save())."""
+    Therapist = apps.get_model('therapists', 'Therapist')
+    rows = (
+        Therapist._base_manager.order_by('id')
+        .values_list('id', 'last_name_paternal', 'last_name_maternal', 'first_name')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for pk, paternal, maternal, name in rows:
+        name_key, phonetic_key = person_name_keys(paternal, maternal, name)
+        batch.append(Therapist(id=pk, name_key=name_key, phonetic_key=phonetic_key))
+        if len(batch) >= BATCH_SIZE:
+            Therapist._base_manager.bulk_update(batch, ['name_key', 'phonetic_key'])
+            batch = []
+    if batch:
+        Therapist._base_manager.bulk_update(batch, ['name_key', 'phonetic_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0009_alter_predeterminedprice_options_and_more'),
+        ('reflexo', '0001_initial'),
+        ('therapists', '0002_alter_therapist_options_therapist_local_id_and_more'),
+        ('ubi_geo', '0009_alter_district_options_district_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='therapist',
+            name='name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre'),
+        ),
+        migrations.AddField(
+            model_name='therapist',
+            name='phonetic_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave fonética'),
+        ),
+        migrations.AddIndex(
+            model_name='therapist',
+            index=models.Index(fields=['reflexo', 'name_key'], name='idx_therapist_reflexo_name_key'),
+        ),
+        migrations.AddIndex(
+            model_name='therapist',
+            index=models.Index(fields=['reflexo', 'phonetic_key'], name='idx_therapist_reflexo_phonetic'),
+        ),
+        migrations.RunPython(build_name_keys, migrations.RunPython.noop),
+    ]
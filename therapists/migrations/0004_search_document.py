@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:45
+
+from django.db import migrations, models
+
+from architect.utils.search import create_fulltext_index, drop_fulltext_index
+from architect.utils.text import search_document
+
+BATCH_SIZE = 2000
+FULLTEXT_INDEX = 'ft_therapist_search_document'
+
+
+def build_search_documents(apps, schema_editor):
+    """Calcula search_document de los terapeutas existentes (mismo criterio que Therapist.build_search_document)."""
+    Therapist = apps.get_model('therapists', 'Therapist')
+    rows = (
+        Therapist._base_manager.order_by('id')
+        .values_list(
+            'id', 'first_name', 'last_name_paternal', 'last_name_maternal',
+            'document_number', 'document_type__name', 'email', 'phone', 'address',
+            'region__name', 'province__name', 'district__name',
+        )
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for pk, *values in rows:
+        batch.append(Therapist(id=pk, search_document=search_document(*values)))
+        if len(batch) >= BATCH_SIZE:
+            Therapist._base_manager.bulk_update(batch, ['search_document'])
+            batch = []
+    if batch:
+        Therapist._base_manager.bulk_update(batch, ['search_document'])
+
+
+def add_fulltext_index(apps, schema_editor):
+    create_fulltext_index(schema_editor, 'therapists', FULLTEXT_INDEX, ['search_document'])
+
+
+def remove_fulltext_index(apps, schema_editor):
+    drop_fulltext_index(schema_editor, 'therapists', FULLTEXT_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('therapists', '0003_name_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='therapist',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Documento de búsqueda'),
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, remove_fulltext_index),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('histories_configurations', '0010_archive_tables'),
+        ('reflexo', '0003_tenant_export_jobs'),
+        ('therapists', '0004_search_document'),
+        ('ubi_geo', '0009_alter_district_options_district_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TherapistArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('local_id', models.IntegerField(blank=True, null=True, verbose_name='ID local (por empresa)')),
+                ('document_number', models.CharField(max_length=20, verbose_name='Número de documento')),
+                ('last_name_paternal', models.CharField(max_length=150, verbose_name='Apellido paterno')),
+                ('last_name_maternal', models.CharField(max_length=150, verbose_name='Apellido materno')),
+                ('first_name', models.CharField(max_length=150, verbose_name='Nombre')),
+                ('birth_date', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de nacimiento')),
+                ('gender', models.CharField(blank=True, max_length=50, null=True, verbose_name='Sexo')),
+                ('personal_reference', models.CharField(blank=True, max_length=255, null=True, verbose_name='Referencia personal')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Activo')),
+                ('phone', models.CharField(blank=True, max_length=20, null=True, verbose_name='Teléfono')),
+                ('email', models.CharField(max_length=254, verbose_name='Email')),
+                ('address', models.TextField(blank=True, null=True, verbose_name='Dirección')),
+                ('profile_picture', models.CharField(blank=True, max_length=255, null=True, verbose_name='Foto de perfil')),
+                ('name_key', models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave de nombre')),
+                ('phonetic_key', models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Clave fonética')),
+                ('search_document', models.TextField(blank=True, default='', editable=False, verbose_name='Documento de búsqueda')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(verbose_name='Fecha de actualización')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de eliminación')),
+                ('archived_at', models.DateTimeField(db_index=True, verbose_name='Fecha de archivo')),
+                ('district', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.district', verbose_name='Distrito')),
+                ('document_type', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='histories_configurations.documenttype', verbose_name='Tipo de documento')),
+                ('province', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.province', verbose_name='Provincia')),
+                ('reflexo', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reflexo.reflexo', verbose_name='reflexo')),
+                ('region', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ubi_geo.region', verbose_name='Región')),
+            ],
+            options={
+                'verbose_name': 'Terapeuta (archivo)',
+                'verbose_name_plural': 'Terapeutas (archivo)',
+                'db_table': 'therapists_archive',
+                'indexes': [models.Index(fields=['document_number'], name='therapists__documen_828ca9_idx')],
+            },
+        ),
+    ]
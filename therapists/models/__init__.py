@@ -1,5 +1,7 @@
 from .therapist import Therapist
+from .archive import TherapistArchive
 
 __all__ = [
     "Therapist",
+    "TherapistArchive",
 ]
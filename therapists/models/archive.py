@@ -0,0 +1,5 @@
+from architect.utils.archive import archive_model
+from .therapist import Therapist
+
+# Tabla espejo de terapeutas eliminados (soft delete): ver architect/utils/archive.py
+TherapistArchive = archive_model(Therapist, __name__, indexes=[("document_number",)])
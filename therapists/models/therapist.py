@@ -1,6 +1,8 @@
 from django.db import models
 from ubi_geo.models import Region, Province, District
 from histories_configurations.models import DocumentType
+from ubi_geo.services.geo_cache import GeoCache
+from architect.utils.text import person_name_keys, search_document as make_search_document
 
 class Therapist(models.Model):
     """
@@ -46,11 +48,65 @@ class Therapist(models.Model):
     address = models.TextField(blank=True, null=True, verbose_name="Dirección")
     profile_picture = models.CharField(max_length=255, blank=True, null=True, verbose_name="Foto de perfil")
     
+    # Claves de nombre normalizada y fonética (detección de duplicados); se calculan en save()
+    name_key = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="Clave de nombre")
+    phonetic_key = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name="Clave fonética")
+    # Texto de búsqueda desnormalizado (sin tildes, en minúsculas); se calcula en save()
+    search_document = models.TextField(blank=True, default='', editable=False, verbose_name="Documento de búsqueda")
+
     # Campos de auditoría
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de actualización")
     deleted_at = models.DateTimeField(blank=True, null=True, verbose_name="Fecha de eliminación")
 
+    NAME_FIELDS = frozenset({'first_name', 'last_name_paternal', 'last_name_maternal'})
+    # Campos que alimentan search_document (con y sin sufijo _id para las FKs)
+    SEARCH_FIELDS = NAME_FIELDS | frozenset({
+        'document_number', 'email', 'phone', 'address',
+        'document_type', 'document_type_id', 'region', 'region_id',
+        'province', 'province_id', 'district', 'district_id',
+    })
+
+    def build_search_document(self):
+        """
+        Texto de búsqueda: nombres, documento, contacto, dirección y nombres de tipo de documento y ubicación.
+        La ubicación sale de GeoCache (sin SQL y con el nombre vigente, no el de una instancia ya cargada).
+        """
+        def geo_name(level):
+            obj = GeoCache.get(level, getattr(self, f'{level}_id'))
+            return obj.name if obj is not None else None
+
+        document_type = None
+        if self.document_type_id:
+            if Therapist.document_type.is_cached(self):
+                document_type = self.document_type.name
+            else:
+                document_type = (
+                    DocumentType.objects.filter(pk=self.document_type_id).values_list('name', flat=True).first()
+                )
+
+        return make_search_document(
+            self.first_name, self.last_name_paternal, self.last_name_maternal,
+            self.document_number, document_type, self.email, self.phone, self.address,
+            geo_name('region'), geo_name('province'), geo_name('district'),
+        )
+
+    def save(self, *args, **kwargs):
+        """Recalcula name_key/phonetic_key y search_document (y los agrega a update_fields si cambiaron sus fuentes)."""
+        self.name_key, self.phonetic_key = person_name_keys(self.last_name_paternal, self.last_name_maternal, self.first_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.SEARCH_FIELDS.intersection(update_fields):
+            self.search_document = self.build_search_document()
+        if update_fields is not None:
+            extra = set()
+            if self.NAME_FIELDS.intersection(update_fields):
+                extra |= {'name_key', 'phonetic_key'}
+            if self.SEARCH_FIELDS.intersection(update_fields):
+                extra.add('search_document')
+            if extra:
+                kwargs['update_fields'] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+
     def soft_delete(self):
         """Marca el registro como eliminado lógicamente."""
         from django.utils import timezone
@@ -82,4 +138,9 @@ class Therapist(models.Model):
                 name='uniq_therapist_local_id_per_reflexo',
                 condition=models.Q(local_id__isnull=False)
             )
-        ]
\ No newline at end of file
+        ]
+        indexes = [
+            models.Index(fields=['reflexo', 'name_key'], name='idx_therapist_reflexo_name_key'),
+            models.Index(fields=['reflexo', 'phonetic_key'], name='idx_therapist_reflexo_phonetic'),
+        ]
+        # En MySQL search_document además tiene un índice FULLTEXT (migración 0004_search_document)
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework import serializers
 from therapists.models import Therapist 
 from ubi_geo.models import Region, Province, District
 from ubi_geo.serializers import RegionSerializer, ProvinceSerializer, DistrictSerializer
+from ubi_geo.services.geo_cache import GeoCache
 from histories_configurations.models import DocumentType
 from histories_configurations.serializers import DocumentTypeSerializer
 from reflexo.models import Reflexo
@@ -97,39 +98,22 @@ class TherapistSerializer(serializers.ModelSerializer):
         resolver por ubigeo_code y colocarlos en attrs como objetos FK (region/province/district).
         """
         # Solo resolver si no vinieron los *_id explícitos
-        region = attrs.get('region')
-        province = attrs.get('province')
-        district = attrs.get('district')
         init = getattr(self, 'initial_data', {}) or {}
 
-        # Region
-        if region is None and 'region_code' in init and init.get('region_code') not in (None, ''):
-            try:
-                code = int(init.get('region_code'))
-                from ubi_geo.models import Region as Reg
-                attrs['region'] = Reg.objects.get(ubigeo_code=code)
-            except (ValueError, Reg.DoesNotExist):
-                raise serializers.ValidationError({'region_code': 'Código de región inválido o no existe.'})
-
-        # Province (requiere region resuelta para coherencia posterior)
-        if province is None and 'province_code' in init and init.get('province_code') not in (None, ''):
-            try:
-                code = int(init.get('province_code'))
-                from ubi_geo.models import Province as Prov
-                attrs['province'] = Prov.objects.get(ubigeo_code=code)
-            except (ValueError, Prov.DoesNotExist):
-                raise serializers.ValidationError({'province_code': 'Código de provincia inválido o no existe.'})
-
-        # District
-        if district is None and 'district_code' in init and init.get('district_code') not in (None, ''):
-            try:
-                code = int(init.get('district_code'))
-                from ubi_geo.models import District as Dist
-                attrs['district'] = Dist.objects.get(ubigeo_code=code)
-            except (ValueError, Dist.DoesNotExist):
-                raise serializers.ValidationError({'district_code': 'Código de distrito inválido o no existe.'})
+        # Resolución en memoria (GeoCache): sin consultas por código
+        for level, label in (('region', 'región'), ('province', 'provincia'), ('district', 'distrito')):
+            code = init.get(f'{level}_code')
+            if attrs.get(level) is None and code not in (None, ''):
+                obj = GeoCache.get_by_code(level, code)
+                if obj is None:
+                    raise serializers.ValidationError({f'{level}_code': f'Código de {label} inválido o no existe.'})
+                attrs[level] = obj
         return attrs
 
+    def _instance_geo(self, level):
+        pk = getattr(self.instance, f'{level}_id', None)
+        return GeoCache.get(level, pk) if pk else None
+
     def _compose_relative_media_url(self, name: str) -> str | None:
         """Compone una URL relativa basada en MEDIA_URL a partir del nombre almacenado en storage."""
         if not name:
@@ -171,9 +155,10 @@ class TherapistSerializer(serializers.ModelSerializer):
         """
         # Resolver alternativas por código antes de validar coherencia
         attrs = self._inject_fk_from_codes(attrs)
-        region = attrs.get("region") or getattr(self.instance, "region", None)
-        province = attrs.get("province") or getattr(self.instance, "province", None)
-        district = attrs.get("district") or getattr(self.instance, "district", None)
+        # En updates, las FK actuales también salen de GeoCache (sin cargar la relación)
+        region = attrs.get("region") or self._instance_geo("region")
+        province = attrs.get("province") or self._instance_geo("province")
+        district = attrs.get("district") or self._instance_geo("district")
 
         # Validar presencia: debe existir region/province/district por id o por code
         errors = {}
@@ -1,5 +1,9 @@
 from ..models.therapist import Therapist
-from django.db import models
+from architect.utils.archive import unarchive_one
+from architect.utils.duplicates import find_duplicate_candidates
+from architect.utils.search import search_queryset
+from architect.utils.tenant import filter_by_tenant
+from architect.utils.text import person_name_keys
 
 class TherapistService:
     """
@@ -19,15 +23,34 @@ class TherapistService:
     @staticmethod
     def search_therapists(query):
         """Busca terapeutas por diferentes criterios"""
-        return Therapist.objects.filter(
-            models.Q(name__icontains=query) |
-            models.Q(last_name_paternal__icontains=query) |
-            models.Q(last_name_maternal__icontains=query) |
-            models.Q(document_number__icontains=query) |
-            models.Q(email__icontains=query),
-            deleted_at__isnull=True
+        return search_queryset(
+            Therapist.objects.filter(deleted_at__isnull=True),
+            query,
+            document_field="search_document",
+            fulltext_fields=("search_document",),
         )
     
+    @staticmethod
+    def find_duplicate_candidates(params, user=None):
+        """Posibles terapeutas duplicados (mismo documento, nombre sin tildes o nombre fonéticamente igual)"""
+        name_key, phonetic_key = person_name_keys(
+            params.get("last_name_paternal"), params.get("last_name_maternal"), params.get("first_name")
+        )
+        try:
+            exclude_id = int(params["exclude"]) if params.get("exclude") else None
+        except (TypeError, ValueError):
+            exclude_id = None
+        queryset = Therapist.objects.filter(deleted_at__isnull=True).select_related("region", "province", "district")
+        if user is not None:
+            queryset = filter_by_tenant(queryset, user, field='reflexo')
+        return find_duplicate_candidates(
+            queryset,
+            name_key,
+            phonetic_key,
+            document_number=(params.get("document_number") or "").strip() or None,
+            exclude_id=exclude_id,
+        )
+
     @staticmethod
     def soft_delete_therapist(therapist_id):
         """Marca un terapeuta como inactivo (soft delete)"""
@@ -39,10 +62,19 @@ class TherapistService:
             return False
     
     @staticmethod
-    def restore_therapist(therapist_id):
-        """Restaura un terapeuta marcándolo como activo"""
+    def restore_therapist(therapist_id, user=None):
+        """Restaura un terapeuta marcándolo como activo (también si ya fue archivado).
+        Lanza ValueError si no puede volver del archivo (valor único reutilizado).
+        """
+        scope = (lambda qs: filter_by_tenant(qs, user, field='reflexo')) if user is not None else None
+        base = Therapist.objects.filter(pk=therapist_id)
+        if scope is not None:
+            base = scope(base)
+        # Del archivo solo vuelve si el usuario puede verlo allí
+        if not base.exists() and not unarchive_one(Therapist, therapist_id, scope):
+            return False
         try:
-            therapist = Therapist.objects.get(pk=therapist_id, deleted_at__isnull=False)
+            therapist = base.get(deleted_at__isnull=False)
             therapist.restore()
             return True
         except Therapist.DoesNotExist:
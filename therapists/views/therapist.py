@@ -5,12 +5,15 @@ Maneja las operaciones CRUD y renderizado de templates.
 """
 
 from django.shortcuts import render
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from therapists.models.therapist import Therapist
 from therapists.serializers.therapist import TherapistSerializer, TherapistPhotoSerializer
+from therapists.services.therapist_service import TherapistService
+from architect.utils.archive import max_with_archive, unarchive_one
+from architect.utils.search import IndexedSearchFilter
 from architect.utils.tenant import filter_by_tenant, is_global_admin
 from django.core.files.storage import default_storage
 
@@ -24,21 +27,12 @@ class TherapistViewSet(viewsets.ModelViewSet):
       - Soft delete y restauración.
     """
     serializer_class = TherapistSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = [
-        "name",
-        "last_name_paternal",
-        "last_name_maternal",
-        "document_number",
-        "document_type",
-        "email",
-        "phone",
-        "address",
-        # búsqueda por nombres de ubicaciones (FK)
-        "region__name",
-        "province__name",
-        "district__name",
-    ]
+    filter_backends = [IndexedSearchFilter]
+    # Nombres, documento, email, teléfono, dirección y nombres de tipo de documento
+    # y región/provincia/distrito, desnormalizados en una sola columna (Therapist.save)
+    search_fields = ["search_document"]
+    search_document_field = "search_document"
+    search_fulltext_fields = ("search_document",)
 
     def get_queryset(self):
         """
@@ -76,7 +70,6 @@ class TherapistViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         # Asigna tenant y local_id secuencial por empresa
         from django.db import transaction
-        from django.db.models import Max
         # Determinar tenant destino
         if not is_global_admin(self.request.user):
             tenant_id = getattr(self.request.user, 'reflexo_id', None)
@@ -87,12 +80,11 @@ class TherapistViewSet(viewsets.ModelViewSet):
         with transaction.atomic():
             next_local = None
             if tenant_id:
-                max_local = (
-                    Therapist.objects.select_for_update()
-                    .filter(reflexo_id=tenant_id)
-                    .aggregate(m=Max('local_id'))['m']
+                # Incluye los archivados: vuelven con su número al restaurarse
+                max_local = max_with_archive(
+                    Therapist, 'local_id', Therapist.objects.select_for_update(), reflexo_id=tenant_id
                 )
-                next_local = (max_local or 0) + 1
+                next_local = max_local + 1
             if not is_global_admin(self.request.user):
                 serializer.save(reflexo_id=tenant_id, local_id=next_local)
             else:
@@ -141,23 +133,52 @@ class TherapistViewSet(viewsets.ModelViewSet):
             return self.get_paginated_response(serializer.data)
         return Response(self.get_serializer(queryset, many=True).data)
 
+    @action(detail=False, methods=["get"])
+    def duplicates(self, request):
+        """
+        Posibles terapeutas duplicados antes de registrar/editar.
+        ?first_name=&last_name_paternal=&last_name_maternal=&document_number=&exclude=<id>
+        """
+        candidates = TherapistService.find_duplicate_candidates(request.query_params, user=request.user)
+        return Response({
+            "results": [
+                {
+                    "match": c["match"],
+                    "score": c["score"],
+                    "therapist": self.get_serializer(c["object"]).data,
+                }
+                for c in candidates
+            ]
+        })
+
     @action(detail=True, methods=["post", "patch"])
     def restore(self, request, pk=None):
         """
         Restaura un terapeuta marcándolo como activo.
         """
+        # Aislar por tenant si no es admin global (en la tabla activa y en el archivo)
+        def scope(qs):
+            if is_global_admin(request.user):
+                return qs
+            return filter_by_tenant(qs, request.user, field='reflexo')
+
         # Buscar sin filtrar por deleted_at para dar feedback claro
+        qs = scope(Therapist.objects.all())
+        if not qs.filter(pk=pk).exists():
+            # Si ya fue archivado, vuelve primero a la tabla activa (solo si es del tenant)
+            try:
+                unarchive_one(Therapist, pk, scope)
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
         try:
-            qs = Therapist.objects.all()
-            # Aislar por tenant si no es admin global
-            if not is_global_admin(request.user):
-                qs = filter_by_tenant(qs, request.user, field='reflexo')
             therapist = qs.get(pk=pk)
         except Therapist.DoesNotExist:
             return Response({"detail": "No encontrado."}, status=status.HTTP_404_NOT_FOUND)
         if therapist.deleted_at is None:
             # Idempotente: si ya está activo, responder 200 con el estado actual
             return Response(self.get_serializer(therapist).data)
+        therapist.restore()
+        return Response(self.get_serializer(therapist).data)
 
     @action(detail=True, methods=["post", "delete"], url_path="photo")
     def photo(self, request, pk=None):
@@ -1,9 +1,17 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from pathlib import Path
+from typing import Dict, Optional
 import csv
+import time
 
 from ubi_geo.models import Region, Province, District
+from ubi_geo.services.geo_cache import CATALOG as GEO_CATALOG
+from architect.utils.cache_version import bump_version
+from architect.utils.db import bulk_upsert
+
+BATCH_SIZE = 1000
 
 def getv(row, *cands):
     for k in cands:
@@ -13,6 +21,12 @@ def getv(row, *cands):
                 return v
     return ""
 
+def _int(value) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
 class Command(BaseCommand):
     help = "Importa regiones, provincias y distritos desde CSV (';'). Usa códigos solo para vincular."
 
@@ -29,6 +43,7 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **opt):
+        started = time.perf_counter()
         base = Path(opt["path"]).resolve()
         files = {
             "regions": base / "regions.csv",
@@ -40,6 +55,7 @@ class Command(BaseCommand):
                 raise CommandError(f"No se encontró {name}: {p}")
 
         only = set(opt.get("only") or ["regions", "provinces", "districts"])
+        self.renamed = 0
 
         if opt["truncate"]:
             self.stdout.write(self.style.WARNING("Truncando tablas seleccionadas…"))
@@ -51,95 +67,101 @@ class Command(BaseCommand):
                 Region.objects.all().delete()
 
         with transaction.atomic():
-            code_to_region = {}
             if "regions" in only:
-                # REGIONS (global)
-                self.stdout.write("Importando regiones…")
-                with files["regions"].open(encoding="utf-8", newline="") as f:
-                    r = csv.DictReader(f, delimiter=";")
-                    n = u = s = 0
-                    for row in r:
-                        code = getv(row, "code", "ubigeo_code")
-                        name = getv(row, "name", "Nombre")
-                        if not name:
-                            s += 1; continue
-                        try:
-                            code_int = int(code) if code else None
-                        except ValueError:
-                            code_int = None
-                        # usar ubigeo_code como clave única y actualizar nombre
-                        obj, created = Region.objects.update_or_create(
-                            ubigeo_code=code_int,
-                            defaults={"name": name}
-                        )
-                        if code:
-                            code_to_region[code] = obj
-                        n += int(created); u += int(not created)
-                    self.stdout.write(f"Regions: +{n} upd:{u} skip:{s}")
+                region_ids = self._import("Regions", Region, files["regions"])
             else:
-                # Si no importamos regiones, construir el mapa leyendo la BD por código
-                for reg in Region.objects.all().only("id", "ubigeo_code"):
-                    if reg.ubigeo_code is not None:
-                        code_to_region[str(reg.ubigeo_code)] = reg
+                # Si no importamos regiones, vincular contra las existentes en BD
+                region_ids = self._code_map(Region)
 
-            code_to_province = {}
             if "provinces" in only:
-                # PROVINCES (global)
-                self.stdout.write("Importando provincias…")
-                with files["provinces"].open(encoding="utf-8", newline="") as f:
-                    r = csv.DictReader(f, delimiter=";")
-                    n = u = s = 0
-                    seq = 0
-                    for row in r:
-                        code = getv(row, "code", "ubigeo_code")
-                        name = getv(row, "name", "Nombre")
-                        region_ref = getv(row, "region_code", "region_id")
-                        region = code_to_region.get(region_ref)
-                        if not (name and region):
-                            s += 1; continue
-                        try:
-                            code_int = int(code) if code else None
-                        except ValueError:
-                            code_int = None
-                        seq += 1
-                        obj, created = Province.objects.update_or_create(
-                            ubigeo_code=code_int,
-                            defaults={"name": name, "region": region, "sequence": seq}
-                        )
-                        if code:
-                            code_to_province[code] = obj
-                        n += int(created); u += int(not created)
-                    self.stdout.write(f"Provinces: +{n} upd:{u} skip:{s}")
+                province_ids = self._import(
+                    "Provinces", Province, files["provinces"],
+                    parent_field="region", parent_refs=("region_code", "region_id"), parent_ids=region_ids,
+                )
             else:
-                # Si no importamos provincias, construir mapa desde BD
-                for prov in Province.objects.select_related("region").only("id", "ubigeo_code"):
-                    if prov.ubigeo_code is not None:
-                        code_to_province[str(prov.ubigeo_code)] = prov
+                province_ids = self._code_map(Province)
 
             if "districts" in only:
-                # DISTRICTS (global)
-                self.stdout.write("Importando distritos…")
-                n = u = s = 0
-                seq = 0
-                with files["districts"].open(encoding="utf-8", newline="") as f:
-                    r = csv.DictReader(f, delimiter=";")
-                    for row in r:
-                        code = getv(row, "code", "ubigeo_code")
-                        name = getv(row, "name", "Nombre")
-                        prov_ref = getv(row, "province_code", "province_id")
-                        province = code_to_province.get(prov_ref)
-                        if not (name and province):
-                            s += 1; continue
-                        try:
-                            code_int = int(code) if code else None
-                        except ValueError:
-                            code_int = None
-                        seq += 1
-                        _, created = District.objects.update_or_create(
-                            ubigeo_code=code_int,
-                            defaults={"name": name, "province": province, "sequence": seq}
-                        )
-                        n += int(created); u += int(not created)
-                self.stdout.write(f"Districts: +{n} upd:{u} skip:{s}")
-
-        self.stdout.write(self.style.SUCCESS("Importación completada ✔"))
+                self._import(
+                    "Districts", District, files["districts"],
+                    parent_field="province", parent_refs=("province_code", "province_id"), parent_ids=province_ids,
+                )
+
+        # bulk_create no dispara señales: las copias en memoria (GeoCache) se reconstruyen en el próximo uso
+        bump_version(GEO_CATALOG)
+        if self.renamed:
+            # search_document de terapeutas guarda los nombres de región/provincia/distrito
+            call_command("backfill_therapist_search_keys", stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Importación completada ✔ ({time.perf_counter() - started:.2f}s)"))
+
+    @staticmethod
+    def _code_map(model) -> Dict[int, int]:
+        """ubigeo_code -> id de las filas existentes (una sola consulta)."""
+        return dict(
+            model._base_manager.filter(ubigeo_code__isnull=False).order_by().values_list("ubigeo_code", "id")
+        )
+
+    def _import(self, label, model, path, parent_field=None, parent_refs=(), parent_ids=None) -> Dict[int, int]:
+        """
+        Lee el CSV una vez, lo compara con las filas existentes (precargadas en
+        un solo SELECT) y aplica solo altas y cambios con bulk_upsert por lotes.
+        Devuelve ubigeo_code -> id para vincular el siguiente nivel.
+        """
+        self.stdout.write(f"Importando {label.lower()}…")
+        t0 = time.perf_counter()
+        has_parent = parent_field is not None
+        columns = ("ubigeo_code", "id", "name") + ((f"{parent_field}_id", "sequence") if has_parent else ())
+        # ubigeo_code -> (id, name, parent_id, sequence)
+        existing = {
+            code: (pk, name, *(rest or (None, None)))
+            for code, pk, name, *rest in model._base_manager.filter(ubigeo_code__isnull=False)
+            .order_by().values_list(*columns)
+        }
+
+        rows = {}
+        s = seq = 0
+        with path.open(encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                code = _int(getv(row, "code", "ubigeo_code"))
+                name = getv(row, "name", "Nombre")
+                parent_id = parent_ids.get(_int(getv(row, *parent_refs))) if has_parent else None
+                # ubigeo_code es la clave del upsert: filas sin código no se pueden vincular
+                if not name or code is None or (has_parent and parent_id is None):
+                    s += 1; continue
+                if has_parent:
+                    seq += 1
+                rows[code] = (name, parent_id, seq if has_parent else None)
+
+        objs = []
+        n = u = 0
+        for code, (name, parent_id, sequence) in rows.items():
+            current = existing.get(code)
+            if current is not None and current[1:] == (name, parent_id, sequence):
+                continue
+            if current is None:
+                n += 1
+            else:
+                u += 1
+                if current[1] != name:
+                    self.renamed += 1
+            extra = {f"{parent_field}_id": parent_id, "sequence": sequence} if has_parent else {}
+            objs.append(model(ubigeo_code=code, name=name, **extra))
+
+        if has_parent:
+            # sequence es único: si el CSV desplaza la numeración, el upsert
+            # (ON DUPLICATE KEY UPDATE) chocaría con la fila que aún tiene ese
+            # número y la sobrescribiría. Liberar antes los números a escribir.
+            sequences = [obj.sequence for obj in objs]
+            for i in range(0, len(sequences), BATCH_SIZE):
+                model._base_manager.filter(sequence__in=sequences[i:i + BATCH_SIZE]).update(sequence=None)
+
+        update_fields = ["name", "updated_at"] + ([parent_field, "sequence"] if has_parent else [])
+        bulk_upsert(model, objs, unique_fields=["ubigeo_code"], update_fields=update_fields, batch_size=BATCH_SIZE)
+
+        ids = {code: current[0] for code, current in existing.items()}
+        if n:
+            # bulk_create no devuelve ids en todos los motores: releerlos una vez
+            ids = self._code_map(model)
+        same = len(rows) - n - u
+        self.stdout.write(f"{label}: +{n} upd:{u} sin cambios:{same} skip:{s} ({time.perf_counter() - t0:.2f}s)")
+        return ids
@@ -0,0 +1,6 @@
+# Services package
+from .geo_cache import GeoCache
+
+__all__ = [
+    'GeoCache'
+]
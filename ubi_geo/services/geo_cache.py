@@ -0,0 +1,158 @@
+# ubi_geo/services/geo_cache.py
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from ubi_geo.models.district import District
+from ubi_geo.models.province import Province
+from ubi_geo.models.region import Region
+from ubi_geo.serializers.district import DistrictSerializer
+from ubi_geo.serializers.province import ProvinceSerializer
+from ubi_geo.serializers.region import RegionSerializer
+from architect.utils.cache_version import get_version
+
+# Nombre del catálogo en architect.utils.cache_version
+CATALOG = "ubigeo"
+
+_MODELS = {"region": Region, "province": Province, "district": District}
+
+
+class _Snapshot:
+    """
+    Ubigeo activo: instancias por id y por ubigeo_code, listas ya serializadas
+    (por nombre), índices por padre y el árbol en JSON.
+    """
+
+    def __init__(self):
+        regions = list(Region.objects.filter(deleted_at__isnull=True).order_by("name"))
+        provinces = list(
+            Province.objects.select_related("region").filter(deleted_at__isnull=True).order_by("name")
+        )
+        districts = list(
+            District.objects.select_related("province", "province__region")
+            .filter(deleted_at__isnull=True)
+            .order_by("name")
+        )
+        # Instancias de solo lectura (compartidas entre requests: no modificarlas)
+        self.objects: Dict[str, Dict[int, object]] = {
+            "region": {r.id: r for r in regions},
+            "province": {p.id: p for p in provinces},
+            "district": {d.id: d for d in districts},
+        }
+        self.by_code: Dict[str, Dict[int, object]] = {
+            level: {obj.ubigeo_code: obj for obj in objs.values() if obj.ubigeo_code is not None}
+            for level, objs in self.objects.items()
+        }
+
+        # Mismo formato que las vistas de lista (se serializa una vez por versión)
+        self.regions: List[dict] = list(RegionSerializer(regions, many=True).data)
+        self.provinces: List[dict] = list(ProvinceSerializer(provinces, many=True).data)
+        self.districts: List[dict] = list(DistrictSerializer(districts, many=True).data)
+
+        self.region_by_id: Dict[int, dict] = {r["id"]: r for r in self.regions}
+        self.province_by_id: Dict[int, dict] = {p["id"]: p for p in self.provinces}
+        self.district_by_id: Dict[int, dict] = {d["id"]: d for d in self.districts}
+        self.provinces_by_region: Dict[int, List[dict]] = defaultdict(list)
+        for p in self.provinces:
+            self.provinces_by_region[p["region"]].append(p)
+        self.districts_by_province: Dict[int, List[dict]] = defaultdict(list)
+        for d in self.districts:
+            self.districts_by_province[d["province"]].append(d)
+
+        tree = [
+            {
+                "id": r["id"],
+                "name": r["name"],
+                "provinces": [
+                    {
+                        "id": p["id"],
+                        "name": p["name"],
+                        "districts": [{"id": d["id"], "name": d["name"]} for d in self.districts_by_province.get(p["id"], ())],
+                    }
+                    for p in self.provinces_by_region.get(r["id"], ())
+                ],
+            }
+            for r in self.regions
+        ]
+        self.tree_json: bytes = json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag: str = '"%s"' % hashlib.sha256(self.tree_json).hexdigest()[:32]
+
+
+class GeoCache:
+    """
+    Copia en memoria (por proceso) de regiones, provincias y distritos.
+
+    Se construye en el primer uso y se reconstruye cuando cambia la versión
+    del catálogo (bump_version(CATALOG) en las señales de ubi_geo y en
+    import_ubigeo). Las vistas de lista, detalle y el árbol, la resolución de
+    ubigeo_code y la validación de jerarquía se resuelven sin SQL.
+    """
+
+    _lock = threading.Lock()
+    _snapshot: Optional[_Snapshot] = None
+    _version = None
+
+    @classmethod
+    def snapshot(cls) -> _Snapshot:
+        version = get_version(CATALOG)
+        snapshot = cls._snapshot
+        if snapshot is not None and cls._version == version:
+            return snapshot
+        with cls._lock:
+            if cls._snapshot is None or cls._version != version:
+                cls._snapshot = _Snapshot()
+                cls._version = version
+            return cls._snapshot
+
+    @classmethod
+    def regions(cls) -> List[dict]:
+        return cls.snapshot().regions
+
+    @classmethod
+    def provinces(cls, region_id: Optional[int] = None) -> List[dict]:
+        snapshot = cls.snapshot()
+        if region_id is None:
+            return snapshot.provinces
+        return snapshot.provinces_by_region.get(region_id, [])
+
+    @classmethod
+    def districts(cls, province_id: Optional[int] = None) -> List[dict]:
+        snapshot = cls.snapshot()
+        if province_id is None:
+            return snapshot.districts
+        return snapshot.districts_by_province.get(province_id, [])
+
+    @classmethod
+    def get(cls, level: str, pk) -> Optional[object]:
+        """
+        Instancia de `level` ("region", "province", "district") por id, o None.
+        Las activas salen de memoria; solo un id desconocido o eliminado va a la BD.
+        """
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        obj = cls.snapshot().objects[level].get(pk)
+        if obj is None:
+            obj = _MODELS[level].objects.filter(pk=pk).order_by().first()
+        return obj
+
+    @classmethod
+    def get_by_code(cls, level: str, code) -> Optional[object]:
+        """Instancia de `level` por ubigeo_code (int o str de dígitos), o None. Igual que get()."""
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            return None
+        obj = cls.snapshot().by_code[level].get(code)
+        if obj is None:
+            obj = _MODELS[level].objects.filter(ubigeo_code=code).order_by().first()
+        return obj
+
+    @classmethod
+    def tree(cls):
+        """(JSON del árbol región > provincia > distrito, ETag)."""
+        snapshot = cls.snapshot()
+        return snapshot.tree_json, snapshot.etag
@@ -1,10 +1,13 @@
 # ubi_geo/signals.py
 from django.apps import apps
 from django.core.management import call_command
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 import logging
 
+from architect.utils.cache_version import bump_version_on_commit
+from ubi_geo.services.geo_cache import CATALOG as GEO_CATALOG
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,3 +43,16 @@ def ensure_default_ubigeo(sender, app_config=None, **kwargs):
     except Exception as e:
         # Do not break application startup due to seed issues
         logger.exception("UbiGeo seed: import failed: %s", e)
+
+
+@receiver(post_save, sender='ubi_geo.Region')
+@receiver(post_save, sender='ubi_geo.Province')
+@receiver(post_save, sender='ubi_geo.District')
+@receiver(post_delete, sender='ubi_geo.Region')
+@receiver(post_delete, sender='ubi_geo.Province')
+@receiver(post_delete, sender='ubi_geo.District')
+def invalidate_geo_cache(sender, raw=False, **kwargs):
+    """Cualquier escritura de ubigeo invalida las copias en memoria (GeoCache)."""
+    if raw:
+        return
+    bump_version_on_commit(GEO_CATALOG)
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views.region import RegionViewSet
 from .views.province import ProvinceViewSet
 from .views.district import DistrictViewSet
+from .views.tree import LocationTreeView
 
 router = DefaultRouter()
 router.register(r"regions", RegionViewSet, basename="region")
@@ -10,5 +11,6 @@ router.register(r"provinces", ProvinceViewSet, basename="province")
 router.register(r"districts", DistrictViewSet, basename="district")
 
 urlpatterns = [
+    path('tree/', LocationTreeView.as_view(), name='location-tree'),
     path('', include(router.urls)),  # APIs disponibles en la raíz
 ]
\ No newline at end of file
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
+from django.http import Http404
+from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from ubi_geo.models.district import District
 from ubi_geo.serializers.district import DistrictSerializer
-from architect.utils.tenant import filter_by_tenant_including_global
+from ubi_geo.services.geo_cache import GeoCache
+from .region import _int
 
 class DistrictViewSet(ReadOnlyModelViewSet):
     """
@@ -11,18 +14,22 @@ class DistrictViewSet(ReadOnlyModelViewSet):
 
     Filtros por querystring:
       - ?province=<id>           -> distritos de esa provincia
+
+    Se sirve desde GeoCache (catálogo global, sin tenant): no consulta la BD.
     """
+    queryset = District.objects.select_related("province", "province__region").filter(deleted_at__isnull=True).order_by("name")
     serializer_class = DistrictSerializer
 
-    def get_queryset(self):
-        qs = (
-            District.objects
-            .select_related("province", "province__region")
-            .filter(deleted_at__isnull=True)
-            .order_by("name")
-        )
-        qs = filter_by_tenant_including_global(qs, self.request.user, field='reflexo')
-        province_id = self.request.query_params.get("province")
-        if province_id:
-            qs = qs.filter(province_id=province_id)
-        return qs
+    def list(self, request, *args, **kwargs):
+        province_id = request.query_params.get("province")
+        rows = GeoCache.districts(_int(province_id) if province_id else None)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
+    def retrieve(self, request, *args, **kwargs):
+        row = GeoCache.snapshot().district_by_id.get(_int(kwargs.get("pk")))
+        if row is None:
+            raise Http404
+        return Response(row)
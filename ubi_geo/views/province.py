@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
+from django.http import Http404
+from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from ubi_geo.models.province import Province
 from ubi_geo.serializers.province import ProvinceSerializer
-from architect.utils.tenant import filter_by_tenant_including_global
+from ubi_geo.services.geo_cache import GeoCache
+from .region import _int
 
 
 class ProvinceViewSet(ReadOnlyModelViewSet):
@@ -12,22 +15,23 @@ class ProvinceViewSet(ReadOnlyModelViewSet):
 
     Filtros por querystring:
       - ?region=<id>            -> provincias de esa región
+
+    Se sirve desde GeoCache (catálogo global, sin tenant): no consulta la BD.
     """
+    queryset = Province.objects.select_related("region").filter(deleted_at__isnull=True).order_by("name")
     serializer_class = ProvinceSerializer
 
-    def get_queryset(self):
-        qs = Province.objects.select_related("region").filter(deleted_at__isnull=True).order_by("name")
-        qs = filter_by_tenant_including_global(qs, self.request.user, field='reflexo')
-        region_id = self.request.query_params.get("region")
-        if region_id:
-            # Aceptar formatos como "{2}" o " 2 "
-            rid = str(region_id).strip()
-            if rid.startswith("{") and rid.endswith("}"):
-                rid = rid[1:-1].strip()
-            try:
-                rid_int = int(rid)
-                qs = qs.filter(region_id=rid_int)
-            except (TypeError, ValueError):
-                # Si no es un entero válido, no aplicar filtro (evitamos 500)
-                pass
-        return qs
+    def list(self, request, *args, **kwargs):
+        region_id = request.query_params.get("region")
+        # Si no es un entero válido, no aplicar filtro (evitamos 500)
+        rows = GeoCache.provinces(_int(region_id) if region_id else None)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
+    def retrieve(self, request, *args, **kwargs):
+        row = GeoCache.snapshot().province_by_id.get(_int(kwargs.get("pk")))
+        if row is None:
+            raise Http404
+        return Response(row)
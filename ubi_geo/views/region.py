@@ -1,17 +1,41 @@
 # -*- coding: utf-8 -*-
+from django.http import Http404
+from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from ubi_geo.models.region import Region
 from ubi_geo.serializers.region import RegionSerializer
-from architect.utils.tenant import filter_by_tenant_including_global
+from ubi_geo.services.geo_cache import GeoCache
 
 class RegionViewSet(ReadOnlyModelViewSet):
     """
     GET /api/regions/           -> lista todas las regiones
     GET /api/regions/{id}/      -> detalle de una región
+
+    Se sirve desde GeoCache (catálogo global, sin tenant): no consulta la BD.
     """
     queryset = Region.objects.filter(deleted_at__isnull=True).order_by("name")
     serializer_class = RegionSerializer
 
-    def get_queryset(self):
-        base = Region.objects.filter(deleted_at__isnull=True).order_by("name")
-        return filter_by_tenant_including_global(base, self.request.user, field='reflexo')
+    def list(self, request, *args, **kwargs):
+        rows = GeoCache.regions()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
+    def retrieve(self, request, *args, **kwargs):
+        row = GeoCache.snapshot().region_by_id.get(_int(kwargs.get("pk")))
+        if row is None:
+            raise Http404
+        return Response(row)
+
+
+def _int(value):
+    """Entero de un parámetro; acepta formatos como "{2}" o " 2 " (None si no es válido)."""
+    value = str(value if value is not None else "").strip()
+    if value.startswith("{") and value.endswith("}"):
+        value = value[1:-1].strip()
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework.views import APIView
+from ubi_geo.services.geo_cache import GeoCache
+
+
+class LocationTreeView(APIView):
+    """
+    GET /api/locations/tree/  -> árbol completo región > provincia > distrito
+
+    [{"id", "name", "provinces": [{"id", "name", "districts": [{"id", "name"}]}]}]
+
+    El JSON se genera una vez por versión del catálogo (GeoCache). Responde con
+    ETag fuerte; si el cliente envía If-None-Match con el mismo valor, 304 sin cuerpo.
+    """
+
+    def get(self, request):
+        payload, etag = GeoCache.tree()
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == "*"):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(payload, content_type="application/json; charset=utf-8")
+        response["ETag"] = etag
+        # Siempre revalidar: la versión puede cambiar tras un import_ubigeo
+        patch_cache_control(response, private=True, no_cache=True)
+        return response